@@ -0,0 +1,5 @@
+"""ETL Benchmark Package.
+
+Contains the synthetic PRH dataset generator and the end-to-end throughput
+benchmark of the ETL pipeline.
+"""
@@ -0,0 +1,385 @@
+"""End-to-end throughput benchmark of the ETL pipeline.
+
+Generates synthetic PRH datasets at the requested scales, runs
+`process_and_clean_entities` on each of them and reports the records per second of
+every profiled step. Each run writes a JSON report to the benchmark directory and
+appends one line per scale to `history.jsonl`, so scaling curves can be tracked
+per commit.
+
+Usage:
+    python -m etl.benchmark.run_benchmark --companies 10000,100000,1000000
+"""
+
+import argparse
+import copy
+import json
+import os
+import shutil
+import subprocess
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from etl.benchmark.synthetic_prh import (
+    generate_dataset,
+    load_industry_codes,
+    write_toimi_mappings,
+)
+from etl.config.config_loader import load_all_configs
+from etl.config.logging.logging_config import get_logger
+from etl.config.mappings.dynamic_loader import TOIMI_FILES_PATH
+from etl.pipeline.etl_run import process_and_clean_entities, setup_environment
+from etl.utils.run_profiler import PROFILER
+
+logger = get_logger()
+
+DEFAULT_SCALES = [10_000, 100_000]
+HISTORY_FILE_NAME = "history.jsonl"
+
+
+def get_git_revision() -> Dict[str, Any]:
+    """Return the checked out commit and whether the working tree has changes.
+
+    Returns:
+        Dict[str, Any]: `commit` (None outside a git checkout) and `dirty`.
+    """
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+        status = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError) as e:
+        logger.warning(f"Could not determine the git commit: {e}")
+        return {"commit": None, "dirty": None}
+    return {"commit": commit, "dirty": bool(status.strip())}
+
+
+def ensure_toimi_mappings(config: Dict[str, Any]) -> None:
+    """Write synthetic TOIMI mapping files if none have been downloaded.
+
+    Existing files are never replaced, so a benchmark does not clobber the
+    mappings downloaded from the PRH API.
+
+    Args:
+        config (Dict[str, Any]): Configuration dictionary.
+    """
+    languages = list(config["languages"].values())
+    missing = [
+        f"{code}_{language}.txt"
+        for code in config["codes"]
+        for language in languages
+        if not (TOIMI_FILES_PATH / f"{code}_{language}.txt").exists()
+    ]
+    if not missing:
+        return
+    logger.info(f"Writing synthetic TOIMI mappings to {TOIMI_FILES_PATH}: {missing}")
+    industry_codes = load_industry_codes(
+        Path(config["config_files"]["industry_2025_file"])
+    )
+    write_toimi_mappings(TOIMI_FILES_PATH, industry_codes, config["codes"], languages)
+
+
+def build_benchmark_config(
+    config: Dict[str, Any], dataset: Dict[str, Any], run_dir: Path
+) -> Dict[str, Any]:
+    """Return the configuration of a benchmark run.
+
+    Args:
+        config (Dict[str, Any]): Configuration dictionary.
+        dataset (Dict[str, Any]): Metadata of the synthetic dataset.
+        run_dir (Path): Directory for the outputs of the run.
+
+    Returns:
+        Dict[str, Any]: A copy of the configuration reading the synthetic dataset
+            and writing into `run_dir`.
+    """
+    benchmark_config = copy.deepcopy(config)
+    benchmark_config["directory_structure"].update(
+        {
+            "raw_dir": str(Path(dataset["archive"]).parent),
+            "extracted_dir": str(run_dir / "extracted_data"),
+            "processed_dir": str(run_dir / "processed_data"),
+            "resources_dir": dataset["resources_dir"],
+            "address_index_dir": str(
+                Path(dataset["resources_dir"]).parent / "address_index"
+            ),
+        }
+    )
+    benchmark_config["incremental"] = False
+    benchmark_config["profiling"] = True
+    return benchmark_config
+
+
+def get_step_name(step: Dict[str, Any]) -> str:
+    """Return the name of a step profile, qualified by its entity.
+
+    Args:
+        step (Dict[str, Any]): Step profile of the run report.
+
+    Returns:
+        str: `step[entity]`, or `step` for steps outside an entity.
+    """
+    return f"{step['step']}[{step['entity']}]" if step["entity"] else step["step"]
+
+
+def get_step_throughput(
+    steps: List[Dict[str, Any]], companies: int
+) -> List[Dict[str, Any]]:
+    """Add the records per second to the step profiles.
+
+    Steps without known input rows are rated by the number of companies.
+
+    Args:
+        steps (List[Dict[str, Any]]): Step profiles of the run report.
+        companies (int): Number of companies in the dataset.
+
+    Returns:
+        List[Dict[str, Any]]: The step profiles with `records` and
+            `records_per_sec`.
+    """
+    results = []
+    for step in steps:
+        records = step["rows_in"] if step["rows_in"] is not None else companies
+        wall_time = step["wall_time"]
+        results.append(
+            {
+                **step,
+                "records": records,
+                "records_per_sec": round(records / wall_time, 1) if wall_time else None,
+            }
+        )
+    return results
+
+
+def run_scale(
+    config: Dict[str, Any],
+    benchmark_dir: Path,
+    companies: int,
+    seed: int,
+    reference_rows: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Generate the dataset of a scale, if needed, and benchmark the pipeline on it.
+
+    Args:
+        config (Dict[str, Any]): Configuration dictionary.
+        benchmark_dir (Path): Directory of the datasets and reports.
+        companies (int): Number of companies.
+        seed (int): Seed of the dataset.
+        reference_rows (Optional[int]): Approximate size of the address reference.
+
+    Returns:
+        Dict[str, Any]: Run report of the scale with the throughput of every step.
+    """
+    dataset_dir = benchmark_dir / "datasets" / f"{companies}_seed{seed}"
+    dataset = generate_dataset(
+        dataset_dir,
+        companies,
+        Path(config["directory_structure"]["resources_dir"]) / "municipality_code.csv",
+        Path(config["config_files"]["industry_2025_file"]),
+        seed,
+        reference_rows,
+    )
+    run_dir = dataset_dir / "run"
+    shutil.rmtree(run_dir, ignore_errors=True)
+    run_config = build_benchmark_config(config, dataset, run_dir)
+    setup_environment(run_config)
+
+    PROFILER.configure(run_config)
+    PROFILER.reset()
+    started_at = datetime.now(timezone.utc)
+    logger.info(f"Benchmarking {companies} companies...")
+    status, error = "failed", None
+    try:
+        process_and_clean_entities(run_config, Path(dataset["archive"]))
+        status = "completed"
+    except Exception as e:
+        logger.error(f"Benchmark of {companies} companies failed: {e}")
+        error = str(e)
+    report = PROFILER.build_report(run_config, started_at, status, error)
+
+    report["companies"] = companies
+    report["dataset"] = dataset
+    report["records_per_sec"] = (
+        round(companies / report["elapsed_time"], 1) if report["elapsed_time"] else None
+    )
+    report["steps"] = get_step_throughput(report["steps"], companies)
+    return report
+
+
+def log_scale(report: Dict[str, Any]) -> None:
+    """Log the throughput of a benchmarked scale.
+
+    Args:
+        report (Dict[str, Any]): Run report of the scale.
+    """
+    logger.info(
+        f"{report['companies']} companies: {report['status']} in "
+        f"{report['elapsed_time']:.2f}s ({report['records_per_sec']} records/sec)"
+    )
+    for step in report["steps"]:
+        logger.info(
+            f"  {get_step_name(step)}: {step['records']} records in {step['wall_time']:.2f}s "
+            f"({step['records_per_sec']} records/sec)"
+        )
+
+
+def write_benchmark_report(
+    benchmark_dir: Path, reports: List[Dict[str, Any]], revision: Dict[str, Any]
+) -> Path:
+    """Write the benchmark report and append the scales to the history.
+
+    Args:
+        benchmark_dir (Path): Directory of the datasets and reports.
+        reports (List[Dict[str, Any]]): Run reports of the scales.
+        revision (Dict[str, Any]): Git commit of the benchmarked code.
+
+    Returns:
+        Path: The written report.
+    """
+    started_at = reports[0]["started_at"] if reports else ""
+    stamp = datetime.fromisoformat(started_at) if started_at else datetime.now()
+    reports_dir = benchmark_dir / "reports"
+    reports_dir.mkdir(parents=True, exist_ok=True)
+    report_file = reports_dir / f"benchmark_{stamp:%Y%m%dT%H%M%S}.json"
+    report_file.write_text(
+        json.dumps({**revision, "scales": reports}, indent=2), encoding="utf-8"
+    )
+
+    with (benchmark_dir / HISTORY_FILE_NAME).open("a", encoding="utf-8") as history:
+        for report in reports:
+            entry = {
+                **revision,
+                "started_at": report["started_at"],
+                "companies": report["companies"],
+                "status": report["status"],
+                "elapsed_time": report["elapsed_time"],
+                "records_per_sec": report["records_per_sec"],
+                "steps": {
+                    get_step_name(step): step["records_per_sec"]
+                    for step in report["steps"]
+                },
+            }
+            history.write(json.dumps(entry) + "\n")
+    logger.info(f"Benchmark report written to {report_file}")
+    return report_file
+
+
+def run_benchmark(
+    scales: List[int],
+    seed: int = 0,
+    reference_rows: Optional[int] = None,
+    benchmark_dir: Optional[Path] = None,
+    overrides: Optional[Dict[str, Any]] = None,
+) -> Path:
+    """Benchmark the pipeline on synthetic datasets of increasing size.
+
+    Scales run in ascending order in this process, so the peak RSS of a scale
+    includes the smaller scales before it.
+
+    Args:
+        scales (List[int]): Numbers of companies to benchmark.
+        seed (int): Seed of the datasets.
+        reference_rows (Optional[int]): Approximate size of the address reference.
+        benchmark_dir (Optional[Path]): Directory of the datasets and reports.
+            Defaults to `benchmark_dir` of the configuration.
+        overrides (Optional[Dict[str, Any]]): Configuration values to override,
+            e.g. `{"cleaning_workers": 1}`.
+
+    Returns:
+        Path: The written benchmark report.
+    """
+    config = load_all_configs()
+    config.update(overrides or {})
+    benchmark_dir = benchmark_dir or Path(
+        config["directory_structure"]["benchmark_dir"]
+    )
+    # Benchmark outputs are never uploaded
+    os.environ["USE_S3"] = "false"
+    ensure_toimi_mappings(config)
+
+    revision = get_git_revision()
+    reports = []
+    for companies in sorted(scales):
+        report = run_scale(config, benchmark_dir, companies, seed, reference_rows)
+        log_scale(report)
+        reports.append(report)
+    return write_benchmark_report(benchmark_dir, reports, revision)
+
+
+def parse_overrides(values: List[str]) -> Dict[str, Any]:
+    """Parse `key=value` configuration overrides.
+
+    Values are parsed as JSON where possible, e.g. `cleaning_workers=1` gives an
+    integer and `storage_format=parquet` a string.
+
+    Args:
+        values (List[str]): The overrides.
+
+    Returns:
+        Dict[str, Any]: The parsed overrides.
+
+    Raises:
+        ValueError: If an override is not of the form `key=value`.
+    """
+    overrides: Dict[str, Any] = {}
+    for value in values:
+        key, separator, raw = value.partition("=")
+        if not separator or not key:
+            raise ValueError(f"Invalid override '{value}', expected key=value.")
+        try:
+            overrides[key] = json.loads(raw)
+        except json.JSONDecodeError:
+            overrides[key] = raw
+    return overrides
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse the command line arguments of the benchmark.
+
+    Args:
+        argv (Optional[List[str]]): Arguments to parse; `sys.argv` if None.
+
+    Returns:
+        argparse.Namespace: The parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the ETL pipeline.")
+    parser.add_argument(
+        "--companies",
+        default=",".join(str(scale) for scale in DEFAULT_SCALES),
+        help="Comma-separated numbers of companies to benchmark, e.g. '10000,100000'",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the datasets")
+    parser.add_argument(
+        "--reference-rows",
+        type=int,
+        help="Approximate size of the address reference (default: 10 per company)",
+    )
+    parser.add_argument(
+        "--benchmark-dir",
+        type=Path,
+        help="Directory of the datasets and reports (default: benchmark_dir)",
+    )
+    parser.add_argument(
+        "--set",
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="Override a configuration value, e.g. 'cleaning_workers=1'",
+    )
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    run_benchmark(
+        [int(scale) for scale in args.companies.split(",")],
+        args.seed,
+        args.reference_rows,
+        args.benchmark_dir,
+        parse_overrides(args.set),
+    )
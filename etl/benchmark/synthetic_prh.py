@@ -0,0 +1,737 @@
+"""Deterministic generator of synthetic PRH datasets.
+
+Produces company records shaped like the PRH `all_companies` response together
+with a matching address reference of Finland, so the ETL pipeline can be run end
+to end at any scale without downloading the real data. The same seed and scale
+always produce byte-identical files.
+
+Addresses of the companies are drawn from the generated reference and then
+perturbed (case changes, typos, wrong or invalid postal codes, unknown streets and
+missing house numbers) so that every branch of the address validation is taken.
+
+Usage:
+    python -m etl.benchmark.synthetic_prh --companies 10000 --output-dir etl/data/benchmark/10000
+"""
+
+import argparse
+import csv
+import json
+import logging
+import math
+import random
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Bumped whenever the generated data changes, so cached datasets are rebuilt
+DATASET_VERSION = 1
+
+# Name of the reference files, matched by the address cleaning
+REFERENCE_FILE_TEMPLATE = "{region:02d}_addresses_2024-11-14.csv"
+REFERENCE_COLUMNS = [
+    "building_id",
+    "region",
+    "municipality",
+    "street",
+    "house_number",
+    "postal_code",
+    "latitude_wgs84",
+    "longitude_wgs84",
+    "building_use",
+]
+REGION_COUNT = 19
+AVERAGE_HOUSES_PER_STREET = 20
+STREETS_PER_POSTAL_CODE = 25
+MAX_POSTAL_CODES_PER_MUNICIPALITY = 99
+
+# Bounding box of mainland Finland
+LATITUDE_RANGE = (60.0, 69.0)
+LONGITUDE_RANGE = (21.0, 30.0)
+
+STREET_SYLLABLES = [
+    "aho", "han", "jär", "kal", "kos", "kuu", "lah", "lin", "mäen", "nie",
+    "pel", "pih", "rai", "ran", "sal", "sil", "suo", "tal", "tuo", "vaa",
+    "val", "vii", "ylä", "ala", "mets", "kirk", "kou", "mylly", "sep", "ran",
+]  # fmt: skip
+STREET_SUFFIXES = ["tie", "katu", "kuja", "polku", "raitti", "väylä", "rinne", "tie"]
+
+COMPANY_FORMS = [
+    ("16", "Osakeyhtiö", "Limited company", "Aktiebolag"),
+    ("13", "Kommandiittiyhtiö", "Limited partnership", "Kommanditbolag"),
+    ("26", "Yksityinen elinkeinonharjoittaja", "Sole trader", "Enskild näringsidkare"),
+    ("5", "Osuuskunta", "Co-operative", "Andelslag"),
+]
+COMPANY_NAME_SUFFIXES = {"16": "Oy", "13": "Ky", "26": "Tmi", "5": "osk"}
+COMPANY_SITUATIONS = ["KONK", "SANE", "SELTILA"]
+
+# Share of companies whose visiting address is perturbed, per perturbation
+ADDRESS_PERTURBATIONS = [
+    ("exact", 0.55),
+    ("case", 0.12),
+    ("typo", 0.10),
+    ("wrong_postal_code", 0.07),
+    ("unknown_street", 0.06),
+    ("missing_street", 0.03),
+    ("invalid_postal_code", 0.03),
+    ("unknown_house_number", 0.04),
+]
+
+BUSINESS_ID_WEIGHTS = [7, 9, 10, 5, 8, 4, 2]
+BUSINESS_ID_BASE = 1_000_000
+JSON_MEMBER_NAME = "companies.json"
+ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+METADATA_FILE_NAME = "dataset.json"
+
+
+@dataclass(frozen=True)
+class Municipality:
+    """A municipality of the synthetic address reference."""
+
+    index: int
+    code: str
+    city: str
+    region: int
+
+
+@dataclass(frozen=True)
+class Street:
+    """A street of the synthetic address reference."""
+
+    name: str
+    postal_code: str
+    house_count: int
+    latitude: float
+    longitude: float
+
+
+def load_municipalities(municipality_file: Path) -> List[Municipality]:
+    """Load the municipalities from a `code,city` CSV file.
+
+    Args:
+        municipality_file (Path): Path to `municipality_code.csv`.
+
+    Returns:
+        List[Municipality]: The municipalities, assigned round-robin to regions.
+    """
+    with municipality_file.open(encoding="utf-8") as file:
+        rows = list(csv.DictReader(file))
+    return [
+        Municipality(i, row["code"], row["city"], i % REGION_COUNT + 1)
+        for i, row in enumerate(rows)
+    ]
+
+
+def load_industry_codes(industry_file: Path) -> List[Dict[str, str]]:
+    """Load the most detailed industry codes with their titles.
+
+    Args:
+        industry_file (Path): Path to the industry 2025 CSV file.
+
+    Returns:
+        List[Dict[str, str]]: Level 5 rows with `code`, `fi`, `en` and `sv` keys.
+    """
+    with industry_file.open(encoding="utf-8") as file:
+        return [
+            {
+                "code": row["TOL 2025"],
+                "fi": row["Title_fi"],
+                "en": row["Title_en"],
+                "sv": row["Title_sv"],
+            }
+            for row in csv.DictReader(file)
+            if row["Level"] == "5"
+        ]
+
+
+def get_business_id(index: int) -> str:
+    """Return a unique, valid Finnish business ID for a company index.
+
+    Args:
+        index (int): Index of the company.
+
+    Returns:
+        str: Business ID in the form `NNNNNNN-C` with a valid check digit.
+    """
+    number = BUSINESS_ID_BASE + 2 * index
+    remainder = _business_id_remainder(number)
+    if remainder == 1:
+        # Numbers with remainder 1 have no valid check digit; the next one has
+        number += 1
+        remainder = _business_id_remainder(number)
+    check_digit = 0 if remainder == 0 else 11 - remainder
+    return f"{number:07d}-{check_digit}"
+
+
+def _business_id_remainder(number: int) -> int:
+    digits = f"{number:07d}"
+    return sum(int(d) * w for d, w in zip(digits, BUSINESS_ID_WEIGHTS)) % 11
+
+
+class SyntheticAddressReference:
+    """Address reference of Finland generated from a seed.
+
+    Streets are derived on demand from the seed, the municipality and the street
+    index, so sampling addresses does not require the reference in memory.
+    """
+
+    def __init__(
+        self, municipalities: List[Municipality], reference_rows: int, seed: int
+    ) -> None:
+        """Initialize the reference.
+
+        Args:
+            municipalities (List[Municipality]): Municipalities of the reference.
+            reference_rows (int): Approximate number of addresses in the reference.
+            seed (int): Seed of the generated streets.
+        """
+        if not municipalities:
+            raise ValueError("The address reference needs at least one municipality.")
+        self.municipalities = municipalities
+        self.seed = seed
+        self.streets_per_municipality = max(
+            1,
+            reference_rows // (len(municipalities) * AVERAGE_HOUSES_PER_STREET),
+        )
+        self.postal_codes_per_municipality = min(
+            MAX_POSTAL_CODES_PER_MUNICIPALITY,
+            max(1, math.ceil(self.streets_per_municipality / STREETS_PER_POSTAL_CODE)),
+        )
+
+    def get_postal_code(self, municipality: Municipality, street_index: int) -> str:
+        """Return the postal code of a street."""
+        offset = street_index % self.postal_codes_per_municipality
+        return f"{10000 + municipality.index * 100 + offset:05d}"
+
+    def get_street(self, municipality: Municipality, street_index: int) -> Street:
+        """Return a street of a municipality.
+
+        Args:
+            municipality (Municipality): The municipality.
+            street_index (int): Index of the street in the municipality.
+
+        Returns:
+            Street: The street, identical for the same seed and indexes.
+        """
+        rng = random.Random(f"{self.seed}:{municipality.index}:{street_index}")
+        syllables = "".join(rng.choices(STREET_SYLLABLES, k=rng.randint(1, 3)))
+        name = f"{syllables}{rng.choice(STREET_SUFFIXES)}".capitalize()
+        lat_span = LATITUDE_RANGE[1] - LATITUDE_RANGE[0]
+        lon_span = LONGITUDE_RANGE[1] - LONGITUDE_RANGE[0]
+        return Street(
+            name=name,
+            postal_code=self.get_postal_code(municipality, street_index),
+            house_count=rng.randint(1, 2 * AVERAGE_HOUSES_PER_STREET - 1),
+            latitude=LATITUDE_RANGE[0]
+            + (municipality.index * 0.618 % 1) * lat_span
+            + rng.uniform(-0.05, 0.05),
+            longitude=LONGITUDE_RANGE[0]
+            + (municipality.index * 0.382 % 1) * lon_span
+            + rng.uniform(-0.05, 0.05),
+        )
+
+    def iter_rows(self, municipality: Municipality) -> Iterator[List[Any]]:
+        """Yield the reference rows of a municipality.
+
+        Every tenth street also has a building without a house number, like the
+        real reference.
+
+        Args:
+            municipality (Municipality): The municipality.
+
+        Yields:
+            List[Any]: Rows in the order of `REFERENCE_COLUMNS`.
+        """
+        for street_index in range(self.streets_per_municipality):
+            street = self.get_street(municipality, street_index)
+            first = 0 if street_index % 10 == 0 else 1
+            for house in range(first, street.house_count + 1):
+                yield [
+                    f"{municipality.index:03d}{street_index:05d}{house:03d}B",
+                    f"{municipality.region:02d}",
+                    municipality.code,
+                    street.name,
+                    str(house) if house else "",
+                    street.postal_code,
+                    f"{street.latitude + house * 0.0001:.6f}",
+                    f"{street.longitude + house * 0.0001:.6f}",
+                    str(1 + house % 3),
+                ]
+
+    def write(self, output_dir: Path) -> List[Path]:
+        """Write the reference as one CSV file per region.
+
+        Args:
+            output_dir (Path): Directory of the reference files.
+
+        Returns:
+            List[Path]: The written files.
+        """
+        output_dir.mkdir(parents=True, exist_ok=True)
+        by_region: Dict[int, List[Municipality]] = {}
+        for municipality in self.municipalities:
+            by_region.setdefault(municipality.region, []).append(municipality)
+
+        written_files = []
+        for region, municipalities in sorted(by_region.items()):
+            output_file = output_dir / REFERENCE_FILE_TEMPLATE.format(region=region)
+            with output_file.open("w", encoding="utf-8", newline="") as file:
+                writer = csv.writer(file)
+                writer.writerow(REFERENCE_COLUMNS)
+                for municipality in municipalities:
+                    writer.writerows(self.iter_rows(municipality))
+            written_files.append(output_file)
+        logger.info(
+            f"Wrote {len(written_files)} address reference files to {output_dir}"
+        )
+        return written_files
+
+    def sample(self, rng: random.Random) -> Tuple[Municipality, Street, int]:
+        """Sample an address of the reference.
+
+        Args:
+            rng (random.Random): Random number generator of the company.
+
+        Returns:
+            Tuple[Municipality, Street, int]: Municipality, street and house number.
+        """
+        municipality = rng.choice(self.municipalities)
+        street = self.get_street(
+            municipality, rng.randrange(self.streets_per_municipality)
+        )
+        return municipality, street, rng.randint(1, street.house_count)
+
+
+class SyntheticPRHGenerator:
+    """Generator of PRH-shaped company records.
+
+    Each record is generated from its own random number generator seeded with the
+    dataset seed and the company index, so any range of companies can be generated
+    independently and always yields the same records.
+    """
+
+    def __init__(
+        self,
+        reference: SyntheticAddressReference,
+        industry_codes: List[str],
+        seed: int,
+    ) -> None:
+        """Initialize the generator.
+
+        Args:
+            reference (SyntheticAddressReference): Reference the addresses come from.
+            industry_codes (List[str]): Industry codes of the main business lines.
+            seed (int): Seed of the generated companies.
+        """
+        if not industry_codes:
+            raise ValueError("The generator needs at least one industry code.")
+        self.reference = reference
+        self.industry_codes = industry_codes
+        self.seed = seed
+        self.perturbations = [name for name, _ in ADDRESS_PERTURBATIONS]
+        self.perturbation_weights = [weight for _, weight in ADDRESS_PERTURBATIONS]
+
+    def iter_companies(self, count: int, start: int = 0) -> Iterator[Dict[str, Any]]:
+        """Yield company records.
+
+        Args:
+            count (int): Number of companies.
+            start (int): Index of the first company.
+
+        Yields:
+            Dict[str, Any]: The company records.
+        """
+        for index in range(start, start + count):
+            yield self.make_company(index)
+
+    def make_company(self, index: int) -> Dict[str, Any]:
+        """Generate the record of a company.
+
+        Args:
+            index (int): Index of the company.
+
+        Returns:
+            Dict[str, Any]: The company record.
+        """
+        rng = random.Random(f"{self.seed}:company:{index}")
+        registered = _random_date(rng, 1990, 2024)
+        form = rng.choice(COMPANY_FORMS)
+        addresses = [self._make_address(rng, 1, registered)]
+        if rng.random() < 0.3:
+            addresses.append(self._make_address(rng, 2, registered))
+        return {
+            "businessId": {
+                "value": get_business_id(index),
+                "registrationDate": registered,
+                "source": "3",
+            },
+            "euId": None,
+            "names": self._make_names(rng, index, form[0], registered),
+            "mainBusinessLine": self._make_business_line(rng, registered),
+            "website": (
+                {"url": f"www.company{index}.fi"} if rng.random() < 0.4 else None
+            ),
+            "companyForms": [
+                {
+                    "type": form[0],
+                    "descriptions": [
+                        {"languageCode": language, "description": description}
+                        for language, description in zip(["1", "3", "2"], form[1:])
+                    ],
+                    "registrationDate": registered,
+                    "endDate": None,
+                    "version": 1,
+                    "source": "1",
+                }
+            ],
+            "companySituations": self._make_situations(rng, registered),
+            "registeredEntries": self._make_registered_entries(rng, registered),
+            "addresses": addresses,
+            "tradeRegisterStatus": rng.choice(["1", "1", "1", "2", "4"]),
+            "status": rng.choice(["2", "2", "2", "2", "1", "5"]),
+            "registrationDate": registered,
+            "endDate": None,
+            "lastModified": f"{_random_date(rng, 2020, 2024)}T12:00:00",
+        }
+
+    def _make_names(
+        self, rng: random.Random, index: int, form: str, registered: str
+    ) -> List[Dict[str, Any]]:
+        suffix = COMPANY_NAME_SUFFIXES[form]
+        names = [
+            {
+                "name": f"Yritys {index} {suffix}",
+                "type": "1",
+                "registrationDate": registered,
+                "endDate": None,
+                "version": 1,
+                "source": "1",
+            }
+        ]
+        if rng.random() < 0.3:
+            names.append(
+                {
+                    "name": f"Vanha {index} {suffix}",
+                    "type": "1",
+                    "registrationDate": _random_date(rng, 1980, 1989),
+                    "endDate": registered,
+                    "version": 2,
+                    "source": "1",
+                }
+            )
+        if rng.random() < 0.1:
+            names.append(
+                {
+                    "name": f"Aputoiminimi {index}",
+                    "type": rng.choice(["2", "3", "4"]),
+                    "registrationDate": registered,
+                    "endDate": None,
+                    "version": 1,
+                    "source": "1",
+                }
+            )
+        return names
+
+    def _make_business_line(
+        self, rng: random.Random, registered: str
+    ) -> Optional[Dict[str, Any]]:
+        if rng.random() < 0.08:
+            return None
+        return {
+            "type": rng.choice(self.industry_codes),
+            "typeCodeSet": "TOIMI3",
+            "registrationDate": registered,
+            "source": "2",
+        }
+
+    def _make_situations(
+        self, rng: random.Random, registered: str
+    ) -> List[Dict[str, Any]]:
+        if rng.random() >= 0.05:
+            return []
+        return [
+            {
+                "type": rng.choice(COMPANY_SITUATIONS),
+                "registrationDate": registered,
+                "source": "1",
+            }
+        ]
+
+    def _make_registered_entries(
+        self, rng: random.Random, registered: str
+    ) -> List[Dict[str, Any]]:
+        entries = [
+            {
+                "type": "1",
+                "registrationDate": registered,
+                "endDate": None,
+                "register": "1",
+                "authority": "2",
+            }
+        ]
+        for register, entry_type in [("4", "1"), ("5", "1"), ("6", "80"), ("7", "1")]:
+            if rng.random() < 0.5:
+                entries.append(
+                    {
+                        "type": entry_type,
+                        "registrationDate": f"{_random_date(rng, 1990, 2024)}T00:00:00",
+                        "endDate": (
+                            _random_date(rng, 2020, 2024)
+                            if rng.random() < 0.1
+                            else None
+                        ),
+                        "register": register,
+                        "authority": "1",
+                    }
+                )
+        return entries
+
+    def _make_address(
+        self, rng: random.Random, address_type: int, registered: str
+    ) -> Dict[str, Any]:
+        municipality, street, house = self.reference.sample(rng)
+        street_name, postal_code = street.name, street.postal_code
+        perturbation = rng.choices(self.perturbations, self.perturbation_weights)[0]
+        if perturbation == "case":
+            street_name = street_name.upper()
+        elif perturbation == "typo":
+            position = rng.randrange(len(street_name))
+            street_name = (
+                street_name[:position]
+                + rng.choice("aeiklnorstuy")
+                + street_name[position + 1 :]
+            )
+        elif perturbation == "wrong_postal_code":
+            postal_code = self.reference.get_postal_code(
+                rng.choice(self.reference.municipalities), 0
+            )
+        elif perturbation == "unknown_street":
+            street_name = f"Tuntematon {rng.randint(1, 500)}"
+        elif perturbation == "missing_street":
+            street_name = ""
+        elif perturbation == "invalid_postal_code":
+            postal_code = rng.choice(["99999", "0012", "123456"])
+        elif perturbation == "unknown_house_number":
+            house = street.house_count + rng.randint(1, 50)
+
+        return {
+            "type": address_type,
+            "street": street_name,
+            "postCode": postal_code,
+            "postOffices": [
+                {
+                    "city": municipality.city.upper(),
+                    "languageCode": "1",
+                    "municipalityCode": municipality.code,
+                },
+                {
+                    "city": municipality.city.upper(),
+                    "languageCode": "2",
+                    "municipalityCode": municipality.code,
+                },
+            ],
+            "postOfficeBox": str(rng.randint(1, 999)) if address_type == 2 else "",
+            "buildingNumber": str(house),
+            "entrance": rng.choice("ABC") if rng.random() < 0.2 else "",
+            "apartmentNumber": str(rng.randint(1, 40)) if rng.random() < 0.25 else "",
+            "apartmentIdSuffix": "",
+            "co": "",
+            "country": None,
+            "freeAddressLine": "",
+            "registrationDate": registered,
+            "source": rng.choice(["0", "1", "2", "3"]),
+        }
+
+
+def _random_date(rng: random.Random, first_year: int, last_year: int) -> str:
+    return (
+        f"{rng.randint(first_year, last_year)}-"
+        f"{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+    )
+
+
+def write_companies(
+    output_file: Path, generator: SyntheticPRHGenerator, count: int
+) -> Path:
+    """Stream generated companies into a JSON array or a ZIP archive.
+
+    Records are written one at a time, so memory use does not grow with `count`.
+
+    Args:
+        output_file (Path): A `.json` file, or a `.zip` archive holding
+            `companies.json` like the PRH download.
+        generator (SyntheticPRHGenerator): The company generator.
+        count (int): Number of companies.
+
+    Returns:
+        Path: The written file.
+    """
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    if output_file.suffix == ".zip":
+        with zipfile.ZipFile(output_file, "w", zipfile.ZIP_DEFLATED) as zip_file:
+            # A fixed timestamp keeps the archive byte-identical between runs
+            member_info = zipfile.ZipInfo(JSON_MEMBER_NAME, date_time=ZIP_DATE_TIME)
+            member_info.compress_type = zipfile.ZIP_DEFLATED
+            with zip_file.open(member_info, "w", force_zip64=True) as member:
+                _write_json_array(member, generator, count)
+    else:
+        with output_file.open("wb") as file:
+            _write_json_array(file, generator, count)
+    logger.info(f"Wrote {count} synthetic companies to {output_file}")
+    return output_file
+
+
+def _write_json_array(file: Any, generator: SyntheticPRHGenerator, count: int) -> None:
+    file.write(b"[")
+    for i, company in enumerate(generator.iter_companies(count)):
+        if i:
+            file.write(b",\n")
+        file.write(json.dumps(company, ensure_ascii=False).encode("utf-8"))
+    file.write(b"]")
+
+
+def write_toimi_mappings(
+    output_dir: Path,
+    industry_codes: List[Dict[str, str]],
+    codes: List[str],
+    languages: List[str],
+) -> List[Path]:
+    """Write TOIMI description files like the ones downloaded from the PRH API.
+
+    Args:
+        output_dir (Path): Directory of the mapping files.
+        industry_codes (List[Dict[str, str]]): Industry codes with their titles.
+        codes (List[str]): Code sets, e.g. `TOIMI3`.
+        languages (List[str]): Language codes, e.g. `fi`.
+
+    Returns:
+        List[Path]: The written files.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    written_files = []
+    for code in codes:
+        for language in languages:
+            output_file = output_dir / f"{code}_{language}.txt"
+            output_file.write_text(
+                "\n".join(f"{row['code']}\t{row[language]}" for row in industry_codes),
+                encoding="utf-8",
+            )
+            written_files.append(output_file)
+    return written_files
+
+
+def generate_dataset(
+    output_dir: Path,
+    companies: int,
+    municipality_file: Path,
+    industry_file: Path,
+    seed: int = 0,
+    reference_rows: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Generate a synthetic dataset unless an identical one already exists.
+
+    The dataset consists of `raw/companies.zip`, the address reference and
+    `municipality_code.csv` in `resources/`, and `dataset.json` describing it.
+
+    Args:
+        output_dir (Path): Directory of the dataset.
+        companies (int): Number of companies.
+        municipality_file (Path): Path to `municipality_code.csv`.
+        industry_file (Path): Path to the industry 2025 CSV file.
+        seed (int): Seed of the dataset.
+        reference_rows (Optional[int]): Approximate size of the address
+            reference. Defaults to ten addresses per company, at least 50 000.
+
+    Returns:
+        Dict[str, Any]: Metadata of the dataset.
+    """
+    reference_rows = reference_rows or max(50_000, 10 * companies)
+    metadata_file = output_dir / METADATA_FILE_NAME
+    expected = {
+        "version": DATASET_VERSION,
+        "seed": seed,
+        "companies": companies,
+        "reference_rows": reference_rows,
+    }
+    if metadata_file.exists():
+        metadata = json.loads(metadata_file.read_text(encoding="utf-8"))
+        if all(metadata.get(key) == value for key, value in expected.items()):
+            logger.info(f"Reusing synthetic dataset in {output_dir}")
+            return metadata
+
+    municipalities = load_municipalities(municipality_file)
+    industry_codes = load_industry_codes(industry_file)
+    reference = SyntheticAddressReference(municipalities, reference_rows, seed)
+    generator = SyntheticPRHGenerator(
+        reference, [row["code"] for row in industry_codes], seed
+    )
+
+    resources_dir = output_dir / "resources"
+    reference.write(resources_dir)
+    (resources_dir / "municipality_code.csv").write_bytes(
+        municipality_file.read_bytes()
+    )
+    archive = write_companies(
+        output_dir / "raw" / "companies.zip", generator, companies
+    )
+
+    metadata = {
+        **expected,
+        "archive": str(archive),
+        "resources_dir": str(resources_dir),
+        "archive_bytes": archive.stat().st_size,
+    }
+    metadata_file.write_text(json.dumps(metadata, indent=2), encoding="utf-8")
+    return metadata
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse the command line arguments of the generator.
+
+    Args:
+        argv (Optional[List[str]]): Arguments to parse; `sys.argv` if None.
+
+    Returns:
+        argparse.Namespace: The parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Generate a synthetic PRH dataset.")
+    parser.add_argument(
+        "--companies", type=int, default=10_000, help="Number of companies"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the dataset")
+    parser.add_argument(
+        "--reference-rows",
+        type=int,
+        help="Approximate size of the address reference (default: 10 per company)",
+    )
+    parser.add_argument(
+        "--output-dir", type=Path, required=True, help="Directory of the dataset"
+    )
+    parser.add_argument(
+        "--municipality-file",
+        type=Path,
+        default=Path("etl/data/resources/municipality_code.csv"),
+        help="CSV file with the municipality codes and names",
+    )
+    parser.add_argument(
+        "--industry-file",
+        type=Path,
+        default=Path("etl/config/mappings/industry_2025.csv"),
+        help="CSV file with the industry 2025 codes",
+    )
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    args = parse_args()
+    generate_dataset(
+        args.output_dir,
+        args.companies,
+        args.municipality_file,
+        args.industry_file,
+        args.seed,
+        args.reference_rows,
+    )
@@ -9,10 +9,13 @@ Key Features:
 - Load mappings from YAML and CSV files.
 - Retrieve specific mappings by category and language.
 - Handle errors and log warnings for missing or invalid mappings.
+- Expose loaded mappings as read-only objects so they can be shared safely.
 """
 
 import logging
+from collections.abc import Mapping
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any, Dict, Optional, Union
 
 import pandas as pd
@@ -34,6 +37,22 @@ CATEGORIES = CONFIG["codes"]  # Supported TOIMI categories
 DEFAULT_MAPPINGS_KEY = "mappings"
 
 
+def freeze_mapping(value: Any) -> Any:
+    """Recursively convert dictionaries and lists into read-only equivalents.
+
+    Args:
+        value (Any): The value to freeze.
+
+    Returns:
+        Any: A read-only view of dictionaries, tuples for lists, other values unchanged.
+    """
+    if isinstance(value, Mapping):
+        return MappingProxyType({k: freeze_mapping(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze_mapping(v) for v in value)
+    return value
+
+
 class DynamicLoader:
     """Class to dynamically load mappings."""
 
@@ -98,11 +117,11 @@ class DynamicLoader:
 
         return mapping
 
-    def load_industry_2025_mapping(self) -> Dict[str, Dict[str, str]]:
+    def load_industry_2025_mapping(self) -> Mapping[str, Mapping[str, str]]:
         """Load the industry 2025 mapping from a CSV file.
 
         Returns:
-            Dict[str, Dict[str, str]]: The loaded industry 2025 mapping data.
+            Mapping[str, Mapping[str, str]]: The loaded, read-only industry 2025 mapping data.
 
         Raises:
             FileNotFoundError: If the industry 2025 file does not exist.
@@ -112,18 +131,24 @@ class DynamicLoader:
                 f"Industry 2025 file not found: {INDUSTRY_2025_FILE}"
             )
 
-        industry_mapping = {}
         df = pd.read_csv(INDUSTRY_2025_FILE)
-        for _, row in df.iterrows():
-            tol_code = row["TOL 2025"]
-            industry_mapping[tol_code] = {
-                "fi": row["Title_fi"],
-                "en": row["Title_en"],
-                "sv": row["Title_sv"],
-                "category": row["Category"],
+        industry_mapping = {
+            tol_code: {
+                "fi": title_fi,
+                "en": title_en,
+                "sv": title_sv,
+                "category": category,
             }
+            for tol_code, title_fi, title_en, title_sv, category in zip(
+                df["TOL 2025"],
+                df["Title_fi"],
+                df["Title_en"],
+                df["Title_sv"],
+                df["Category"],
+            )
+        }
 
-        return industry_mapping
+        return freeze_mapping(industry_mapping)
 
     def _load_yaml_file(self, file_path: str) -> Dict[str, Any]:
         """Load data from a YAML file.
@@ -165,7 +190,7 @@ class Mappings:
             mappings_file (str): Path to the YAML mappings file.
         """
         self.mappings_file: Path = Path(mappings_file).resolve()
-        self.mappings: Dict[str, Any] = self._load_mappings()
+        self.mappings: Mapping[str, Any] = freeze_mapping(self._load_mappings())
 
     def _load_mappings(self) -> Dict[str, Any]:
         """Load mappings from the YAML file.
@@ -182,7 +207,7 @@ class Mappings:
 
     def get_mapping(
         self, mapping_name: str, language: Optional[str] = None
-    ) -> Union[Dict[str, Any], str]:
+    ) -> Union[Mapping[str, Any], str]:
         """Retrieve a specific mapping for a given language.
 
         Args:
@@ -190,7 +215,7 @@ class Mappings:
             language (Optional[str]): The language code (e.g., 'en', 'fi').
 
         Returns:
-            Union[Dict[str, Any], str]: The requested mapping.
+            Union[Mapping[str, Any], str]: The requested read-only mapping.
 
         Raises:
             KeyError: If the mapping or language does not exist.
@@ -202,14 +227,14 @@ class Mappings:
                 f"Mapping '{mapping_name}' not found in {self.mappings_file}."
             )
 
-        if isinstance(mapping, dict) and language:
+        if isinstance(mapping, Mapping) and language:
             if language in mapping:
                 return mapping[language]
             raise KeyError(
                 f"Language '{language}' not supported for mapping '{mapping_name}'."
             )
 
-        if isinstance(mapping, (str, dict)):
+        if isinstance(mapping, (str, Mapping)):
             return mapping
         raise TypeError(
             f"Unexpected type for mapping '{mapping_name}': {type(mapping).__name__}"
@@ -0,0 +1,143 @@
+"""In-memory Index for TOIMI and Industry 2025 Mappings.
+
+This module defines the `MappingIndex` class, which holds every TOIMI description
+mapping in memory and a precomputed industry 2025 lookup table. It replaces reading
+TOIMI text files from disk per company record and scanning the industry 2025 mapping
+linearly for every industry code.
+
+Key Features:
+- Loads each TOIMI category/language file at most once per process.
+- Precomputes code -> (title, letter) for industry 2025 in every language.
+- Provides O(1) lookups for main business line extraction.
+"""
+
+import logging
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple
+
+from etl.config.mappings.dynamic_loader import CATEGORIES, LANGUAGES, DynamicLoader
+
+logger = logging.getLogger(__name__)
+
+
+class MappingIndex:
+    """Index of TOIMI descriptions and industry 2025 titles for O(1) lookups."""
+
+    def __init__(
+        self,
+        industry_2025_mapping: Mapping[str, Mapping[str, Any]],
+        dynamic_loader: Optional[DynamicLoader] = None,
+    ) -> None:
+        """Initialize the MappingIndex.
+
+        Args:
+            industry_2025_mapping (Mapping[str, Mapping[str, Any]]): Industry 2025
+                mapping as returned by `DynamicLoader.load_industry_2025_mapping`.
+            dynamic_loader (Optional[DynamicLoader]): Loader used to read TOIMI files.
+        """
+        self.dynamic_loader = dynamic_loader or DynamicLoader()
+        self._toimi_mappings: Dict[Tuple[str, str], Mapping[str, str]] = {}
+        self._toimi_errors: Dict[Tuple[str, str], Exception] = {}
+        self._industry_titles = self._build_industry_titles(industry_2025_mapping)
+
+    @classmethod
+    def build(
+        cls,
+        industry_2025_mapping: Mapping[str, Mapping[str, Any]],
+        categories: Iterable[str] = CATEGORIES,
+        languages: Iterable[str] = LANGUAGES,
+        dynamic_loader: Optional[DynamicLoader] = None,
+    ) -> "MappingIndex":
+        """Build an index with every configured TOIMI category and language preloaded.
+
+        Args:
+            industry_2025_mapping (Mapping[str, Mapping[str, Any]]): Industry 2025 mapping.
+            categories (Iterable[str]): TOIMI categories to preload.
+            languages (Iterable[str]): Language codes to preload.
+            dynamic_loader (Optional[DynamicLoader]): Loader used to read TOIMI files.
+
+        Returns:
+            MappingIndex: The populated index.
+        """
+        index = cls(industry_2025_mapping, dynamic_loader)
+        languages = list(languages)
+        for category in categories:
+            for language in languages:
+                try:
+                    index.get_toimi_mapping(category, language)
+                except (FileNotFoundError, ValueError) as e:
+                    logger.warning(f"TOIMI mapping not preloaded: {e}")
+        logger.info(
+            f"Mapping index built with {len(index._toimi_mappings)} TOIMI mappings "
+            f"and {len(index._industry_titles)} industry 2025 codes."
+        )
+        return index
+
+    def get_toimi_mapping(self, category: str, language: str) -> Mapping[str, str]:
+        """Return the TOIMI mapping for a category and language, loading it once.
+
+        Args:
+            category (str): The category of the mapping (e.g., "TOIMI3").
+            language (str): The language code (e.g., "fi", "en").
+
+        Returns:
+            Mapping[str, str]: Read-only mapping from TOIMI code to description.
+
+        Raises:
+            FileNotFoundError: If the mapping file does not exist.
+            ValueError: If the mapping file cannot be parsed.
+        """
+        key = (category, language)
+        mapping = self._toimi_mappings.get(key)
+        if mapping is not None:
+            return mapping
+        if key in self._toimi_errors:
+            raise self._toimi_errors[key]
+
+        try:
+            mapping = MappingProxyType(
+                self.dynamic_loader.load_toimi_mapping(category, language)
+            )
+        except (FileNotFoundError, ValueError) as e:
+            self._toimi_errors[key] = e
+            raise
+        self._toimi_mappings[key] = mapping
+        return mapping
+
+    def get_industry_title(self, type_code: str, language: str) -> Tuple[str, str]:
+        """Return the industry 2025 title and letter for an industry code.
+
+        Args:
+            type_code (str): The industry type code.
+            language (str): The language code for the title.
+
+        Returns:
+            Tuple[str, str]: The industry title and letter, or empty strings if unknown.
+        """
+        return self._industry_titles.get(type_code, {}).get(language, ("", ""))
+
+    @staticmethod
+    def _build_industry_titles(
+        industry_2025_mapping: Mapping[str, Mapping[str, Any]],
+    ) -> Dict[str, Dict[str, Tuple[str, str]]]:
+        """Precompute the industry 2025 title and letter for every code.
+
+        Args:
+            industry_2025_mapping (Mapping[str, Mapping[str, Any]]): Industry 2025 mapping.
+
+        Returns:
+            Dict[str, Dict[str, Tuple[str, str]]]: Code -> language -> (title, letter).
+        """
+        languages = ("fi", "en", "sv")
+        industry_titles: Dict[str, Dict[str, Tuple[str, str]]] = {}
+        for tol_code, data in industry_2025_mapping.items():
+            category = data["category"]
+            if not isinstance(category, str):
+                continue  # Top-level rows have no parent category
+            category_row = industry_2025_mapping.get(category)
+            if category_row is None:
+                continue
+            industry_titles[tol_code] = {
+                lang: (category_row[lang], category) for lang in languages
+            }
+        return industry_titles
@@ -0,0 +1,95 @@
+"""Shared fixtures of the ETL tests.
+
+Pipeline tests run in a temporary workspace with the repository's configuration and
+resources linked in, so the relative paths of the configuration (mappings, logs,
+address index) resolve inside the workspace. Pipeline modules are imported once the
+workspace is the working directory, as importing them configures logging.
+"""
+
+import copy
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+import pytest
+
+# The configuration requires a database URL; the tests never connect to it
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("LOG_TO_FILE", "false")
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+TEST_COMPANIES = 300
+TEST_REFERENCE_ROWS = 3000
+TEST_SNAPSHOT_DATE = "2025-01-01"
+
+
+@pytest.fixture
+def pipeline_workspace(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    (tmp_path / "etl" / "data").mkdir(parents=True)
+    (tmp_path / "etl" / "config").symlink_to(REPO_ROOT / "etl" / "config")
+    (tmp_path / "etl" / "data" / "resources").symlink_to(
+        REPO_ROOT / "etl" / "data" / "resources"
+    )
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def synthetic_dataset(pipeline_workspace: Path) -> Dict[str, Any]:
+    from etl.benchmark.synthetic_prh import (
+        generate_dataset,
+        load_industry_codes,
+        write_toimi_mappings,
+    )
+    from etl.config.config_loader import CONFIG
+    from etl.config.mappings.dynamic_loader import TOIMI_FILES_PATH
+
+    industry_file = Path(CONFIG["config_files"]["industry_2025_file"])
+    write_toimi_mappings(
+        TOIMI_FILES_PATH,
+        load_industry_codes(industry_file),
+        CONFIG["codes"],
+        list(CONFIG["languages"].values()),
+    )
+    return generate_dataset(
+        pipeline_workspace / "dataset",
+        TEST_COMPANIES,
+        REPO_ROOT / "etl" / "data" / "resources" / "municipality_code.csv",
+        industry_file,
+        seed=0,
+        reference_rows=TEST_REFERENCE_ROWS,
+    )
+
+
+@pytest.fixture
+def make_pipeline_config(
+    pipeline_workspace: Path, synthetic_dataset: Dict[str, Any]
+) -> Callable[..., Dict[str, Any]]:
+    """Return a factory of configurations writing into a run directory."""
+    from etl.config.config_loader import CONFIG
+
+    def make_config(run_name: str, **overrides: Any) -> Dict[str, Any]:
+        run_dir = pipeline_workspace / run_name
+        config = copy.deepcopy(CONFIG)
+        config["directory_structure"].update(
+            {
+                "raw_dir": str(Path(synthetic_dataset["archive"]).parent),
+                "extracted_dir": str(run_dir / "extracted_data"),
+                "processed_dir": str(run_dir / "processed_data"),
+                "resources_dir": synthetic_dataset["resources_dir"],
+                "address_index_dir": str(pipeline_workspace / "address_index"),
+            }
+        )
+        config.update(
+            {
+                "snapshot_date": TEST_SNAPSHOT_DATE,
+                "incremental": False,
+                "profiling": False,
+                "cleaning_workers": 1,
+                "extraction_workers": 1,
+            }
+        )
+        config.update(overrides)
+        return config
+
+    return make_config
@@ -0,0 +1,286 @@
+"""Memory-Aware Adaptive Batch Sizing.
+
+This module groups streamed records into batches whose size follows a memory
+budget instead of a fixed record count. A fixed `chunk_size` is either too small
+for cheap records, where per-batch overhead dominates, or unbounded in memory for
+records with many nested addresses and names.
+
+The sizer measures the in-memory footprint of the parsed records (a deep size of a
+sample of every batch) and of the DataFrames extracted from them (reported by the
+entity writers), and sizes the next batch so that all batches alive at the same
+time fit in the budget left over by the process baseline and the writer buffers.
+The process RSS is checked after every batch; a batch that raises the peak above
+the budget makes the following batches shrink, and they grow back gradually.
+
+With `chunk_memory_budget_mb: 0` batches have a fixed size of `chunk_size`
+records and nothing is measured.
+"""
+
+import logging
+import sys
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from etl.pipeline.data_fetcher import iter_record_batches
+from etl.utils.run_profiler import BYTES_PER_MB, get_rss_bytes
+from etl.utils.table_writer import DEFAULT_BUFFER_BYTES
+
+logger = logging.getLogger(__name__)
+
+# Default bounds of adaptive batch sizes (`min_chunk_size`/`max_chunk_size`)
+DEFAULT_MIN_BATCH_SIZE = 100
+DEFAULT_MAX_BATCH_SIZE = 100_000
+# Number of records of every batch whose deep size is measured
+SAMPLE_RECORDS = 32
+# Weight of the latest batch in the moving averages of bytes per record
+SMOOTHING = 0.3
+# Largest growth of the batch size from one batch to the next
+MAX_GROWTH = 2.0
+# Factor applied to the memory pressure while the RSS is above the budget
+PRESSURE_BACKOFF = 0.7
+# Factor applied to the memory pressure while the RSS is within the budget
+PRESSURE_RECOVERY = 1.1
+MIN_PRESSURE = 0.05
+
+
+def get_deep_size(value: Any) -> int:
+    """Return the memory used by a parsed JSON value and everything it contains.
+
+    Args:
+        value (Any): A dict, list or scalar as produced by the JSON parser.
+
+    Returns:
+        int: Size in bytes.
+    """
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        for key, item in value.items():
+            size += sys.getsizeof(key) + get_deep_size(item)
+    elif isinstance(value, list):
+        for item in value:
+            size += get_deep_size(item)
+    return size
+
+
+def _update_average(average: Optional[float], value: float) -> float:
+    return value if average is None else average + SMOOTHING * (value - average)
+
+
+class AdaptiveBatchSizer:
+    """Sizes record batches to hold the process RSS near a memory budget."""
+
+    def __init__(
+        self,
+        batch_size: int,
+        memory_budget_bytes: Optional[int] = None,
+        min_batch_size: int = DEFAULT_MIN_BATCH_SIZE,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        batches_in_flight: int = 1,
+        reserved_bytes: int = 0,
+    ) -> None:
+        """Initialize the sizer.
+
+        Args:
+            batch_size (int): Size of the first batch, and of every batch if no
+                budget is given.
+            memory_budget_bytes (Optional[int]): Target peak RSS of the process;
+                None for fixed-size batches.
+            min_batch_size (int): Smallest adaptive batch size.
+            max_batch_size (int): Largest adaptive batch size.
+            batches_in_flight (int): Number of batches held in memory at the same
+                time, e.g. the batches queued for worker processes.
+            reserved_bytes (int): Memory of the budget held outside the batches,
+                e.g. the buffers of the entity writers.
+
+        Raises:
+            ValueError: If a size or the budget is not positive, or the minimum
+                batch size exceeds the maximum.
+        """
+        if batch_size <= 0 or min_batch_size <= 0 or batches_in_flight <= 0:
+            raise ValueError(
+                "Batch sizes and the number of batches in flight must be positive"
+            )
+        if min_batch_size > max_batch_size:
+            raise ValueError(
+                f"min_chunk_size ({min_batch_size}) exceeds "
+                f"max_chunk_size ({max_batch_size})"
+            )
+        if memory_budget_bytes is not None and memory_budget_bytes <= 0:
+            raise ValueError(
+                f"Memory budget must be positive, got {memory_budget_bytes}"
+            )
+
+        self.memory_budget_bytes = memory_budget_bytes
+        self.min_batch_size = min_batch_size
+        self.max_batch_size = max_batch_size
+        self.batches_in_flight = batches_in_flight
+        self.reserved_bytes = reserved_bytes
+        self.batch_size = (
+            self._clamp(batch_size) if memory_budget_bytes is not None else batch_size
+        )
+
+        self.input_bytes_per_record: Optional[float] = None
+        self.output_bytes_per_record: Optional[float] = None
+        self.pressure = 1.0
+        self.baseline_rss = 0
+        self.peak_rss = 0
+        self.batches = 0
+        self.records = 0
+        self.smallest_batch = 0
+        self.largest_batch = 0
+
+    @classmethod
+    def from_config(
+        cls, config: Dict[str, Any], batches_in_flight: int = 1
+    ) -> "AdaptiveBatchSizer":
+        """Create a sizer from the batching settings of the config.
+
+        With a single batch in flight the extraction writes into long-lived
+        entity writers in this process, so their buffers (up to
+        `output_buffer_bytes` per entity) are reserved from the budget.
+
+        Args:
+            config (Dict[str, Any]): Configuration dictionary.
+            batches_in_flight (int): Number of batches held in memory at once.
+
+        Returns:
+            AdaptiveBatchSizer: The sizer; fixed-size unless
+                `chunk_memory_budget_mb` is set.
+        """
+        budget_mb = int(config.get("chunk_memory_budget_mb", 0))
+        reserved_bytes = 0
+        if batches_in_flight == 1:
+            reserved_bytes = len(config.get("entities", [])) * int(
+                config.get("output_buffer_bytes", DEFAULT_BUFFER_BYTES)
+            )
+        return cls(
+            int(config["chunk_size"]),
+            budget_mb * BYTES_PER_MB if budget_mb else None,
+            int(config.get("min_chunk_size", DEFAULT_MIN_BATCH_SIZE)),
+            int(config.get("max_chunk_size", DEFAULT_MAX_BATCH_SIZE)),
+            batches_in_flight,
+            reserved_bytes,
+        )
+
+    @property
+    def adaptive(self) -> bool:
+        """Whether batch sizes follow a memory budget."""
+        return self.memory_budget_bytes is not None
+
+    @property
+    def bytes_per_record(self) -> Optional[float]:
+        """Estimated memory of a record and the rows extracted from it."""
+        if self.input_bytes_per_record is None:
+            return None
+        return self.input_bytes_per_record + (self.output_bytes_per_record or 0.0)
+
+    def iter_batches(
+        self, records: Iterable[Dict[str, Any]]
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Group streamed records into batches of the current batch size.
+
+        The size is adjusted whenever the consumer asks for the next batch, i.e.
+        once the previous batch has been processed (or queued for a worker).
+
+        Args:
+            records (Iterable[Dict[str, Any]]): The streamed records.
+
+        Yields:
+            List[Dict[str, Any]]: The record batches in input order.
+        """
+        if not self.adaptive:
+            yield from iter_record_batches(records, self.batch_size)
+            return
+
+        self.baseline_rss = self.peak_rss = get_rss_bytes()
+        iterator = iter(records)
+        while batch := list(islice(iterator, self.batch_size)):
+            self._observe_batch(batch)
+            yield batch
+            self._adjust()
+
+    def record_output(self, num_records: int, output_bytes: int) -> None:
+        """Record the memory of the rows extracted from a batch.
+
+        Args:
+            num_records (int): Number of records in the batch.
+            output_bytes (int): In-memory size of the DataFrames extracted from it.
+        """
+        if self.adaptive and num_records:
+            self.output_bytes_per_record = _update_average(
+                self.output_bytes_per_record, output_bytes / num_records
+            )
+
+    def get_target_batch_size(self) -> int:
+        """Return the batch size that fits the batches in flight in the budget.
+
+        Returns:
+            int: The target size, or the current size until the memory of both
+                the records and their extracted rows has been measured.
+        """
+        bytes_per_record = self.bytes_per_record
+        if (
+            self.memory_budget_bytes is None
+            or bytes_per_record is None
+            or self.output_bytes_per_record is None
+        ):
+            return self.batch_size
+        available = max(
+            0, self.memory_budget_bytes - self.baseline_rss - self.reserved_bytes
+        )
+        batch_budget = available * self.pressure / self.batches_in_flight
+        return self._clamp(int(batch_budget / max(bytes_per_record, 1.0)))
+
+    def _observe_batch(self, batch: List[Dict[str, Any]]) -> None:
+        step = max(1, len(batch) // SAMPLE_RECORDS)
+        sample = batch[::step][:SAMPLE_RECORDS]
+        sample_bytes = sum(get_deep_size(record) for record in sample)
+        self.input_bytes_per_record = _update_average(
+            self.input_bytes_per_record, sample_bytes / len(sample)
+        )
+        self.batches += 1
+        self.records += len(batch)
+        self.smallest_batch = min(self.smallest_batch or len(batch), len(batch))
+        self.largest_batch = max(self.largest_batch, len(batch))
+
+    def _adjust(self) -> None:
+        budget = self.memory_budget_bytes
+        if budget is None:
+            return
+        rss = get_rss_bytes()
+        # RSS rarely shrinks, so only a new peak is attributed to the last batch
+        new_peak = rss > self.peak_rss
+        self.peak_rss = max(self.peak_rss, rss)
+        if new_peak and rss > budget:
+            self.pressure = max(MIN_PRESSURE, self.pressure * PRESSURE_BACKOFF)
+        else:
+            self.pressure = min(1.0, self.pressure * PRESSURE_RECOVERY)
+
+        target = self.get_target_batch_size()
+        if new_peak and rss > budget:
+            target = min(target, self._clamp(int(self.batch_size * PRESSURE_BACKOFF)))
+        new_size = min(target, self._clamp(int(self.batch_size * MAX_GROWTH)))
+        if new_size != self.batch_size:
+            logger.debug(
+                f"Batch size {self.batch_size} -> {new_size} "
+                f"(RSS {rss / BYTES_PER_MB:.0f} MB, "
+                f"{self.bytes_per_record:.0f} bytes/record)"
+            )
+            self.batch_size = new_size
+
+    def _clamp(self, batch_size: int) -> int:
+        return max(self.min_batch_size, min(self.max_batch_size, batch_size))
+
+    def log_stats(self) -> None:
+        """Log the batch sizes chosen and the memory measured."""
+        if not self.adaptive or not self.batches:
+            return
+        budget_mb = (self.memory_budget_bytes or 0) / BYTES_PER_MB
+        logger.info(
+            f"Adaptive batching: {self.records} records in {self.batches} batches "
+            f"of {self.smallest_batch}-{self.largest_batch} records "
+            f"(last {self.batch_size}), "
+            f"~{self.bytes_per_record or 0:.0f} bytes/record, "
+            f"peak RSS {self.peak_rss / BYTES_PER_MB:.0f} MB "
+            f"of a {budget_mb:.0f} MB budget"
+        )
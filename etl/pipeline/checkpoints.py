@@ -0,0 +1,502 @@
+"""Stage Checkpointing and Resume for the ETL Pipeline.
+
+This module records every pipeline stage in a stage manifest: the content hashes of
+the stage's inputs and outputs and a hash of the configuration it ran with. When the
+pipeline is run again, a stage is skipped if its recorded inputs, outputs and
+parameters still match, so a failed run resumes from the first invalid stage
+instead of downloading, splitting and extracting everything again.
+
+Key Features:
+- Content hashes of files and directories, cached by size and modification time so
+  unchanged files are not read again.
+- Outputs are either declared up front or detected as the files a stage creates or
+  modifies in its output directories.
+- Outputs of a stage that is run again (or that failed) are removed first, because
+  pipeline tables are appended to.
+- Stage selection by name, by group (e.g. `clean` for every `clean:<entity>` stage),
+  from a given stage onwards, or forced regardless of the manifest.
+"""
+
+import fnmatch
+import hashlib
+import json
+import logging
+import shutil
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Name of the manifest file inside the processed data directory
+MANIFEST_FILE_NAME = "stage_manifest.json"
+# Version of the manifest layout; manifests of other versions are ignored
+MANIFEST_VERSION = 1
+# Buffer size used when hashing files
+HASH_BUFFER_SIZE = 1024 * 1024
+
+# Stage statuses recorded in the manifest
+STATUS_COMPLETED = "completed"
+STATUS_FAILED = "failed"
+
+
+@dataclass
+class PipelineStage:
+    """A checkpointed pipeline stage."""
+
+    name: str
+    inputs: List[Path] = field(default_factory=list)
+    outputs: List[Path] = field(default_factory=list)
+    output_dirs: List[Path] = field(default_factory=list)
+    params: Dict[str, Any] = field(default_factory=dict)
+    reset_outputs: bool = True
+
+
+@dataclass
+class StageRun:
+    """State of stages that are running, used to record them once they finish."""
+
+    stages: List[PipelineStage]
+    input_hashes: Dict[str, Dict[str, Optional[str]]]
+    files_before: Dict[str, Tuple[int, int]]
+    start_time: float = field(default_factory=time.time)
+
+    @property
+    def names(self) -> str:
+        """Return the comma-separated names of the stages."""
+        return ", ".join(stage.name for stage in self.stages)
+
+
+def hash_params(params: Dict[str, Any]) -> str:
+    """Hash the parameters of a stage.
+
+    Args:
+        params (Dict[str, Any]): JSON-serializable stage parameters.
+
+    Returns:
+        str: Hex digest of the parameters.
+    """
+    content = json.dumps(params, sort_keys=True, default=str)
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def snapshot_files(directories: Iterable[Path]) -> Dict[str, Tuple[int, int]]:
+    """Return the size and modification time of every file in some directories.
+
+    Args:
+        directories (Iterable[Path]): Directories to scan recursively.
+
+    Returns:
+        Dict[str, Tuple[int, int]]: (size, mtime in ns) keyed by file path.
+    """
+    files: Dict[str, Tuple[int, int]] = {}
+    for directory in directories:
+        if not directory.is_dir():
+            continue
+        for file_path in directory.rglob("*"):
+            if file_path.is_file():
+                stat = file_path.stat()
+                files[str(file_path)] = (stat.st_size, stat.st_mtime_ns)
+    return files
+
+
+def remove_path(path: Path) -> None:
+    """Remove a file or directory if it exists.
+
+    Args:
+        path (Path): The path to remove.
+    """
+    if path.is_dir():
+        shutil.rmtree(path)
+    elif path.exists():
+        path.unlink()
+
+
+class StageManifest:
+    """Manifest of completed pipeline stages with content hashes."""
+
+    def __init__(self, manifest_path: Path) -> None:
+        """Initialize the StageManifest, loading an existing manifest file.
+
+        Args:
+            manifest_path (Path): Path to the manifest JSON file.
+        """
+        self.manifest_path = Path(manifest_path)
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self._hash_cache: Dict[str, Dict[str, Any]] = {}
+        self.load()
+
+    def load(self) -> None:
+        """Load the manifest file, starting empty if it is missing or unreadable."""
+        if not self.manifest_path.exists():
+            return
+        try:
+            with self.manifest_path.open("r", encoding="utf-8") as file:
+                data = json.load(file)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(
+                f"Ignoring unreadable stage manifest {self.manifest_path}: {e}"
+            )
+            return
+        if data.get("version") != MANIFEST_VERSION:
+            logger.warning(f"Ignoring stage manifest of version {data.get('version')}")
+            return
+        self.stages = data.get("stages", {})
+        self._hash_cache = data.get("hash_cache", {})
+
+    def save(self) -> None:
+        """Write the manifest file atomically."""
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.manifest_path.with_suffix(".json.tmp")
+        with temp_path.open("w", encoding="utf-8") as file:
+            json.dump(
+                {
+                    "version": MANIFEST_VERSION,
+                    "stages": self.stages,
+                    "hash_cache": {
+                        path: entry
+                        for path, entry in self._hash_cache.items()
+                        if Path(path).exists()
+                    },
+                },
+                file,
+                indent=2,
+                sort_keys=True,
+            )
+        temp_path.replace(self.manifest_path)
+
+    def hash_file(self, file_path: Path) -> str:
+        """Return the content hash of a file, reusing the cached hash if unchanged.
+
+        Args:
+            file_path (Path): The file to hash.
+
+        Returns:
+            str: Hex digest of the file content.
+        """
+        stat = file_path.stat()
+        key = str(file_path)
+        cached = self._hash_cache.get(key)
+        if (
+            cached
+            and cached["size"] == stat.st_size
+            and cached["mtime_ns"] == stat.st_mtime_ns
+        ):
+            return cached["hash"]
+
+        digest = hashlib.blake2b(digest_size=16)
+        with file_path.open("rb") as file:
+            for block in iter(lambda: file.read(HASH_BUFFER_SIZE), b""):
+                digest.update(block)
+        file_hash = digest.hexdigest()
+        self._hash_cache[key] = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "hash": file_hash,
+        }
+        return file_hash
+
+    def hash_path(self, path: Path) -> Optional[str]:
+        """Return the content hash of a file or directory.
+
+        Args:
+            path (Path): The file or directory to hash.
+
+        Returns:
+            Optional[str]: Hex digest of the content, or None if the path is missing.
+        """
+        if path.is_file():
+            return self.hash_file(path)
+        if not path.is_dir():
+            return None
+        digest = hashlib.blake2b(digest_size=16)
+        for file_path in sorted(p for p in path.rglob("*") if p.is_file()):
+            digest.update(str(file_path.relative_to(path)).encode("utf-8"))
+            digest.update(self.hash_file(file_path).encode("ascii"))
+        return digest.hexdigest()
+
+    def hash_paths(self, paths: Iterable[Path]) -> Dict[str, Optional[str]]:
+        """Return the content hashes of several paths.
+
+        Args:
+            paths (Iterable[Path]): Files or directories to hash.
+
+        Returns:
+            Dict[str, Optional[str]]: Hashes keyed by path; None for missing paths.
+        """
+        return {str(path): self.hash_path(path) for path in paths}
+
+    def is_valid(self, stage: PipelineStage) -> bool:
+        """Check whether a stage's recorded run is still valid.
+
+        Args:
+            stage (PipelineStage): The stage to check.
+
+        Returns:
+            bool: True if the stage completed with the same parameters and inputs,
+                and all of its recorded outputs are unchanged.
+        """
+        entry = self.stages.get(stage.name)
+        if not entry or entry.get("status") != STATUS_COMPLETED:
+            return False
+        if entry.get("params_hash") != hash_params(stage.params):
+            return False
+        if entry.get("inputs") != self.hash_paths(stage.inputs):
+            return False
+        recorded_outputs = entry.get("outputs", {})
+        return recorded_outputs == self.hash_paths(Path(p) for p in recorded_outputs)
+
+    def get_outputs(self, stage_name: str) -> List[Path]:
+        """Return the outputs recorded for a stage.
+
+        Args:
+            stage_name (str): Name of the stage.
+
+        Returns:
+            List[Path]: The recorded output paths.
+        """
+        return [Path(p) for p in self.stages.get(stage_name, {}).get("outputs", {})]
+
+    def record(
+        self,
+        stage: PipelineStage,
+        outputs: Iterable[Path],
+        status: str,
+        elapsed: float,
+        input_hashes: Optional[Dict[str, Optional[str]]] = None,
+    ) -> None:
+        """Record a stage run and save the manifest.
+
+        Args:
+            stage (PipelineStage): The stage that ran.
+            outputs (Iterable[Path]): Outputs written by the stage.
+            status (str): "completed" or "failed".
+            elapsed (float): Duration of the run in seconds.
+            input_hashes (Optional[Dict[str, Optional[str]]]): Input hashes taken
+                before the stage ran; computed now if not given.
+        """
+        self.stages[stage.name] = {
+            "status": status,
+            "params_hash": hash_params(stage.params),
+            "inputs": (
+                input_hashes
+                if input_hashes is not None
+                else self.hash_paths(stage.inputs)
+            ),
+            "outputs": self.hash_paths(sorted(set(outputs))),
+            "elapsed_seconds": round(elapsed, 3),
+            "finished_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        self.save()
+
+
+class StageRunner:
+    """Run pipeline stages, skipping those whose checkpoints are still valid."""
+
+    def __init__(
+        self,
+        manifest: StageManifest,
+        selected: Optional[List[str]] = None,
+        from_stage: Optional[str] = None,
+        force: bool = False,
+    ) -> None:
+        """Initialize the StageRunner.
+
+        Args:
+            manifest (StageManifest): The stage manifest.
+            selected (Optional[List[str]]): Stage names, groups or patterns to run;
+                all stages if None.
+            from_stage (Optional[str]): Stage (or group) from which all stages are
+                run regardless of their checkpoints; earlier stages are not run.
+            force (bool): Run the selected stages regardless of their checkpoints.
+        """
+        self.manifest = manifest
+        self.selected = selected
+        self.from_stage = from_stage
+        self.force = force
+        self._from_stage_reached = from_stage is None
+
+    @staticmethod
+    def matches(stage_name: str, pattern: str) -> bool:
+        """Check whether a stage name matches a name, group or wildcard pattern.
+
+        Args:
+            stage_name (str): Name of the stage, e.g. "clean:addresses".
+            pattern (str): A stage name, a group such as "clean", or a pattern.
+
+        Returns:
+            bool: True if the stage matches.
+        """
+        return (
+            stage_name == pattern
+            or stage_name.split(":", 1)[0] == pattern
+            or fnmatch.fnmatchcase(stage_name, pattern)
+        )
+
+    def is_selected(self, stage: PipelineStage) -> bool:
+        """Check whether a stage is selected to run.
+
+        Args:
+            stage (PipelineStage): The stage.
+
+        Returns:
+            bool: True if the stage is selected.
+        """
+        if not self._from_stage_reached:
+            if not self.matches(stage.name, str(self.from_stage)):
+                return False
+            self._from_stage_reached = True
+        if self.selected is None:
+            return True
+        return any(self.matches(stage.name, pattern) for pattern in self.selected)
+
+    def needs_run(self, stage: PipelineStage, selected: Optional[bool] = None) -> bool:
+        """Check whether a stage has to run.
+
+        Args:
+            stage (PipelineStage): The stage.
+            selected (Optional[bool]): Whether the stage is selected, if already
+                determined with `is_selected`.
+
+        Returns:
+            bool: True if the stage is selected and its checkpoint is not valid.
+        """
+        if selected is None:
+            selected = self.is_selected(stage)
+        if not selected:
+            if not self.manifest.is_valid(stage):
+                logger.warning(f"Stage '{stage.name}' is not selected but not valid.")
+            else:
+                logger.info(f"Stage '{stage.name}' not selected.")
+            return False
+        if self.force or self.from_stage is not None:
+            return True
+        if self.manifest.is_valid(stage):
+            logger.info(f"Skipping stage '{stage.name}': checkpoint is valid.")
+            return False
+        return True
+
+    def run(self, stage: PipelineStage, func: Callable[[], None]) -> bool:
+        """Run a stage unless its checkpoint is valid.
+
+        Args:
+            stage (PipelineStage): The stage.
+            func (Callable[[], None]): Function performing the stage.
+
+        Returns:
+            bool: True if the stage ran.
+        """
+        return bool(self.run_group([stage], lambda stages: func()))
+
+    def run_group(
+        self,
+        stages: List[PipelineStage],
+        func: Callable[[List[PipelineStage]], None],
+    ) -> List[PipelineStage]:
+        """Run the stages of a group that need to run in a single call.
+
+        Used for stages produced by one pass over the data, such as the extraction
+        of several entities. Each stage is checkpointed separately.
+
+        Args:
+            stages (List[PipelineStage]): Stages of the group.
+            func (Callable[[List[PipelineStage]], None]): Function performing the
+                given stages.
+
+        Returns:
+            List[PipelineStage]: The stages that ran.
+
+        Raises:
+            Exception: Any error raised by the stage function, after the stages
+                and their partial outputs have been recorded as failed.
+        """
+        pending = [stage for stage in stages if self.needs_run(stage)]
+        if not pending:
+            return []
+        self.run_stages(pending, func)
+        return pending
+
+    def run_stages(
+        self,
+        stages: List[PipelineStage],
+        func: Callable[[List[PipelineStage]], None],
+    ) -> None:
+        """Run stages unconditionally and record them in the manifest.
+
+        Args:
+            stages (List[PipelineStage]): Stages to run.
+            func (Callable[[List[PipelineStage]], None]): Function performing them.
+        """
+        stage_run = self.start(stages)
+        completed = False
+        try:
+            func(stages)
+            completed = True
+        finally:
+            self.finish(stage_run, completed)
+
+    def start(self, stages: List[PipelineStage]) -> StageRun:
+        """Prepare stages to run: remove their previous outputs and hash their inputs.
+
+        Use together with `finish` when the stages run elsewhere, e.g. in a worker
+        process; otherwise use `run_stages`.
+
+        Args:
+            stages (List[PipelineStage]): Stages about to run.
+
+        Returns:
+            StageRun: The state needed to record the run in `finish`.
+        """
+        for stage in stages:
+            if stage.reset_outputs:
+                for output in self.manifest.get_outputs(stage.name) + stage.outputs:
+                    remove_path(output)
+
+        output_dirs = {d for stage in stages for d in stage.output_dirs}
+        stage_run = StageRun(
+            stages=stages,
+            input_hashes={
+                stage.name: self.manifest.hash_paths(stage.inputs) for stage in stages
+            },
+            files_before=snapshot_files(output_dirs),
+        )
+        logger.info(f"Running stage(s): {stage_run.names}")
+        return stage_run
+
+    def finish(
+        self,
+        stage_run: StageRun,
+        completed: bool,
+        outputs: Optional[Dict[str, List[Path]]] = None,
+    ) -> None:
+        """Record stages that have run, with their declared and detected outputs.
+
+        Args:
+            stage_run (StageRun): The state returned by `start`.
+            completed (bool): Whether the stages completed successfully.
+            outputs (Optional[Dict[str, List[Path]]]): Outputs reported by the
+                stage function, keyed by stage name.
+        """
+        elapsed = time.time() - stage_run.start_time
+        status = STATUS_COMPLETED if completed else STATUS_FAILED
+        output_dirs = {d for stage in stage_run.stages for d in stage.output_dirs}
+        files_after = snapshot_files(output_dirs)
+        changed = [
+            Path(p)
+            for p, state in files_after.items()
+            if stage_run.files_before.get(p) != state
+        ]
+        for stage in stage_run.stages:
+            detected = [
+                p for p in changed if any(d in p.parents for d in stage.output_dirs)
+            ]
+            reported = (outputs or {}).get(stage.name, [])
+            self.manifest.record(
+                stage,
+                [p for p in stage.outputs + reported if p.exists()] + detected,
+                status,
+                elapsed,
+                stage_run.input_hashes[stage.name],
+            )
+        logger.info(f"Stage(s) {stage_run.names} {status} in {elapsed:.2f} seconds.")
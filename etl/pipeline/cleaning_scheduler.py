@@ -0,0 +1,459 @@
+"""Dependency-Aware Scheduler for Entity Cleaning.
+
+This module runs the cleaning of the extracted entities as a small DAG of jobs.
+Dependencies between entities are declared with `depends_on` in `entities.yml`
+(e.g. `addresses` reads `staging_post_offices` written by `post_offices`); every
+other entity is independent. Independent jobs are cleaned concurrently in worker
+processes, as long as their estimated memory fits in the configured budget, so the
+total wall time is set by the longest dependency chain instead of the sum of all
+entities.
+
+Key Features:
+- Validates the declared dependencies (self-dependencies and cycles are errors).
+- Starts jobs that unblock other jobs first, then the largest ones.
+- Memory estimates are derived from the size of each job's input files.
+- A failed job skips its dependents; the other jobs still run.
+- Optionally checkpoints every job as a `clean:<entity>` stage.
+"""
+
+import logging
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from etl.pipeline.checkpoints import PipelineStage, StageRun, StageRunner
+from etl.pipeline.entity_processing import get_extracted_table
+from etl.pipeline.incremental import get_cleaned_dir
+from etl.pipeline.parallel_extraction import resolve_worker_count
+from etl.pipeline.transform.start_cleaning_process import start_cleaning_process
+from etl.utils.columnar_io import STORAGE_FORMAT_CSV, with_storage_suffix
+from etl.utils.file_io import record_written_files
+from etl.utils.run_profiler import PROFILER
+
+logger = logging.getLogger(__name__)
+
+# Estimated peak memory of a cleaning job per byte of input files
+MEMORY_PER_INPUT_BYTE = 10
+# Default memory budget for concurrent cleaning jobs (`cleaning_memory_budget_mb`)
+DEFAULT_MEMORY_BUDGET_MB = 8192
+
+# Job states
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+JOB_SKIPPED = "skipped"
+FINISHED_STATES = (JOB_COMPLETED, JOB_FAILED, JOB_SKIPPED)
+
+# Written files, error and step profiles returned by a cleaning job
+JobResult = Tuple[List[str], Optional[str], List[Dict[str, Any]]]
+
+
+@dataclass
+class CleaningJob:
+    """Cleaning of a single entity, with its dependencies."""
+
+    entity: Dict[str, Any]
+    depends_on: List[str] = field(default_factory=list)
+    memory_estimate: int = 0
+    stage: Optional[PipelineStage] = None
+
+    @property
+    def name(self) -> str:
+        """Return the name of the cleaned entity."""
+        return self.entity["name"]
+
+
+def get_staging_dir(config: Dict[str, Any]) -> Path:
+    """Return the directory of the staging tables shared between entities.
+
+    Args:
+        config (Dict[str, Any]): Configuration dictionary.
+
+    Returns:
+        Path: The `staging` directory inside the processed data directory.
+    """
+    return Path(config["directory_structure"]["processed_dir"]) / "staging"
+
+
+def get_cleaning_inputs(config: Dict[str, Any], entity: Dict[str, Any]) -> List[Path]:
+    """Return the files read when cleaning an entity.
+
+    Args:
+        config (Dict[str, Any]): Configuration dictionary.
+        entity (Dict[str, Any]): Entity configuration.
+
+    Returns:
+        List[Path]: The extracted table of the entity and any reference files.
+    """
+    resources_dir = Path(config["directory_structure"]["resources_dir"])
+    inputs = [get_extracted_table(config, entity["name"])]
+    if entity["name"] == "post_offices":
+        inputs.append(resources_dir / "municipality_code.csv")
+    elif entity["name"] == "addresses":
+        inputs += [
+            with_storage_suffix(
+                get_staging_dir(config) / "staging_post_offices.csv",
+                config.get("storage_format", STORAGE_FORMAT_CSV),
+            ),
+            resources_dir,
+        ]
+    return inputs
+
+
+def get_path_size(path: Path) -> int:
+    """Return the size of a file, or of all files in a directory.
+
+    Args:
+        path (Path): File or directory.
+
+    Returns:
+        int: Size in bytes; 0 if the path does not exist.
+    """
+    if path.is_file():
+        return path.stat().st_size
+    if path.is_dir():
+        return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+    return 0
+
+
+def clean_entity(entity: Dict[str, Any], config: Dict[str, Any]) -> None:
+    """Clean the extracted data of a single entity.
+
+    Args:
+        entity (Dict[str, Any]): Entity configuration.
+        config (Dict[str, Any]): Configuration dictionary.
+    """
+    entity_name = entity["name"]
+    cleaned_dir = get_cleaned_dir(config, config["snapshot_date"])
+    staging_dir = get_staging_dir(config)
+    resources_dir = Path(config["directory_structure"]["resources_dir"])
+    cleaned_dir.mkdir(parents=True, exist_ok=True)
+    staging_dir.mkdir(parents=True, exist_ok=True)
+    logger.info(f"Starting cleaning for entity: {entity_name}")
+
+    input_file = get_extracted_table(config, entity_name)
+    if not input_file.exists():
+        logger.warning(f"Skipping {entity_name}: File not found: {input_file}")
+        return
+
+    start_cleaning_process(
+        str(input_file),
+        str(cleaned_dir),
+        str(staging_dir),
+        entity_name,
+        str(resources_dir),
+        config,
+    )
+
+
+def _run_cleaning_job(entity: Dict[str, Any], config: Dict[str, Any]) -> JobResult:
+    """Clean an entity and report the files it wrote (runs in a worker process).
+
+    Errors are returned instead of raised so that the files written before the
+    error are still reported and removed when the job is run again.
+
+    Args:
+        entity (Dict[str, Any]): Entity configuration.
+        config (Dict[str, Any]): Configuration dictionary.
+
+    Returns:
+        JobResult: The written files, the error if any, and the step profiles.
+    """
+    PROFILER.configure(config, trace_allocations=False)
+    error = None
+    with PROFILER.collect() as profiles, record_written_files() as written_files:
+        try:
+            clean_entity(entity, config)
+        except Exception as e:
+            logger.exception(f"Error cleaning entity '{entity['name']}': {e}")
+            error = f"{type(e).__name__}: {e}"
+    return list(written_files), error, profiles
+
+
+def build_cleaning_jobs(
+    config: Dict[str, Any], stages: Optional[List[PipelineStage]] = None
+) -> List[CleaningJob]:
+    """Create the cleaning jobs of the configured entities in dependency order.
+
+    Args:
+        config (Dict[str, Any]): Configuration dictionary.
+        stages (Optional[List[PipelineStage]]): The `clean:<entity>` stages to
+            checkpoint the jobs with, in entity order.
+
+    Returns:
+        List[CleaningJob]: The jobs, sorted so that dependencies come first.
+
+    Raises:
+        ValueError: If an entity depends on itself or the dependencies form a cycle.
+    """
+    entities = config["entities"]
+    names = {entity["name"] for entity in entities}
+    jobs = []
+    for index, entity in enumerate(entities):
+        depends_on = list(entity.get("depends_on", []))
+        if entity["name"] in depends_on:
+            raise ValueError(f"Entity '{entity['name']}' depends on itself")
+        unknown = [name for name in depends_on if name not in names]
+        if unknown:
+            # Outputs of entities that are not cleaned now come from an earlier run
+            logger.warning(
+                f"Entity '{entity['name']}' depends on entities that are not "
+                f"configured, assuming their outputs exist: {unknown}"
+            )
+            depends_on = [name for name in depends_on if name in names]
+        jobs.append(
+            CleaningJob(
+                entity=entity,
+                depends_on=depends_on,
+                memory_estimate=MEMORY_PER_INPUT_BYTE
+                * sum(get_path_size(p) for p in get_cleaning_inputs(config, entity)),
+                stage=stages[index] if stages is not None else None,
+            )
+        )
+    return sort_jobs_by_dependencies(jobs)
+
+
+def sort_jobs_by_dependencies(jobs: List[CleaningJob]) -> List[CleaningJob]:
+    """Sort jobs so that every job comes after its dependencies.
+
+    Jobs keep their configured order unless they come before a dependency.
+
+    Args:
+        jobs (List[CleaningJob]): Jobs in configured order.
+
+    Returns:
+        List[CleaningJob]: The sorted jobs.
+
+    Raises:
+        ValueError: If the dependencies form a cycle.
+    """
+    ordered: List[CleaningJob] = []
+    done: set = set()
+    remaining = list(jobs)
+    while remaining:
+        job = next((j for j in remaining if set(j.depends_on) <= done), None)
+        if job is None:
+            cycle = ", ".join(j.name for j in remaining)
+            raise ValueError(f"Cyclic dependencies between entities: {cycle}")
+        ordered.append(job)
+        done.add(job.name)
+        remaining.remove(job)
+    return ordered
+
+
+class CleaningScheduler:
+    """Runs cleaning jobs in dependency order, concurrently within a memory budget."""
+
+    def __init__(
+        self,
+        config: Dict[str, Any],
+        jobs: List[CleaningJob],
+        runner: Optional[StageRunner] = None,
+        workers: int = 1,
+        memory_budget: int = DEFAULT_MEMORY_BUDGET_MB * 1024 * 1024,
+    ) -> None:
+        """Initialize the CleaningScheduler.
+
+        Args:
+            config (Dict[str, Any]): Configuration dictionary.
+            jobs (List[CleaningJob]): Jobs sorted by dependencies.
+            runner (Optional[StageRunner]): Runner checkpointing the job stages. If
+                not given, every job is run.
+            workers (int): Number of worker processes (1 = sequential, in-process).
+            memory_budget (int): Total estimated memory in bytes of the jobs running
+                at the same time. A job that exceeds it on its own still runs alone.
+        """
+        self.config = config
+        self.jobs = jobs
+        self.runner = runner
+        self.workers = workers
+        self.memory_budget = memory_budget
+        self.states: Dict[str, str] = {}
+        self.errors: Dict[str, str] = {}
+        self._selected: Dict[str, bool] = {}
+        self._dependents = {
+            job.name: [other.name for other in jobs if job.name in other.depends_on]
+            for job in jobs
+        }
+
+    @classmethod
+    def from_config(
+        cls,
+        config: Dict[str, Any],
+        runner: Optional[StageRunner] = None,
+        stages: Optional[List[PipelineStage]] = None,
+    ) -> "CleaningScheduler":
+        """Create a scheduler for the configured entities.
+
+        Args:
+            config (Dict[str, Any]): Configuration dictionary.
+            runner (Optional[StageRunner]): Runner checkpointing the job stages.
+            stages (Optional[List[PipelineStage]]): The `clean:<entity>` stages.
+
+        Returns:
+            CleaningScheduler: The scheduler.
+        """
+        memory_budget_mb = int(
+            config.get("cleaning_memory_budget_mb", DEFAULT_MEMORY_BUDGET_MB)
+        )
+        return cls(
+            config,
+            build_cleaning_jobs(config, stages),
+            runner,
+            resolve_worker_count(config, "cleaning_workers"),
+            memory_budget_mb * 1024 * 1024,
+        )
+
+    def run(self) -> None:
+        """Run all jobs.
+
+        Raises:
+            RuntimeError: If any job failed.
+        """
+        self.states = {job.name: JOB_PENDING for job in self.jobs}
+        self.errors = {}
+        # Stage selection (e.g. `--from-stage`) depends on the stage order, so it is
+        # resolved up front rather than in the order the jobs become ready
+        self._selected = {
+            job.name: self.runner.is_selected(job.stage)
+            for job in self.jobs
+            if self.runner is not None and job.stage is not None
+        }
+        with PROFILER.measure("clean"):
+            if self.workers == 1 or len(self.jobs) <= 1:
+                self._run_sequential()
+            else:
+                self._run_concurrent()
+
+        skipped = [name for name, state in self.states.items() if state == JOB_SKIPPED]
+        if skipped:
+            logger.warning(f"Skipped cleaning after failed dependencies: {skipped}")
+        if self.errors:
+            failed = "; ".join(f"{name}: {e}" for name, e in self.errors.items())
+            raise RuntimeError(f"Cleaning failed for entities: {failed}")
+        logger.info("Cleaning process completed for all entities.")
+
+    def _run_sequential(self) -> None:
+        """Run the jobs one after another in the current process."""
+        for job in self.jobs:
+            stage_run = self._start(job)
+            if self.states[job.name] == JOB_RUNNING:
+                self._finish(job, stage_run, _run_cleaning_job(job.entity, self.config))
+
+    def _run_concurrent(self) -> None:
+        """Run independent jobs concurrently in a process pool.
+
+        Raises:
+            RuntimeError: If no job can be started while jobs are still pending.
+        """
+        running: Dict[Future, Tuple[CleaningJob, Optional[StageRun]]] = {}
+        reserved = 0
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            while JOB_PENDING in self.states.values() or running:
+                job = self._next_job(len(running), reserved)
+                if job is not None:
+                    stage_run = self._start(job)
+                    if self.states[job.name] == JOB_RUNNING:
+                        future = executor.submit(
+                            _run_cleaning_job, job.entity, self.config
+                        )
+                        running[future] = (job, stage_run)
+                        reserved += job.memory_estimate
+                    continue
+                if not running:
+                    raise RuntimeError("No cleaning job can be started")
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job, stage_run = running.pop(future)
+                    reserved -= job.memory_estimate
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        result = ([], f"{type(e).__name__}: {e}", [])
+                    self._finish(job, stage_run, result)
+
+    def _next_job(self, running_count: int, reserved: int) -> Optional[CleaningJob]:
+        """Pick the next job to start, if one is ready and fits the limits.
+
+        Jobs that other jobs wait for come first, then the largest ones.
+
+        Args:
+            running_count (int): Number of running jobs.
+            reserved (int): Estimated memory of the running jobs.
+
+        Returns:
+            Optional[CleaningJob]: The job to start, or None to wait for a job.
+        """
+        if running_count >= self.workers:
+            return None
+        ready = [
+            job
+            for job in self.jobs
+            if self.states[job.name] == JOB_PENDING
+            and all(self.states[name] in FINISHED_STATES for name in job.depends_on)
+        ]
+        ready.sort(
+            key=lambda job: (bool(self._dependents[job.name]), job.memory_estimate),
+            reverse=True,
+        )
+        for job in ready:
+            if (
+                running_count == 0
+                or reserved + job.memory_estimate <= self.memory_budget
+            ):
+                return job
+        return None
+
+    def _start(self, job: CleaningJob) -> Optional[StageRun]:
+        """Mark a ready job as running, skipped or up to date.
+
+        Args:
+            job (CleaningJob): A job whose dependencies have finished.
+
+        Returns:
+            Optional[StageRun]: The checkpoint state of the job's stage, if any.
+        """
+        failed = [name for name in job.depends_on if self.states[name] != JOB_COMPLETED]
+        if failed:
+            logger.error(f"Skipping cleaning of {job.name}: {failed} did not complete")
+            self.states[job.name] = JOB_SKIPPED
+            return None
+        if self.runner is not None and job.stage is not None:
+            if not self.runner.needs_run(job.stage, self._selected[job.name]):
+                self.states[job.name] = JOB_COMPLETED
+                return None
+            self.states[job.name] = JOB_RUNNING
+            return self.runner.start([job.stage])
+        self.states[job.name] = JOB_RUNNING
+        return None
+
+    def _finish(
+        self,
+        job: CleaningJob,
+        stage_run: Optional[StageRun],
+        result: JobResult,
+    ) -> None:
+        """Record the result of a job that has run.
+
+        Args:
+            job (CleaningJob): The job.
+            stage_run (Optional[StageRun]): The checkpoint state of the job's stage.
+            result (JobResult): The result of the job.
+        """
+        written_files, error, profiles = result
+        PROFILER.merge(profiles)
+        if error is None:
+            self.states[job.name] = JOB_COMPLETED
+        else:
+            logger.error(f"Cleaning of {job.name} failed: {error}")
+            self.states[job.name] = JOB_FAILED
+            self.errors[job.name] = error
+        if self.runner is not None and stage_run is not None:
+            self.runner.finish(
+                stage_run,
+                error is None,
+                {job.stage.name: [Path(p) for p in written_files]},
+            )
@@ -1,27 +1,33 @@
 """File Download, Extraction, and JSON Streaming.
 
 This module provides utilities for:
-- Downloading files with retry logic.
+- Downloading files with retry logic, resume, and integrity verification.
 - Safely extracting ZIP and TAR files.
-- Streaming JSON files in a memory-efficient manner.
+- Streaming JSON records in a memory-efficient manner, directly from a ZIP archive
+  or from an extracted JSON file.
 
 Key Features:
 - Prevents unsafe extractions outside the destination directory.
-- Handles retries and chunked downloading for large files.
+- Handles retries, resumable ranged downloading, and conditional requests for large files.
 - Integrates with a configuration system for paths and settings.
 """
 
 import gc
 import logging
 import tarfile
-import time
 import zipfile
+from itertools import islice
 from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
-import requests
-
+import ijson
 from etl.config.config_loader import CONFIG
-from etl.utils.file_system_utils import clear_directory, ensure_directory_exists
+from etl.utils.file_system_utils import (
+    clear_directory,
+    ensure_directory_exists,
+    is_empty_directory,
+)
+from etl.utils.resumable_download import ResumableDownloader
 
 logger = logging.getLogger(__name__)
 
@@ -29,8 +35,12 @@ logger = logging.getLogger(__name__)
 DEFAULT_DOWNLOAD_CHUNK_SIZE = CONFIG.get(
     "download_chunk_size", 1024 * 1024
 )  # Default to 1 MB if not set
+DEFAULT_DOWNLOAD_CONNECTIONS = CONFIG.get(
+    "download_connections", 4
+)  # Parallel ranged connections for large downloads
 DEFAULT_TIMEOUT = 30  # Timeout for HTTP requests in seconds
 SUPPORTED_ARCHIVES = {".zip", ".tar.gz", ".tgz"}  # Supported file formats
+JSON_RECORDS_PREFIX = "item"  # ijson prefix of the records in the top-level array
 
 
 def ensure_safe_extraction(destination_dir: Path, member_name: str) -> bool:
@@ -54,8 +64,13 @@ def download_file(
     retries: int = 3,
     delay: int = 5,
     timeout: int = DEFAULT_TIMEOUT,
-) -> None:
-    """Download a file with retry logic.
+    connections: int = DEFAULT_DOWNLOAD_CONNECTIONS,
+    expected_sha256: Optional[str] = None,
+) -> bool:
+    """Download a file with retry logic, resuming partial downloads.
+
+    The request is conditional on the ETag / Last-Modified of the previous download,
+    so an unchanged remote file is not downloaded again.
 
     Args:
         url (str): URL of the file to download.
@@ -64,33 +79,24 @@ def download_file(
         retries (int): Number of retry attempts. Defaults to 3.
         delay (int): Delay between retries in seconds. Defaults to 5.
         timeout (int): Timeout for HTTP requests in seconds. Defaults to DEFAULT_TIMEOUT.
+        connections (int): Maximum parallel ranged connections. Defaults to
+            DEFAULT_DOWNLOAD_CONNECTIONS.
+        expected_sha256 (Optional[str]): Expected SHA-256 checksum, if known.
+
+    Returns:
+        bool: True if the file was downloaded, False if the local copy is up to date.
 
     Raises:
-        RuntimeError: If the download fails after all retries.
+        RuntimeError: If the download fails after all retries or verification fails.
     """
-    destination_path.parent.mkdir(parents=True, exist_ok=True)
-
-    for attempt in range(retries):
-        try:
-            logger.info(
-                f"Downloading file from {url} (Attempt {attempt + 1}/{retries})"
-            )
-            response = requests.get(url, stream=True, timeout=timeout)
-            response.raise_for_status()
-
-            with destination_path.open("wb") as file:
-                for chunk in response.iter_content(chunk_size=chunk_size):
-                    file.write(chunk)
-
-            logger.info(f"File downloaded successfully to {destination_path}")
-            return
-        except requests.RequestException as e:
-            logger.warning(f"Download failed (Attempt {attempt + 1}/{retries}): {e}")
-            if attempt < retries - 1:
-                time.sleep(delay)
-            else:
-                logger.error(f"Failed to download file after {retries} attempts: {e}")
-                raise RuntimeError(f"Download failed for {url}") from e
+    downloader = ResumableDownloader(
+        chunk_size=chunk_size,
+        connections=connections,
+        retries=retries,
+        delay=delay,
+        timeout=timeout,
+    )
+    return downloader.download(url, destination_path, expected_sha256=expected_sha256)
 
 
 def extract_zip(file_path: Path, extracted_dir: Path) -> None:
@@ -170,6 +176,8 @@ def download_and_extract_files(
     raw_file_path: Path,
     extracted_dir: Path,
     chunk_size: int = DEFAULT_DOWNLOAD_CHUNK_SIZE,
+    connections: int = DEFAULT_DOWNLOAD_CONNECTIONS,
+    expected_sha256: Optional[str] = None,
 ) -> None:
     """Download a file from a URL and extract it to a specified directory.
 
@@ -178,15 +186,108 @@ def download_and_extract_files(
         raw_file_path (Path): Path to save the downloaded file.
         extracted_dir (Path): Directory to extract files.
         chunk_size (int): Size of chunks for streaming. Defaults to DEFAULT_DOWNLOAD_CHUNK_SIZE.
+        connections (int): Maximum parallel ranged connections. Defaults to
+            DEFAULT_DOWNLOAD_CONNECTIONS.
+        expected_sha256 (Optional[str]): Expected SHA-256 checksum, if known.
 
     Raises:
         RuntimeError: If download or extraction fails.
     """
     try:
-        download_file(url, raw_file_path, chunk_size=chunk_size)
+        downloaded = download_file(
+            url,
+            raw_file_path,
+            chunk_size=chunk_size,
+            connections=connections,
+            expected_sha256=expected_sha256,
+        )
+        if not downloaded and not is_empty_directory(extracted_dir):
+            logger.info(
+                f"Archive unchanged, keeping extracted files in {extracted_dir}"
+            )
+            return
         extract_file(raw_file_path, extracted_dir)
     except Exception as e:
         logger.error(f"Failed to download and extract files: {e}")
         raise RuntimeError(f"Failed to download and extract files from {url}") from e
     finally:
         gc.collect()  # Perform garbage collection after download and extraction
+
+
+def find_json_member(zip_path: Path) -> str:
+    """Find the first JSON member of a ZIP archive.
+
+    Args:
+        zip_path (Path): Path to the ZIP archive.
+
+    Returns:
+        str: Name of the first JSON member in the archive.
+
+    Raises:
+        FileNotFoundError: If the archive contains no JSON members.
+    """
+    with zipfile.ZipFile(zip_path, "r") as zip_ref:
+        for member in zip_ref.namelist():
+            if member.endswith(".json") and not member.endswith("/"):
+                return member
+    raise FileNotFoundError(f"No JSON files found in archive: {zip_path}")
+
+
+def iter_json_records(
+    source_path: Path, member: Optional[str] = None
+) -> Iterator[Dict[str, Any]]:
+    """Stream records from a JSON array, reading ZIP members without extracting them.
+
+    Records are parsed incrementally, so only the record currently being parsed
+    is held in memory regardless of the size of the input.
+
+    Args:
+        source_path (Path): Path to a ZIP archive or a JSON file.
+        member (Optional[str]): Name of the JSON member inside the ZIP archive.
+            Defaults to the first JSON member.
+
+    Yields:
+        Dict[str, Any]: The parsed records.
+
+    Raises:
+        RuntimeError: If the archive is invalid or the JSON cannot be parsed.
+    """
+    try:
+        if source_path.suffix == ".zip":
+            member = member or find_json_member(source_path)
+            logger.info(f"Streaming records from {source_path}:{member}")
+            with zipfile.ZipFile(source_path, "r") as zip_ref:
+                with zip_ref.open(member, "r") as json_file:
+                    yield from ijson.items(
+                        json_file, JSON_RECORDS_PREFIX, use_float=True
+                    )
+        else:
+            logger.info(f"Streaming records from {source_path}")
+            with source_path.open("rb") as json_file:
+                yield from ijson.items(json_file, JSON_RECORDS_PREFIX, use_float=True)
+    except (zipfile.BadZipFile, ijson.JSONError) as e:
+        logger.error(f"Error streaming records from {source_path}: {e}")
+        raise RuntimeError(f"Streaming failed for {source_path}") from e
+
+
+def iter_record_batches(
+    records: Iterable[Dict[str, Any]], batch_size: int
+) -> Iterator[List[Dict[str, Any]]]:
+    """Group streamed records into batches.
+
+    Args:
+        records (Iterable[Dict[str, Any]]): The streamed records.
+        batch_size (int): Maximum number of records per batch.
+
+    Yields:
+        List[Dict[str, Any]]: Batches of at most `batch_size` records.
+
+    Raises:
+        ValueError: If the batch size is not positive.
+    """
+    if batch_size <= 0:
+        raise ValueError(f"Batch size must be positive, got {batch_size}")
+
+    iterator = iter(records)
+    while batch := list(islice(iterator, batch_size)):
+        yield batch
@@ -1,88 +1,168 @@
 """This script processes JSON files for various entities, extracts relevant data using specified extractors, and saves the extracted data to CSV files. Each entity's data is saved to a separate CSV file.
 
+Raw records can be passed either as a DataFrame or as plain dict records straight from
+the JSON parser. Extracted rows are collected in column buffers and a DataFrame is only
+built when the data is written.
+
 Functions:
-    get_extractor_instance: Dynamically resolve and instantiate the extractor class for a given entity.
-    save_to_csv: Save a DataFrame to a CSV file, appending if the file already exists.
+    get_extracted_dir: Return the directory where extracted entity files are written.
+    get_extracted_table: Return the path of an entity's extracted table.
+    get_extractor_instance: Resolve the shared extractor instance for a given entity from the registry.
+    as_records: Return raw records as a sequence of plain dicts.
     process_and_save_entity: Process and save data for a specific entity with optimized performance.
+    extract_entities_fused: Extract all entities in a single pass over the raw records.
+    extract_rows_profiled: Run the fused extraction loop, timing every extractor.
+    process_and_save_entities_fused: Process and save all entities using fused extraction.
     process_entities: Process and save data for all entities with consistent naming.
 """
 
 import gc
 import logging
+import time
 from collections import defaultdict
 from pathlib import Path
-from typing import Any, DefaultDict, Dict
+from typing import (
+    Any,
+    Callable,
+    DefaultDict,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 import pandas as pd
 
 from etl.config.config_loader import CONFIG
-from etl.utils.dynamic_imports import import_function
-from etl.utils.file_io import save_to_csv
-from etl.utils.file_system_utils import ensure_directory_exists
+from etl.pipeline.extract.column_buffer import ColumnBuffer
+from etl.pipeline.extract.extractor_registry import EXTRACTOR_REGISTRY
+from etl.utils.columnar_io import (
+    STORAGE_FORMAT_CSV,
+    get_column_types,
+    with_storage_suffix,
+)
+from etl.utils.run_profiler import BYTES_PER_MB, PROFILER, count_rows, get_rss_bytes
+from etl.utils.table_writer import EntityWriters
 
 logger = logging.getLogger(__name__)
 
 # Type annotation for entity_index_tracker
 entity_index_tracker: DefaultDict[str, int] = defaultdict(int)
 
+# Supported extraction modes (configured via `extraction_mode` in etl.yml)
+EXTRACTION_MODE_FUSED = "fused"
+EXTRACTION_MODE_PER_ENTITY = "per_entity"
+
+# Raw records as a DataFrame or as plain dicts from the JSON parser
+DataRecords = Union[pd.DataFrame, Sequence[Dict[str, Any]]]
+
+
+def get_extracted_dir(config: Dict[str, Any]) -> Path:
+    """Return the directory where extracted entity files are written.
+
+    Args:
+        config (Dict[str, Any]): Configuration dictionary.
+
+    Returns:
+        Path: The `extracted` directory inside the processed data directory.
+    """
+    return Path(config["directory_structure"]["processed_dir"]) / "extracted"
+
+
+def get_extracted_table(config: Dict[str, Any], entity_name: str) -> Path:
+    """Return the path of an entity's extracted table.
+
+    Args:
+        config (Dict[str, Any]): Configuration dictionary.
+        entity_name (str): Name of the entity.
+
+    Returns:
+        Path: The extracted CSV file or Parquet table of the entity.
+    """
+    return with_storage_suffix(
+        get_extracted_dir(config) / f"{entity_name}.csv",
+        config.get("storage_format", STORAGE_FORMAT_CSV),
+    )
+
+
+def as_records(data_records: DataRecords) -> Sequence[Dict[str, Any]]:
+    """Return raw records as a sequence of plain dicts.
+
+    Args:
+        data_records (DataRecords): Raw records as a DataFrame or a sequence of dicts.
+
+    Returns:
+        Sequence[Dict[str, Any]]: The raw records as plain dicts.
+    """
+    if isinstance(data_records, pd.DataFrame):
+        return data_records.to_dict(orient="records")
+    return data_records
+
 
 def get_extractor_instance(entity: Dict[str, Any], lang: str) -> Any:
-    """Dynamically resolve and instantiate the extractor class for a given entity.
+    """Resolve the extractor for a given entity from the process-wide registry.
+
+    Extractors are created once per language and reused for every chunk.
 
     Args:
         entity (Dict[str, Any]): Entity configuration containing the extractor path.
         lang (str): The target language for processing.
 
     Returns:
-        Any: An instance of the resolved extractor class.
+        Any: The shared instance of the resolved extractor class.
 
     Raises:
         ValueError: If the extractor class cannot be resolved or instantiated.
     """
     try:
-        extractor_cls = import_function(entity["extractor"])
         mappings_file = CONFIG["config_files"]["mappings_file"]
-        return extractor_cls(mappings_file, lang)
+        return EXTRACTOR_REGISTRY.get_extractor(
+            entity["extractor"], mappings_file, lang
+        )
     except Exception as e:
         logger.error(f"Failed to resolve extractor for entity '{entity['name']}': {e}")
         raise ValueError(f"Error resolving extractor for entity '{entity['name']}'")
 
 
 def process_and_save_entity(
-    data_records: pd.DataFrame,
+    data_records: DataRecords,
     lang: str,
     entity: Dict[str, Any],
-    extract_data_path: str,
+    writers: EntityWriters,
 ) -> None:
     """Process and save data for a specific entity with optimized performance.
 
     Args:
-        data_records (pd.DataFrame): DataFrame containing data records to process.
+        data_records (DataRecords): Raw records to process.
         lang (str): The target language for processing.
         entity (Dict[str, Any]): Entity configuration containing the extractor path.
-        extract_data_path (str): Path to the directory where extracted data will be saved.
+        writers (EntityWriters): Buffered writers of the extracted entity tables.
 
     Raises:
         RuntimeError: If an error occurs during the processing of the entity.
     """
     entity_name = entity["name"]
-    subfolder_path = Path(extract_data_path)
-    ensure_directory_exists(subfolder_path)
 
     try:
         logger.info(f"Processing entity: {entity_name}")
         extractor = get_extractor_instance(entity, lang)
 
         # Extract data
-        extracted_data = extractor.extract(data_records)
+        records = as_records(data_records)
+        with PROFILER.measure("extract_entity", entity_name, len(records)) as step:
+            extracted_data = extractor.extract_records(records)
+            step.rows_out = count_rows(extracted_data)
 
-        if extracted_data.empty or not isinstance(extracted_data, pd.DataFrame):
+        if not isinstance(extracted_data, pd.DataFrame) or extracted_data.empty:
             logger.warning(f"No valid data extracted for entity '{entity_name}'.")
             return
 
-        # Save data to CSV
-        output_file = subfolder_path / f"{entity_name}.csv"
-        save_to_csv(extracted_data, str(output_file))
+        # Buffer data for the entity's CSV or Parquet table
+        writers.write(
+            entity_name, extracted_data, get_column_types([entity], entity_name)
+        )
 
         logger.info(f"Processing and saving completed for entity: {entity_name}")
         gc.collect()  # Perform garbage collection once per entity
@@ -91,24 +171,174 @@ def process_and_save_entity(
         raise RuntimeError(f"Error processing entity '{entity_name}': {e}")
 
 
-def process_entities(data_records: pd.DataFrame, config: Dict[str, Any]) -> None:
+def extract_entities_fused(
+    data_records: DataRecords, extractors: Dict[str, Any]
+) -> Dict[str, ColumnBuffer]:
+    """Extract all entities in a single pass over the raw records.
+
+    Each raw company record is visited once and handed to the `process_row`
+    handler of every extractor. The rows produced by each extractor are
+    collected in a column buffer of its own, so the output is identical to
+    running the extractors one after another.
+
+    Args:
+        data_records (DataRecords): Raw records to process.
+        extractors (Dict[str, Any]): Extractor instances keyed by entity name.
+
+    Returns:
+        Dict[str, ColumnBuffer]: Extracted data keyed by entity name.
+    """
+    buffers = {name: ColumnBuffer() for name in extractors}
+    handlers: List[Tuple[ColumnBuffer, Callable[..., Any]]] = [
+        (buffers[name], extractor.process_row) for name, extractor in extractors.items()
+    ]
+
+    records = as_records(data_records)
+    logger.info(f"Starting fused extraction. Input rows: {len(records)}")
+    if PROFILER.enabled:
+        extract_rows_profiled(records, extractors, buffers)
+        return buffers
+
+    for record in records:
+        for buffer, process_row in handlers:
+            processed_rows = process_row(record)
+            if isinstance(processed_rows, list):
+                buffer.extend(processed_rows)
+
+    return buffers
+
+
+def extract_rows_profiled(
+    records: Sequence[Dict[str, Any]],
+    extractors: Dict[str, Any],
+    buffers: Dict[str, ColumnBuffer],
+) -> None:
+    """Run the fused extraction loop, timing every extractor separately.
+
+    The loop is single-threaded and CPU bound, so the CPU time of each extractor
+    is recorded as its wall time rather than reading the process CPU clock for
+    every record.
+
+    Args:
+        records (Sequence[Dict[str, Any]]): Raw records to process.
+        extractors (Dict[str, Any]): Extractor instances keyed by entity name.
+        buffers (Dict[str, ColumnBuffer]): Output buffers keyed by entity name.
+    """
+    timings = dict.fromkeys(extractors, 0.0)
+    handlers = [
+        (name, buffers[name], extractor.process_row)
+        for name, extractor in extractors.items()
+    ]
+    perf_counter = time.perf_counter
+    for record in records:
+        for name, buffer, process_row in handlers:
+            start_time = perf_counter()
+            processed_rows = process_row(record)
+            if isinstance(processed_rows, list):
+                buffer.extend(processed_rows)
+            timings[name] += perf_counter() - start_time
+
+    peak_rss_mb = get_rss_bytes() / BYTES_PER_MB
+    for name, elapsed in timings.items():
+        PROFILER.add_profile(
+            "extract_entity",
+            name,
+            calls=1,
+            wall_time=elapsed,
+            cpu_time=elapsed,
+            peak_rss_mb=peak_rss_mb,
+            rows_in=len(records),
+            rows_out=len(buffers[name]),
+        )
+
+
+def process_and_save_entities_fused(
+    data_records: DataRecords,
+    lang: str,
+    entities: List[Dict[str, Any]],
+    writers: EntityWriters,
+) -> None:
+    """Process and save data for all entities using a single pass over the records.
+
+    Args:
+        data_records (DataRecords): Raw records to process.
+        lang (str): The target language for processing.
+        entities (List[Dict[str, Any]]): Entity configurations containing the extractor paths.
+        writers (EntityWriters): Buffered writers of the extracted entity tables.
+
+    Raises:
+        RuntimeError: If an error occurs during the processing of the entities.
+    """
+    extractors = {
+        entity["name"]: get_extractor_instance(entity, lang) for entity in entities
+    }
+
+    try:
+        extracted = extract_entities_fused(data_records, extractors)
+    except Exception as e:
+        logger.error(f"Error during fused extraction: {e}")
+        raise RuntimeError(f"Error during fused extraction: {e}")
+
+    for entity in entities:
+        entity_name = entity["name"]
+        buffer = extracted[entity_name]
+        if not len(buffer):
+            logger.warning(f"No valid data extracted for entity '{entity_name}'.")
+            continue
+
+        writers.write(
+            entity_name, buffer.to_frame(), get_column_types([entity], entity_name)
+        )
+        buffer.clear()
+        logger.info(f"Processing and saving completed for entity: {entity_name}")
+
+    gc.collect()
+
+
+def process_entities(
+    data_records: DataRecords,
+    config: Dict[str, Any],
+    extract_data_path: Optional[Path] = None,
+    writers: Optional[EntityWriters] = None,
+) -> None:
     """Process and save data for all entities with consistent naming.
 
+    Callers processing many chunks should pass long-lived `writers` and close them
+    at the end of the stage; otherwise writers are created and closed per call.
+
     Args:
-        data_records (pd.DataFrame): DataFrame containing data records to process.
+        data_records (DataRecords): Raw records to process, either as a DataFrame or
+            as plain dict records from the JSON parser.
         config (Dict[str, Any]): Configuration dictionary containing entity and directory information.
+        extract_data_path (Optional[Path]): Directory for the extracted entity files.
+            Defaults to `extracted` inside the processed data directory. Ignored
+            if `writers` is given.
+        writers (Optional[EntityWriters]): Buffered writers of the extracted tables.
     """
-    extract_data_path = (
-        Path(config["directory_structure"]["processed_dir"]) / "extracted"
-    )
-    extract_data_path.mkdir(parents=True, exist_ok=True)
+    if writers is None:
+        if extract_data_path is None:
+            extract_data_path = get_extracted_dir(config)
+        with EntityWriters.from_config(config, extract_data_path) as stage_writers:
+            process_entities(data_records, config, writers=stage_writers)
+        return
 
-    for entity in config["entities"]:
-        process_and_save_entity(
+    extraction_mode = config.get("extraction_mode", EXTRACTION_MODE_FUSED)
+    if extraction_mode == EXTRACTION_MODE_FUSED:
+        process_and_save_entities_fused(
             data_records,
             config["chosen_language"],
-            entity,
-            str(extract_data_path),
+            config["entities"],
+            writers,
         )
+    elif extraction_mode == EXTRACTION_MODE_PER_ENTITY:
+        for entity in config["entities"]:
+            process_and_save_entity(
+                data_records,
+                config["chosen_language"],
+                entity,
+                writers,
+            )
+    else:
+        raise ValueError(f"Unsupported extraction mode: {extraction_mode}")
 
     logger.info("Entity processing completed.")
@@ -4,35 +4,81 @@ This script orchestrates the ETL pipeline, including:
 1. Environment setup.
 2. Downloading and extracting raw data.
 3. Downloading required mappings.
-4. Splitting JSON files into chunks.
+4. Splitting JSON files into chunks, or streaming records straight from the archive.
 5. Processing entities based on extracted data.
 
 Key Features:
 - Modular and reusable pipeline steps.
 - Robust error handling and logging.
+- Stage checkpoints: re-runs skip stages whose recorded outputs are still valid.
+- Stage selection from the command line (`--stages`, `--from-stage`, `--force`).
+- JSON run report with the timing, memory and row counts of every step.
 """
 
+import argparse
 import gc
 import json
 import time
+from datetime import datetime, timezone
+from itertools import chain
 from pathlib import Path
-from typing import Any, Dict, List, Union
+from typing import Any, Dict, Iterable, List, Optional, Union
 
 import ijson
 import pandas as pd
 from etl.config.config_loader import load_all_configs
 from etl.config.logging.logging_config import configure_logging, get_logger
-from etl.pipeline.data_fetcher import download_and_extract_files
-from etl.pipeline.entity_processing import process_entities
-from etl.pipeline.transform.start_cleaning_process import start_cleaning_process
+from etl.pipeline.data_fetcher import (
+    download_and_extract_files,
+    download_file,
+    iter_json_records,
+)
+from etl.pipeline.batch_sizing import AdaptiveBatchSizer
+from etl.pipeline.cleaning_scheduler import (
+    CleaningScheduler,
+    get_cleaning_inputs,
+    get_staging_dir,
+)
+from etl.pipeline.entity_processing import (
+    get_extracted_dir,
+    get_extracted_table,
+    process_entities,
+)
+from etl.pipeline.extract.extractor_registry import EXTRACTOR_REGISTRY
+from etl.pipeline.checkpoints import (
+    MANIFEST_FILE_NAME,
+    PipelineStage,
+    StageManifest,
+    StageRunner,
+)
+from etl.pipeline.incremental import (
+    IncrementalRun,
+    find_previous_snapshot,
+    get_cleaned_dir,
+)
+from etl.pipeline.parallel_extraction import (
+    extract_batches_parallel,
+    extract_chunk_files_parallel,
+    get_batches_in_flight,
+    resolve_worker_count,
+)
+from etl.utils.columnar_io import STORAGE_FORMAT_CSV
+from etl.utils.date_parsing import DATE_NORMALIZER
+from etl.utils.file_io import load_json_records
 from etl.utils.file_system_utils import setup_directories
 from etl.utils.network_utils import download_mapping_files, get_url
+from etl.utils.run_profiler import PROFILER, profile_step
+from etl.utils.table_writer import EntityWriters
 
 # Configure logging
 configure_logging()
 logger = get_logger()
 logger.info("Starting ETL pipeline")
 
+# Supported ingestion modes (configured via `ingestion_mode` in etl.yml)
+INGESTION_MODE_STREAM = "stream"
+INGESTION_MODE_CHUNK_FILES = "chunk_files"
+
 
 def setup_environment(config: Dict[str, Any]) -> None:
     """Set up the environment by ensuring necessary directories exist.
@@ -49,6 +95,7 @@ def setup_environment(config: Dict[str, Any]) -> None:
     logger.info("Environment setup completed.")
 
 
+@profile_step("download")
 def download_raw_data(config: Dict[str, Any]) -> Path:
     """Download and extract raw data files from a specified URL.
 
@@ -65,11 +112,46 @@ def download_raw_data(config: Dict[str, Any]) -> Path:
     )
     extracted_dir = Path(config["directory_structure"]["extracted_dir"])
     download_chunk_size = config.get("download_chunk_size", 1024 * 1024)
-    download_and_extract_files(url, raw_file_path, extracted_dir, download_chunk_size)
+    download_and_extract_files(
+        url,
+        raw_file_path,
+        extracted_dir,
+        download_chunk_size,
+        connections=config.get("download_connections", 4),
+        expected_sha256=config.get("download_sha256") or None,
+    )
     logger.info("Raw data downloaded and extracted.")
     return extracted_dir
 
 
+@profile_step("download")
+def download_raw_archive(config: Dict[str, Any]) -> Path:
+    """Download the raw data archive without extracting it.
+
+    Args:
+        config (Dict[str, Any]): Configuration dictionary containing URL and file paths.
+
+    Returns:
+        Path: Path to the downloaded archive.
+    """
+    url = get_url("all_companies", config["url_templates"])
+    raw_file_path = (
+        Path(config["directory_structure"]["raw_dir"])
+        / config["file_names"]["zip_file_name"]
+    )
+    download_chunk_size = config.get("download_chunk_size", 1024 * 1024)
+    download_file(
+        url,
+        raw_file_path,
+        chunk_size=download_chunk_size,
+        connections=config.get("download_connections", 4),
+        expected_sha256=config.get("download_sha256") or None,
+    )
+    logger.info("Raw data archive downloaded.")
+    return raw_file_path
+
+
+@profile_step("mappings")
 def download_mappings(config: Dict[str, Any]) -> None:
     """Download mapping files required for data processing.
 
@@ -113,17 +195,22 @@ def split_json_to_files(input_path: Path, output_dir: Path, chunk_size: int) ->
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
 
-    with input_path.open("r", encoding="utf-8") as infile:
+    with (
+        PROFILER.measure("split") as step,
+        input_path.open("r", encoding="utf-8") as infile,
+    ):
         chunk = []
         chunk_index = 0
         for record in ijson.items(infile, "item"):
             chunk.append(record)
             if len(chunk) >= chunk_size:
                 save_json_chunk(chunk, output_path, chunk_index)
+                step.add_rows_out(len(chunk))
                 chunk_index += 1
                 chunk = []
         if chunk:
             save_json_chunk(chunk, output_path, chunk_index)
+            step.add_rows_out(len(chunk))
 
 
 def get_first_json_file(extracted_dir: Path) -> Path:
@@ -153,109 +240,487 @@ def process_json_file(json_file: Path) -> pd.DataFrame:
     Returns:
         pd.DataFrame: DataFrame containing JSON data.
     """
-    all_rows = []
-    try:
-        with json_file.open("r", encoding="utf-8") as file:
-
-            data = json.load(file)
-            if isinstance(data, list):
-                all_rows.extend(data)
-            else:
-                logger.warning(
-                    f"Unexpected JSON format in {json_file}. Expected a list."
-                )
-    except json.JSONDecodeError:
-        logger.info(f"Falling back to line-by-line parsing for {json_file}.")
-
-        with json_file.open("r", encoding="utf-8") as file:
-            for line in file:
-                try:
-                    record = json.loads(line)
-                    if isinstance(record, dict):
-                        all_rows.append(record)
-                except json.JSONDecodeError as e:
-                    logger.error(f"Skipping invalid JSON line: {e}")
-
-    if not all_rows:
-        logger.warning(f"No valid data found in {json_file}")
-        return pd.DataFrame()
-
-    return pd.DataFrame(all_rows)
-
-
-def process_and_clean_entities(config: Dict[str, Any]) -> None:
-    """Process and clean entities based on the configuration.
+    return pd.DataFrame(load_json_records(json_file))
+
+
+def extract_record_batches(
+    records: Iterable[Dict[str, Any]], config: Dict[str, Any]
+) -> None:
+    """Extract entities from batches of raw records, sequentially or in parallel.
+
+    Batches hold `chunk_size` records, or are sized to `chunk_memory_budget_mb`
+    at runtime if a budget is configured.
 
     Args:
+        records (Iterable[Dict[str, Any]]): Raw records in input order.
         config (Dict[str, Any]): Configuration dictionary.
     """
+    workers = resolve_worker_count(config)
+    if workers > 1:
+        sizer = AdaptiveBatchSizer.from_config(config, get_batches_in_flight(workers))
+        extract_batches_parallel(sizer.iter_batches(records), config, sizer)
+        sizer.log_stats()
+        return
+
+    sizer = AdaptiveBatchSizer.from_config(config)
+    total_records = 0
+    with EntityWriters.from_config(config, get_extracted_dir(config)) as writers:
+        for batch_index, batch in enumerate(sizer.iter_batches(records)):
+            frame_bytes = writers.frame_bytes
+            process_entities(batch, config, writers=writers)
+            sizer.record_output(len(batch), writers.frame_bytes - frame_bytes)
+            total_records += len(batch)
+            logger.info(
+                f"Processed batch {batch_index} ({total_records} records streamed so far)"
+            )
+    sizer.log_stats()
+
+
+@profile_step("extract")
+def extract_entities_from_chunks(
+    config: Dict[str, Any], incremental: Optional[IncrementalRun] = None
+) -> None:
+    """Extract entities from the chunk files written by `split_json_to_files`.
+
+    Args:
+        config (Dict[str, Any]): Configuration dictionary.
+        incremental (Optional[IncrementalRun]): Incremental run filtering the records.
+    """
     split_dir = Path(config["directory_structure"]["processed_dir"]) / "chunks"
-    processed_dir = Path(config["directory_structure"]["processed_dir"]) / "extracted"
-    cleaned_dir = (
-        Path(config["directory_structure"]["processed_dir"])
-        / "cleaned"
-        / config["snapshot_date"]
-        / config["language"]
+    json_files = sorted(split_dir.glob("chunk_*.json"))
+    if incremental is not None:
+        # Only new and changed records are re-batched and extracted
+        records = incremental.filter_records(
+            chain.from_iterable(load_json_records(f) for f in json_files)
+        )
+        extract_record_batches(records, config)
+        return
+
+    if resolve_worker_count(config) > 1:
+        extract_chunk_files_parallel(json_files, config)
+        return
+
+    with EntityWriters.from_config(config, get_extracted_dir(config)) as writers:
+        for json_file in json_files:
+            data_records = load_json_records(json_file)
+            process_entities(data_records, config, writers=writers)
+
+
+@profile_step("extract")
+def extract_entities_from_archive(
+    archive_path: Path,
+    config: Dict[str, Any],
+    incremental: Optional[IncrementalRun] = None,
+) -> None:
+    """Extract entities from records streamed directly out of the raw archive.
+
+    No intermediate chunk files are written; records are parsed incrementally and
+    handed to the extractors in batches (see `extract_record_batches`).
+
+    Args:
+        archive_path (Path): Path to the ZIP archive or JSON file to stream.
+        config (Dict[str, Any]): Configuration dictionary.
+        incremental (Optional[IncrementalRun]): Incremental run filtering the records.
+    """
+    records: Iterable[Dict[str, Any]] = iter_json_records(archive_path)
+    if incremental is not None:
+        records = incremental.filter_records(records)
+    extract_record_batches(records, config)
+
+
+def clean_entities(config: Dict[str, Any]) -> None:
+    """Clean the extracted data of every configured entity.
+
+    Independent entities are cleaned concurrently (`cleaning_workers`), entities
+    with `depends_on` after their dependencies.
+
+    Args:
+        config (Dict[str, Any]): Configuration dictionary.
+    """
+    CleaningScheduler.from_config(config).run()
+
+
+def process_and_clean_entities(
+    config: Dict[str, Any], archive_path: Optional[Path] = None
+) -> None:
+    """Process and clean entities based on the configuration.
+
+    With `incremental` enabled, only new and changed companies are extracted and
+    cleaned; the rows of unchanged companies are carried over from the previous
+    snapshot's cleaned outputs.
+
+    Args:
+        config (Dict[str, Any]): Configuration dictionary.
+        archive_path (Optional[Path]): Archive or JSON file to stream records from.
+            If not given, records are read from the chunk files.
+    """
+    incremental = None
+    if config.get("incremental"):
+        incremental = IncrementalRun.from_config(config)
+        incremental.reset_outputs()
+    if archive_path is not None:
+        extract_entities_from_archive(archive_path, config, incremental)
+    else:
+        extract_entities_from_chunks(config, incremental)
+    DATE_NORMALIZER.log_stats()
+    EXTRACTOR_REGISTRY.log_stats()
+
+    clean_entities(config)
+    if incremental is not None:
+        incremental.carry_over_cleaned_outputs()
+        incremental.commit()
+
+
+def build_pipeline_stages(config: Dict[str, Any]) -> Dict[str, List[PipelineStage]]:
+    """Define the checkpointed stages of the pipeline with their inputs and outputs.
+
+    Args:
+        config (Dict[str, Any]): Configuration dictionary.
+
+    Returns:
+        Dict[str, List[PipelineStage]]: Stages keyed by stage group, in run order.
+
+    Raises:
+        ValueError: If the ingestion mode is not supported.
+    """
+    ingestion_mode = config.get("ingestion_mode", INGESTION_MODE_STREAM)
+    if ingestion_mode not in (INGESTION_MODE_STREAM, INGESTION_MODE_CHUNK_FILES):
+        raise ValueError(f"Unsupported ingestion mode: {ingestion_mode}")
+
+    directories = config["directory_structure"]
+    raw_file_path = Path(directories["raw_dir"]) / config["file_names"]["zip_file_name"]
+    extracted_dir = Path(directories["extracted_dir"])
+    chunks_dir = Path(directories["processed_dir"]) / "chunks"
+    mappings_path = Path(directories["raw_dir"]) / "mappings"
+    resources_dir = Path(directories["resources_dir"])
+    storage_format = config.get("storage_format", STORAGE_FORMAT_CSV)
+    snapshot = {
+        "snapshot_date": config["snapshot_date"],
+        "language": config["language"],
+        "storage_format": storage_format,
+    }
+    incremental = bool(config.get("incremental"))
+    if incremental:
+        snapshot["previous_snapshot_date"] = find_previous_snapshot(config)
+
+    stages: Dict[str, List[PipelineStage]] = {}
+    stream = ingestion_mode == INGESTION_MODE_STREAM
+    stages["download"] = [
+        PipelineStage(
+            "download",
+            outputs=[raw_file_path] if stream else [raw_file_path, extracted_dir],
+            params={
+                "url": get_url("all_companies", config["url_templates"]),
+                "ingestion_mode": ingestion_mode,
+                "snapshot_date": config["snapshot_date"],
+            },
+            reset_outputs=False,
+        )
+    ]
+    stages["mappings"] = [
+        PipelineStage(
+            "mappings",
+            outputs=[mappings_path],
+            params={
+                "url_templates": config["url_templates"],
+                "codes": config["codes"],
+                "languages": config["languages"],
+                "snapshot_date": config["snapshot_date"],
+            },
+            reset_outputs=False,
+        )
+    ]
+    if not stream:
+        stages["split"] = [
+            PipelineStage(
+                "split",
+                inputs=[extracted_dir],
+                outputs=[chunks_dir],
+                params={"chunk_size": config["chunk_size"]},
+            )
+        ]
+
+    source = raw_file_path if stream else chunks_dir
+    stages["extract"] = [
+        PipelineStage(
+            f"extract:{entity['name']}",
+            inputs=[source, mappings_path],
+            outputs=[get_extracted_table(config, entity["name"])],
+            params={
+                **snapshot,
+                "entity": entity,
+                "chosen_language": config["chosen_language"],
+                "extraction_mode": config.get("extraction_mode"),
+                "incremental": incremental,
+            },
+        )
+        for entity in config["entities"]
+    ]
+
+    if incremental:
+        # Carry-over appends to the cleaned outputs of all entities, so cleaning
+        # and carry-over are checkpointed together
+        stages["clean"] = [
+            PipelineStage(
+                "clean",
+                inputs=[stage.outputs[0] for stage in stages["extract"]]
+                + [resources_dir],
+                output_dirs=[
+                    get_cleaned_dir(config, config["snapshot_date"]),
+                    get_staging_dir(config),
+                ],
+                params=snapshot,
+            )
+        ]
+        return stages
+
+    # Cleaning jobs report the files they write, as they may run concurrently
+    stages["clean"] = [
+        PipelineStage(
+            f"clean:{entity['name']}",
+            inputs=get_cleaning_inputs(config, entity),
+            params={**snapshot, "entity": entity},
+        )
+        for entity in config["entities"]
+    ]
+    return stages
+
+
+def run_extraction_stages(
+    config: Dict[str, Any],
+    runner: StageRunner,
+    stages: List[PipelineStage],
+    source: Path,
+    incremental: Optional[IncrementalRun] = None,
+) -> None:
+    """Extract the entities whose extraction checkpoints are not valid in one pass.
+
+    Args:
+        config (Dict[str, Any]): Configuration dictionary.
+        runner (StageRunner): Runner deciding which stages to run.
+        stages (List[PipelineStage]): The `extract:<entity>` stages.
+        source (Path): Archive to stream records from, or the chunk directory.
+        incremental (Optional[IncrementalRun]): Incremental run filtering the records.
+    """
+
+    def extract(extract_stages: List[PipelineStage]) -> None:
+        if incremental is not None:
+            incremental.reset_outputs()
+        entity_names = {stage.name.split(":", 1)[1] for stage in extract_stages}
+        stage_config = {
+            **config,
+            "entities": [e for e in config["entities"] if e["name"] in entity_names],
+        }
+        if source.is_dir():
+            extract_entities_from_chunks(stage_config, incremental)
+        else:
+            extract_entities_from_archive(source, stage_config, incremental)
+        DATE_NORMALIZER.log_stats()
+        EXTRACTOR_REGISTRY.log_stats()
+
+    if incremental is None:
+        runner.run_group(stages, extract)
+    elif [stage for stage in stages if runner.needs_run(stage)]:
+        # Incremental extraction clears all extracted tables, so it is all or nothing
+        runner.run_stages(stages, extract)
+
+
+def run_cleaning_stages(
+    config: Dict[str, Any],
+    runner: StageRunner,
+    stages: List[PipelineStage],
+    incremental: Optional[IncrementalRun] = None,
+) -> None:
+    """Clean the entities whose cleaning checkpoints are not valid.
+
+    Args:
+        config (Dict[str, Any]): Configuration dictionary.
+        runner (StageRunner): Runner deciding which stages to run.
+        stages (List[PipelineStage]): The `clean:<entity>` stages, or the single
+            `clean` stage of an incremental run.
+        incremental (Optional[IncrementalRun]): Incremental run carrying over rows.
+    """
+    if incremental is None:
+        CleaningScheduler.from_config(config, runner, stages).run()
+        return
+
+    def clean_and_carry_over() -> None:
+        clean_entities(config)
+        incremental.carry_over_cleaned_outputs()
+        incremental.commit()
+
+    runner.run(stages[0], clean_and_carry_over)
+
+
+def run_pipeline_stages(config: Dict[str, Any], runner: StageRunner) -> None:
+    """Run the pipeline stages, skipping those whose checkpoints are still valid.
+
+    Args:
+        config (Dict[str, Any]): Configuration dictionary.
+        runner (StageRunner): Runner deciding which stages to run.
+    """
+    stages = build_pipeline_stages(config)
+    stream = "split" not in stages
+
+    # Download raw data (and extract it for chunk files) and the mappings
+    runner.run(
+        stages["download"][0],
+        lambda: download_raw_archive(config) if stream else download_raw_data(config),
     )
-    staging_dir = Path(config["directory_structure"]["processed_dir"]) / "staging"
-    resources_dir = Path(config["directory_structure"]["resources_dir"])
-    cleaned_dir.mkdir(parents=True, exist_ok=True)
-    staging_dir.mkdir(parents=True, exist_ok=True)
-    for json_file in sorted(split_dir.glob("chunk_*.json")):
-        data_records = process_json_file(json_file)
-        process_entities(data_records, config)
-
-    for entity in config["entities"]:
-        entity_name = entity["name"]
-        logger.info(f"Starting cleaning for entity: {entity_name}")
-
-        input_file = processed_dir / f"{entity_name}.csv"
-        if not input_file.exists():
-            logger.warning(f"Skipping {entity_name}: File not found: {input_file}")
-            continue
-
-        start_cleaning_process(
-            str(input_file),
-            str(cleaned_dir),
-            str(staging_dir),
-            entity_name,
-            str(resources_dir),
-            config,
+    runner.run(stages["mappings"][0], lambda: download_mappings(config))
+    if stream:
+        source = stages["download"][0].outputs[0]
+    else:
+        # Split JSON file into smaller chunks
+        split_stage = stages["split"][0]
+        source = split_stage.outputs[0]
+        runner.run(
+            split_stage,
+            lambda: split_json_to_files(
+                get_first_json_file(split_stage.inputs[0]),
+                source,
+                config["chunk_size"],
+            ),
         )
 
-    logger.info("Cleaning process completed for all entities.")
+    incremental = (
+        IncrementalRun.from_config(config) if config.get("incremental") else None
+    )
+    run_extraction_stages(config, runner, stages["extract"], source, incremental)
+    run_cleaning_stages(config, runner, stages["clean"], incremental)
+
 
+def run_etl_pipeline(
+    stages: Optional[List[str]] = None,
+    from_stage: Optional[str] = None,
+    force: bool = False,
+) -> None:
+    """Execute the ETL pipeline.
+
+    Stages whose checkpoints in the stage manifest are still valid are skipped, so
+    a re-run resumes from the first stage that failed or whose inputs changed.
 
-def run_etl_pipeline() -> None:
-    """Execute the ETL pipeline."""
+    Args:
+        stages (Optional[List[str]]): Stages or stage groups to run; all if None.
+        from_stage (Optional[str]): Run this stage and all later stages regardless
+            of their checkpoints, skipping the earlier ones.
+        force (bool): Run the selected stages regardless of their checkpoints.
+    """
     start_time = time.time()
+    started_at = datetime.now(timezone.utc)
     config = load_all_configs()
+    PROFILER.configure(config)
+    status, error = "failed", None
 
     try:
         # Setup environment
         setup_environment(config)
-        # Download raw data
-        extracted_dir = download_raw_data(config)
-        # Download mappings
-        download_mappings(config)
-        # Split JSON file into smaller chunks
-        input_json_file = get_first_json_file(extracted_dir)
-        split_json_to_files(
-            input_json_file,
-            Path(config["directory_structure"]["processed_dir"]) / "chunks",
-            config["chunk_size"],
+        runner = StageRunner(
+            StageManifest(get_manifest_path(config)),
+            stages,
+            from_stage,
+            force or not config.get("checkpoints", True),
         )
-        # Process and clean entities
-        process_and_clean_entities(config)
+        run_pipeline_stages(config, runner)
         # Explicitly invoke garbage collection
         gc.collect()
         elapsed_time = time.time() - start_time
         logger.info(f"ETL pipeline completed in {elapsed_time:.2f} seconds.")
+        status = "completed"
 
     except Exception as e:
         logger.error(f"ETL pipeline failed: {e}")
+        error = str(e)
         raise
+    finally:
+        if PROFILER.enabled:
+            PROFILER.log_stats()
+            PROFILER.write_report(
+                get_run_report_path(config, started_at),
+                config,
+                started_at,
+                status,
+                error,
+            )
+
+
+def get_run_report_path(config: Dict[str, Any], started_at: datetime) -> Path:
+    """Return the path of the JSON report of a run.
+
+    Args:
+        config (Dict[str, Any]): Configuration dictionary.
+        started_at (datetime): Start time of the run.
+
+    Returns:
+        Path: `reports/run_report_<start time>.json` in the processed data directory.
+    """
+    return (
+        Path(config["directory_structure"]["processed_dir"])
+        / "reports"
+        / f"run_report_{started_at:%Y%m%dT%H%M%S}.json"
+    )
+
+
+def get_manifest_path(config: Dict[str, Any]) -> Path:
+    """Return the path of the stage manifest.
+
+    Args:
+        config (Dict[str, Any]): Configuration dictionary.
+
+    Returns:
+        Path: The stage manifest inside the processed data directory.
+    """
+    return Path(config["directory_structure"]["processed_dir"]) / MANIFEST_FILE_NAME
+
+
+def list_stages() -> None:
+    """Print every pipeline stage and whether its checkpoint is valid."""
+    config = load_all_configs()
+    manifest = StageManifest(get_manifest_path(config))
+    for group in build_pipeline_stages(config).values():
+        for stage in group:
+            status = "valid" if manifest.is_valid(stage) else "pending"
+            print(f"{stage.name:32} {status}")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse the command line arguments of the pipeline.
+
+    Args:
+        argv (Optional[List[str]]): Arguments to parse; `sys.argv` if None.
+
+    Returns:
+        argparse.Namespace: The parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Run the ETL pipeline.")
+    parser.add_argument(
+        "--stages",
+        help="Comma-separated stages or groups to run, e.g. 'extract,clean:addresses'",
+    )
+    parser.add_argument(
+        "--from-stage",
+        help="Run this stage and all later stages regardless of their checkpoints",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Run the selected stages regardless of their checkpoints",
+    )
+    parser.add_argument(
+        "--list-stages",
+        action="store_true",
+        help="List the pipeline stages and whether their checkpoints are valid",
+    )
+    return parser.parse_args(argv)
 
 
 if __name__ == "__main__":
-    run_etl_pipeline()
+    args = parse_args()
+    if args.list_stages:
+        list_stages()
+    else:
+        run_etl_pipeline(
+            stages=args.stages.split(",") if args.stages else None,
+            from_stage=args.from_stage,
+            force=args.force,
+        )
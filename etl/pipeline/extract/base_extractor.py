@@ -1,22 +1,27 @@
 """Base Extractor Module.
 
 This module defines the BaseExtractor class, which serves as a base class for all entity-specific extractors.
-It provides common functionality for processing and extracting data from DataFrames, validating language codes,
-mapping values, and parsing dates. Subclasses must implement the `process_row` and `extract` methods.
+It provides common functionality for processing and extracting data from DataFrames or plain dict records,
+validating language codes, mapping values, and parsing dates. Subclasses must implement the `process_row`
+and `extract` methods.
 """
 
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
 import pandas as pd
-from dateutil.parser import ParserError, parse
 
-from etl.config.mappings.dynamic_loader import Mappings
+from etl.pipeline.extract.column_buffer import ColumnBuffer
+from etl.pipeline.extract.extractor_registry import EXTRACTOR_REGISTRY
+from etl.utils.date_parsing import DATE_NORMALIZER, DateNormalizer
 
 
 class BaseExtractor:
     """Base class for all entity-specific extractors."""
 
+    # Shared across extractors so the date memo cache is reused for every entity
+    date_normalizer: DateNormalizer = DATE_NORMALIZER
+
     def __init__(self, mappings_file: str, lang: str) -> None:
         """Initialize the BaseExtractor.
 
@@ -25,7 +30,7 @@ class BaseExtractor:
             lang (str): Target language abbreviation (e.g., "fi", "en", "sv").
         """
         self.logger = logging.getLogger("etl")
-        self.mappings = Mappings(mappings_file)
+        self.mappings = EXTRACTOR_REGISTRY.get_mappings(mappings_file)
         self.lang = lang
 
     def process_row(self, row: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -63,12 +68,34 @@ class BaseExtractor:
         Returns:
             pd.DataFrame: The processed DataFrame.
         """
-        results = []
-        for _, row in data.iterrows():
-            processed_rows = self.process_row(row.to_dict())
+        return self.extract_records(data.to_dict(orient="records"))
+
+    def extract_records(self, records: Iterable[Dict[str, Any]]) -> pd.DataFrame:
+        """Extract data from plain dict records without building an input DataFrame.
+
+        Args:
+            records (Iterable[Dict[str, Any]]): Raw company records as parsed from JSON.
+
+        Returns:
+            pd.DataFrame: The extracted data.
+        """
+        buffer = ColumnBuffer()
+        self.extract_into(records, buffer)
+        return buffer.to_frame()
+
+    def extract_into(
+        self, records: Iterable[Dict[str, Any]], buffer: ColumnBuffer
+    ) -> None:
+        """Extract data from plain dict records into an existing column buffer.
+
+        Args:
+            records (Iterable[Dict[str, Any]]): Raw company records as parsed from JSON.
+            buffer (ColumnBuffer): Buffer receiving the extracted rows.
+        """
+        for record in records:
+            processed_rows = self.process_row(record)
             if isinstance(processed_rows, list):
-                results.extend(processed_rows)
-        return pd.DataFrame(results)
+                buffer.extend(processed_rows)
 
     def validate_language(self, mapping_name: str) -> bool:
         """Validate if a language code exists in the mapping.
@@ -90,17 +117,7 @@ class BaseExtractor:
         Returns:
             Optional[str]: The parsed date in ISO format (YYYY-MM-DD), or None if parsing fails.
         """
-        self.logger.debug(f"Parsing date string: {date_str}")
-
-        if not date_str:
-            return None
-
-        try:
-            parsed_date = parse(date_str, fuzzy=True)
-            return parsed_date.date().isoformat()
-        except (ValueError, TypeError, ParserError) as e:
-            self.logger.warning(f"Invalid date string '{date_str}': {e}")
-            return None
+        return self.date_normalizer.normalize(date_str)
 
     def get_mapping(self, mapping_name: str, language: Optional[str] = None) -> Any:
         """Retrieve a specific mapping by name and optionally filter by language.
@@ -0,0 +1,75 @@
+"""Column Buffer for Extracted Records.
+
+This module defines the `ColumnBuffer` class, which collects the rows produced by
+extractors directly into per-column lists. Building the output this way avoids
+materializing an intermediate DataFrame for the raw input records and keeps the
+extracted data in a compact layout until it is written.
+
+Key Features:
+- Appends extracted row dictionaries column by column.
+- Handles rows with missing or additional keys by padding with None.
+- Builds a DataFrame only when the data is about to be written.
+"""
+
+from typing import Any, Dict, Iterable, List
+
+import pandas as pd
+
+
+class ColumnBuffer:
+    """Accumulate extracted rows as per-column lists."""
+
+    def __init__(self) -> None:
+        """Initialize an empty column buffer."""
+        self.columns: Dict[str, List[Any]] = {}
+        self.num_rows = 0
+
+    def __len__(self) -> int:
+        """Return the number of buffered rows.
+
+        Returns:
+            int: Number of rows in the buffer.
+        """
+        return self.num_rows
+
+    def append(self, row: Dict[str, Any]) -> None:
+        """Append a single extracted row to the buffer.
+
+        Args:
+            row (Dict[str, Any]): The extracted row to append.
+        """
+        columns = self.columns
+        if row.keys() == columns.keys():
+            for key, value in row.items():
+                columns[key].append(value)
+        else:
+            for key in row:
+                if key not in columns:
+                    columns[key] = [None] * self.num_rows
+            for key, values in columns.items():
+                values.append(row.get(key))
+        self.num_rows += 1
+
+    def extend(self, rows: Iterable[Dict[str, Any]]) -> None:
+        """Append several extracted rows to the buffer.
+
+        Args:
+            rows (Iterable[Dict[str, Any]]): The extracted rows to append.
+        """
+        for row in rows:
+            self.append(row)
+
+    def clear(self) -> None:
+        """Remove all buffered rows."""
+        self.columns = {}
+        self.num_rows = 0
+
+    def to_frame(self) -> pd.DataFrame:
+        """Build a DataFrame from the buffered columns.
+
+        Returns:
+            pd.DataFrame: The buffered data, or an empty DataFrame if no rows were added.
+        """
+        if not self.num_rows:
+            return pd.DataFrame()
+        return pd.DataFrame(self.columns)
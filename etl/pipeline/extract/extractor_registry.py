@@ -0,0 +1,163 @@
+"""Process-wide Extractor and Mappings Registry.
+
+This module defines the `ExtractorRegistry` class, which caches parsed mapping
+files and extractor instances for the lifetime of the process. Mappings are loaded
+once and shared as read-only objects between all extractors, and each extractor is
+created once per language and reused for every chunk.
+
+Key Features:
+- Loads `mappings.yml` and the industry 2025 CSV once per process.
+- Builds the TOIMI and industry 2025 mapping index once per process.
+- Reuses extractor instances across chunks, keyed by extractor path and language.
+- Reports the time spent loading mappings and the number of cache hits.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from etl.config.mappings.dynamic_loader import DynamicLoader, Mappings
+from etl.config.mappings.mapping_index import MappingIndex
+from etl.utils.dynamic_imports import import_function
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RegistryStats:
+    """Counters describing registry loads and cache hits."""
+
+    mapping_loads: int = 0
+    mapping_hits: int = 0
+    extractor_creations: int = 0
+    extractor_hits: int = 0
+    load_time: float = 0.0
+
+
+class ExtractorRegistry:
+    """Cache of parsed mappings and extractor instances shared within a process."""
+
+    def __init__(self) -> None:
+        """Initialize an empty registry."""
+        self.stats = RegistryStats()
+        self._mappings: Dict[str, Mappings] = {}
+        self._industry_2025_mapping: Dict[str, Mapping[str, Mapping[str, str]]] = {}
+        self._mapping_index: Optional[MappingIndex] = None
+        self._extractors: Dict[Tuple[str, str, str], Any] = {}
+        self._lock = threading.RLock()
+
+    def get_mappings(self, mappings_file: str) -> Mappings:
+        """Return the parsed YAML mappings, loading the file on first use.
+
+        Args:
+            mappings_file (str): Path to the mappings YAML file.
+
+        Returns:
+            Mappings: Shared, read-only mappings for the file.
+        """
+        key = str(Path(mappings_file).resolve())
+        with self._lock:
+            mappings = self._mappings.get(key)
+            if mappings is not None:
+                self.stats.mapping_hits += 1
+                return mappings
+
+            start_time = time.perf_counter()
+            mappings = Mappings(mappings_file)
+            self.stats.load_time += time.perf_counter() - start_time
+            self.stats.mapping_loads += 1
+            self._mappings[key] = mappings
+            return mappings
+
+    def get_industry_2025_mapping(self) -> Mapping[str, Mapping[str, str]]:
+        """Return the industry 2025 mapping, loading the CSV file on first use.
+
+        Returns:
+            Mapping[str, Mapping[str, str]]: Shared, read-only industry 2025 mapping.
+        """
+        with self._lock:
+            if self._industry_2025_mapping:
+                self.stats.mapping_hits += 1
+                return self._industry_2025_mapping
+
+            start_time = time.perf_counter()
+            self._industry_2025_mapping = DynamicLoader().load_industry_2025_mapping()
+            self.stats.load_time += time.perf_counter() - start_time
+            self.stats.mapping_loads += 1
+            return self._industry_2025_mapping
+
+    def get_mapping_index(self) -> MappingIndex:
+        """Return the TOIMI and industry 2025 mapping index, building it on first use.
+
+        Returns:
+            MappingIndex: Shared index with every TOIMI category and language loaded.
+        """
+        with self._lock:
+            if self._mapping_index is not None:
+                self.stats.mapping_hits += 1
+                return self._mapping_index
+
+            industry_2025_mapping = self.get_industry_2025_mapping()
+            start_time = time.perf_counter()
+            self._mapping_index = MappingIndex.build(industry_2025_mapping)
+            self.stats.load_time += time.perf_counter() - start_time
+            self.stats.mapping_loads += 1
+            return self._mapping_index
+
+    def get_extractor(self, extractor_path: str, mappings_file: str, lang: str) -> Any:
+        """Return a cached extractor instance, creating it on first use.
+
+        Args:
+            extractor_path (str): Fully qualified path of the extractor class.
+            mappings_file (str): Path to the mappings YAML file.
+            lang (str): Target language code (e.g., 'en', 'fi', 'sv').
+
+        Returns:
+            Any: The shared extractor instance.
+        """
+        key = (extractor_path, mappings_file, lang)
+        with self._lock:
+            extractor = self._extractors.get(key)
+            if extractor is not None:
+                self.stats.extractor_hits += 1
+                return extractor
+
+            extractor_cls = import_function(extractor_path)
+            extractor = extractor_cls(mappings_file, lang)
+            self.stats.extractor_creations += 1
+            self._extractors[key] = extractor
+            return extractor
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return the registry counters.
+
+        Returns:
+            Dict[str, Any]: Load counts, cache hits, and total load time in seconds.
+        """
+        return asdict(self.stats)
+
+    def log_stats(self) -> None:
+        """Log the registry counters."""
+        stats = self.stats
+        logger.info(
+            f"Extractor registry: {stats.mapping_loads} mapping loads in "
+            f"{stats.load_time:.3f} seconds, {stats.mapping_hits} mapping cache hits, "
+            f"{stats.extractor_creations} extractors created, "
+            f"{stats.extractor_hits} extractor cache hits."
+        )
+
+    def clear(self) -> None:
+        """Drop all cached mappings and extractors and reset the counters."""
+        with self._lock:
+            self._mappings.clear()
+            self._industry_2025_mapping = {}
+            self._mapping_index = None
+            self._extractors.clear()
+            self.stats = RegistryStats()
+
+
+# Shared process-wide registry
+EXTRACTOR_REGISTRY = ExtractorRegistry()
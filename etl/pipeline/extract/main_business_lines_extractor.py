@@ -6,6 +6,7 @@ mappings and supports language-specific transformations.
 
 Key Features:
 - Dynamic mapping resolution for fields like industry codes.
+- Constant-time TOIMI and industry 2025 lookups from a shared in-memory index.
 - Handles nested fields like source mappings.
 - Modular class-based design for reusability in ETL pipelines.
 - Comprehensive logging and error handling for skipped or invalid records.
@@ -15,8 +16,8 @@ from typing import Any, Dict, List, Tuple
 
 import pandas as pd
 
-from etl.config.mappings.dynamic_loader import DynamicLoader
 from etl.pipeline.extract.base_extractor import BaseExtractor
+from etl.pipeline.extract.extractor_registry import EXTRACTOR_REGISTRY
 
 
 class MainBusinessLinesExtractor(BaseExtractor):
@@ -34,9 +35,8 @@ class MainBusinessLinesExtractor(BaseExtractor):
             KeyError: If the TOIMI mappings are not found in the mappings file.
         """
         super().__init__(mappings_file, lang)
-        self.dynamic_loader = DynamicLoader()
         self.source_mapping = self.get_mapping("source_mapping")
-        self.industry_2025_mapping = self.dynamic_loader.load_industry_2025_mapping()
+        self.mapping_index = EXTRACTOR_REGISTRY.get_mapping_index()
 
     def process_row(self, row: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Process a single company record to extract main business line information.
@@ -69,7 +69,7 @@ class MainBusinessLinesExtractor(BaseExtractor):
             return results
 
         try:
-            mapping = self.dynamic_loader.load_toimi_mapping(type_code_set, self.lang)
+            mapping = self.mapping_index.get_toimi_mapping(type_code_set, self.lang)
             mapped_name = mapping.get(type_code, "")
             source = main_business_line.get("source")
             mapped_source = (
@@ -106,21 +106,9 @@ class MainBusinessLinesExtractor(BaseExtractor):
             type_code (str): The industry type code.
 
         Returns:
-            str: The industry title in the specified language.
+            Tuple[str, str]: The industry title in the specified language and the industry letter.
         """
-        industry_title = ""
-        industry_letter = ""
-        lang_column = self.lang
-
-        if type_code in self.industry_2025_mapping:
-            category = self.industry_2025_mapping[type_code]["category"]
-            for tol_code, data in self.industry_2025_mapping.items():
-                if tol_code == category:
-                    industry_title = data[lang_column]
-                    industry_letter = category
-                    break
-
-        return industry_title, industry_letter
+        return self.mapping_index.get_industry_title(type_code, self.lang)
 
     def extract(self, data: pd.DataFrame) -> pd.DataFrame:
         """Extract and process main business line data from raw input.
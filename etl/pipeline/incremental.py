@@ -0,0 +1,417 @@
+"""Incremental ETL Runs Driven by Snapshot Fingerprints.
+
+This module lets the pipeline process only the companies that are new or have
+changed since the previous snapshot. Every raw company record is fingerprinted by
+its `lastModified` value and a hash of its content. The fingerprints of a run are
+stored per snapshot date, and the next incremental run compares the incoming
+records against them:
+
+- New and changed companies are passed on to extraction, cleaning and address
+  validation as usual.
+- Unchanged companies are skipped, and their rows are carried over from the
+  previous snapshot's cleaned outputs once cleaning has finished.
+- Companies missing from the new snapshot are dropped from the carried-over rows.
+
+The first incremental run (or a run without a usable previous snapshot) processes
+all records and writes the fingerprints used by the next run.
+"""
+
+import csv
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Set, Tuple
+
+import pandas as pd
+
+from etl.utils.columnar_io import (
+    STORAGE_FORMAT_CSV,
+    STORAGE_FORMAT_PARQUET,
+    get_column_types,
+    is_parquet_path,
+    read_parquet_table,
+    with_storage_suffix,
+    write_parquet_file,
+)
+from etl.utils.file_io import upload_cleaned_file
+from etl.utils.file_system_utils import clear_directory
+from etl.utils.run_profiler import profile_step
+from etl.utils.table_writer import TableWriter
+
+logger = logging.getLogger(__name__)
+
+# Directory (inside the processed data directory) holding fingerprint files
+FINGERPRINTS_DIR_NAME = "fingerprints"
+# Columns of a fingerprint file
+FINGERPRINT_COLUMNS = ["business_id", "last_modified", "content_hash"]
+# Key column used to carry over cleaned rows
+KEY_COLUMN = "business_id"
+# Rows read at a time when carrying over cleaned CSV files
+CARRY_OVER_CHUNK_SIZE = 200_000
+
+# Fingerprint of a company record: (lastModified, content hash)
+Fingerprint = Tuple[str, str]
+
+
+def compute_record_fingerprint(record: Dict[str, Any]) -> Fingerprint:
+    """Compute the fingerprint of a raw company record.
+
+    Args:
+        record (Dict[str, Any]): The raw company record.
+
+    Returns:
+        Fingerprint: The record's `lastModified` value and a 64-bit content hash.
+    """
+    content = json.dumps(
+        record, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str
+    )
+    content_hash = hashlib.blake2b(content.encode("utf-8"), digest_size=8).hexdigest()
+    return str(record.get("lastModified") or ""), content_hash
+
+
+def get_record_business_id(record: Dict[str, Any]) -> Optional[str]:
+    """Return the business ID of a raw company record.
+
+    Args:
+        record (Dict[str, Any]): The raw company record.
+
+    Returns:
+        Optional[str]: The business ID, or None if the record has none.
+    """
+    business_id = record.get("businessId")
+    if isinstance(business_id, dict):
+        business_id = business_id.get("value")
+    return business_id or None
+
+
+def get_fingerprints_dir(config: Dict[str, Any]) -> Path:
+    """Return the directory where snapshot fingerprints are stored.
+
+    Args:
+        config (Dict[str, Any]): Configuration dictionary.
+
+    Returns:
+        Path: The fingerprints directory inside the processed data directory.
+    """
+    return Path(config["directory_structure"]["processed_dir"]) / FINGERPRINTS_DIR_NAME
+
+
+def get_cleaned_dir(config: Dict[str, Any], snapshot_date: str) -> Path:
+    """Return the cleaned output directory of a snapshot in the configured language.
+
+    Args:
+        config (Dict[str, Any]): Configuration dictionary.
+        snapshot_date (str): The snapshot date.
+
+    Returns:
+        Path: The cleaned output directory.
+    """
+    return (
+        Path(config["directory_structure"]["processed_dir"])
+        / "cleaned"
+        / snapshot_date
+        / config["language"]
+    )
+
+
+def find_previous_snapshot(config: Dict[str, Any]) -> Optional[str]:
+    """Find the snapshot to compare an incremental run against.
+
+    The snapshot is taken from `previous_snapshot_date` in the configuration or the
+    `PREV_SNAPSHOT_DATE` environment variable. Otherwise it is the latest earlier
+    snapshot that has both fingerprints and cleaned outputs in the configured language.
+
+    Args:
+        config (Dict[str, Any]): Configuration dictionary.
+
+    Returns:
+        Optional[str]: The previous snapshot date, or None if there is none.
+    """
+    configured = config.get("previous_snapshot_date") or os.getenv("PREV_SNAPSHOT_DATE")
+    if configured:
+        return str(configured)
+
+    snapshot_date = config["snapshot_date"]
+    candidates = sorted(
+        fingerprint_file.stem
+        for fingerprint_file in get_fingerprints_dir(config).glob("*.csv")
+        if fingerprint_file.stem < snapshot_date
+        and get_cleaned_dir(config, fingerprint_file.stem).is_dir()
+    )
+    return candidates[-1] if candidates else None
+
+
+def load_fingerprints(fingerprint_file: Path) -> Dict[str, Fingerprint]:
+    """Load the fingerprints of a snapshot.
+
+    Args:
+        fingerprint_file (Path): Path to the fingerprint file.
+
+    Returns:
+        Dict[str, Fingerprint]: Fingerprints keyed by business ID.
+    """
+    fingerprints: Dict[str, Fingerprint] = {}
+    with fingerprint_file.open("r", encoding="utf-8", newline="") as file:
+        reader = csv.reader(file)
+        next(reader, None)  # Skip the header
+        for business_id, last_modified, content_hash in reader:
+            fingerprints[business_id] = (last_modified, content_hash)
+    return fingerprints
+
+
+class IncrementalRun:
+    """Change detection and carry-over state of an incremental ETL run."""
+
+    def __init__(
+        self,
+        config: Dict[str, Any],
+        previous_snapshot_date: Optional[str] = None,
+        previous_fingerprints: Optional[Dict[str, Fingerprint]] = None,
+    ) -> None:
+        """Initialize the IncrementalRun.
+
+        Args:
+            config (Dict[str, Any]): Configuration dictionary.
+            previous_snapshot_date (Optional[str]): Snapshot to compare against; all
+                records are processed if None.
+            previous_fingerprints (Optional[Dict[str, Fingerprint]]): Fingerprints
+                of the previous snapshot keyed by business ID.
+        """
+        self.config = config
+        self.snapshot_date = config["snapshot_date"]
+        self.previous_snapshot_date = previous_snapshot_date
+        self.fingerprint_file = (
+            get_fingerprints_dir(config) / f"{self.snapshot_date}.csv"
+        )
+        self._pending_file = self.fingerprint_file.with_suffix(".csv.tmp")
+        # Entries are removed as records are seen; the rest were removed upstream
+        self._previous = previous_fingerprints or {}
+        self.changed_ids: Set[str] = set()
+        self.records_filtered = False
+        self.counts = {"new": 0, "changed": 0, "unchanged": 0, "removed": 0}
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "IncrementalRun":
+        """Create an incremental run against the previous snapshot, if one is usable.
+
+        Args:
+            config (Dict[str, Any]): Configuration dictionary.
+
+        Returns:
+            IncrementalRun: The incremental run.
+        """
+        previous_snapshot_date = find_previous_snapshot(config)
+        if previous_snapshot_date is None:
+            logger.info("No previous snapshot found: processing all records.")
+            return cls(config)
+
+        if previous_snapshot_date >= config["snapshot_date"]:
+            logger.warning(
+                f"Previous snapshot {previous_snapshot_date} is not earlier than "
+                f"{config['snapshot_date']}: processing all records."
+            )
+            return cls(config)
+
+        fingerprint_file = (
+            get_fingerprints_dir(config) / f"{previous_snapshot_date}.csv"
+        )
+        previous_cleaned_dir = get_cleaned_dir(config, previous_snapshot_date)
+        if not fingerprint_file.exists() or not previous_cleaned_dir.is_dir():
+            logger.warning(
+                f"Snapshot {previous_snapshot_date} has no fingerprints or cleaned "
+                "outputs: processing all records."
+            )
+            return cls(config)
+
+        previous_fingerprints = load_fingerprints(fingerprint_file)
+        logger.info(
+            f"Incremental run against snapshot {previous_snapshot_date} "
+            f"({len(previous_fingerprints)} fingerprints)."
+        )
+        return cls(config, previous_snapshot_date, previous_fingerprints)
+
+    @property
+    def is_incremental(self) -> bool:
+        """Return whether the run compares against a previous snapshot."""
+        return self.previous_snapshot_date is not None
+
+    def reset_outputs(self) -> None:
+        """Clear extracted, staging and this snapshot's cleaned tables.
+
+        Pipeline tables are appended to, so tables left over from an earlier run
+        would otherwise be cleaned or carried over a second time.
+        """
+        processed_dir = Path(self.config["directory_structure"]["processed_dir"])
+        for directory in (
+            processed_dir / "extracted",
+            processed_dir / "staging",
+            get_cleaned_dir(self.config, self.snapshot_date),
+        ):
+            clear_directory(directory)
+
+    def filter_records(
+        self, records: Iterable[Dict[str, Any]]
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield the new and changed records, fingerprinting every record.
+
+        The fingerprints of all records are written to a pending fingerprint file,
+        which becomes the snapshot's fingerprint file in `commit`.
+
+        Args:
+            records (Iterable[Dict[str, Any]]): Raw company records.
+
+        Yields:
+            Dict[str, Any]: The records that need to be processed.
+        """
+        self._pending_file.parent.mkdir(parents=True, exist_ok=True)
+        with self._pending_file.open("w", encoding="utf-8", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(FINGERPRINT_COLUMNS)
+            for record in records:
+                business_id = get_record_business_id(record)
+                if business_id is None:
+                    yield record
+                    continue
+
+                fingerprint = compute_record_fingerprint(record)
+                writer.writerow([business_id, *fingerprint])
+                previous = self._previous.pop(business_id, None)
+                if previous == fingerprint:
+                    self.counts["unchanged"] += 1
+                    continue
+
+                self.counts["new" if previous is None else "changed"] += 1
+                self.changed_ids.add(business_id)
+                yield record
+
+        self.records_filtered = True
+        if self.is_incremental:
+            self.counts["removed"] = len(self._previous)
+        logger.info(
+            f"Change detection: {self.counts['new']} new, "
+            f"{self.counts['changed']} changed, {self.counts['unchanged']} unchanged, "
+            f"{self.counts['removed']} removed companies."
+        )
+
+    def get_excluded_ids(self) -> Set[str]:
+        """Return the business IDs whose previous rows must not be carried over.
+
+        If the records were not filtered in this process (for example when a resumed
+        run skips extraction), the IDs are derived from this run's fingerprint file.
+
+        Returns:
+            Set[str]: IDs of new, changed and removed companies.
+        """
+        if not self.records_filtered:
+            current_file = (
+                self._pending_file
+                if self._pending_file.exists()
+                else self.fingerprint_file
+            )
+            for business_id, fingerprint in load_fingerprints(current_file).items():
+                if self._previous.pop(business_id, None) != fingerprint:
+                    self.changed_ids.add(business_id)
+            self.records_filtered = True
+        return self.changed_ids | set(self._previous)
+
+    @profile_step("carry_over")
+    def carry_over_cleaned_outputs(self) -> None:
+        """Append the rows of unchanged companies from the previous cleaned outputs.
+
+        Rows of new, changed and removed companies are not carried over: the first
+        two were cleaned again in this run, the last no longer exist.
+
+        Raises:
+            RuntimeError: If a cleaned output cannot be carried over.
+        """
+        if not self.is_incremental:
+            return
+
+        previous_dir = get_cleaned_dir(self.config, str(self.previous_snapshot_date))
+        cleaned_dir = get_cleaned_dir(self.config, self.snapshot_date)
+        cleaned_dir.mkdir(parents=True, exist_ok=True)
+        excluded_ids = self.get_excluded_ids()
+        storage_format = self.config.get("storage_format", STORAGE_FORMAT_CSV)
+
+        for previous_file in sorted(previous_dir.iterdir()):
+            if previous_file.suffix not in (".csv", ".parquet"):
+                continue
+            output_file = with_storage_suffix(
+                cleaned_dir / previous_file.name, storage_format
+            )
+            try:
+                num_rows = self._carry_over_file(
+                    previous_file, output_file, excluded_ids, storage_format
+                )
+            except (OSError, ValueError, KeyError) as e:
+                logger.error(f"Error carrying over {previous_file}: {e}")
+                raise RuntimeError(f"Error carrying over {previous_file}: {e}") from e
+            if num_rows:
+                upload_cleaned_file(str(output_file), self.config)
+            logger.info(f"Carried over {num_rows} rows from {previous_file}")
+
+    def _carry_over_file(
+        self,
+        previous_file: Path,
+        output_file: Path,
+        excluded_ids: Set[str],
+        storage_format: str,
+    ) -> int:
+        """Append the rows of unchanged companies from one cleaned output.
+
+        Args:
+            previous_file (Path): Cleaned output of the previous snapshot.
+            output_file (Path): Cleaned output of this run.
+            excluded_ids (Set[str]): Business IDs whose rows are not carried over.
+            storage_format (str): Storage format of this run's outputs.
+
+        Returns:
+            int: Number of rows carried over.
+        """
+        if storage_format == STORAGE_FORMAT_PARQUET:
+            previous_df = (
+                read_parquet_table(previous_file)
+                if is_parquet_path(previous_file)
+                else pd.read_csv(previous_file, low_memory=False)
+            )
+            carried_over = previous_df[
+                ~previous_df[KEY_COLUMN].astype(str).isin(excluded_ids)
+            ]
+            if not carried_over.empty:
+                write_parquet_file(
+                    carried_over,
+                    output_file,
+                    get_column_types(self.config.get("entities", [])),
+                )
+            return len(carried_over)
+
+        # CSV rows are copied as text, so values are carried over unchanged
+        if is_parquet_path(previous_file):
+            chunks: Iterable[pd.DataFrame] = [read_parquet_table(previous_file)]
+        else:
+            chunks = pd.read_csv(
+                previous_file,
+                dtype=str,
+                keep_default_na=False,
+                chunksize=CARRY_OVER_CHUNK_SIZE,
+            )
+        num_rows = 0
+        with TableWriter(output_file) as writer:
+            for chunk in chunks:
+                carried_over = chunk[~chunk[KEY_COLUMN].astype(str).isin(excluded_ids)]
+                writer.write(carried_over)
+                num_rows += len(carried_over)
+        return num_rows
+
+    def commit(self) -> None:
+        """Store the fingerprints of this run as the snapshot's fingerprint file.
+
+        Called once the run has completed, so a failed run never leaves fingerprints
+        for outputs that were not written.
+        """
+        if not self._pending_file.exists():
+            return
+        self._pending_file.replace(self.fingerprint_file)
+        logger.info(f"Saved snapshot fingerprints to {self.fingerprint_file}")
@@ -2,7 +2,7 @@
 
 This script is responsible for:
 1. Creating database tables based on a provided SQL schema file.
-2. Loading processed CSV files into the appropriate database tables.
+2. Loading processed CSV (or Parquet) files into the appropriate database tables.
 3. Validating the database by removing duplicates and ensuring referential integrity.
 
 It uses SQLAlchemy for database interactions and pandas for reading and handling CSV data.
@@ -19,6 +19,8 @@ from sqlalchemy import create_engine, text
 from sqlalchemy.exc import SQLAlchemyError
 
 from etl.config.config_loader import CONFIG, DATABASE_URL
+from etl.utils.columnar_io import STORAGE_FORMAT_CSV, with_storage_suffix
+from etl.utils.file_io import read_table
 from etl.utils.s3_utils import download_file_from_s3
 
 # Enable SQLAlchemy logging
@@ -32,6 +34,7 @@ sql_logger.setLevel(logging.WARNING)
 processed_dir = Path(CONFIG["directory_structure"]["processed_dir"])
 processed_data_path = processed_dir / "cleaned"
 db_schema = Path(CONFIG["directory_structure"]["db_schema_path"])
+storage_format = CONFIG.get("storage_format", STORAGE_FORMAT_CSV)
 entities = [
     {"table": "businesses", "file": "cleaned_names.csv"},
     {"table": "business_name_history", "file": "staging_names_old.csv"},
@@ -179,7 +182,7 @@ def load_csv_to_db(engine, table_name, file_path):
     """
     try:
         logger.info(f"Loading {file_path} into table {table_name}")
-        df = pd.read_csv(file_path)
+        df = read_table(str(file_path))
         df.drop_duplicates(inplace=True)
         # Add snapshot_date column
         df["snapshot_date"] = SNAPSHOT_DATE
@@ -224,7 +227,9 @@ def load_data():
         # Load all tables
         for entity in entities:
             try:
-                file_path = get_cleaned_csv_path(entity["file"])
+                file_path = get_cleaned_csv_path(
+                    with_storage_suffix(entity["file"], storage_format).name
+                )
                 load_csv_to_db(engine, entity["table"], file_path)
             except FileNotFoundError as e:
                 logger.warning(f"⚠️ {e}. Skipping.")
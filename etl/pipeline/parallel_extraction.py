@@ -0,0 +1,355 @@
+"""Parallel Entity Extraction with Ordered Shard Merge.
+
+This module fans independent record batches out to a pool of worker processes.
+Each worker runs the regular entity extraction for its batch and writes the result
+to a shard directory of its own. Once all batches are done, the shards are merged
+in batch order into `extracted/<entity>.csv`, so the output is identical to the
+sequential path regardless of the order in which workers finish.
+
+Functions:
+    resolve_worker_count: Resolve a configured number of worker processes.
+    get_batches_in_flight: Number of record batches held in memory at once.
+    extract_batches_parallel: Extract entities from record batches in a process pool.
+    extract_chunk_files_parallel: Extract entities from chunk files in a process pool.
+    merge_entity_shards: Merge per-batch shard files into the final entity files.
+"""
+
+import logging
+import os
+import shutil
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import pandas as pd
+
+from etl.pipeline.batch_sizing import AdaptiveBatchSizer
+from etl.pipeline.entity_processing import get_extracted_dir, process_entities
+from etl.utils.columnar_io import (
+    STORAGE_FORMAT_CSV,
+    STORAGE_FORMAT_PARQUET,
+    move_parquet_parts,
+    with_storage_suffix,
+)
+from etl.utils.file_io import load_json_records
+from etl.utils.file_system_utils import clear_directory, ensure_directory_exists
+from etl.utils.run_profiler import PROFILER
+from etl.utils.table_writer import EntityWriters
+
+logger = logging.getLogger(__name__)
+
+# Name of the directory (inside `extracted/`) that holds per-batch shards
+SHARDS_DIR_NAME = "_shards"
+# Number of batches queued per worker before waiting for results
+BATCHES_IN_FLIGHT_PER_WORKER = 2
+# Buffer size used when copying shard files
+MERGE_BUFFER_SIZE = 1024 * 1024
+
+# Batch index, number of records, step profiles and in-memory size of the extracted
+# DataFrames (0 unless measured) returned by a worker
+BatchResult = Tuple[int, int, List[Dict[str, Any]], int]
+
+
+def resolve_worker_count(
+    config: Dict[str, Any], key: str = "extraction_workers"
+) -> int:
+    """Resolve a configured number of worker processes.
+
+    Args:
+        config (Dict[str, Any]): Configuration dictionary.
+        key (str): Configuration key of the worker count.
+
+    Returns:
+        int: Number of worker processes; 0 in the configuration means all CPU cores.
+
+    Raises:
+        ValueError: If the configured number of workers is negative.
+    """
+    workers = int(config.get(key, 1))
+    if workers < 0:
+        raise ValueError(f"{key} must not be negative, got {workers}")
+    return workers or os.cpu_count() or 1
+
+
+def get_batches_in_flight(workers: int) -> int:
+    """Return the number of record batches held in memory during parallel extraction.
+
+    Args:
+        workers (int): Number of worker processes.
+
+    Returns:
+        int: The batches queued for or processed by the workers, plus the batch
+            being read by the main process.
+    """
+    return workers * BATCHES_IN_FLIGHT_PER_WORKER + 1
+
+
+def get_shard_path(shards_dir: Path, batch_index: int) -> Path:
+    """Return the shard directory of a batch.
+
+    Args:
+        shards_dir (Path): Root directory of all shards.
+        batch_index (int): Index of the batch.
+
+    Returns:
+        Path: Directory holding the per-entity files of the batch.
+    """
+    return shards_dir / f"batch_{batch_index:06d}"
+
+
+def _extract_batch(
+    batch_index: int,
+    records: List[Dict[str, Any]],
+    config: Dict[str, Any],
+    shards_dir: str,
+) -> BatchResult:
+    """Extract entities from a batch of records into the batch's shard directory.
+
+    Args:
+        batch_index (int): Index of the batch.
+        records (List[Dict[str, Any]]): Raw records of the batch.
+        config (Dict[str, Any]): Configuration dictionary.
+        shards_dir (str): Root directory of all shards.
+
+    Returns:
+        BatchResult: The batch index, the number of records processed, the step
+            profiles of the batch and the size of the extracted DataFrames.
+    """
+    shard_path = get_shard_path(Path(shards_dir), batch_index)
+    PROFILER.configure(config, trace_allocations=False)
+    with PROFILER.collect() as profiles:
+        with EntityWriters.from_config(config, shard_path) as writers:
+            process_entities(records, config, writers=writers)
+    return batch_index, len(records), profiles, writers.frame_bytes
+
+
+def _extract_chunk_file(
+    batch_index: int,
+    json_file: str,
+    config: Dict[str, Any],
+    shards_dir: str,
+) -> BatchResult:
+    """Load a chunk file and extract its entities into the batch's shard directory.
+
+    Args:
+        batch_index (int): Index of the chunk.
+        json_file (str): Path to the chunk file.
+        config (Dict[str, Any]): Configuration dictionary.
+        shards_dir (str): Root directory of all shards.
+
+    Returns:
+        BatchResult: The chunk index, the number of records processed, the step
+            profiles of the chunk and the size of the extracted DataFrames.
+    """
+    records = load_json_records(Path(json_file))
+    return _extract_batch(batch_index, records, config, shards_dir)
+
+
+def _run_in_pool(
+    worker: Callable[..., BatchResult],
+    items: Iterable[Any],
+    config: Dict[str, Any],
+    shards_dir: Path,
+    workers: int,
+    sizer: Optional[AdaptiveBatchSizer] = None,
+) -> int:
+    """Submit batches to a process pool, keeping a bounded number in flight.
+
+    Args:
+        worker (Callable[..., BatchResult]): Worker function to run per batch.
+        items (Iterable[Any]): Batches (records or chunk file paths) in input order.
+        config (Dict[str, Any]): Configuration dictionary.
+        shards_dir (Path): Root directory of all shards.
+        workers (int): Number of worker processes.
+        sizer (Optional[AdaptiveBatchSizer]): Sizer of the batches, which is told
+            the size of the DataFrames extracted from every batch.
+
+    Returns:
+        int: Number of batches processed.
+
+    Raises:
+        RuntimeError: If any batch fails.
+    """
+    max_in_flight = workers * BATCHES_IN_FLIGHT_PER_WORKER
+    pending: Set[Future] = set()
+    num_batches = 0
+    total_records = 0
+
+    def collect(done: Set[Future]) -> None:
+        nonlocal total_records
+        for future in done:
+            batch_index, num_records, profiles, frame_bytes = future.result()
+            total_records += num_records
+            PROFILER.merge(profiles)
+            if sizer is not None:
+                sizer.record_output(num_records, frame_bytes)
+            logger.info(
+                f"Extracted batch {batch_index} ({total_records} records so far)"
+            )
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        try:
+            for batch_index, item in enumerate(items):
+                if len(pending) >= max_in_flight:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+                pending.add(
+                    executor.submit(worker, batch_index, item, config, str(shards_dir))
+                )
+                num_batches += 1
+            done, pending = wait(pending)
+            collect(done)
+        except Exception as e:
+            for future in pending:
+                future.cancel()
+            logger.error(f"Parallel extraction failed: {e}")
+            raise RuntimeError(f"Parallel extraction failed: {e}") from e
+
+    return num_batches
+
+
+def extract_batches_parallel(
+    batches: Iterable[List[Dict[str, Any]]],
+    config: Dict[str, Any],
+    sizer: Optional[AdaptiveBatchSizer] = None,
+) -> None:
+    """Extract entities from record batches in a process pool and merge the shards.
+
+    Args:
+        batches (Iterable[List[Dict[str, Any]]]): Record batches in input order.
+        config (Dict[str, Any]): Configuration dictionary.
+        sizer (Optional[AdaptiveBatchSizer]): Sizer producing the batches.
+    """
+    _extract_and_merge(_extract_batch, batches, config, sizer)
+
+
+def extract_chunk_files_parallel(
+    json_files: Iterable[Path], config: Dict[str, Any]
+) -> None:
+    """Extract entities from chunk files in a process pool and merge the shards.
+
+    Only the file paths are sent to the workers; each worker reads its own chunk.
+
+    Args:
+        json_files (Iterable[Path]): Chunk files in input order.
+        config (Dict[str, Any]): Configuration dictionary.
+    """
+    _extract_and_merge(
+        _extract_chunk_file, (str(json_file) for json_file in json_files), config
+    )
+
+
+def _extract_and_merge(
+    worker: Callable[..., BatchResult],
+    items: Iterable[Any],
+    config: Dict[str, Any],
+    sizer: Optional[AdaptiveBatchSizer] = None,
+) -> None:
+    """Run the worker over all batches and merge the resulting shards.
+
+    Args:
+        worker (Callable[..., BatchResult]): Worker function to run per batch.
+        items (Iterable[Any]): Batches in input order.
+        config (Dict[str, Any]): Configuration dictionary.
+        sizer (Optional[AdaptiveBatchSizer]): Sizer producing the batches.
+    """
+    workers = resolve_worker_count(config)
+    extracted_dir = get_extracted_dir(config)
+    shards_dir = extracted_dir / SHARDS_DIR_NAME
+    ensure_directory_exists(shards_dir)
+    clear_directory(shards_dir)
+
+    logger.info(f"Starting parallel extraction with {workers} worker processes.")
+    try:
+        num_batches = _run_in_pool(worker, items, config, shards_dir, workers, sizer)
+        merge_entity_shards(
+            shards_dir,
+            extracted_dir,
+            [entity["name"] for entity in config["entities"]],
+            num_batches,
+            config.get("storage_format", STORAGE_FORMAT_CSV),
+        )
+    finally:
+        shutil.rmtree(shards_dir, ignore_errors=True)
+
+
+def merge_entity_shards(
+    shards_dir: Path,
+    output_dir: Path,
+    entity_names: List[str],
+    num_batches: int,
+    storage_format: str = STORAGE_FORMAT_CSV,
+) -> None:
+    """Merge per-batch shard files into the final entity files in batch order.
+
+    CSV shard files are appended byte for byte, skipping the header of every shard
+    after the first one, exactly as the sequential path appends each chunk. Parquet
+    shards are merged by moving their part files into the final table in order.
+
+    Args:
+        shards_dir (Path): Root directory of all shards.
+        output_dir (Path): Directory of the final `<entity>.csv` files.
+        entity_names (List[str]): Names of the entities to merge.
+        num_batches (int): Number of batches that were processed.
+        storage_format (str): Storage format of the shards, "csv" or "parquet".
+
+    Raises:
+        RuntimeError: If merging a shard fails.
+    """
+    for entity_name in entity_names:
+        file_name = with_storage_suffix(f"{entity_name}.csv", storage_format).name
+        output_file = output_dir / file_name
+        shard_files = [
+            shard_file
+            for shard_file in (
+                get_shard_path(shards_dir, batch_index) / file_name
+                for batch_index in range(num_batches)
+            )
+            if shard_file.exists()
+        ]
+        if not shard_files:
+            logger.warning(f"No shards to merge for entity '{entity_name}'.")
+            continue
+
+        try:
+            for shard_file in shard_files:
+                if storage_format == STORAGE_FORMAT_PARQUET:
+                    move_parquet_parts(shard_file, output_file)
+                else:
+                    _append_shard(shard_file, output_file)
+        except OSError as e:
+            logger.error(f"Error merging shards for entity '{entity_name}': {e}")
+            raise RuntimeError(
+                f"Error merging shards for entity '{entity_name}': {e}"
+            ) from e
+        logger.info(
+            f"Merged {len(shard_files)} shards for entity '{entity_name}' into {output_file}"
+        )
+
+
+def _append_shard(shard_file: Path, output_file: Path) -> None:
+    """Append a shard file to an output CSV file.
+
+    Args:
+        shard_file (Path): Shard CSV file including its header row.
+        output_file (Path): Output CSV file, created with the shard header if missing.
+    """
+    if not output_file.exists():
+        shutil.copyfile(shard_file, output_file)
+        return
+
+    with output_file.open("rb") as output:
+        output_header = output.readline()
+    with shard_file.open("rb") as shard, output_file.open("ab") as output:
+        shard_header = shard.readline()
+        if shard_header == output_header:
+            shutil.copyfileobj(shard, output, MERGE_BUFFER_SIZE)
+            return
+
+    # Column order differs from the output file: align the shard before appending
+    logger.warning(f"Aligning columns of shard {shard_file} to {output_file}")
+    output_columns = pd.read_csv(output_file, nrows=0).columns
+    shard_df = pd.read_csv(shard_file, dtype=str, keep_default_na=False)
+    shard_df.reindex(columns=output_columns).to_csv(
+        output_file, mode="a", header=False, index=False, encoding="utf-8"
+    )
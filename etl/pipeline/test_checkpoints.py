@@ -0,0 +1,178 @@
+"""Tests of stage checkpointing and resume."""
+
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+import pytest
+
+from etl.pipeline.checkpoints import (
+    STATUS_COMPLETED,
+    STATUS_FAILED,
+    PipelineStage,
+    StageManifest,
+    StageRunner,
+)
+
+
+class StageCalls:
+    """Stage functions writing one output file each, recording which ones ran."""
+
+    def __init__(self, tmp_path: Path) -> None:
+        """Initialize the stages `a` -> `b` -> `c`, each reading its predecessor."""
+        self.tmp_path = tmp_path
+        self.calls: List[str] = []
+        self.source = tmp_path / "source.txt"
+        self.source.write_text("v1")
+        self.stages = [
+            PipelineStage("a", inputs=[self.source], outputs=[tmp_path / "a.txt"]),
+            PipelineStage(
+                "b", inputs=[tmp_path / "a.txt"], outputs=[tmp_path / "b.txt"]
+            ),
+            PipelineStage(
+                "c", inputs=[tmp_path / "b.txt"], outputs=[tmp_path / "c.txt"]
+            ),
+        ]
+
+    def make_func(self, stage: PipelineStage) -> Callable[[], None]:
+        """Return the function of a stage, appending its name to its input."""
+
+        def func() -> None:
+            self.calls.append(stage.name)
+            content = stage.inputs[0].read_text() + stage.name
+            stage.outputs[0].write_text(content)
+
+        return func
+
+    def run(self, **runner_options: Any) -> List[str]:
+        """Run all stages with a new runner and return the names of those that ran."""
+        self.calls = []
+        runner = StageRunner(
+            StageManifest(self.tmp_path / "manifest.json"), **runner_options
+        )
+        for stage in self.stages:
+            runner.run(stage, self.make_func(stage))
+        return self.calls
+
+
+@pytest.fixture
+def stage_calls(tmp_path: Path) -> StageCalls:
+    return StageCalls(tmp_path)
+
+
+def test_valid_stages_are_skipped(stage_calls: StageCalls) -> None:
+    assert stage_calls.run() == ["a", "b", "c"]
+    assert stage_calls.run() == []
+
+
+def test_changed_input_invalidates_the_stage_and_its_successors(
+    stage_calls: StageCalls,
+) -> None:
+    stage_calls.run()
+    stage_calls.source.write_text("v2")
+
+    assert stage_calls.run() == ["a", "b", "c"]
+    assert (stage_calls.tmp_path / "c.txt").read_text() == "v2abc"
+
+
+def test_changed_output_invalidates_the_stage(stage_calls: StageCalls) -> None:
+    stage_calls.run()
+    (stage_calls.tmp_path / "c.txt").unlink()
+
+    assert stage_calls.run() == ["c"]
+
+
+def test_changed_params_invalidate_the_stage(stage_calls: StageCalls) -> None:
+    stage_calls.run()
+    stage_calls.stages[1].params = {"chunk_size": 10}
+
+    # The output of `b` is rewritten with the same content, so `c` stays valid
+    assert stage_calls.run() == ["b"]
+
+
+def test_from_stage_runs_it_and_later_stages_only(stage_calls: StageCalls) -> None:
+    stage_calls.run()
+
+    assert stage_calls.run(from_stage="b") == ["b", "c"]
+
+
+def test_selected_stages_and_force(stage_calls: StageCalls) -> None:
+    stage_calls.run()
+
+    assert stage_calls.run(selected=["c"]) == []
+    assert stage_calls.run(selected=["c"], force=True) == ["c"]
+
+
+def test_failed_stage_is_run_again(stage_calls: StageCalls, tmp_path: Path) -> None:
+    manifest_path = tmp_path / "manifest.json"
+    partial_output = tmp_path / "b.txt"
+
+    def fail() -> None:
+        partial_output.write_text("partial")
+        raise RuntimeError("stage b failed")
+
+    runner = StageRunner(StageManifest(manifest_path))
+    runner.run(stage_calls.stages[0], stage_calls.make_func(stage_calls.stages[0]))
+    with pytest.raises(RuntimeError, match="stage b failed"):
+        runner.run(stage_calls.stages[1], fail)
+    assert StageManifest(manifest_path).stages["b"]["status"] == STATUS_FAILED
+
+    assert stage_calls.run() == ["b", "c"]
+    assert partial_output.read_text() == "v1ab"
+    assert StageManifest(manifest_path).stages["b"]["status"] == STATUS_COMPLETED
+
+
+def test_failed_address_cleaning_is_resumed(
+    make_pipeline_config: Callable[..., Dict[str, Any]],
+    synthetic_dataset: Dict[str, Any],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    from etl.pipeline import cleaning_scheduler, etl_run
+    from etl.pipeline.incremental import get_cleaned_dir
+    from etl.pipeline.transform.cleaning.address import address_cleaning
+
+    config = make_pipeline_config("run")
+    config["entities"] = [
+        entity
+        for entity in config["entities"]
+        if entity["name"] in ("post_offices", "addresses")
+    ]
+    etl_run.setup_environment(config)
+    etl_run.extract_entities_from_archive(Path(synthetic_dataset["archive"]), config)
+    manifest_path = etl_run.get_manifest_path(config)
+    cleaned_output = (
+        get_cleaned_dir(config, config["snapshot_date"]) / "cleaned_address_data.csv"
+    )
+
+    run_cleaning_job = cleaning_scheduler._run_cleaning_job
+    cleaned_entities: List[str] = []
+
+    def record_cleaning_job(entity: Dict[str, Any], config: Dict[str, Any]) -> Any:
+        cleaned_entities.append(entity["name"])
+        return run_cleaning_job(entity, config)
+
+    def run_cleaning_stages() -> None:
+        stages = etl_run.build_pipeline_stages(config)["clean"]
+        runner = StageRunner(StageManifest(manifest_path))
+        etl_run.run_cleaning_stages(config, runner, stages)
+
+    def fail_validation(*args: Any, **kwargs: Any) -> None:
+        raise RuntimeError("validation failed")
+
+    monkeypatch.setattr(cleaning_scheduler, "_run_cleaning_job", record_cleaning_job)
+    with monkeypatch.context() as patch:
+        patch.setattr(
+            address_cleaning, "validate_and_save_street_names", fail_validation
+        )
+        with pytest.raises(RuntimeError, match="addresses"):
+            run_cleaning_stages()
+    stages = StageManifest(manifest_path).stages
+    assert stages["clean:post_offices"]["status"] == STATUS_COMPLETED
+    assert stages["clean:addresses"]["status"] == STATUS_FAILED
+    assert not cleaned_output.exists()
+
+    cleaned_entities.clear()
+    run_cleaning_stages()
+    stages = StageManifest(manifest_path).stages
+    assert cleaned_entities == ["addresses"]
+    assert stages["clean:addresses"]["status"] == STATUS_COMPLETED
+    assert str(cleaned_output) in stages["clean:addresses"]["outputs"]
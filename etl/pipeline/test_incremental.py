@@ -0,0 +1,107 @@
+"""An incremental run must produce the cleaned outputs of a full run."""
+
+import copy
+import json
+import zipfile
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+import pandas as pd
+import pytest
+
+FIRST_SNAPSHOT_DATE = "2025-01-01"
+SECOND_SNAPSHOT_DATE = "2025-02-01"
+
+
+def load_records(archive: Path) -> List[Dict[str, Any]]:
+    with zipfile.ZipFile(archive) as zip_file:
+        return json.loads(zip_file.read(zip_file.namelist()[0]))
+
+
+def write_snapshot(records: List[Dict[str, Any]], path: Path) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(records), encoding="utf-8")
+    return path
+
+
+def change_company(record: Dict[str, Any]) -> Dict[str, Any]:
+    changed = copy.deepcopy(record)
+    changed["lastModified"] = f"{SECOND_SNAPSHOT_DATE}T12:00:00"
+    changed["names"][0]["name"] += " Uusi"
+    changed["addresses"][0]["buildingNumber"] = "1"
+    return changed
+
+
+def read_cleaned_outputs(cleaned_dir: Path) -> Dict[str, pd.DataFrame]:
+    from etl.utils.file_io import read_table
+
+    outputs = {}
+    for path in sorted(cleaned_dir.iterdir()):
+        if path.suffix == ".csv":
+            df = pd.read_csv(path, dtype=str, keep_default_na=False)
+        else:
+            df = read_table(str(path)).astype(str)
+        outputs[path.name] = df.sort_values(list(df.columns)).reset_index(drop=True)
+    return outputs
+
+
+@pytest.mark.parametrize("storage_format", ["csv", "parquet"])
+def test_incremental_run_equals_full_run(
+    make_pipeline_config: Callable[..., Dict[str, Any]],
+    synthetic_dataset: Dict[str, Any],
+    pipeline_workspace: Path,
+    storage_format: str,
+) -> None:
+    from etl.pipeline.entity_processing import get_extracted_table
+    from etl.pipeline.etl_run import process_and_clean_entities, setup_environment
+    from etl.pipeline.incremental import get_cleaned_dir
+    from etl.utils.file_io import read_table
+
+    records = load_records(Path(synthetic_dataset["archive"]))
+    snapshots = pipeline_workspace / "snapshots"
+    # The second snapshot removes 10 companies, changes 10 and adds 20
+    first = write_snapshot(records[:280], snapshots / f"{FIRST_SNAPSHOT_DATE}.json")
+    second = write_snapshot(
+        records[10:20]
+        + [change_company(record) for record in records[20:30]]
+        + records[30:],
+        snapshots / f"{SECOND_SNAPSHOT_DATE}.json",
+    )
+
+    def run(
+        run_name: str, snapshot: Path, snapshot_date: str, incremental: bool
+    ) -> Dict[str, Any]:
+        config = make_pipeline_config(
+            run_name,
+            snapshot_date=snapshot_date,
+            incremental=incremental,
+            storage_format=storage_format,
+        )
+        setup_environment(config)
+        process_and_clean_entities(config, snapshot)
+        return config
+
+    run("incremental", first, FIRST_SNAPSHOT_DATE, incremental=True)
+    incremental_config = run(
+        "incremental", second, SECOND_SNAPSHOT_DATE, incremental=True
+    )
+    full_config = run("full", second, SECOND_SNAPSHOT_DATE, incremental=False)
+
+    # Only the new and changed companies were extracted and cleaned again
+    extracted_ids = read_table(
+        str(get_extracted_table(incremental_config, "names")), columns=["businessId"]
+    )["businessId"]
+    assert set(extracted_ids) == {
+        record["businessId"]["value"] for record in records[20:30] + records[280:]
+    }
+
+    incremental_outputs = read_cleaned_outputs(
+        get_cleaned_dir(incremental_config, SECOND_SNAPSHOT_DATE)
+    )
+    full_outputs = read_cleaned_outputs(
+        get_cleaned_dir(full_config, SECOND_SNAPSHOT_DATE)
+    )
+    assert "cleaned_names" in "".join(full_outputs)
+    assert list(incremental_outputs) == list(full_outputs)
+    for name, full_output in full_outputs.items():
+        pd.testing.assert_frame_equal(incremental_outputs[name], full_output, obj=name)
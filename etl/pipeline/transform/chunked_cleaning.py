@@ -0,0 +1,278 @@
+"""Chunked Cleaning of Large Entities.
+
+Cleaning reads an extracted table whole by default. With `cleaning_chunk_size`
+set, entities whose cleaning only transforms rows independently (date formatting,
+text standardization, website normalization) are read and cleaned in chunks of
+that many rows, so the memory of their cleaning does not grow with the size of the
+register. Duplicate rows are dropped across chunks by a streaming deduplicator.
+
+Cleaning steps that compare rows with each other, such as keeping the latest
+version of a company name, are isolated into a keyed reduce phase: the rows are
+first spilled to partition files by a hash of their key, so that all rows of a
+business ID land in the same partition, and each partition is then cleaned as a
+whole. Memory is bounded by the size of a partition (see `cleaning_partitions`).
+The cleaned outputs of the partitions are merged by key, so they are saved in the
+same order as with whole-table cleaning.
+
+Entities whose cleaning needs the whole table (post offices, addresses) are always
+cleaned in one piece.
+"""
+
+import itertools
+import logging
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from etl.pipeline.transform.cleaning.core.base_cleaning import (
+    remove_duplicates,
+    standardize_column_names,
+)
+from etl.utils.file_io import (
+    defer_parquet_outputs,
+    iter_table_chunks,
+    redirect_outputs,
+    save_to_csv_and_upload,
+)
+from etl.utils.row_dedup import RowDeduplicator, hash_rows
+
+logger = logging.getLogger(__name__)
+
+# Entities whose cleaning transforms every row on its own
+ROW_LOCAL_ENTITIES = (
+    "companies",
+    "company_forms",
+    "company_situations",
+    "main_business_lines",
+    "registered_entries",
+)
+# Entities whose cleaning compares the rows sharing a key, with that key
+KEYED_ENTITIES = {"names": "business_id"}
+# Default number of key partitions (`cleaning_partitions`)
+DEFAULT_PARTITIONS = 16
+
+# Cleans preprocessed rows of an entity and writes its outputs
+FrameCleaner = Callable[[pd.DataFrame], None]
+
+
+def supports_chunked_cleaning(entity_name: str) -> bool:
+    """Check whether an entity can be cleaned in chunks.
+
+    Args:
+        entity_name (str): Name of the entity.
+
+    Returns:
+        bool: True for `ROW_LOCAL_ENTITIES` and `KEYED_ENTITIES`.
+    """
+    return entity_name in ROW_LOCAL_ENTITIES or entity_name in KEYED_ENTITIES
+
+
+def uses_chunked_cleaning(config: Dict[str, Any], entity_name: str) -> bool:
+    """Check whether an entity is cleaned in chunks.
+
+    Args:
+        config (Dict[str, Any]): Configuration dictionary.
+        entity_name (str): Name of the entity.
+
+    Returns:
+        bool: True if `cleaning_chunk_size` is set and the entity supports it.
+    """
+    if not int(config.get("cleaning_chunk_size", 0)):
+        return False
+    return supports_chunked_cleaning(entity_name)
+
+
+def clean_in_chunks(
+    input_file: str,
+    entity_name: str,
+    clean_frame: FrameCleaner,
+    spill_dir: str,
+    config: Dict[str, Any],
+    dtype_plan: Optional[Dict[str, str]] = None,
+) -> int:
+    """Clean an extracted table in chunks of `cleaning_chunk_size` rows.
+
+    Parquet outputs are written as part files while the chunks are cleaned and
+    combined into the output files at the end.
+
+    Args:
+        input_file (str): Path to the extracted CSV file or Parquet table.
+        entity_name (str): Name of the entity, one of `ROW_LOCAL_ENTITIES` or
+            `KEYED_ENTITIES`.
+        clean_frame (FrameCleaner): Entity-specific cleaning of preprocessed rows.
+        spill_dir (str): Directory for the partition files of keyed entities.
+        config (Dict[str, Any]): Configuration dictionary.
+        dtype_plan (Optional[Dict[str, str]]): pandas dtypes to read the table with.
+
+    Returns:
+        int: Number of rows read.
+    """
+    chunk_size = int(config["cleaning_chunk_size"])
+    chunks = (
+        standardize_column_names(chunk)
+        for chunk in iter_table_chunks(input_file, chunk_size, dtype_plan)
+    )
+    with defer_parquet_outputs(config):
+        if entity_name in KEYED_ENTITIES:
+            partitions = int(config.get("cleaning_partitions", DEFAULT_PARTITIONS))
+            return clean_key_partitions(
+                chunks,
+                KEYED_ENTITIES[entity_name],
+                clean_frame,
+                spill_dir,
+                partitions,
+                config,
+                chunk_size,
+            )
+        return clean_row_chunks(chunks, entity_name, clean_frame)
+
+
+def clean_row_chunks(
+    chunks: Iterable[pd.DataFrame], entity_name: str, clean_frame: FrameCleaner
+) -> int:
+    """Clean every chunk on its own, dropping rows seen in earlier chunks.
+
+    Args:
+        chunks (Iterable[pd.DataFrame]): Chunks with standardized column names.
+        entity_name (str): Name of the entity, used in logs.
+        clean_frame (FrameCleaner): Entity-specific cleaning of preprocessed rows.
+
+    Returns:
+        int: Number of rows read.
+    """
+    deduplicator = RowDeduplicator(entity_name)
+    rows = 0
+    for chunk in chunks:
+        rows += len(chunk)
+        chunk = deduplicator.filter(chunk)
+        if not chunk.empty:
+            clean_frame(chunk)
+    deduplicator.log_stats()
+    return rows
+
+
+def clean_key_partitions(
+    chunks: Iterable[pd.DataFrame],
+    key: str,
+    clean_frame: FrameCleaner,
+    spill_dir: str,
+    partitions: int,
+    config: Dict[str, Any],
+    chunk_size: int,
+) -> int:
+    """Spill chunks to partitions by key, then clean every partition as a whole.
+
+    Rows keep their input order within a partition, and identical rows share a
+    key, so the partitions are deduplicated on their own. The outputs of the
+    partitions are spilled as well and merged by key, so they are saved in the
+    order of whole-table cleaning, which sorts them by key.
+
+    Args:
+        chunks (Iterable[pd.DataFrame]): Chunks with standardized column names.
+        key (str): Column whose equal values are cleaned together; it must not be
+            missing.
+        clean_frame (FrameCleaner): Entity-specific cleaning of preprocessed rows,
+            saving its outputs sorted by `key`.
+        spill_dir (str): Directory in which the partition files are created.
+        partitions (int): Number of partitions.
+        config (Dict[str, Any]): Configuration dictionary, to save the outputs.
+        chunk_size (int): Largest number of rows per spilled output run.
+
+    Returns:
+        int: Number of rows read.
+
+    Raises:
+        ValueError: If the number of partitions is not positive.
+    """
+    if partitions <= 0:
+        raise ValueError(f"cleaning_partitions must be positive, got {partitions}")
+    Path(spill_dir).mkdir(parents=True, exist_ok=True)
+    rows = 0
+    with tempfile.TemporaryDirectory(prefix="partitions_", dir=spill_dir) as temp_dir:
+        partition_dirs = [Path(temp_dir) / f"{p:04d}" for p in range(partitions)]
+        for index, chunk in enumerate(chunks):
+            rows += len(chunk)
+            partition_ids = hash_rows(chunk, [key]) % partitions
+            for partition, part in chunk.groupby(partition_ids, sort=False):
+                partition_dirs[partition].mkdir(exist_ok=True)
+                part.to_pickle(partition_dirs[partition] / f"{index:06d}.pkl")
+        logger.info(f"Spilled {rows} rows to {partitions} partitions by '{key}'")
+
+        # Runs of every output, per partition: (output file, entity) -> files
+        output_runs: Dict[Tuple[str, str], Dict[int, List[Path]]] = {}
+        output_dir = Path(temp_dir) / "outputs"
+        output_dir.mkdir()
+        run_numbers = itertools.count()
+        for partition, partition_dir in enumerate(partition_dirs):
+            part_files = sorted(partition_dir.glob("*.pkl"))
+            if not part_files:
+                continue
+            df = pd.concat(
+                [pd.read_pickle(part_file) for part_file in part_files],
+                ignore_index=True,
+            )
+
+            def spill_output(
+                output: pd.DataFrame, output_file: str, entity_name: str
+            ) -> None:
+                runs = output_runs.setdefault((output_file, entity_name), {})
+                partition_runs = runs.setdefault(partition, [])
+                for start in range(0, len(output), chunk_size):
+                    run_file = output_dir / f"{next(run_numbers):06d}.pkl"
+                    output.iloc[start : start + chunk_size].to_pickle(run_file)
+                    partition_runs.append(run_file)
+
+            with redirect_outputs(spill_output):
+                clean_frame(remove_duplicates(df))
+            del df
+            shutil.rmtree(partition_dir)
+
+        for (output_file, entity_name), runs in output_runs.items():
+            for block in merge_key_ordered_runs(list(runs.values()), key):
+                save_to_csv_and_upload(block, output_file, entity_name, config)
+    return rows
+
+
+def _read_next_run(runs: Iterator[Path]) -> Optional[pd.DataFrame]:
+    run_file = next(runs, None)
+    return None if run_file is None else pd.read_pickle(run_file)
+
+
+def merge_key_ordered_runs(
+    partition_runs: List[List[Path]], key: str
+) -> Iterator[pd.DataFrame]:
+    """Merge the sorted outputs of key partitions into blocks in key order.
+
+    Every partition's runs are sorted by `key` and no key is in two partitions, so
+    the rows up to the smallest last key of the current runs can be emitted. Only
+    one run per partition is held in memory.
+
+    Args:
+        partition_runs (List[List[Path]]): Pickled runs of every partition, in order.
+        key (str): The sort key of the runs.
+
+    Yields:
+        pd.DataFrame: The rows in key order, rows of a key in their partition order.
+    """
+    iterators = [iter(runs) for runs in partition_runs]
+    current = [_read_next_run(runs) for runs in iterators]
+    while any(run is not None for run in current):
+        active = [p for p, run in enumerate(current) if run is not None]
+        bound = min(current[p][key].iloc[-1] for p in active)
+        blocks = []
+        for p in active:
+            run = current[p]
+            count = int(
+                np.searchsorted(run[key].to_numpy(dtype=object), bound, side="right")
+            )
+            if count:
+                blocks.append(run.iloc[:count])
+            current[p] = run.iloc[count:] if count < len(run) else None
+            if current[p] is None:
+                current[p] = _read_next_run(iterators[p])
+        if blocks:
+            yield pd.concat(blocks).sort_values(key, kind="stable")
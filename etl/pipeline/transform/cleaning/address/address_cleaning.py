@@ -5,9 +5,10 @@ It includes steps for removing unnecessary columns, filtering invalid rows, stan
 """
 
 import logging
-from glob import glob
+from pathlib import Path
 
 import pandas as pd
+from etl.pipeline.parallel_extraction import resolve_worker_count
 from etl.pipeline.transform.cleaning.address.address_cleaning_helpers import (
     filter_and_save_special_chars_street_addresses,
     filter_clean_and_save_missing_street_addresses,
@@ -26,14 +27,24 @@ from etl.pipeline.transform.cleaning.core.cleaning_utils import (
     normalize_postal_codes,
     remove_invalid_post_codes,
 )
+from etl.pipeline.transform.cleaning.validation.fuzzy_match_cache import (
+    load_fuzzy_match_cache,
+)
+from etl.pipeline.transform.cleaning.validation.reference_index import (
+    get_address_index_dir,
+    load_address_reference,
+)
 from etl.pipeline.transform.cleaning.validation.validate_addresses import (
     validate_street_names,
 )
-from etl.utils.file_io import read_and_concatenate_csv_files, save_to_csv_and_upload
+from etl.utils.columnar_io import STORAGE_FORMAT_CSV
+from etl.utils.file_io import save_to_csv_and_upload
+from etl.utils.run_profiler import PROFILER, profile_step
 
 logger = logging.getLogger(__name__)
 
 
+@profile_step()
 def clean_addresses(
     df: pd.DataFrame,
     staging_dir: str,
@@ -49,6 +60,10 @@ def clean_addresses(
         output_dir (str): Path to save cleaned files.
         config (dict): Config dictionary for S3 upload.
         entity_name (str): Name of the entity (default: "addresses").
+
+    Raises:
+        Exception: Any error of a cleaning step, after it has been logged, so the
+            cleaning job (and its checkpoint) is recorded as failed.
     """
     logger.info("Starting address cleaning process...")
 
@@ -68,7 +83,9 @@ def clean_addresses(
         df = clean_building_number(df)
         df = clean_entrance_column(df)
         df = clean_street_column(df)
-        df = add_columns_from_csv(df, staging_dir)
+        df = add_columns_from_csv(
+            df, staging_dir, config.get("storage_format", STORAGE_FORMAT_CSV)
+        )
 
         # Step 5: Filter & Move Data to Staging
         df, missing_streets = filter_clean_and_save_missing_street_addresses(df)
@@ -88,10 +105,13 @@ def clean_addresses(
         logger.info("Address cleaning process completed successfully.")
     except KeyError as e:
         logger.error(f"Missing column during address cleaning process: {e}")
+        raise
     except Exception as e:
         logger.error(f"Error during address cleaning process: {e}")
+        raise
 
 
+@profile_step()
 def validate_and_save_street_names(
     df: pd.DataFrame, staging_dir: str, output_dir: str, config: dict, entity_name: str
 ) -> None:
@@ -105,13 +125,21 @@ def validate_and_save_street_names(
         entity_name (str): Name of the entity.
     """
     logger.info("Validating street names...")
-    finland_path_pattern = "etl/data/resources/*_addresses_2024-11-14.csv"
-    finland_file_paths = glob(finland_path_pattern)
-    finland_df = read_and_concatenate_csv_files(finland_file_paths)
+    resources_dir = Path(config["directory_structure"]["resources_dir"])
+    with PROFILER.measure("validate:reference_index"):
+        reference = load_address_reference(resources_dir, get_address_index_dir(config))
+        fuzzy_match_cache = load_fuzzy_match_cache(config, reference)
 
     address_with_coordinates_df, unmatched_df = validate_street_names(
-        df, finland_df, staging_dir
+        df,
+        reference,
+        staging_dir,
+        resolve_worker_count(config, "address_validation_workers"),
+        fuzzy_match_cache,
     )
+    if fuzzy_match_cache is not None:
+        with PROFILER.measure("validate:fuzzy_match_cache"):
+            fuzzy_match_cache.save()
 
     df_merged = standardize_and_clean_data(address_with_coordinates_df)
     save_to_csv_and_upload(
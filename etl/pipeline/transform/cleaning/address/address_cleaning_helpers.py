@@ -10,8 +10,11 @@ from typing import Tuple
 import pandas as pd
 
 from etl.pipeline.transform.cleaning.address.address_helpers import filter_street_column
+from etl.pipeline.transform.cleaning.core.normalization import normalize_dates
+from etl.utils.run_profiler import profile_step
 
 
+@profile_step()
 def filter_clean_and_save_missing_street_addresses(
     df: pd.DataFrame,
 ) -> Tuple[pd.DataFrame, pd.DataFrame]:
@@ -61,15 +64,9 @@ def filter_clean_and_save_missing_street_addresses(
         missing_street = missing_street.drop(columns=columns_to_remove, errors="ignore")
 
         # Convert 'registration_date' to standardized format
-        missing_street["registration_date"] = pd.to_datetime(
-            missing_street["registration_date"], errors="coerce"
-        )
-        missing_street["registration_date"] = missing_street[
-            "registration_date"
-        ].dt.strftime("%Y-%m-%d")
-        missing_street["registration_date"] = missing_street[
-            "registration_date"
-        ].fillna("")
+        missing_street["registration_date"] = normalize_dates(
+            missing_street["registration_date"]
+        ).fillna("")
 
         # Convert 'postal_code' and 'municipality' to string, preserving leading zeros
         if "postal_code" in missing_street.columns:
@@ -91,6 +88,7 @@ def filter_clean_and_save_missing_street_addresses(
     return df, missing_street
 
 
+@profile_step()
 def filter_and_save_special_chars_street_addresses(df: pd.DataFrame) -> pd.DataFrame:
     """Filter and save special characters street addresses.
 
@@ -157,6 +155,7 @@ def move_numbers_to_columns(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+@profile_step()
 def standardize_and_clean_data(df: pd.DataFrame) -> pd.DataFrame:
     """Standardize and clean the DataFrame.
 
@@ -169,9 +168,7 @@ def standardize_and_clean_data(df: pd.DataFrame) -> pd.DataFrame:
     df["apartment_number"] = pd.to_numeric(
         df["apartment_number"], errors="coerce"
     ).astype("Int64")
-    df["registration_date"] = pd.to_datetime(df["registration_date"], errors="coerce")
-    df["registration_date"] = df["registration_date"].dt.strftime("%Y-%m-%d")
-    df["registration_date"] = df["registration_date"].fillna("")
+    df["registration_date"] = normalize_dates(df["registration_date"]).fillna("")
     df["street"] = df["street"].str.title().str.strip()
     df["city"] = df["city"].str.title().str.strip()
     df["country"] = df["country"].str.upper().str.strip()
@@ -194,6 +191,7 @@ def standardize_and_clean_data(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+@profile_step()
 def process_unmatched_addresses(df: pd.DataFrame) -> pd.DataFrame:
     """Process unmatched addresses.
 
@@ -205,9 +203,7 @@ def process_unmatched_addresses(df: pd.DataFrame) -> pd.DataFrame:
     """
     df = df.dropna(subset=["street"])
     df = df.drop(columns=["latitude_wgs84", "longitude_wgs84"], errors="ignore")
-    df["registration_date"] = pd.to_datetime(df["registration_date"], errors="coerce")
-    df["registration_date"] = df["registration_date"].dt.strftime("%Y-%m-%d")
-    df["registration_date"] = df["registration_date"].fillna("")
+    df["registration_date"] = normalize_dates(df["registration_date"]).fillna("")
     df["postal_code"] = df["postal_code"].astype(str)
     df["municipality"] = df["municipality"].astype(str)
     return df
@@ -4,10 +4,15 @@ import logging
 
 import pandas as pd
 
+from etl.utils.columnar_io import STORAGE_FORMAT_CSV, with_storage_suffix
+from etl.utils.file_io import read_table
+from etl.utils.run_profiler import profile_step
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+@profile_step()
 def drop_unnecessary_columns(df: pd.DataFrame, columns_to_drop: list) -> pd.DataFrame:
     """Drop specified unnecessary columns from the DataFrame.
 
@@ -23,6 +28,7 @@ def drop_unnecessary_columns(df: pd.DataFrame, columns_to_drop: list) -> pd.Data
     )
 
 
+@profile_step()
 def remove_unusable_rows(df: pd.DataFrame, required_columns: list) -> pd.DataFrame:
     """Remove rows where all specified key address components are missing.
 
@@ -38,6 +44,7 @@ def remove_unusable_rows(df: pd.DataFrame, required_columns: list) -> pd.DataFra
     return df
 
 
+@profile_step()
 def clean_building_number(df: pd.DataFrame) -> pd.DataFrame:
     """Remove rows with specific invalid 'business_id' values.
 
@@ -51,13 +58,20 @@ def clean_building_number(df: pd.DataFrame) -> pd.DataFrame:
         logger.warning("'business_id' column not found in DataFrame.")
         return df
 
-    # Remove decimal points and trim spaces from building_number
+    # Remove decimal points and trim spaces from building_number, keeping missing
+    # numbers missing (CSV reads them as NaN, Parquet as None)
     df["building_number"] = (
-        df["building_number"].astype(str).str.strip().str.split(".").str[0]
+        df["building_number"]
+        .astype(str)
+        .str.strip()
+        .str.split(".")
+        .str[0]
+        .where(df["building_number"].notna())
     )
     return df
 
 
+@profile_step()
 def clean_entrance_column(df: pd.DataFrame) -> pd.DataFrame:
     """Clean and normalize the 'entrance' column in the DataFrame.
 
@@ -90,8 +104,11 @@ def clean_entrance_column(df: pd.DataFrame) -> pd.DataFrame:
         }
     )
 
-    # Step 3: Normalize case (capitalize all valid entries)
-    df["entrance"] = df["entrance"].str.lower().astype(str).str.strip()
+    # Step 3: Normalize case, keeping missing entrances missing so that they do not
+    # end up in house numbers as "nan" or "None"
+    df["entrance"] = (
+        df["entrance"].astype(str).str.lower().str.strip().where(df["entrance"].notna())
+    )
     return df
 
 
@@ -128,6 +145,7 @@ def filter_street_column(df: pd.DataFrame, filter_type: str) -> pd.DataFrame:
     return filtered_df
 
 
+@profile_step()
 def clean_street_column(df: pd.DataFrame) -> pd.DataFrame:
     """Clean and normalize the 'street' column in the DataFrame.
 
@@ -176,22 +194,32 @@ def clean_street_column(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
-def add_columns_from_csv(df: pd.DataFrame, staging_dir: str) -> pd.DataFrame:
+@profile_step()
+def add_columns_from_csv(
+    df: pd.DataFrame, staging_dir: str, storage_format: str = STORAGE_FORMAT_CSV
+) -> pd.DataFrame:
     """Add municipality and active columns to the DataFrame by matching business_id from another CSV file.
 
     Args:
         df (pd.DataFrame): The input DataFrame.
         staging_dir (str): Path to the CSV file containing business_id, municipality, and active columns.
+        storage_format (str): Storage format of the staging data, "csv" or "parquet".
 
     Returns:
         pd.DataFrame: The DataFrame with added columns.
     """
-    output_path = f"{staging_dir}/staging_post_offices.csv"
-    additional_data = pd.read_csv(output_path)
+    output_path = with_storage_suffix(
+        f"{staging_dir}/staging_post_offices.csv", storage_format
+    )
+    additional_data = read_table(
+        str(output_path),
+        columns=["business_id", "postal_code", "municipality", "city", "active"],
+    )
+    if additional_data["postal_code"].dtype == object:
+        # Typed storage keeps postal codes as strings: pad them like the staging table
+        df["postal_code"] = df["postal_code"].str.zfill(5)
     df = df.merge(
-        additional_data[
-            ["business_id", "postal_code", "municipality", "city", "active"]
-        ],
+        additional_data,
         on=["business_id", "postal_code"],
         how="left",
     )
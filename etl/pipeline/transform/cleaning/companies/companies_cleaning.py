@@ -1,7 +1,12 @@
 from urllib.parse import urlparse
 
 import pandas as pd
+from etl.pipeline.transform.cleaning.core.normalization import (
+    map_unique,
+    normalize_dates,
+)
 from etl.utils.file_io import save_to_csv_and_upload
+from etl.utils.run_profiler import profile_step
 
 
 def clean_website(url: str) -> str:
@@ -33,6 +38,7 @@ def clean_website(url: str) -> str:
     return url
 
 
+@profile_step()
 def clean_companies(
     df: pd.DataFrame,
     staging_dir: str,
@@ -42,20 +48,14 @@ def clean_companies(
 ) -> pd.DataFrame:
 
     # Apply website cleaning function
-    df["website"] = df["website"].apply(clean_website)
+    df["website"] = map_unique(df["website"], clean_website)
 
     # Convert `registrationDate` and `lastModified` to YYYY-MM-DD format
-    df["registration_date"] = pd.to_datetime(
-        df["registration_date"], errors="coerce"
-    ).dt.strftime("%Y-%m-%d")
-    df["last_modified"] = pd.to_datetime(
-        df["last_modified"], errors="coerce"
-    ).dt.strftime("%Y-%m-%d")
+    df["registration_date"] = normalize_dates(df["registration_date"])
+    df["last_modified"] = normalize_dates(df["last_modified"])
 
     # Convert `endDate` to YYYY-MM-DD (NULL if missing)
-    df["end_date"] = pd.to_datetime(df["end_date"], errors="coerce").dt.strftime(
-        "%Y-%m-%d"
-    )
+    df["end_date"] = normalize_dates(df["end_date"])
 
     # Filter rows where the `website` column is missing
     df_missing_website = df[df["website"].isna() | (df["website"].str.strip() == "")]
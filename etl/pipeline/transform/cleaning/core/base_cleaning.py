@@ -8,10 +8,12 @@ import logging
 import re
 
 import pandas as pd
+from etl.utils.run_profiler import profile_step
 
 logger = logging.getLogger(__name__)
 
 
+@profile_step()
 def standardize_column_names(df: pd.DataFrame) -> pd.DataFrame:
     """Standardize column names to snake_case without excessive underscores.
 
@@ -44,6 +46,7 @@ def standardize_column_names(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+@profile_step()
 def remove_duplicates(df: pd.DataFrame) -> pd.DataFrame:
     """Remove duplicate rows from a DataFrame.
 
@@ -15,10 +15,12 @@ Key Features:
 import logging
 
 import pandas as pd
+from etl.utils.run_profiler import profile_step
 
 logger = logging.getLogger(__name__)
 
 
+@profile_step()
 def normalize_postal_codes(
     df: pd.DataFrame, column_name: str = "postal_code"
 ) -> pd.DataFrame:
@@ -38,6 +40,7 @@ def normalize_postal_codes(
     return df
 
 
+@profile_step()
 def remove_invalid_post_codes(df: pd.DataFrame) -> pd.DataFrame:
     """Remove rows where the 'post_code' column has the value 0.0.
 
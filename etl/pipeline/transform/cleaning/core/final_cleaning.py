@@ -5,7 +5,12 @@ It ensures data integrity by formatting dates, standardizing text fields, and ha
 """
 
 import pandas as pd
+from etl.pipeline.transform.cleaning.core.normalization import (
+    normalize_dates,
+    standardize_text,
+)
 from etl.utils.file_io import save_to_csv_and_upload
+from etl.utils.run_profiler import profile_step
 
 
 def standardize_text_fields(df: pd.DataFrame, columns: list) -> pd.DataFrame:
@@ -19,7 +24,7 @@ def standardize_text_fields(df: pd.DataFrame, columns: list) -> pd.DataFrame:
         pd.DataFrame: DataFrame with standardized text fields.
     """
     for col in columns:
-        df[col] = df[col].str.strip().str.title()
+        df[col] = standardize_text(df[col])
     return df
 
 
@@ -34,10 +39,11 @@ def format_dates(df: pd.DataFrame, columns: list) -> pd.DataFrame:
         pd.DataFrame: DataFrame with formatted date columns.
     """
     for col in columns:
-        df[col] = pd.to_datetime(df[col], errors="coerce").dt.strftime("%Y-%m-%d")
+        df[col] = normalize_dates(df[col])
     return df
 
 
+@profile_step()
 def clean_dataset(
     df: pd.DataFrame, text_columns: list, date_columns: list, nullable_columns: list
 ) -> pd.DataFrame:
@@ -59,6 +65,7 @@ def clean_dataset(
     return df
 
 
+@profile_step()
 def clean_registered_entries(
     df: pd.DataFrame,
     output_dir: str,
@@ -87,6 +94,7 @@ def clean_registered_entries(
     )
 
 
+@profile_step()
 def clean_company_forms(
     df: pd.DataFrame, output_dir: str, config: dict, entity_name: str = "company_forms"
 ) -> None:
@@ -106,6 +114,7 @@ def clean_company_forms(
     )
 
 
+@profile_step()
 def clean_company_situations(
     df: pd.DataFrame,
     output_dir: str,
@@ -0,0 +1,138 @@
+"""Vectorized Text and Date Normalization.
+
+This module provides the column-level normalization shared by the cleaning
+modules. Row-wise `.apply()` calls and format-inferring date parsing are replaced
+by vectorized pandas string operations and by evaluating expensive conversions
+once per distinct value: registers repeat the same dates, statuses and sources on
+many rows, so parsing and formatting only the unique values and mapping the
+results back to the rows avoids most of the work.
+
+Key Features:
+- `map_unique` applies a scalar function once per distinct value of a column.
+- `normalize_dates` parses ISO 8601 values with an explicit format and formats
+  them as `YYYY-MM-DD`, per distinct value.
+- `standardize_text` and `normalize_company_names` are vectorized string
+  pipelines with the same results as the former row-wise functions.
+"""
+
+from typing import Any, Callable
+
+import numpy as np
+import pandas as pd
+
+# Format of the dates in the extracted PRH data
+INPUT_DATE_FORMAT = "ISO8601"
+# Format of the dates in the cleaned tables
+OUTPUT_DATE_FORMAT = "%Y-%m-%d"
+
+# Characters kept in company names, and runs of spaces collapsed afterwards
+COMPANY_NAME_REMOVED_CHARS = r"[^a-zA-Z0-9&\-. ]+"
+REPEATED_SPACES = r" {2,}"
+
+
+def _take_by_codes(
+    series: pd.Series, codes: np.ndarray, values: Any, na_value: Any
+) -> pd.Series:
+    # Code -1 (a missing value) picks the value appended at the end
+    lookup = np.empty(len(values) + 1, dtype=object)
+    lookup[:-1] = values
+    lookup[-1] = na_value
+    return pd.Series(lookup[codes], index=series.index, name=series.name)
+
+
+def map_unique(series: pd.Series, func: Callable[[Any], Any]) -> pd.Series:
+    """Apply a scalar function once per distinct value of a Series.
+
+    Equivalent to `series.apply(func)` for a pure function, but `func` is called
+    only for the unique values (and once for missing values, passed as NaN).
+
+    Args:
+        series (pd.Series): The values to map.
+        func (Callable[[Any], Any]): The function to apply to a single value.
+
+    Returns:
+        pd.Series: The results, aligned with the input.
+    """
+    codes, uniques = pd.factorize(series)
+    values = [func(value) for value in uniques]
+    na_value = func(np.nan) if (codes == -1).any() else np.nan
+    return _take_by_codes(series, codes, values, na_value).infer_objects()
+
+
+def normalize_dates(
+    series: pd.Series, input_format: str = INPUT_DATE_FORMAT
+) -> pd.Series:
+    """Format a date column as `YYYY-MM-DD` strings.
+
+    Each distinct value is parsed with an explicit format instead of a format
+    inferred from the first value. Values that cannot be parsed become missing, as
+    with `pd.to_datetime(..., errors="coerce")`. Columns already read as datetimes
+    are only formatted.
+
+    Args:
+        series (pd.Series): Date strings or datetimes.
+        input_format (str): Format of the date strings, ISO 8601 by default.
+
+    Returns:
+        pd.Series: The formatted dates, NaN where missing or invalid.
+    """
+    codes, uniques = pd.factorize(series)
+    if isinstance(uniques, pd.DatetimeIndex):
+        parsed = uniques
+    else:
+        parsed = pd.DatetimeIndex(
+            pd.to_datetime(
+                pd.Series(uniques, dtype=object), format=input_format, errors="coerce"
+            )
+        )
+    values = parsed.strftime(OUTPUT_DATE_FORMAT).to_numpy(dtype=object)
+    return _take_by_codes(series, codes, values, np.nan)
+
+
+def standardize_text(series: pd.Series) -> pd.Series:
+    """Strip and title-case text, once per distinct value.
+
+    Same result as `series.str.strip().str.title()`; non-string values become NaN.
+
+    Args:
+        series (pd.Series): The text column.
+
+    Returns:
+        pd.Series: The standardized text.
+    """
+    codes, uniques = pd.factorize(series)
+    values = [
+        value.strip().title() if isinstance(value, str) else np.nan for value in uniques
+    ]
+    return _take_by_codes(series, codes, values, np.nan)
+
+
+def normalize_company_names(series: pd.Series) -> pd.Series:
+    """Clean and standardize company names with vectorized string operations.
+
+    Names are trimmed, characters other than letters, digits, '&', '-', '.' and
+    spaces are removed, and runs of spaces collapsed. Names that are not entirely
+    upper case are title-cased. Missing and non-string values become "".
+
+    Args:
+        series (pd.Series): Raw company names.
+
+    Returns:
+        pd.Series: Cleaned company names.
+    """
+    if not (
+        pd.api.types.is_object_dtype(series)
+        or pd.api.types.is_string_dtype(series)
+        or isinstance(series.dtype, pd.CategoricalDtype)
+    ):
+        return pd.Series("", index=series.index, name=series.name, dtype=object)
+
+    names = (
+        series.astype(object)
+        .str.strip()
+        .str.replace(COMPANY_NAME_REMOVED_CHARS, "", regex=True)
+        .str.replace(REPEATED_SPACES, " ", regex=True)
+    )
+    not_upper = names.str.isupper().eq(False)
+    names[not_upper] = names[not_upper].str.title()
+    return names.fillna("")
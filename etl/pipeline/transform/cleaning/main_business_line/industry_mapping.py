@@ -2,6 +2,7 @@
 
 import pandas as pd
 from rapidfuzz import fuzz, process
+from etl.utils.run_profiler import profile_step
 
 
 def find_best_match(description, choices):
@@ -48,6 +49,7 @@ def map_industry_code_to_category(
     return None, None
 
 
+@profile_step()
 def process_main_business_lines(main_business_lines_df: pd.DataFrame) -> pd.DataFrame:
     """Process the main_business_lines DataFrame to fill missing industry_letter values.
 
@@ -109,21 +111,23 @@ def process_main_business_lines(main_business_lines_df: pd.DataFrame) -> pd.Data
     # Define the language column to use
     lang_column = "Title_en"  # Change this to "Title_fi" or "Title_sv" as needed
 
-    # Apply the mapping function to the DataFrame
-    missing_industry_letter_df[["industry", "industry_letter"]] = (
-        missing_industry_letter_df.apply(
-            lambda row: pd.Series(
-                map_industry_code_to_category(
-                    row["industry_code"],
-                    row["industry_description"],
-                    lang_column,
-                    source_to_target_dict,
-                    industry_2025_dict,
-                )
-            ),
-            axis=1,
+    # Apply the mapping function to the DataFrame (apply() on an empty frame
+    # returns no columns to assign)
+    if not missing_industry_letter_df.empty:
+        missing_industry_letter_df[["industry", "industry_letter"]] = (
+            missing_industry_letter_df.apply(
+                lambda row: pd.Series(
+                    map_industry_code_to_category(
+                        row["industry_code"],
+                        row["industry_description"],
+                        lang_column,
+                        source_to_target_dict,
+                        industry_2025_dict,
+                    )
+                ),
+                axis=1,
+            )
         )
-    )
 
     # Merge the updated missing_industry_letter_df back into main_business_lines_df
     main_business_lines_df = pd.concat(
@@ -6,8 +6,10 @@ from etl.pipeline.transform.cleaning.main_business_line.industry_mapping import
     process_main_business_lines,
 )
 from etl.utils.file_io import save_to_csv_and_upload
+from etl.utils.run_profiler import profile_step
 
 
+@profile_step()
 def clean_main_business_lines(
     df: pd.DataFrame,
     output_dir: str,
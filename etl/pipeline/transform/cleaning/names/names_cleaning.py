@@ -1,37 +1,15 @@
 """This module provides functions for cleaning and standardizing company names."""
 
-import re
-
 import pandas as pd
+from etl.pipeline.transform.cleaning.core.normalization import (
+    normalize_company_names,
+    normalize_dates,
+)
 from etl.utils.file_io import save_to_csv_and_upload
+from etl.utils.run_profiler import profile_step
 
 
-def clean_company_name(name: str) -> str:
-    """Cleans and standardizes company names by trimming, removing unnecessary special characters, and maintaining relevant formatting.
-
-    Args:
-        name (str): Raw company name.
-
-    Returns:
-        str: Cleaned company name.
-
-    """
-    if not isinstance(name, str) or pd.isna(name):
-        return ""
-
-    name = name.strip()  # Trim spaces
-    name = re.sub(
-        r"[^a-zA-Z0-9&\-. ]", "", name
-    )  # Keep '&', '-', and '.' but remove other special characters
-    name = re.sub(r"\s+", " ", name)  # Replace multiple spaces with a single space
-
-    # Preserve uppercase formatting if the name is entirely in uppercase
-    if not name.isupper():
-        name = name.title()  # Standardize capitalization for non-uppercase names
-
-    return name
-
-
+@profile_step()
 def clean_names(
     df: pd.DataFrame,
     staging_dir: str,
@@ -52,15 +30,11 @@ def clean_names(
         None
     """
     # Apply cleaning to company_name column
-    df["company_name"] = df["company_name"].apply(clean_company_name)
+    df["company_name"] = normalize_company_names(df["company_name"])
 
     # Standardize `registrationDate` and `endDate` to YYYY-MM-DD format
-    df.loc[:, "registration_date"] = pd.to_datetime(
-        df["registration_date"], errors="coerce"
-    ).dt.strftime("%Y-%m-%d")
-    df.loc[:, "end_date"] = pd.to_datetime(df["end_date"], errors="coerce").dt.strftime(
-        "%Y-%m-%d"
-    )
+    df["registration_date"] = normalize_dates(df["registration_date"])
+    df["end_date"] = normalize_dates(df["end_date"])
 
     # Mark active companies where `endDate` is missing
     df.loc[:, "active"] = df["end_date"].isna()
@@ -10,11 +10,13 @@ from etl.pipeline.transform.cleaning.core.cleaning_utils import (
     remove_invalid_post_codes,
 )
 from etl.utils.file_io import save_to_csv_and_upload
+from etl.utils.run_profiler import profile_step
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+@profile_step()
 def match_municipality_codes(df: pd.DataFrame, resources_dir: str) -> pd.DataFrame:
     """Match municipality codes from the given CSV file to the DataFrame.
 
@@ -51,6 +53,7 @@ def match_municipality_codes(df: pd.DataFrame, resources_dir: str) -> pd.DataFra
     return df
 
 
+@profile_step()
 def format_city_names(df: pd.DataFrame) -> pd.DataFrame:
     """Format city names to have the first letter capitalized and the rest in lowercase, and strip empty spaces.
 
@@ -64,6 +67,7 @@ def format_city_names(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+@profile_step()
 def clean_post_offices(
     df: pd.DataFrame,
     resources_dir: str,
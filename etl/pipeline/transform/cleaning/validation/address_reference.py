@@ -0,0 +1,187 @@
+"""Address Reference.
+
+Lookup structures built from the normalized Finland address reference. Every
+validation tier matches addresses within a postal code or a municipality, so the
+structures are kept per key column.
+
+The structures are derived from two flat tables per key column, which is the form
+in which the prebuilt reference index stores them (see `reference_index`):
+
+- `streets_<key>`: the distinct (key, street) pairs, in the order of their first
+  occurrence in the reference.
+- `addresses_<key>`: the distinct (street, key, house_number) addresses with the
+  coordinates of their last occurrence, grouped by (street, key) and in the order
+  of first occurrence within a group.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from etl.pipeline.transform.cleaning.validation.coordinates_matching import (
+    COORDINATE_COLUMNS,
+)
+
+logger = logging.getLogger(__name__)
+
+# Columns the reference is keyed by, in the order of the validation tiers
+KEY_COLUMNS = ("postal_code", "municipality")
+# Address columns of the reference
+REFERENCE_COLUMNS = ["postal_code", "municipality", "street", "house_number"]
+
+
+@dataclass
+class AddressReference:
+    """Lookup structures of the address reference, by key column."""
+
+    street_pairs: Dict[str, pd.MultiIndex]
+    street_choices: Dict[str, Dict[str, List[str]]]
+    house_numbers: Dict[str, Dict[Tuple[str, str], set]]
+    coordinates: Dict[str, pd.DataFrame]
+    version: str = ""
+
+
+def normalize_reference_addresses(finland_df: pd.DataFrame) -> pd.DataFrame:
+    """Normalize, deduplicate and sort the Finland reference addresses.
+
+    Streets are lowercased, postal codes zero-padded to five digits and house
+    numbers lowercased without spaces, like the staging addresses.
+
+    Args:
+        finland_df (pd.DataFrame): Reference addresses as read from the CSV files.
+
+    Returns:
+        pd.DataFrame: The normalized addresses sorted by postal code, street and
+            municipality.
+
+    Raises:
+        KeyError: If an address or coordinate column is missing.
+    """
+    missing = [
+        column
+        for column in REFERENCE_COLUMNS + COORDINATE_COLUMNS
+        if column not in finland_df.columns
+    ]
+    if missing:
+        raise KeyError(f"Missing columns in the address reference: {missing}")
+
+    finland_df["street"] = finland_df["street"].astype(str).str.lower().str.strip()
+    finland_df["postal_code"] = (
+        finland_df["postal_code"].astype(str).str.strip().str.zfill(5)
+    )
+    finland_df["municipality"] = (
+        finland_df["municipality"]
+        .astype(str)
+        .str.strip()
+        .str.replace(r"\.0$", "", regex=True)
+    )
+    finland_df["house_number"] = (
+        finland_df["house_number"]
+        .astype(str)
+        .str.strip()
+        .str.lower()
+        .str.replace(" ", "", regex=True)
+    )
+
+    finland_df.drop_duplicates(inplace=True)
+    finland_df.sort_values(by=["postal_code", "street", "municipality"], inplace=True)
+    return finland_df
+
+
+def build_reference_tables(finland_df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    """Build the street and address tables of every key column.
+
+    Args:
+        finland_df (pd.DataFrame): Reference addresses, normalized by
+            `normalize_reference_addresses`.
+
+    Returns:
+        Dict[str, pd.DataFrame]: `streets_<key>` and `addresses_<key>` tables.
+    """
+    tables: Dict[str, pd.DataFrame] = {}
+    for column in KEY_COLUMNS:
+        address_columns = ["street", column, "house_number"]
+        tables[f"streets_{column}"] = finland_df[[column, "street"]].drop_duplicates(
+            ignore_index=True
+        )
+
+        # Coordinates of the last occurrence of an address, as a dictionary built
+        # row by row would keep
+        coordinates = finland_df.drop_duplicates(subset=address_columns, keep="last")[
+            address_columns + COORDINATE_COLUMNS
+        ]
+        addresses = finland_df.drop_duplicates(subset=address_columns)[
+            address_columns
+        ].merge(coordinates, on=address_columns, how="left")
+        # Multi-column sorts are stable, so house numbers keep their order
+        tables[f"addresses_{column}"] = addresses.sort_values(
+            ["street", column], ignore_index=True
+        )
+    return tables
+
+
+def _group_house_numbers(
+    addresses: pd.DataFrame, column: str
+) -> Dict[Tuple[str, str], set]:
+    streets = addresses["street"].to_numpy(dtype=object)
+    keys = addresses[column].to_numpy(dtype=object)
+    if not len(streets):
+        return {}
+    new_group = np.ones(len(streets), dtype=bool)
+    new_group[1:] = (streets[1:] != streets[:-1]) | (keys[1:] != keys[:-1])
+    starts = np.flatnonzero(new_group)
+    house_numbers = np.split(
+        addresses["house_number"].to_numpy(dtype=object), starts[1:]
+    )
+    return dict(
+        zip(zip(streets[starts], keys[starts]), (set(group) for group in house_numbers))
+    )
+
+
+def create_address_reference(
+    tables: Dict[str, pd.DataFrame], version: str = ""
+) -> AddressReference:
+    """Create the lookup structures from the reference tables.
+
+    Args:
+        tables (Dict[str, pd.DataFrame]): Tables from `build_reference_tables`.
+        version (str): Version of the reference index the tables come from.
+
+    Returns:
+        AddressReference: Street pairs, street choices, house numbers and
+            coordinates for every key column.
+    """
+    reference = AddressReference({}, {}, {}, {}, version)
+    for column in KEY_COLUMNS:
+        streets = tables[f"streets_{column}"]
+        addresses = tables[f"addresses_{column}"]
+        reference.street_pairs[column] = pd.MultiIndex.from_frame(
+            streets[[column, "street"]]
+        )
+        reference.street_choices[column] = {
+            key: group.tolist()
+            for key, group in streets.groupby(column, sort=False)["street"]
+        }
+        reference.house_numbers[column] = _group_house_numbers(addresses, column)
+        reference.coordinates[column] = addresses.set_index(
+            [column, "street", "house_number"]
+        )[COORDINATE_COLUMNS]
+    return reference
+
+
+def build_address_reference(finland_df: pd.DataFrame) -> AddressReference:
+    """Build the lookup structures of the Finland reference in memory.
+
+    Args:
+        finland_df (pd.DataFrame): Reference addresses as read from the CSV files.
+
+    Returns:
+        AddressReference: The lookup structures, without a version.
+    """
+    finland_df = normalize_reference_addresses(finland_df)
+    reference = create_address_reference(build_reference_tables(finland_df))
+    logger.info(f"Built address reference from {len(finland_df)} addresses.")
+    return reference
@@ -1,39 +1,215 @@
 """Best Match Finder.
 
 Contains functions for fuzzy matching of street names, postal codes, municipalities, and house numbers.
+
+Street names are matched in batches: the distinct (postal_code/municipality,
+street) pairs of the unmatched rows are grouped by postal code or municipality,
+and every group is scored against the streets of that key with one
+`rapidfuzz.process.cdist` call. The results are mapped back to the rows with an
+index lookup, and house numbers are matched once per distinct address. Addresses
+whose matches are in the fuzzy match cache are not scored again.
 """
 
 import logging
-from typing import Dict, Tuple
+from typing import Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 from rapidfuzz import fuzz, process
 
-from etl.pipeline.transform.cleaning.validation.house_number_matching import (
-    get_house_number_match_fuzzy,
+from etl.pipeline.transform.cleaning.validation.fuzzy_match_cache import (
+    FuzzyMatchCache,
 )
-from etl.pipeline.transform.cleaning.validation.street_matching import (
-    group_streets_by_column,
+from etl.pipeline.transform.cleaning.validation.house_number_matching import (
+    score_best_house_number,
 )
 
 logger = logging.getLogger(__name__)
 
+# Largest number of scores computed by a single cdist call, to bound its memory
+MAX_SCORES_PER_BATCH = 5_000_000
+
+
+def find_best_streets(
+    streets: List[str], choices: List[str], threshold: int = 80
+) -> Tuple[List[Optional[str]], List[float]]:
+    """Finds the best fuzzy match of every street among the reference streets of a key.
+
+    The score is `fuzz.token_set_ratio`; of equally scored choices the first one
+    is taken.
+
+    Args:
+        streets (List[str]): Street names to match.
+        choices (List[str]): Distinct reference streets.
+        threshold (int): Minimum match score to accept.
+
+    Returns:
+        Tuple[List[Optional[str]], List[float]]: The best match of every street,
+            None if no choice reaches the threshold, and its score (0.0 if None).
+    """
+    best_streets: List[Optional[str]] = []
+    best_street_scores: List[float] = []
+    batch_size = max(1, MAX_SCORES_PER_BATCH // max(1, len(choices)))
+    for start in range(0, len(streets), batch_size):
+        scores = process.cdist(
+            streets[start : start + batch_size],
+            choices,
+            scorer=fuzz.token_set_ratio,
+            score_cutoff=threshold,
+        )
+        best_positions = scores.argmax(axis=1)
+        best_scores = scores[np.arange(len(best_positions)), best_positions]
+        for position, score in zip(best_positions, best_scores):
+            matched = score >= threshold
+            best_streets.append(choices[position] if matched else None)
+            best_street_scores.append(float(score) if matched else 0.0)
+    return best_streets, best_street_scores
+
+
+def match_distinct_streets(
+    rows: pd.DataFrame,
+    street_choices: Dict[str, List[str]],
+    group_by_column: str,
+    threshold: int = 80,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Fuzzy matches the streets of the rows, scoring every distinct street once.
+
+    The distinct (key, street) pairs are grouped by key, and the streets of a key
+    are scored against its reference streets in batches.
+
+    Args:
+        rows (pd.DataFrame): Rows with 'street' and `group_by_column`, whose keys
+            are in `street_choices`.
+        street_choices (Dict[str, List[str]]): Distinct reference streets by key.
+        group_by_column (str): Column to use for matching (either "postal_code" or "municipality").
+        threshold (int): Minimum match score to accept.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The matched street of every row, None where
+            there is no match, and the match scores.
+    """
+    if rows.empty:
+        return np.empty(0, dtype=object), np.empty(0, dtype=float)
+
+    pair_codes, pairs = pd.MultiIndex.from_frame(
+        rows[[group_by_column, "street"]]
+    ).factorize()
+    pair_frame = pairs.to_frame(index=False, name=[group_by_column, "street"])
+    pair_matches = np.empty(len(pair_frame), dtype=object)
+    pair_scores = np.zeros(len(pair_frame), dtype=float)
+    for key_value, positions in pair_frame.groupby(
+        group_by_column, sort=False
+    ).indices.items():
+        pair_matches[positions], pair_scores[positions] = find_best_streets(
+            pair_frame["street"].iloc[positions].tolist(),
+            street_choices[key_value],
+            threshold,
+        )
+    logger.info(f"Scored {len(pair_frame)} distinct streets of {len(rows)} rows.")
+    return pair_matches[pair_codes], pair_scores[pair_codes]
+
+
+def match_distinct_house_numbers(
+    street_matches: np.ndarray,
+    key_values: pd.Series,
+    house_numbers: pd.Series,
+    house_number_dict: Dict[Tuple[str, str], set],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Matches the house numbers of fuzzy-matched streets, once per distinct address.
+
+    Args:
+        street_matches (np.ndarray): Matched streets, none of them missing.
+        key_values (pd.Series): Postal codes or municipalities of the rows, none of
+            them missing.
+        house_numbers (pd.Series): House numbers of the rows.
+        house_number_dict (Dict[Tuple[str, str], set]): Dictionary mapping (street, postal_code/municipality) to valid house numbers.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The matched house number of every row and
+            the match scores.
+    """
+    address_codes, addresses = pd.MultiIndex.from_arrays(
+        [street_matches, key_values, house_numbers]
+    ).factorize()
+    scored = [
+        score_best_house_number(
+            (street_match, key_value), house_number, house_number_dict
+        )
+        for street_match, key_value, house_number in addresses
+    ]
+    address_matches = np.array(
+        [house_number for house_number, _ in scored], dtype=object
+    )
+    address_scores = np.array([score for _, score in scored], dtype=float)
+    return address_matches[address_codes], address_scores[address_codes]
+
+
+def match_distinct_addresses(
+    addresses: pd.DataFrame,
+    street_choices: Dict[str, List[str]],
+    house_number_dict: Dict[Tuple[str, str], set],
+    group_by_column: str,
+    threshold: int = 80,
+) -> Dict[str, np.ndarray]:
+    """Fuzzy matches the streets, then the house numbers, of distinct addresses.
+
+    Args:
+        addresses (pd.DataFrame): Distinct addresses with `group_by_column`,
+            'street' and 'house_number', whose keys are in `street_choices`.
+        street_choices (Dict[str, List[str]]): Distinct reference streets by key.
+        house_number_dict (Dict[Tuple[str, str], set]): Dictionary mapping (street, postal_code/municipality) to valid house numbers.
+        group_by_column (str): Column to use for matching (either "postal_code" or "municipality").
+        threshold (int): Minimum match score to accept.
+
+    Returns:
+        Dict[str, np.ndarray]: 'street_match', 'street_score', 'house_number_match'
+            and 'house_number_score' of every address; the house number match is
+            None where the street is not matched.
+    """
+    street_matches, street_scores = match_distinct_streets(
+        addresses, street_choices, group_by_column, threshold
+    )
+    house_number_matches = np.full(len(addresses), None, dtype=object)
+    house_number_scores = np.zeros(len(addresses), dtype=float)
+    matched = pd.notna(street_matches)
+    if matched.any():
+        (
+            house_number_matches[matched],
+            house_number_scores[matched],
+        ) = match_distinct_house_numbers(
+            street_matches[matched],
+            addresses[group_by_column][matched],
+            addresses["house_number"][matched],
+            house_number_dict,
+        )
+    return {
+        "street_match": street_matches,
+        "street_score": street_scores,
+        "house_number_match": house_number_matches,
+        "house_number_score": house_number_scores,
+    }
+
 
 def apply_fuzzy_street_matching(
     df: pd.DataFrame,
-    finland_df: pd.DataFrame,
+    street_choices: Dict[str, List[str]],
     house_number_dict: Dict[Tuple[str, str], set],
     group_by_column: str,
     threshold: int = 80,
+    cache: Optional[FuzzyMatchCache] = None,
 ) -> pd.DataFrame:
     """Applies fuzzy matching to find the best street matches for unmatched addresses.
 
+    Every distinct address is matched once. Matches found in `cache` are taken
+    from it, and the matches of the other addresses are added to it.
+
     Args:
         df (pd.DataFrame): DataFrame containing addresses with missing `street_match`.
-        finland_df (pd.DataFrame): Reference DataFrame containing valid street names.
+        street_choices (Dict[str, List[str]]): Distinct reference streets by postal code or municipality, see `AddressReference`.
         house_number_dict (Dict[Tuple[str, str], set]): Dictionary mapping (street, postal_code/municipality) to valid house numbers.
         group_by_column (str): Column to use for matching (either "postal_code" or "municipality").
         threshold (int): Minimum match score to accept.
+        cache (Optional[FuzzyMatchCache]): Fuzzy match cache of the reference, if any.
 
     Returns:
         pd.DataFrame: Updated DataFrame with fuzzy-matched street values.
@@ -51,8 +227,6 @@ def apply_fuzzy_street_matching(
         raise KeyError(f"Missing 'street' or '{group_by_column}' column in DataFrame.")
 
     total_house_numbers = len(df)
-    # Create a dictionary of postal codes mapped to streets
-    reference_dict = group_streets_by_column(finland_df, group_by_column)
     # Copy DataFrame to prevent modification warnings
     df = df.copy()
     df[
@@ -64,29 +238,55 @@ def apply_fuzzy_street_matching(
         ]
     ] = None
 
-    for index, row in df.iterrows():
-        street_name = row["street"]
-        key_value = row[group_by_column]
-        if pd.isna(street_name) or pd.isna(key_value):
-            continue
-        if key_value in reference_dict:
-            matches = process.extract(
-                street_name,
-                reference_dict[key_value],
-                scorer=fuzz.token_set_ratio,
-                limit=5,
-            )
-            best_match, best_score = max(
-                matches, key=lambda x: x[1], default=(None, 0)
-            )[:2]
-
-            if best_score >= threshold:
-                df.at[index, "street_match"] = best_match
-                df.at[index, f"{group_by_column}_match"] = key_value
-                if best_match is not None:
-                    df.at[index, "house_number_match"] = get_house_number_match_fuzzy(
-                        best_match, key_value, row["house_number"], house_number_dict
-                    )
+    valid = (
+        df["street"].notna()
+        & df[group_by_column].notna()
+        & df[group_by_column].isin(list(street_choices))
+    )
+    rows = df.loc[valid, [group_by_column, "street", "house_number"]]
+    if rows.empty:
+        logger.info(
+            f"Fuzzy matching completed. Found 0 fuzzy matches out of {total_house_numbers}."
+        )
+        return df
+
+    address_codes, addresses = pd.MultiIndex.from_frame(rows).factorize()
+    addresses = addresses.to_frame(index=False, name=list(rows.columns))
+    street_matches = np.full(len(addresses), None, dtype=object)
+    house_number_matches = np.full(len(addresses), None, dtype=object)
+    missing = np.ones(len(addresses), dtype=bool)
+    if cache is not None:
+        cached, results = cache.lookup(group_by_column, addresses)
+        street_matches[cached] = results["street_match"].to_numpy()
+        house_number_matches[cached] = results["house_number_match"].to_numpy()
+        missing = ~cached
+
+    if missing.any():
+        results = match_distinct_addresses(
+            addresses[missing],
+            street_choices,
+            house_number_dict,
+            group_by_column,
+            threshold,
+        )
+        street_matches[missing] = results["street_match"]
+        house_number_matches[missing] = results["house_number_match"]
+        if cache is not None:
+            cache.add(group_by_column, addresses[missing], results)
+
+    street_matches = street_matches[address_codes]
+    matched = pd.notna(street_matches)
+    if matched.any():
+        # Write the matches back to the rows
+        matched_positions = np.flatnonzero(valid)[matched]
+        for column, values in (
+            ("street_match", street_matches[matched]),
+            (f"{group_by_column}_match", rows[group_by_column].to_numpy()[matched]),
+            ("house_number_match", house_number_matches[address_codes][matched]),
+        ):
+            column_values = np.full(len(df), None, dtype=object)
+            column_values[matched_positions] = values
+            df[column] = column_values
 
     logger.info(
         f"Fuzzy matching completed. Found {df['street_match'].notna().sum()} fuzzy matches out of {total_house_numbers}."
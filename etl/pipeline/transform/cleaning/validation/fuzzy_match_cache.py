@@ -0,0 +1,263 @@
+"""Persistent Fuzzy Match Cache.
+
+The same misspelled streets and odd house numbers turn up in every snapshot, and
+fuzzy matching them against the reference is the most expensive part of the
+address validation. This module keeps the results of the fuzzy matches across
+runs.
+
+An entry is keyed by the key column ('postal_code' or 'municipality'), its value,
+the normalized street and the house number of an address, and holds the matched
+street and house number with their scores. Addresses without a match are cached
+as well, with a missing street match or an empty house number match.
+
+The cache is stored next to the reference index it was computed against, as
+`<address_index_dir>/<version>/fuzzy_match_cache_v<format>.arrow`, so a new index
+version or cache format starts with an empty cache, and the old cache is removed
+with its index. It is read at the start of the address validation and written
+back once, with the new entries, at the end. Without the reference index
+(`address_index: false`) or with `fuzzy_match_cache: false` nothing is cached.
+"""
+
+import logging
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from etl.pipeline.transform.cleaning.validation.address_reference import (
+    AddressReference,
+)
+from etl.pipeline.transform.cleaning.validation.reference_index import (
+    get_address_index_dir,
+    import_feather,
+)
+
+logger = logging.getLogger(__name__)
+
+# Version of the cache entries; bump it when the matching rules or thresholds change
+CACHE_FORMAT_VERSION = 1
+CACHE_FILE_NAME = f"fuzzy_match_cache_v{CACHE_FORMAT_VERSION}.arrow"
+CACHE_KEY_COLUMNS = ["key_column", "key_value", "street", "house_number"]
+CACHE_RESULT_COLUMNS = [
+    "street_match",
+    "street_score",
+    "house_number_match",
+    "house_number_score",
+]
+
+
+@dataclass
+class CacheUpdate:
+    """New entries and lookup counts of a cache, e.g. of a worker process."""
+
+    entries: pd.DataFrame
+    lookups: int = 0
+    hits: int = 0
+
+
+def _empty_entries() -> pd.DataFrame:
+    return pd.DataFrame(
+        {column: pd.Series(dtype=object) for column in CACHE_KEY_COLUMNS}
+        | {
+            "street_match": pd.Series(dtype=object),
+            "street_score": pd.Series(dtype=float),
+            "house_number_match": pd.Series(dtype=object),
+            "house_number_score": pd.Series(dtype=float),
+        }
+    )
+
+
+def _concat_entries(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    if not frames:
+        return _empty_entries()
+    return pd.concat(frames, ignore_index=True)
+
+
+class FuzzyMatchCache:
+    """Fuzzy match results of addresses, for one reference index version."""
+
+    def __init__(
+        self,
+        version: str,
+        entries: Optional[pd.DataFrame] = None,
+        cache_path: Optional[Path] = None,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            version (str): Version of the reference index the entries belong to.
+            entries (Optional[pd.DataFrame]): Cached entries with the key and result
+                columns; None for an empty cache.
+            cache_path (Optional[Path]): File the cache is saved to; None to keep it
+                in memory only.
+        """
+        self.version = version
+        self.entries = _empty_entries() if entries is None else entries
+        self.cache_path = cache_path
+        self._index = pd.MultiIndex.from_frame(self.entries[CACHE_KEY_COLUMNS])
+        self._pending: List[pd.DataFrame] = []
+        self.lookups = 0
+        self.hits = 0
+
+    @classmethod
+    def load(cls, cache_path: Path, version: str) -> "FuzzyMatchCache":
+        """Load the cache of a reference index version.
+
+        Args:
+            cache_path (Path): Cache file in the directory of the index version.
+            version (str): Version of the reference index.
+
+        Returns:
+            FuzzyMatchCache: The cache, empty if the file is missing or unreadable.
+        """
+        feather = import_feather()
+        if feather is None or not cache_path.exists():
+            return cls(version, cache_path=cache_path)
+        try:
+            entries = feather.read_feather(cache_path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring invalid fuzzy match cache {cache_path}: {e}")
+            return cls(version, cache_path=cache_path)
+        logger.info(f"Loaded {len(entries)} cached fuzzy matches of index {version}.")
+        return cls(version, entries, cache_path)
+
+    def lookup(
+        self, key_column: str, addresses: pd.DataFrame
+    ) -> Tuple[np.ndarray, pd.DataFrame]:
+        """Look up the cached matches of distinct addresses.
+
+        Args:
+            key_column (str): 'postal_code' or 'municipality'.
+            addresses (pd.DataFrame): Distinct addresses with `key_column`, 'street'
+                and 'house_number' columns.
+
+        Returns:
+            Tuple[np.ndarray, pd.DataFrame]: Boolean mask of the cached addresses,
+                and their result columns.
+        """
+        keys = pd.MultiIndex.from_arrays(
+            [
+                np.full(len(addresses), key_column, dtype=object),
+                addresses[key_column].to_numpy(dtype=object),
+                addresses["street"].to_numpy(dtype=object),
+                addresses["house_number"].to_numpy(dtype=object),
+            ]
+        )
+        positions = self._index.get_indexer(keys) if len(self._index) else None
+        if positions is None:
+            positions = np.full(len(addresses), -1)
+        cached = positions >= 0
+        self.lookups += len(addresses)
+        self.hits += int(cached.sum())
+        return cached, self.entries.iloc[positions[cached]][CACHE_RESULT_COLUMNS]
+
+    def add(
+        self, key_column: str, addresses: pd.DataFrame, results: Dict[str, Any]
+    ) -> None:
+        """Add the matches of distinct addresses missing from the cache.
+
+        The entries are kept aside and only written by `save`.
+
+        Args:
+            key_column (str): 'postal_code' or 'municipality'.
+            addresses (pd.DataFrame): Distinct addresses with `key_column`, 'street'
+                and 'house_number' columns.
+            results (Dict[str, Any]): Values of the result columns, aligned with
+                `addresses`.
+        """
+        if addresses.empty:
+            return
+        entries = pd.DataFrame(
+            {
+                "key_column": key_column,
+                "key_value": addresses[key_column].to_numpy(dtype=object),
+                "street": addresses["street"].to_numpy(dtype=object),
+                "house_number": addresses["house_number"].to_numpy(dtype=object),
+            }
+        )
+        for column in CACHE_RESULT_COLUMNS:
+            entries[column] = results[column]
+        self._pending.append(entries)
+
+    def take_update(self) -> CacheUpdate:
+        """Return and reset the new entries and lookup counts.
+
+        Returns:
+            CacheUpdate: The entries added and the lookups made since the last call.
+        """
+        update = CacheUpdate(_concat_entries(self._pending), self.lookups, self.hits)
+        self._pending = []
+        self.lookups = 0
+        self.hits = 0
+        return update
+
+    def apply_update(self, update: CacheUpdate) -> None:
+        """Merge the new entries and lookup counts of another cache, e.g. of a worker.
+
+        Args:
+            update (CacheUpdate): The update returned by `take_update`.
+        """
+        if not update.entries.empty:
+            self._pending.append(update.entries)
+        self.lookups += update.lookups
+        self.hits += update.hits
+
+    def get_hit_rate(self) -> float:
+        """Return the share of the lookups answered by the cache.
+
+        Returns:
+            float: Hits per lookup, 0.0 without lookups.
+        """
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    def save(self) -> None:
+        """Write the cache with the new entries and log its hit rate.
+
+        The file is replaced atomically, so a concurrent run reads either the old
+        or the new cache.
+        """
+        new_entries = _concat_entries(self._pending).drop_duplicates(
+            subset=CACHE_KEY_COLUMNS
+        )
+        logger.info(
+            f"Fuzzy match cache: {self.hits} hits of {self.lookups} lookups "
+            f"({self.get_hit_rate():.1%}), {len(new_entries)} new entries."
+        )
+        feather = import_feather()
+        if self.cache_path is None or feather is None or new_entries.empty:
+            return
+
+        entries = _concat_entries([self.entries, new_entries])
+        temp_path = self.cache_path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            feather.write_feather(entries, temp_path)
+            os.replace(temp_path, self.cache_path)
+        finally:
+            if temp_path.exists():
+                temp_path.unlink()
+        logger.info(f"Saved {len(entries)} fuzzy matches to {self.cache_path}")
+
+
+def load_fuzzy_match_cache(
+    config: Dict[str, Any], reference: AddressReference
+) -> Optional[FuzzyMatchCache]:
+    """Load the fuzzy match cache of the reference index in use.
+
+    Args:
+        config (Dict[str, Any]): Configuration dictionary.
+        reference (AddressReference): The loaded address reference.
+
+    Returns:
+        Optional[FuzzyMatchCache]: The cache, or None if it is disabled or the
+            reference was not loaded from an index.
+    """
+    if not config.get("fuzzy_match_cache", True) or not reference.version:
+        return None
+    index_dir = get_address_index_dir(config)
+    if index_dir is None:
+        return None
+    cache_path = index_dir / reference.version / CACHE_FILE_NAME
+    return FuzzyMatchCache.load(cache_path, reference.version)
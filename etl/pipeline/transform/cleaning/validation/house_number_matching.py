@@ -1,16 +1,26 @@
 """House Number Matching Functions.
 
-Contains functions for matching house numbers.
+Contains functions for matching house numbers. House numbers found as such in the
+reference are matched with a hash join; only the remaining rows are fuzzy matched,
+once per distinct address and unless their match is cached.
 """
 
 import logging
 from typing import Dict, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 from rapidfuzz import fuzz, process
 
+from etl.pipeline.transform.cleaning.validation.fuzzy_match_cache import (
+    FuzzyMatchCache,
+)
+
 logger = logging.getLogger(__name__)
 
+# Substrings removed from house numbers, in this order
+HOUSE_NUMBER_REMOVED_SUBSTRINGS = ["nan", " ", "as.", "lh.", "lt."]
+
 
 def clean_house_number(value: Optional[str]) -> str:
     """Cleans and normalizes house number values.
@@ -28,45 +38,34 @@ def clean_house_number(value: Optional[str]) -> str:
     cleaned_value = str(value).lower().strip()
 
     # Remove specific substrings
-    substrings_to_remove = ["nan", " ", "as.", "lh.", "lt."]
-    for substring in substrings_to_remove:
+    for substring in HOUSE_NUMBER_REMOVED_SUBSTRINGS:
         cleaned_value = cleaned_value.replace(substring, "")
 
     return cleaned_value
 
 
-def create_house_number_dict(
-    finland_df: pd.DataFrame, group_by: Tuple[str, str]
-) -> Dict[Tuple[str, str], set]:
-    """Creates a dictionary mapping (street, postal_code) to a set of house numbers.
+def clean_house_numbers(house_numbers: pd.Series) -> pd.Series:
+    """Cleans and normalizes a column of house numbers like `clean_house_number`.
 
     Args:
-        finland_df (pd.DataFrame): Finland reference addresses.
-        group_by (Tuple[str, str]): Columns to group by (e.g., ("street", "postal_code")).
+        house_numbers (pd.Series): The house numbers to clean.
 
     Returns:
-        Dict[Tuple[str, str], set]: Dictionary with (street, postal_code) as keys and sets of house numbers as values.
-
-    Raises:
-        KeyError: If the required columns are missing in the DataFrame.
+        pd.Series: The cleaned house numbers, "" where missing.
     """
-    if not all(col in finland_df.columns for col in group_by):
-        raise KeyError(f"Missing required columns in DataFrame: {group_by}")
+    cleaned = house_numbers.astype(str).str.lower().str.strip()
+    for substring in HOUSE_NUMBER_REMOVED_SUBSTRINGS:
+        cleaned = cleaned.str.replace(substring, "", regex=False)
+    return cleaned.where(house_numbers.notna(), "")
 
-    return (
-        finland_df.groupby(list(group_by))["house_number"]
-        .apply(lambda x: set(x.dropna()))  # Ensure no NaN values
-        .to_dict()
-    )
 
-
-def find_best_house_number(
+def score_best_house_number(
     key: Tuple[str, str],
     house_number: str,
     house_number_dict: Dict[Tuple[str, str], set],
     threshold: int = 65,
-) -> str:
-    """Finds the best matching house number using rapidfuzz if an exact match is not found.
+) -> Tuple[str, float]:
+    """Finds the best matching house number and its score.
 
     Args:
         key: The key to look up in the house number dictionary.
@@ -75,85 +74,120 @@ def find_best_house_number(
         threshold: Minimum match score to accept.
 
     Returns:
-        The best matching house number.
+        The best matching house number and its score, ("", 0.0) if there is none.
     """
     if key in house_number_dict:
         possible_matches = house_number_dict[key]
         # First, check for an exact match
         if house_number in possible_matches:
-            return house_number
+            return house_number, 100.0
         # If no exact match, apply fuzzy matching
         best_match = process.extractOne(
             house_number, possible_matches, scorer=fuzz.partial_ratio
         )
         if best_match and best_match[1] >= threshold:  # Apply fuzzy threshold
-            return best_match[0]
-    return ""
+            return best_match[0], float(best_match[1])
+    return "", 0.0
 
 
-def get_house_number_match(
-    row: pd.Series,
+def find_best_house_number(
+    key: Tuple[str, str],
+    house_number: str,
     house_number_dict: Dict[Tuple[str, str], set],
-    key_column: str,
     threshold: int = 65,
 ) -> str:
-    """Helper function to get the best house number match for a row.
+    """Finds the best matching house number using rapidfuzz if an exact match is not found.
 
     Args:
-        row: The row of the DataFrame.
+        key: The key to look up in the house number dictionary.
+        house_number: The house number to match.
         house_number_dict: Dictionary mapping (street, postal_code) to house numbers.
-        key_column: Column name used for matching (e.g., 'postal_code' or 'municipality').
         threshold: Minimum match score to accept.
 
     Returns:
         The best matching house number.
     """
-    key = (row["street_match"], row[key_column])
-    if pd.notna(row["street_match"]) and pd.notna(row[key_column]):
-        return find_best_house_number(
-            key, row["house_number"], house_number_dict, threshold
-        )
-    return ""
+    return score_best_house_number(key, house_number, house_number_dict, threshold)[0]
 
 
-def get_house_number_match_fuzzy(
-    street_match: str,
-    key_value: str,
-    house_number: str,
+def fuzzy_match_house_numbers(
+    candidates: pd.DataFrame,
     house_number_dict: Dict[Tuple[str, str], set],
+    key_column: str,
     threshold: int = 65,
-) -> str:
-    """Helper function to get the best house number match for a row in fuzzy matching.
+    cache: Optional[FuzzyMatchCache] = None,
+) -> np.ndarray:
+    """Fuzzy matches the house numbers of addresses with a matched street.
+
+    Cached matches are taken from `cache`; the other distinct addresses are
+    matched with `score_best_house_number` and added to it.
 
     Args:
-        street_match: The matched street name.
-        key_value: The postal code or municipality value.
-        house_number: The house number to match.
-        house_number_dict: Dictionary mapping (street, postal_code/municipality) to valid house numbers.
+        candidates: Addresses with `key_column`, 'street_match' and 'house_number'.
+        house_number_dict: Dictionary mapping (street, key_column) to house numbers.
+        key_column: Column name used for matching (e.g., 'postal_code' or 'municipality').
         threshold: Minimum match score to accept.
+        cache: Fuzzy match cache of the reference, if any.
 
     Returns:
-        The best matching house number.
+        np.ndarray: The matched house number of every address.
     """
-    key = (street_match, key_value)
-    if pd.notna(street_match) and pd.notna(key_value):
-        return find_best_house_number(key, house_number, house_number_dict, threshold)
-    return ""
+    address_codes, addresses = pd.MultiIndex.from_frame(
+        candidates[[key_column, "street_match", "house_number"]]
+    ).factorize()
+    addresses = addresses.to_frame(
+        index=False, name=[key_column, "street", "house_number"]
+    )
+    address_matches = np.empty(len(addresses), dtype=object)
+    missing = np.ones(len(addresses), dtype=bool)
+    if cache is not None:
+        cached, results = cache.lookup(key_column, addresses)
+        address_matches[cached] = results["house_number_match"].to_numpy()
+        missing = ~cached
+
+    scored = [
+        score_best_house_number(
+            (street, key), house_number, house_number_dict, threshold
+        )
+        for key, street, house_number in addresses[missing].itertuples(index=False)
+    ]
+    address_matches[missing] = [house_number for house_number, _ in scored]
+    if cache is not None:
+        cache.add(
+            key_column,
+            addresses[missing],
+            {
+                "street_match": addresses["street"][missing].to_numpy(),
+                "street_score": 100.0,
+                "house_number_match": address_matches[missing],
+                "house_number_score": [score for _, score in scored],
+            },
+        )
+    return address_matches[address_codes]
 
 
 def match_house_numbers(
     unmatched_df: pd.DataFrame,
     house_number_dict: Dict[Tuple[str, str], set],
+    address_index: pd.MultiIndex,
     key_column: str,
     threshold: int = 65,
+    cache: Optional[FuzzyMatchCache] = None,
 ) -> pd.DataFrame:
     """Matches house numbers in staging data to the best reference match.
 
+    House numbers whose (key_column, street_match, house_number) address exists in
+    the reference are matched by a lookup in `address_index`; the others are fuzzy
+    matched with `fuzzy_match_house_numbers`.
+
     Args:
         unmatched_df: DataFrame containing addresses.
         house_number_dict: Dictionary mapping (street, key_column) to house numbers.
+        address_index: Unique (key_column, street, house_number) addresses of the
+            reference, e.g. the index of `AddressReference.coordinates`.
         key_column: Column name used for matching (e.g., 'postal_code' or 'municipality').
         threshold: Minimum match score to accept.
+        cache: Fuzzy match cache of the reference, if any.
 
     Returns:
         pd.DataFrame: Updated DataFrame with best house number matches.
@@ -175,16 +209,26 @@ def match_house_numbers(
     # Initialize column for storing matches
     unmatched_df["house_number_match"] = None
 
-    for index, row in unmatched_df.iterrows():
-        if (
-            pd.isna(row["house_number"])
-            or pd.isna(row["street_match"])
-            or pd.isna(row[key_column])
-        ):
-            continue  # Skip rows with missing values
-
-        unmatched_df.at[index, "house_number_match"] = get_house_number_match(
-            row, house_number_dict, key_column, threshold
+    # Skip rows with missing values
+    valid = (
+        unmatched_df["house_number"].notna()
+        & unmatched_df["street_match"].notna()
+        & unmatched_df[key_column].notna()
+    )
+    if valid.any():
+        candidates = unmatched_df.loc[
+            valid, [key_column, "street_match", "house_number"]
+        ]
+        exact = address_index.get_indexer(pd.MultiIndex.from_frame(candidates)) >= 0
+        house_number_matches = candidates["house_number"].to_numpy(dtype=object)
+        if not exact.all():
+            house_number_matches[~exact] = fuzzy_match_house_numbers(
+                candidates[~exact], house_number_dict, key_column, threshold, cache
+            )
+        unmatched_df.loc[valid, "house_number_match"] = house_number_matches
+        logger.info(
+            f"Found {exact.sum()} exact house numbers, "
+            f"fuzzy matched {(~exact).sum()} others."
         )
 
     matched_count = unmatched_df["house_number_match"].notna().sum()
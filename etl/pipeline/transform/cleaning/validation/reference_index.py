@@ -0,0 +1,390 @@
+"""Prebuilt Address Reference Index.
+
+Compiling the Finland address reference (reading the regional CSV files,
+normalizing millions of rows and building the lookup tables) takes minutes, yet
+the reference only changes when new files are put in the resources directory.
+This module compiles it once into a versioned index on disk, which later runs load
+in seconds.
+
+An index is a directory `<address_index_dir>/<version>/` holding the street and
+address tables of `address_reference` as uncompressed Arrow IPC (Feather) files,
+read through memory maps, and a `manifest.json`. The version is a hash of the
+contents of the source files and of `INDEX_FORMAT_VERSION`, so changed sources or
+a changed index layout lead to a new index. The manifest records the size and
+modification time of the sources, so an unchanged reference is recognized without
+hashing it again. The most recent `KEPT_VERSIONS` indexes are kept.
+
+The index is built on first use, or ahead of time with:
+    python -m etl.pipeline.transform.cleaning.validation.reference_index
+
+With `address_index: false`, or without `pyarrow`, the reference is compiled in
+memory on every run.
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from etl.pipeline.transform.cleaning.validation.address_reference import (
+    AddressReference,
+    build_reference_tables,
+    create_address_reference,
+    normalize_reference_addresses,
+)
+from etl.utils.file_io import read_and_concatenate_csv_files
+
+logger = logging.getLogger(__name__)
+
+# Version of the index layout; bump it when the normalization or the tables change
+INDEX_FORMAT_VERSION = 1
+# Reference address files of Finland inside the resources directory
+FINLAND_ADDRESS_FILE_PATTERN = "*_addresses_2024-11-14.csv"
+MANIFEST_FILE_NAME = "manifest.json"
+TABLE_SUFFIX = ".arrow"
+# Number of index versions kept in the index directory
+KEPT_VERSIONS = 3
+HASH_BUFFER_SIZE = 1024 * 1024
+
+
+def import_feather() -> Optional[Any]:
+    try:
+        import pyarrow.feather as feather
+    except ImportError:
+        return None
+    return feather
+
+
+def find_reference_files(resources_dir: Path) -> List[Path]:
+    """Return the reference address files of the resources directory.
+
+    Args:
+        resources_dir (Path): Directory of the reference resources.
+
+    Returns:
+        List[Path]: The address files, sorted by name.
+
+    Raises:
+        FileNotFoundError: If there are no reference address files.
+    """
+    source_files = sorted(Path(resources_dir).glob(FINLAND_ADDRESS_FILE_PATTERN))
+    if not source_files:
+        raise FileNotFoundError(
+            f"No address reference files matching '{FINLAND_ADDRESS_FILE_PATTERN}' "
+            f"in {resources_dir}"
+        )
+    return source_files
+
+
+def get_source_stats(source_files: List[Path]) -> List[Dict[str, Any]]:
+    """Return the name, size and modification time of the source files.
+
+    Args:
+        source_files (List[Path]): The reference address files.
+
+    Returns:
+        List[Dict[str, Any]]: One entry per file, as stored in the manifest.
+    """
+    stats = []
+    for source_file in source_files:
+        stat = source_file.stat()
+        stats.append(
+            {
+                "name": source_file.name,
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+            }
+        )
+    return stats
+
+
+def compute_index_version(source_files: List[Path]) -> str:
+    """Compute the index version of some source files from their contents.
+
+    Args:
+        source_files (List[Path]): The reference address files.
+
+    Returns:
+        str: Hex digest of the file names and contents and the index format.
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(f"format:{INDEX_FORMAT_VERSION}".encode("ascii"))
+    for source_file in source_files:
+        digest.update(source_file.name.encode("utf-8"))
+        with source_file.open("rb") as file:
+            for block in iter(lambda: file.read(HASH_BUFFER_SIZE), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def load_manifest(version_dir: Path) -> Optional[Dict[str, Any]]:
+    """Load the manifest of an index.
+
+    Args:
+        version_dir (Path): Directory of the index version.
+
+    Returns:
+        Optional[Dict[str, Any]]: The manifest, or None if it is missing, unreadable
+            or of another index format.
+    """
+    manifest_path = version_dir / MANIFEST_FILE_NAME
+    if not manifest_path.exists():
+        return None
+    try:
+        with manifest_path.open("r", encoding="utf-8") as file:
+            manifest = json.load(file)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring invalid address index manifest {manifest_path}: {e}")
+        return None
+    if manifest.get("format_version") != INDEX_FORMAT_VERSION:
+        return None
+    return manifest
+
+
+def save_manifest(version_dir: Path, manifest: Dict[str, Any]) -> None:
+    """Write the manifest of an index.
+
+    Args:
+        version_dir (Path): Directory of the index version.
+        manifest (Dict[str, Any]): The manifest.
+    """
+    with (version_dir / MANIFEST_FILE_NAME).open("w", encoding="utf-8") as file:
+        json.dump(manifest, file, indent=2)
+
+
+def find_reference_index(source_files: List[Path], index_dir: Path) -> Optional[Path]:
+    """Find the index built from the current source files.
+
+    An index whose manifest lists the same source sizes and modification times is
+    taken as is. Otherwise the sources are hashed, and an index of the same
+    version (e.g. after the files were copied) gets the new file times.
+
+    Args:
+        source_files (List[Path]): The reference address files.
+        index_dir (Path): Directory of the index versions.
+
+    Returns:
+        Optional[Path]: Directory of the matching index version, or None.
+    """
+    source_stats = get_source_stats(source_files)
+    for manifest_path in sorted(Path(index_dir).glob(f"*/{MANIFEST_FILE_NAME}")):
+        manifest = load_manifest(manifest_path.parent)
+        if manifest is not None and manifest.get("sources") == source_stats:
+            return manifest_path.parent
+
+    version_dir = Path(index_dir) / compute_index_version(source_files)
+    manifest = load_manifest(version_dir)
+    if manifest is None:
+        return None
+    manifest["sources"] = source_stats
+    save_manifest(version_dir, manifest)
+    return version_dir
+
+
+def build_reference_index(source_files: List[Path], index_dir: Path) -> Path:
+    """Compile the reference address files into a new index version.
+
+    The index is written to a temporary directory and renamed into place, so a
+    failed or concurrent build never leaves a partial index behind.
+
+    Args:
+        source_files (List[Path]): The reference address files.
+        index_dir (Path): Directory of the index versions.
+
+    Returns:
+        Path: Directory of the index version.
+
+    Raises:
+        ImportError: If pyarrow is not installed.
+    """
+    feather = import_feather()
+    if feather is None:
+        raise ImportError("pyarrow is required to build the address reference index")
+
+    version = compute_index_version(source_files)
+    version_dir = Path(index_dir) / version
+    logger.info(f"Building address reference index {version} in {index_dir}...")
+
+    finland_df = normalize_reference_addresses(
+        read_and_concatenate_csv_files([str(path) for path in source_files])
+    )
+    tables = build_reference_tables(finland_df)
+
+    Path(index_dir).mkdir(parents=True, exist_ok=True)
+    temp_dir = Path(tempfile.mkdtemp(prefix=f".{version}-", dir=index_dir))
+    try:
+        for name, table in tables.items():
+            feather.write_feather(
+                table, temp_dir / f"{name}{TABLE_SUFFIX}", compression="uncompressed"
+            )
+        save_manifest(
+            temp_dir,
+            {
+                "format_version": INDEX_FORMAT_VERSION,
+                "version": version,
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "sources": get_source_stats(source_files),
+                "addresses": len(finland_df),
+                "tables": {name: len(table) for name, table in tables.items()},
+            },
+        )
+        if version_dir.exists():
+            shutil.rmtree(version_dir)
+        os.replace(temp_dir, version_dir)
+    finally:
+        if temp_dir.exists():
+            shutil.rmtree(temp_dir)
+
+    logger.info(
+        f"Address reference index {version} built from {len(finland_df)} addresses."
+    )
+    prune_reference_indexes(index_dir)
+    return version_dir
+
+
+def prune_reference_indexes(index_dir: Path, keep: int = KEPT_VERSIONS) -> None:
+    """Remove all but the most recently built index versions.
+
+    Args:
+        index_dir (Path): Directory of the index versions.
+        keep (int): Number of versions to keep.
+    """
+    version_dirs = sorted(
+        (path.parent for path in Path(index_dir).glob(f"*/{MANIFEST_FILE_NAME}")),
+        key=lambda path: (path / MANIFEST_FILE_NAME).stat().st_mtime_ns,
+        reverse=True,
+    )
+    for version_dir in version_dirs[keep:]:
+        logger.info(f"Removing old address reference index {version_dir.name}")
+        shutil.rmtree(version_dir)
+
+
+def read_reference_index(version_dir: Path) -> AddressReference:
+    """Load an index version, reading its tables through memory maps.
+
+    Args:
+        version_dir (Path): Directory of the index version.
+
+    Returns:
+        AddressReference: The lookup structures, with the index version.
+
+    Raises:
+        ImportError: If pyarrow is not installed.
+        FileNotFoundError: If the index has no valid manifest.
+    """
+    feather = import_feather()
+    if feather is None:
+        raise ImportError("pyarrow is required to read the address reference index")
+    manifest = load_manifest(version_dir)
+    if manifest is None:
+        raise FileNotFoundError(f"No valid address index manifest in {version_dir}")
+
+    tables = {
+        name: feather.read_table(
+            version_dir / f"{name}{TABLE_SUFFIX}", memory_map=True
+        ).to_pandas()
+        for name in manifest["tables"]
+    }
+    reference = create_address_reference(tables, manifest["version"])
+    logger.info(
+        f"Loaded address reference index {manifest['version']} "
+        f"({manifest['addresses']} addresses)."
+    )
+    return reference
+
+
+def get_address_index_dir(config: Dict[str, Any]) -> Optional[Path]:
+    """Return the directory of the address reference index.
+
+    Args:
+        config (Dict[str, Any]): Configuration dictionary.
+
+    Returns:
+        Optional[Path]: `address_index_dir` of the directory structure, or None if
+            the index is disabled or pyarrow is not installed.
+    """
+    if not config.get("address_index", True):
+        return None
+    if import_feather() is None:
+        logger.warning(
+            "pyarrow is not installed, compiling the address reference in memory"
+        )
+        return None
+    return Path(config["directory_structure"]["address_index_dir"])
+
+
+def load_address_reference(
+    resources_dir: Path, index_dir: Optional[Path] = None
+) -> AddressReference:
+    """Load the address reference, building its index if needed.
+
+    Args:
+        resources_dir (Path): Directory of the reference address files.
+        index_dir (Optional[Path]): Directory of the index versions; None to
+            compile the reference in memory.
+
+    Returns:
+        AddressReference: The lookup structures of the reference.
+    """
+    source_files = find_reference_files(resources_dir)
+    if index_dir is None:
+        finland_df = normalize_reference_addresses(
+            read_and_concatenate_csv_files([str(path) for path in source_files])
+        )
+        return create_address_reference(build_reference_tables(finland_df))
+
+    version_dir = find_reference_index(source_files, index_dir)
+    if version_dir is None:
+        version_dir = build_reference_index(source_files, index_dir)
+    return read_reference_index(version_dir)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse the command line arguments of the index build.
+
+    Args:
+        argv (Optional[List[str]]): Arguments to parse; `sys.argv` if None.
+
+    Returns:
+        argparse.Namespace: The parsed arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description="Build the Finland address reference index."
+    )
+    parser.add_argument(
+        "--resources-dir",
+        type=Path,
+        help="Directory of the reference address files (default: resources_dir)",
+    )
+    parser.add_argument(
+        "--index-dir",
+        type=Path,
+        help="Directory of the index versions (default: address_index_dir)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Rebuild the index even if it is up to date",
+    )
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    from etl.config.config_loader import CONFIG
+
+    logging.basicConfig(level=logging.INFO)
+    args = parse_args()
+    directories = CONFIG["directory_structure"]
+    resources_dir = args.resources_dir or Path(directories["resources_dir"])
+    index_dir = args.index_dir or Path(directories["address_index_dir"])
+    source_files = find_reference_files(resources_dir)
+    version_dir = None if args.force else find_reference_index(source_files, index_dir)
+    if version_dir is None:
+        version_dir = build_reference_index(source_files, index_dir)
+    logger.info(f"Address reference index: {version_dir}")
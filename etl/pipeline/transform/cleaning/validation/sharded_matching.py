@@ -0,0 +1,213 @@
+"""Sharded Address Matching.
+
+Runs the matching of a validation tier over shards of the addresses in a process
+pool. A tier only looks up reference streets, house numbers and coordinates of the
+postal code or municipality of an address, so the addresses are split into shards
+by a hash of that key and every shard is matched on its own.
+
+The reference structures are built once and handed to every worker process when
+the pool starts. With the `fork` start method (the default on Linux) they are
+shared copy-on-write instead of copied. The matched shards are put back in the
+input order, so the results do not depend on the number of workers. The workers
+look up fuzzy matches in their copy of the fuzzy match cache and send the new
+entries back with every shard.
+
+With `address_validation_workers: 1`, or for inputs too small to be worth
+sharding, the tiers are matched in the current process.
+"""
+
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from types import TracebackType
+from typing import List, Optional, Tuple, Type
+
+import numpy as np
+import pandas as pd
+
+from etl.pipeline.transform.cleaning.validation.address_reference import (
+    AddressReference,
+)
+from etl.pipeline.transform.cleaning.validation.best_match_finder import (
+    apply_fuzzy_street_matching,
+)
+from etl.pipeline.transform.cleaning.validation.fuzzy_match_cache import (
+    CacheUpdate,
+    FuzzyMatchCache,
+)
+from etl.pipeline.transform.cleaning.validation.house_number_matching import (
+    match_house_numbers,
+)
+from etl.pipeline.transform.cleaning.validation.street_matching import (
+    find_matched_streets,
+)
+from etl.utils.row_dedup import hash_rows
+
+logger = logging.getLogger(__name__)
+
+# Shards per worker process, so that uneven shards still keep every worker busy
+SHARDS_PER_WORKER = 4
+# Smallest number of addresses worth a shard of their own
+MIN_SHARD_ROWS = 2000
+
+# Reference and fuzzy match cache of the worker processes, set by the pool initializer
+_worker_reference: Optional[AddressReference] = None
+_worker_cache: Optional[FuzzyMatchCache] = None
+
+
+def match_addresses(
+    df: pd.DataFrame,
+    reference: AddressReference,
+    key_column: str,
+    fuzzy: bool,
+    cache: Optional[FuzzyMatchCache] = None,
+) -> pd.DataFrame:
+    """Match the streets and house numbers of addresses within a key column.
+
+    Args:
+        df (pd.DataFrame): Normalized addresses to match.
+        reference (AddressReference): Lookup structures of the address reference.
+        key_column (str): 'postal_code' or 'municipality'.
+        fuzzy (bool): Whether to fuzzy match the streets instead of exactly.
+        cache (Optional[FuzzyMatchCache]): Fuzzy match cache of the reference, if any.
+
+    Returns:
+        pd.DataFrame: The addresses, in input order, with 'street_match',
+            '<key_column>_match' and 'house_number_match' columns.
+    """
+    if fuzzy:
+        return apply_fuzzy_street_matching(
+            df,
+            reference.street_choices[key_column],
+            reference.house_numbers[key_column],
+            key_column,
+            cache=cache,
+        )
+    df = find_matched_streets(df, reference.street_pairs[key_column], key_column)
+    return match_house_numbers(
+        df,
+        reference.house_numbers[key_column],
+        reference.coordinates[key_column].index,
+        key_column,
+        cache=cache,
+    )
+
+
+def _init_worker(reference: AddressReference, cache: Optional[FuzzyMatchCache]) -> None:
+    global _worker_reference, _worker_cache
+    _worker_reference = reference
+    _worker_cache = cache
+
+
+def _match_shard(
+    df: pd.DataFrame, key_column: str, fuzzy: bool
+) -> Tuple[pd.DataFrame, Optional[CacheUpdate]]:
+    if _worker_reference is None:
+        raise RuntimeError("Address reference is not initialized in the worker")
+    df = match_addresses(df, _worker_reference, key_column, fuzzy, _worker_cache)
+    return df, _worker_cache.take_update() if _worker_cache is not None else None
+
+
+class ShardedAddressMatcher:
+    """Matches validation tiers in shards by key over a pool of worker processes."""
+
+    def __init__(
+        self,
+        reference: AddressReference,
+        workers: int = 1,
+        cache: Optional[FuzzyMatchCache] = None,
+    ) -> None:
+        """Initialize the matcher.
+
+        Args:
+            reference (AddressReference): Lookup structures of the address reference.
+            workers (int): Number of worker processes; 1 matches in this process.
+            cache (Optional[FuzzyMatchCache]): Fuzzy match cache of the reference,
+                collecting the new matches of all workers.
+
+        Raises:
+            ValueError: If the number of workers is not positive.
+        """
+        if workers <= 0:
+            raise ValueError(
+                f"address_validation_workers must be positive, got {workers}"
+            )
+        self.reference = reference
+        self.workers = workers
+        self.cache = cache
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> "ShardedAddressMatcher":
+        """Start the worker processes."""
+        if self.workers > 1:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.reference, self.cache),
+            )
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Stop the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=exc_type is not None)
+            self._executor = None
+
+    def get_shard_count(self, num_rows: int) -> int:
+        """Return the number of shards to split a number of addresses into.
+
+        Args:
+            num_rows (int): Number of addresses to match.
+
+        Returns:
+            int: Number of shards; 1 if the tier is matched in this process.
+        """
+        if self._executor is None:
+            return 1
+        return max(1, min(self.workers * SHARDS_PER_WORKER, num_rows // MIN_SHARD_ROWS))
+
+    def match(self, df: pd.DataFrame, key_column: str, fuzzy: bool) -> pd.DataFrame:
+        """Match the streets and house numbers of addresses within a key column.
+
+        Args:
+            df (pd.DataFrame): Normalized addresses to match.
+            key_column (str): 'postal_code' or 'municipality'.
+            fuzzy (bool): Whether to fuzzy match the streets instead of exactly.
+
+        Returns:
+            pd.DataFrame: The addresses, in input order, with the match columns of
+                `match_addresses`.
+        """
+        shards = self.get_shard_count(len(df))
+        if self._executor is None or shards == 1:
+            return match_addresses(df, self.reference, key_column, fuzzy, self.cache)
+
+        shard_ids = hash_rows(df, [key_column]) % shards
+        shard_positions: List[np.ndarray] = [
+            positions
+            for positions in (np.flatnonzero(shard_ids == s) for s in range(shards))
+            if len(positions)
+        ]
+        futures = [
+            self._executor.submit(_match_shard, df.iloc[positions], key_column, fuzzy)
+            for positions in shard_positions
+        ]
+        matched_shards = []
+        for future in futures:
+            matched_shard, cache_update = future.result()
+            matched_shards.append(matched_shard)
+            if self.cache is not None and cache_update is not None:
+                self.cache.apply_update(cache_update)
+        matched_df = pd.concat(matched_shards)
+        logger.info(
+            f"Matched {len(df)} addresses by {key_column} in "
+            f"{len(shard_positions)} shards on {self.workers} workers."
+        )
+
+        # Restore the input order
+        order = np.argsort(np.concatenate(shard_positions), kind="stable")
+        return matched_df.iloc[order]
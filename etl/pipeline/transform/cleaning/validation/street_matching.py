@@ -1,114 +1,73 @@
 """Street Matching Functions.
 
-Contains functions for matching street names.
+Contains functions for matching street names. Exact matches are found with a
+semi-join of the (postal_code/municipality, street) pairs against the reference.
 """
 
 import logging
-from typing import Dict
 
+import numpy as np
 import pandas as pd
 
 logger = logging.getLogger(__name__)
 
 
-def group_streets_by_column(finland_df: pd.DataFrame, column: str) -> Dict[str, list]:
-    """Group street values by a specified column from Finland addresses."""
-    return finland_df.groupby(column)["street"].apply(list).to_dict()
-
-
-def find_matched_streets_by_postal(
-    staging_df: pd.DataFrame, finland_df: pd.DataFrame
-) -> pd.DataFrame:
-    """Finds matches for street values in staging_df against finland_df.
+def find_streets_in_reference(
+    staging_df: pd.DataFrame, street_pairs: pd.MultiIndex, column: str
+) -> np.ndarray:
+    """Checks which (column, street) pairs of staging_df exist in the reference.
 
     Args:
         staging_df (pd.DataFrame): DataFrame containing addresses to validate.
-        finland_df (pd.DataFrame): Finland reference DataFrame.
+        street_pairs (pd.MultiIndex): Distinct (column, street) pairs of the reference.
+        column (str): Column paired with the street, 'postal_code' or 'municipality'.
 
     Returns:
-        pd.DataFrame: Updated `staging_df` with 'street_match' and 'postal_code_match' columns.
-
-    Raises:
-        KeyError: If the required columns ('postal_code' or 'street') are missing in one of the DataFrames.
+        np.ndarray: Boolean mask of the staging rows whose pair is in the reference.
     """
-    logger.info("Starting street matching process...")
-
-    # Ensure necessary columns exist
-    required_columns = ["postal_code", "street"]
-    for col in required_columns:
-        if col not in staging_df.columns or col not in finland_df.columns:
-            logger.error(f"Missing column '{col}' in one of the DataFrames.")
-            raise KeyError(f"Missing column '{col}' in one of the DataFrames.")
+    staging_pairs = pd.MultiIndex.from_frame(staging_df[[column, "street"]])
+    return street_pairs.get_indexer(staging_pairs) >= 0
 
-    # Create a dictionary of postal codes mapped to streets
-    reference_dict = group_streets_by_column(finland_df, "postal_code")
 
-    # Ensure 'postal_code' is a string to prevent mismatches
-    staging_df["postal_code"] = staging_df["postal_code"].astype(str)
-
-    # Create a boolean mask for valid matches
-    mask = staging_df["postal_code"].isin(reference_dict) & staging_df.apply(
-        lambda row: row["street"] in reference_dict.get(row["postal_code"], []), axis=1
-    )
-
-    # Assign matches
-    staging_df.loc[mask, "street_match"] = staging_df.loc[mask, "street"]
-    staging_df.loc[mask, "postal_code_match"] = staging_df.loc[mask, "postal_code"]
-
-    # Logging results
-    matched_count = mask.sum()
-    total_streets = len(staging_df)
-    logger.info(
-        f"Street matching completed. Found {matched_count} matches out of {total_streets}."
-    )
-
-    return staging_df
-
-
-def find_matched_streets_by_municipality(
-    staging_df: pd.DataFrame, finland_df: pd.DataFrame
+def find_matched_streets(
+    staging_df: pd.DataFrame, street_pairs: pd.MultiIndex, column: str
 ) -> pd.DataFrame:
-    """Finds matches for street values in staging_df against finland_df using municipality.
+    """Finds exact matches for street values in staging_df within a postal code or municipality.
 
     Args:
         staging_df (pd.DataFrame): DataFrame containing addresses to validate.
-        finland_df (pd.DataFrame): Finland reference DataFrame.
+        street_pairs (pd.MultiIndex): Distinct (column, street) pairs of the reference.
+        column (str): Column to match by, 'postal_code' or 'municipality'.
 
     Returns:
-        pd.DataFrame: Updated `staging_df` with 'street_match' and 'municipality_match' columns.
+        pd.DataFrame: Updated `staging_df` with 'street_match' and '<column>_match' columns.
 
     Raises:
-        KeyError: If the required columns ('municipality' or 'street') are missing in one of the DataFrames.
+        KeyError: If the required columns (`column` or 'street') are missing in the DataFrame.
     """
-    logger.info("Starting street matching by municipality...")
+    logger.info(f"Starting street matching by {column}...")
 
     # Ensure necessary columns exist
-    required_columns = ["municipality", "street"]
-    for col in required_columns:
-        if col not in staging_df.columns or col not in finland_df.columns:
-            logger.error(f"Missing column '{col}' in one of the DataFrames.")
-            raise KeyError(f"Missing column '{col}' in one of the DataFrames.")
-
-    # Create a dictionary of municipalities mapped to streets
-    reference_dict = group_streets_by_column(finland_df, "municipality")
+    for col in (column, "street"):
+        if col not in staging_df.columns:
+            logger.error(f"Missing column '{col}' in the DataFrame.")
+            raise KeyError(f"Missing column '{col}' in the DataFrame.")
 
-    # Ensure 'municipality' is a string to prevent mismatches
-    staging_df["municipality"] = staging_df["municipality"].astype(str)
+    # Ensure the key is a string to prevent mismatches
+    staging_df[column] = staging_df[column].astype(str)
 
     # Create a boolean mask for valid matches
-    mask = staging_df["municipality"].isin(reference_dict) & staging_df.apply(
-        lambda row: row["street"] in reference_dict.get(row["municipality"], []), axis=1
-    )
+    mask = find_streets_in_reference(staging_df, street_pairs, column)
 
     # Assign matches
     staging_df.loc[mask, "street_match"] = staging_df.loc[mask, "street"]
-    staging_df.loc[mask, "municipality_match"] = staging_df.loc[mask, "municipality"]
+    staging_df.loc[mask, f"{column}_match"] = staging_df.loc[mask, column]
 
     # Logging results
     matched_count = mask.sum()
     total_streets = len(staging_df)
     logger.info(
-        f"Street matching by municipality completed. Found {matched_count} matches out of {total_streets}."
+        f"Street matching by {column} completed. Found {matched_count} matches out of {total_streets}."
     )
 
     return staging_df
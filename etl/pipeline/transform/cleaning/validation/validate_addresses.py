@@ -1,54 +1,52 @@
 """Validate Addresses.
 
 Main function to validate street names and house numbers in a staging DataFrame
-against a reference DataFrame of Finland addresses.
+against the Finland address reference.
 """
 
 import logging
-from typing import Tuple
+from typing import Optional, Tuple
 
 import pandas as pd
 
-from etl.pipeline.transform.cleaning.validation.best_match_finder import (
-    apply_fuzzy_street_matching,
+from etl.pipeline.transform.cleaning.validation.address_reference import (
+    AddressReference,
 )
 from etl.pipeline.transform.cleaning.validation.coordinates_matching import (
-    assign_coordinates_from_dict,
-    create_coordinates_dict,
+    assign_coordinates,
 )
-from etl.pipeline.transform.cleaning.validation.street_matching import (
-    find_matched_streets_by_municipality,
-    find_matched_streets_by_postal,
+from etl.pipeline.transform.cleaning.validation.fuzzy_match_cache import (
+    FuzzyMatchCache,
 )
-
-from .house_number_matching import (
-    clean_house_number,
-    create_house_number_dict,
-    match_house_numbers,
+from etl.pipeline.transform.cleaning.validation.sharded_matching import (
+    ShardedAddressMatcher,
 )
 
+from .house_number_matching import clean_house_numbers
+from etl.utils.run_profiler import PROFILER, profile_step
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-def read_and_extract_columns(
-    staging_df: pd.DataFrame, finland_df: pd.DataFrame
-) -> Tuple[pd.DataFrame, pd.DataFrame]:
-    """Reads CSV files and extracts required columns, ensuring data consistency.
+def _strip_or_empty(values: pd.Series) -> pd.Series:
+    return values.astype(str).str.strip().where(values.notna(), "")
+
+
+@profile_step()
+def normalize_staging_addresses(staging_df: pd.DataFrame) -> pd.DataFrame:
+    """Normalizes the addresses to validate like the reference addresses.
 
     Args:
         staging_df (pd.DataFrame): DataFrame containing the staging data with addresses to validate.
-        finland_df (pd.DataFrame): DataFrame containing the reference data with correct addresses.
 
     Returns:
-        Tuple[pd.DataFrame, pd.DataFrame]: A tuple containing the normalized staging DataFrame and the normalized Finland reference DataFrame.
+        pd.DataFrame: The normalized, deduplicated staging DataFrame sorted by postal code, street and municipality.
     """
     # Normalize data
-    staging_df["house_number"] = staging_df.apply(
-        lambda row: f"{str(row['building_number']).strip() if pd.notna(row['building_number']) else ''}"
-        f"{str(row['entrance']).strip() if pd.notna(row['entrance']) else ''}",
-        axis=1,
-    )
+    staging_df["house_number"] = _strip_or_empty(
+        staging_df["building_number"]
+    ) + _strip_or_empty(staging_df["entrance"])
     staging_df["street"] = staging_df["street"].astype(str).str.lower().str.strip()
     staging_df["postal_code"] = (
         staging_df["postal_code"].astype(str).str.strip().str.zfill(5)
@@ -59,47 +57,35 @@ def read_and_extract_columns(
         .str.strip()
         .str.replace(r"\.0$", "", regex=True)
     )
-    staging_df["house_number"] = staging_df["house_number"].apply(clean_house_number)
-
-    # Normalize Finland reference data
-    finland_df["street"] = finland_df["street"].astype(str).str.lower().str.strip()
-    finland_df["postal_code"] = (
-        finland_df["postal_code"].astype(str).str.strip().str.zfill(5)
-    )
-    finland_df["municipality"] = (
-        finland_df["municipality"]
-        .astype(str)
-        .str.strip()
-        .str.replace(r"\.0$", "", regex=True)
-    )
-    finland_df["house_number"] = (
-        finland_df["house_number"]
-        .astype(str)
-        .str.strip()
-        .str.lower()
-        .str.replace(" ", "", regex=True)
-    )
+    staging_df["house_number"] = clean_house_numbers(staging_df["house_number"])
 
     # Remove duplicates
     staging_df.drop_duplicates(inplace=True)
-    finland_df.drop_duplicates(inplace=True)
 
     # Sort data for consistency
     staging_df.sort_values(by=["postal_code", "street", "municipality"], inplace=True)
-    finland_df.sort_values(by=["postal_code", "street", "municipality"], inplace=True)
 
-    return staging_df, finland_df
+    return staging_df
 
 
+@profile_step()
 def validate_street_names(
-    staging_df: pd.DataFrame, finland_df: pd.DataFrame, output_path: str
+    staging_df: pd.DataFrame,
+    reference: AddressReference,
+    output_path: str,
+    workers: int = 1,
+    cache: Optional[FuzzyMatchCache] = None,
 ) -> Tuple[pd.DataFrame, pd.DataFrame]:
     """Orchestrates the street name validation process.
 
     Args:
         staging_df (pd.DataFrame): DataFrame with addresses to validate.
-        finland_df (pd.DataFrame): Reference DataFrame with correct addresses.
+        reference (AddressReference): Lookup structures of the Finland address reference.
         output_path (str): Path to save the validated addresses.
+        workers (int): Number of worker processes matching shards of the
+            addresses (1 = in this process).
+        cache (Optional[FuzzyMatchCache]): Cache of the fuzzy matches, consulted
+            before and updated with every fuzzy match; saving it is up to the caller.
 
     Returns:
         pd.DataFrame: Cleaned staging_df (with matched addresses)
@@ -107,65 +93,71 @@ def validate_street_names(
     """
     logger.info("Starting street validation process.")
 
-    # Read and preprocess staging & reference data
-    staging_df, finland_df = read_and_extract_columns(staging_df, finland_df)
-
-    house_number_post_dict = create_house_number_dict(
-        finland_df, ("street", "postal_code")
-    )
-    house_number_municipality_dict = create_house_number_dict(
-        finland_df, ("street", "municipality")
-    )
-    coordinates_dict_postal = create_coordinates_dict(finland_df, "postal_code")
-    coordinates_dict_municipality = create_coordinates_dict(finland_df, "municipality")
-
-    # Match streets by postal code
-    street_postal_df = find_matched_streets_by_postal(staging_df, finland_df)
-    street_postal_df = match_house_numbers(
-        street_postal_df, house_number_post_dict, "postal_code"
-    )
-    street_municipality_df = street_postal_df[
-        street_postal_df["street_match"].isna()
-    ].copy()
-    street_postal_df = street_postal_df.dropna(subset=["street_match"])
-    street_postal_df = assign_coordinates_from_dict(
-        street_postal_df, coordinates_dict_postal, "postal_code"
-    )
-
-    # Match streets by municipality for unmatched rows
-    street_municipality_df = find_matched_streets_by_municipality(
-        street_municipality_df, finland_df
-    )
-    street_municipality_df = match_house_numbers(
-        street_municipality_df, house_number_municipality_dict, "municipality"
-    )
-    best_municipality_df = street_municipality_df[
-        street_municipality_df["street_match"].isna()
-    ].copy()
-    street_municipality_df = street_municipality_df.dropna(subset=["street_match"])
-    street_municipality_df = assign_coordinates_from_dict(
-        street_municipality_df, coordinates_dict_municipality, "municipality"
-    )
-
-    best_municipality_df = apply_fuzzy_street_matching(
-        best_municipality_df, finland_df, house_number_municipality_dict, "municipality"
-    )
-    best_postal_df = best_municipality_df[
-        best_municipality_df["street_match"].isna()
-    ].copy()
-    best_municipality_df = best_municipality_df.dropna(subset=["street_match"])
-    best_municipality_df = assign_coordinates_from_dict(
-        best_municipality_df, coordinates_dict_municipality, "municipality"
-    )
-
-    best_postal_df = apply_fuzzy_street_matching(
-        best_postal_df, finland_df, house_number_post_dict, "postal_code"
-    )
-    no_coordinates = best_postal_df[best_postal_df["street_match"].isna()].copy()
-    best_postal_df = best_postal_df.dropna(subset=["street_match"])
-    best_postal_df = assign_coordinates_from_dict(
-        best_postal_df, coordinates_dict_postal, "postal_code"
-    )
+    # Preprocess staging data
+    staging_df = normalize_staging_addresses(staging_df)
+
+    coordinates_postal = reference.coordinates["postal_code"]
+    coordinates_municipality = reference.coordinates["municipality"]
+
+    with ShardedAddressMatcher(reference, workers, cache) as matcher:
+        # Match streets by postal code
+        with PROFILER.measure("validate:postal", rows_in=len(staging_df)) as step:
+            street_postal_df = matcher.match(staging_df, "postal_code", fuzzy=False)
+            street_municipality_df = street_postal_df[
+                street_postal_df["street_match"].isna()
+            ].copy()
+            street_postal_df = street_postal_df.dropna(subset=["street_match"])
+            street_postal_df = assign_coordinates(
+                street_postal_df, coordinates_postal, "postal_code"
+            )
+            step.rows_out = len(street_postal_df)
+
+        # Match streets by municipality for unmatched rows
+        with PROFILER.measure(
+            "validate:municipality", rows_in=len(street_municipality_df)
+        ) as step:
+            street_municipality_df = matcher.match(
+                street_municipality_df, "municipality", fuzzy=False
+            )
+            best_municipality_df = street_municipality_df[
+                street_municipality_df["street_match"].isna()
+            ].copy()
+            street_municipality_df = street_municipality_df.dropna(
+                subset=["street_match"]
+            )
+            street_municipality_df = assign_coordinates(
+                street_municipality_df, coordinates_municipality, "municipality"
+            )
+            step.rows_out = len(street_municipality_df)
+
+        # Fuzzy match the remaining streets by municipality, then by postal code
+        with PROFILER.measure(
+            "validate:fuzzy_municipality", rows_in=len(best_municipality_df)
+        ) as step:
+            best_municipality_df = matcher.match(
+                best_municipality_df, "municipality", fuzzy=True
+            )
+            best_postal_df = best_municipality_df[
+                best_municipality_df["street_match"].isna()
+            ].copy()
+            best_municipality_df = best_municipality_df.dropna(subset=["street_match"])
+            best_municipality_df = assign_coordinates(
+                best_municipality_df, coordinates_municipality, "municipality"
+            )
+            step.rows_out = len(best_municipality_df)
+
+        with PROFILER.measure(
+            "validate:fuzzy_postal", rows_in=len(best_postal_df)
+        ) as step:
+            best_postal_df = matcher.match(best_postal_df, "postal_code", fuzzy=True)
+            no_coordinates = best_postal_df[
+                best_postal_df["street_match"].isna()
+            ].copy()
+            best_postal_df = best_postal_df.dropna(subset=["street_match"])
+            best_postal_df = assign_coordinates(
+                best_postal_df, coordinates_postal, "postal_code"
+            )
+            step.rows_out = len(best_postal_df)
 
     # Combine DataFrames with coordinates
     address_with_coordinates_df = pd.concat(
@@ -9,10 +9,21 @@ Key Features:
 - Deduplicates and consolidates records.
 - Iteratively cleans address-related columns.
 - Moves incomplete records to a staging table.
+- Reads entities with the dtype plan of `entities.yml` (categoricals, nullable
+  integers and dates) to keep the tables compact while they are cleaned.
+- Optionally cleans row-local entities in bounded chunks, and entities compared
+  per business ID one key partition at a time (see `chunked_cleaning`).
 - Validates data types and ensures database readiness.
 
 """
 
+import pandas as pd
+
+from etl.pipeline.transform.chunked_cleaning import (
+    clean_in_chunks,
+    supports_chunked_cleaning,
+    uses_chunked_cleaning,
+)
 from etl.pipeline.transform.cleaning.address.address_cleaning import clean_addresses
 from etl.pipeline.transform.cleaning.companies.companies_cleaning import clean_companies
 from etl.pipeline.transform.cleaning.core.base_cleaning import (
@@ -31,7 +42,9 @@ from etl.pipeline.transform.cleaning.names.names_cleaning import clean_names
 from etl.pipeline.transform.cleaning.post_office.post_office_cleaning import (
     clean_post_offices,
 )
-from etl.utils.file_io import read_csv
+from etl.utils.columnar_io import get_dtype_plan, get_text_dtype_plan
+from etl.utils.file_io import read_table
+from etl.utils.run_profiler import PROFILER
 
 
 def start_cleaning_process(
@@ -42,22 +55,67 @@ def start_cleaning_process(
     resources_dir: str,
     config: dict,
 ) -> None:
-    """Executes the cleaning process on extracted CSV files.
+    """Executes the cleaning process on extracted CSV or Parquet files.
+
+    With `cleaning_chunk_size` set, entities supported by the chunked cleaning
+    are cleaned in bounded chunks instead of as a whole table.
 
     Args:
-        input_file (str): Path to the extracted CSV file.
+        input_file (str): Path to the extracted CSV file or Parquet table.
         output_dir (str): Directory to save cleaned data.
         staging_dir (str): Directory to save staging data for later enrichment.
         entity_name (str): Name of the entity being processed.
         resources_dir (str): Path to resources directory for additional reference files.
         config (dict): Config dictionary for S3 upload and metadata.
     """
-    # Step 1: Load and preprocess
-    df = read_csv(input_file)
-    df = standardize_column_names(df)
-    df = remove_duplicates(df)
+    with PROFILER.measure("clean_entity", entity_name) as step:
+        entities = config.get("entities", [])
+        dtype_plan = {}
+        if supports_chunked_cleaning(entity_name):
+            # Chunks are read with the column types of the whole table, in both modes
+            dtype_plan.update(get_text_dtype_plan(entities, entity_name))
+        if config.get("enforce_dtypes", True):
+            dtype_plan.update(get_dtype_plan(entities, entity_name))
+
+        def clean_frame(df: pd.DataFrame) -> None:
+            clean_entity_frame(
+                df, output_dir, staging_dir, entity_name, resources_dir, config
+            )
+
+        if uses_chunked_cleaning(config, entity_name):
+            step.rows_in = clean_in_chunks(
+                input_file, entity_name, clean_frame, staging_dir, config, dtype_plan
+            )
+            return
+
+        # Step 1: Load and preprocess
+        df = read_table(input_file, dtype_plan=dtype_plan)
+        step.rows_in = len(df)
+        df = standardize_column_names(df)
+        df = remove_duplicates(df)
+
+        # Step 2: Entity-Specific Cleaning
+        clean_frame(df)
+
+
+def clean_entity_frame(
+    df: pd.DataFrame,
+    output_dir: str,
+    staging_dir: str,
+    entity_name: str,
+    resources_dir: str,
+    config: dict,
+) -> None:
+    """Runs the entity-specific cleaning on preprocessed rows of an entity.
 
-    # Step 2: Entity-Specific Cleaning
+    Args:
+        df (pd.DataFrame): Rows with standardized column names and no duplicates.
+        output_dir (str): Directory to save cleaned data.
+        staging_dir (str): Directory to save staging data for later enrichment.
+        entity_name (str): Name of the entity being processed.
+        resources_dir (str): Path to resources directory for additional reference files.
+        config (dict): Config dictionary for S3 upload and metadata.
+    """
     if entity_name == "post_offices":
         clean_post_offices(df, resources_dir, staging_dir, config, entity_name)
     elif entity_name == "addresses":
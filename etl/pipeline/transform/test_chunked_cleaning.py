@@ -0,0 +1,120 @@
+"""Chunked cleaning must produce the outputs of whole-table cleaning."""
+
+from pathlib import Path
+
+import pandas as pd
+import pytest
+import yaml
+
+from etl.pipeline.transform.start_cleaning_process import start_cleaning_process
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+ROWS = 900
+CHUNK_SIZE = 100
+
+
+@pytest.fixture
+def config(monkeypatch: pytest.MonkeyPatch) -> dict:
+    # Cleaning reads its mapping resources relative to the repository root
+    monkeypatch.chdir(REPO_ROOT)
+    entities = yaml.safe_load((REPO_ROOT / "etl/config/entities.yml").read_text())
+    return {
+        "entities": entities["entities"],
+        "storage_format": "csv",
+        "enforce_dtypes": True,
+        "cleaning_chunk_size": 0,
+        "cleaning_partitions": 4,
+        "snapshot_date": "2025-01-01",
+        "language": "en",
+    }
+
+
+def write_main_business_lines(path: Path) -> pd.DataFrame:
+    # Codes with leading zeros only, so each chunk alone would infer integers
+    codes = [f"0{1110 + (i % 40) * 10}" for i in range(ROWS)]
+    df = pd.DataFrame(
+        {
+            "business_id": [f"{1000000 + i}-{i % 10}" for i in range(ROWS)],
+            "industryCode": codes,
+            "industryLetter": "A",
+            "industry": "Agriculture, forestry and fisheries",
+            "industryDescription": [f"Desc {code}" for code in codes],
+            "registrationDate": "2020-01-01",
+            "source": "Tax Administration",
+        }
+    )
+    df.to_csv(path, index=False)
+    return df
+
+
+def write_names(path: Path) -> None:
+    rows = []
+    for i in range(ROWS):
+        business_id = f"{1000000 + (i * 7919) % 300}-{i % 10}"
+        rows.append(
+            {
+                "businessId": business_id,
+                "companyName": f"company {i}",
+                "version": 1 + i % 3,
+                "companyType": "Company name",
+                "registrationDate": f"20{10 + i % 10}-01-01",
+                "endDate": "" if i % 4 else "2024-01-01",
+                "source": "Trade Register",
+            }
+        )
+    rows += rows[:50]  # duplicated rows, dropped across chunks
+    pd.DataFrame(rows).to_csv(path, index=False)
+
+
+def clean(input_file: Path, entity_name: str, output_dir: Path, config: dict) -> None:
+    output_dir.mkdir()
+    start_cleaning_process(
+        str(input_file),
+        str(output_dir),
+        str(output_dir),
+        entity_name,
+        str(REPO_ROOT / "etl/data/resources"),
+        config,
+    )
+
+
+@pytest.mark.parametrize("entity_name", ["main_business_lines", "names"])
+def test_chunked_outputs_equal_whole_table_outputs(
+    tmp_path: Path, config: dict, entity_name: str
+) -> None:
+    input_file = tmp_path / f"{entity_name}.csv"
+    if entity_name == "main_business_lines":
+        write_main_business_lines(input_file)
+    else:
+        write_names(input_file)
+
+    clean(input_file, entity_name, tmp_path / "whole", config)
+    clean(
+        input_file,
+        entity_name,
+        tmp_path / "chunked",
+        {**config, "cleaning_chunk_size": CHUNK_SIZE},
+    )
+
+    whole_files = sorted(path.name for path in (tmp_path / "whole").glob("*.csv"))
+    chunked_files = sorted(path.name for path in (tmp_path / "chunked").glob("*.csv"))
+    assert whole_files and whole_files == chunked_files
+    for name in whole_files:
+        assert (tmp_path / "whole" / name).read_bytes() == (
+            tmp_path / "chunked" / name
+        ).read_bytes(), name
+
+
+def test_codes_keep_leading_zeros(tmp_path: Path, config: dict) -> None:
+    input_file = tmp_path / "main_business_lines.csv"
+    source = write_main_business_lines(input_file)
+    clean(
+        input_file,
+        "main_business_lines",
+        tmp_path / "chunked",
+        {**config, "cleaning_chunk_size": CHUNK_SIZE},
+    )
+    cleaned = pd.read_csv(
+        tmp_path / "chunked" / "cleaned_main_business_lines.csv", dtype=str
+    )
+    assert cleaned["industry_code"].tolist() == source["industryCode"].tolist()
@@ -0,0 +1,573 @@
+"""Typed Columnar Storage for Pipeline Tables.
+
+This module provides the Parquet storage format used as an alternative to CSV for
+extracted, staging, and cleaned tables. Column types come from the
+`validation.columns` blocks in `entities.yml`, so values such as postal codes keep
+their leading zeros and no type inference is needed when a table is read back.
+
+Key Features:
+- Arrow schemas derived from the SQL column types in `entities.yml`.
+- Appendable tables stored as directories of ordered Parquet part files, and
+  single-file tables for staging and cleaned outputs.
+- Column projection on read.
+- pandas dtype plans applied when tables are read: categoricals for the
+  low-cardinality columns listed in `categorical_columns`, nullable integers for
+  INT codes and datetimes for DATE columns, and text for VARCHAR codes and IDs.
+- `pyarrow` is imported lazily, so it is only required for the Parquet format.
+"""
+
+import logging
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Supported storage formats (configured via `storage_format` in etl.yml)
+STORAGE_FORMAT_CSV = "csv"
+STORAGE_FORMAT_PARQUET = "parquet"
+STORAGE_FORMATS = {STORAGE_FORMAT_CSV, STORAGE_FORMAT_PARQUET}
+
+# File suffixes per storage format
+STORAGE_SUFFIXES = {STORAGE_FORMAT_CSV: ".csv", STORAGE_FORMAT_PARQUET: ".parquet"}
+
+# Arrow type aliases for the SQL base types used in entities.yml
+SQL_TO_ARROW_TYPES = {
+    "VARCHAR": "string",
+    "TEXT": "string",
+    "CHAR": "string",
+    "INT": "int64",
+    "INTEGER": "int64",
+    "BIGINT": "int64",
+    "FLOAT": "double",
+    "DOUBLE": "double",
+    "NUMERIC": "double",
+    "DECIMAL": "double",
+    "DATE": "date32",
+    "BOOLEAN": "bool",
+}
+
+# pandas dtypes for the SQL base types converted when a table is read
+SQL_TO_PANDAS_TYPES = {
+    "INT": "Int64",
+    "INTEGER": "Int64",
+    "BIGINT": "Int64",
+    "DATE": "datetime64[ns]",
+}
+CATEGORY_DTYPE = "category"
+# SQL base types read as text, and the pandas dtype of text columns in a plan
+SQL_TEXT_TYPES = ("VARCHAR", "TEXT", "CHAR")
+TEXT_DTYPE = "object"
+
+# Name pattern of the part files of an appendable Parquet table
+PART_FILE_TEMPLATE = "part-{index:06d}.parquet"
+
+
+def _import_pyarrow() -> Any:
+    """Import pyarrow, raising a helpful error if it is not installed.
+
+    Returns:
+        Any: The `pyarrow` module.
+
+    Raises:
+        ImportError: If pyarrow is not installed.
+    """
+    try:
+        import pyarrow
+        import pyarrow.parquet  # noqa: F401
+    except ImportError as e:
+        raise ImportError(
+            f"pyarrow is required for storage_format '{STORAGE_FORMAT_PARQUET}'"
+        ) from e
+    return pyarrow
+
+
+def validate_storage_format(storage_format: str) -> str:
+    """Validate a configured storage format.
+
+    Args:
+        storage_format (str): The storage format name.
+
+    Returns:
+        str: The validated storage format.
+
+    Raises:
+        ValueError: If the storage format is not supported.
+    """
+    if storage_format not in STORAGE_FORMATS:
+        raise ValueError(f"Unsupported storage format: {storage_format}")
+    return storage_format
+
+
+def with_storage_suffix(path: Union[Path, str], storage_format: str) -> Path:
+    """Return the path of a table for the given storage format.
+
+    Args:
+        path (Union[Path, str]): Table path, usually with a `.csv` suffix.
+        storage_format (str): The storage format.
+
+    Returns:
+        Path: The path with the suffix of the storage format.
+    """
+    return Path(path).with_suffix(
+        STORAGE_SUFFIXES[validate_storage_format(storage_format)]
+    )
+
+
+def is_parquet_path(path: Union[Path, str]) -> bool:
+    """Check whether a table path refers to Parquet storage.
+
+    Args:
+        path (Union[Path, str]): The table path.
+
+    Returns:
+        bool: True if the path has the Parquet suffix.
+    """
+    return Path(path).suffix == STORAGE_SUFFIXES[STORAGE_FORMAT_PARQUET]
+
+
+def to_snake_case(column: str) -> str:
+    """Convert an extracted camelCase column name to snake_case.
+
+    Args:
+        column (str): The column name.
+
+    Returns:
+        str: The snake_case column name, as produced by the cleaning step.
+    """
+    column = re.sub(r"__+", "_", re.sub(r"([a-z])([A-Z])", r"\1_\2", column))
+    return re.sub(r"[^a-zA-Z0-9_]", "", column).lower()
+
+
+def get_base_type(sql_type: Any) -> str:
+    """Return the base type of an `entities.yml` SQL type, e.g. VARCHAR for VARCHAR(20).
+
+    Args:
+        sql_type (Any): The declared SQL type.
+
+    Returns:
+        str: The upper-case base type.
+    """
+    return re.split(r"[\s(]", str(sql_type).strip().upper(), 1)[0]
+
+
+def get_column_types(
+    entities: Iterable[Dict[str, Any]], entity_name: Optional[str] = None
+) -> Dict[str, str]:
+    """Collect Arrow type aliases for the columns declared in `entities.yml`.
+
+    Columns of all entities are included so that derived staging and cleaned tables
+    are typed as well; the columns of `entity_name` take precedence.
+
+    Args:
+        entities (Iterable[Dict[str, Any]]): Entity configurations.
+        entity_name (Optional[str]): Entity whose column types take precedence.
+
+    Returns:
+        Dict[str, str]: Arrow type alias keyed by snake_case column name.
+    """
+    column_types: Dict[str, str] = {}
+    entity_types: Dict[str, str] = {}
+    for entity in entities:
+        columns = entity.get("validation", {}).get("columns", {})
+        target = entity_types if entity.get("name") == entity_name else column_types
+        for column, sql_type in columns.items():
+            base_type = get_base_type(sql_type)
+            arrow_type = SQL_TO_ARROW_TYPES.get(base_type)
+            if arrow_type:
+                target.setdefault(column, arrow_type)
+    column_types.update(entity_types)
+    return column_types
+
+
+def get_dtype_plan(
+    entities: Iterable[Dict[str, Any]], entity_name: str
+) -> Dict[str, str]:
+    """Build the pandas dtypes of an entity's columns from `entities.yml`.
+
+    Columns listed in the entity's `categorical_columns` become categoricals; other
+    INT and DATE columns of its `validation.columns` become nullable integers and
+    datetimes. Remaining columns keep the types inferred by the reader.
+
+    Args:
+        entities (Iterable[Dict[str, Any]]): Entity configurations.
+        entity_name (str): Name of the entity.
+
+    Returns:
+        Dict[str, str]: pandas dtype keyed by snake_case column name.
+    """
+    dtype_plan: Dict[str, str] = {}
+    for entity in entities:
+        if entity.get("name") != entity_name:
+            continue
+        columns = entity.get("validation", {}).get("columns", {})
+        for column, sql_type in columns.items():
+            base_type = get_base_type(sql_type)
+            if base_type in SQL_TO_PANDAS_TYPES:
+                dtype_plan[column] = SQL_TO_PANDAS_TYPES[base_type]
+        for column in entity.get("categorical_columns", []):
+            dtype_plan[column] = CATEGORY_DTYPE
+    return dtype_plan
+
+
+def get_text_dtype_plan(
+    entities: Iterable[Dict[str, Any]], entity_name: str
+) -> Dict[str, str]:
+    """Build the pandas dtypes of an entity's text columns from `entities.yml`.
+
+    VARCHAR, TEXT and CHAR columns are read as text instead of inferred, so that
+    codes and IDs such as `industry_code` keep their leading zeros, and every chunk
+    of a table read in chunks gets the same column types whatever values it holds.
+
+    Args:
+        entities (Iterable[Dict[str, Any]]): Entity configurations.
+        entity_name (str): Name of the entity.
+
+    Returns:
+        Dict[str, str]: `TEXT_DTYPE` keyed by snake_case column name.
+    """
+    dtype_plan: Dict[str, str] = {}
+    for entity in entities:
+        if entity.get("name") != entity_name:
+            continue
+        columns = entity.get("validation", {}).get("columns", {})
+        for column, sql_type in columns.items():
+            if get_base_type(sql_type) in SQL_TEXT_TYPES:
+                dtype_plan[column] = TEXT_DTYPE
+    return dtype_plan
+
+
+def get_categorical_columns(
+    columns: Iterable[str], dtype_plan: Dict[str, str]
+) -> List[str]:
+    """Select the columns of a table that the dtype plan reads as categoricals.
+
+    Args:
+        columns (Iterable[str]): Column names of the table, in any case style.
+        dtype_plan (Dict[str, str]): pandas dtype keyed by snake_case column name.
+
+    Returns:
+        List[str]: The categorical columns, with their names in the table.
+    """
+    return [
+        column
+        for column in columns
+        if dtype_plan.get(to_snake_case(str(column))) == CATEGORY_DTYPE
+    ]
+
+
+def get_parser_dtypes(
+    columns: Iterable[str], dtype_plan: Dict[str, str]
+) -> Dict[str, str]:
+    """Select the dtypes of a plan that a CSV parser applies itself.
+
+    Categoricals are built by the parser, without an object column first, and
+    text columns are left as text instead of being inferred.
+
+    Args:
+        columns (Iterable[str]): Column names of the table, in any case style.
+        dtype_plan (Dict[str, str]): pandas dtype keyed by snake_case column name.
+
+    Returns:
+        Dict[str, str]: The parser dtypes, keyed by the column names in the table.
+    """
+    parser_dtypes: Dict[str, str] = {}
+    for column in columns:
+        dtype = dtype_plan.get(to_snake_case(str(column)))
+        if dtype in (CATEGORY_DTYPE, TEXT_DTYPE):
+            parser_dtypes[column] = dtype
+    return parser_dtypes
+
+
+def _convert_column(series: pd.Series, dtype: str) -> pd.Series:
+    if dtype == CATEGORY_DTYPE:
+        if not isinstance(series.dtype, pd.CategoricalDtype):
+            series = series.astype(CATEGORY_DTYPE)
+        # Sorted categories keep sort_values() in the order of the plain strings
+        categories = series.cat.categories
+        if not categories.is_monotonic_increasing:
+            series = series.cat.reorder_categories(categories.sort_values())
+        return series
+    if dtype == TEXT_DTYPE:
+        # Read as text by the CSV parser, and stored as strings in Parquet tables
+        return series
+    if dtype.startswith("datetime64"):
+        if pd.api.types.is_datetime64_any_dtype(series):
+            return series
+        # Raises unless every value has the format inferred from the first one, in
+        # which case the strings are left for the cleaning step to coerce
+        return pd.to_datetime(series)
+    return series.astype(dtype)
+
+
+def apply_dtype_plan(df: pd.DataFrame, dtype_plan: Dict[str, str]) -> pd.DataFrame:
+    """Convert the columns of a DataFrame to the dtypes of a plan.
+
+    Columns are matched by their snake_case name. A column whose values cannot be
+    converted losslessly (e.g. fractional codes or malformed dates) is left as read.
+
+    Args:
+        df (pd.DataFrame): The DataFrame, converted in place.
+        dtype_plan (Dict[str, str]): pandas dtype keyed by snake_case column name.
+
+    Returns:
+        pd.DataFrame: The converted DataFrame.
+    """
+    for column in df.columns:
+        dtype = dtype_plan.get(to_snake_case(str(column)))
+        if dtype is None:
+            continue
+        try:
+            df[column] = _convert_column(df[column], dtype)
+        except (ValueError, TypeError, OverflowError) as e:
+            logger.debug(f"Column '{column}' not converted to {dtype}: {e}")
+    return df
+
+
+def build_arrow_table(df: pd.DataFrame, column_types: Dict[str, str]) -> Any:
+    """Convert a DataFrame to an Arrow table using the declared column types.
+
+    Columns are matched by their snake_case name. Columns without a declared type,
+    or whose values cannot be converted to it, fall back to Arrow type inference;
+    mixed-type columns that cannot be inferred are stored as strings. As with CSV,
+    empty strings are stored as nulls.
+
+    Args:
+        df (pd.DataFrame): The DataFrame to convert.
+        column_types (Dict[str, str]): Arrow type aliases keyed by snake_case name.
+
+    Returns:
+        pyarrow.Table: The typed Arrow table.
+    """
+    pa = _import_pyarrow()
+    arrays = []
+    for column in df.columns:
+        series = df[column]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # Stored as plain values, so parts written from any dtype plan concatenate
+            series = series.astype(object)
+        if series.dtype == object:
+            series = series.where(series != "", None)
+        type_alias = column_types.get(to_snake_case(str(column)))
+        array = None
+        if type_alias:
+            try:
+                array = pa.array(series, from_pandas=True).cast(
+                    pa.type_for_alias(type_alias)
+                )
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError, TypeError) as e:
+                logger.debug(f"Column '{column}' not stored as {type_alias}: {e}")
+        if array is None:
+            try:
+                array = pa.array(series, from_pandas=True)
+            except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError):
+                array = pa.array(
+                    series.astype(str).where(series.notna(), None), from_pandas=True
+                )
+        arrays.append(array)
+    return pa.Table.from_arrays(arrays, names=[str(column) for column in df.columns])
+
+
+def list_part_files(table_path: Path) -> List[Path]:
+    """List the part files of an appendable Parquet table in write order.
+
+    Args:
+        table_path (Path): Directory of the Parquet table.
+
+    Returns:
+        List[Path]: Sorted part files.
+    """
+    return sorted(table_path.glob("part-*.parquet"))
+
+
+def append_parquet_part(
+    df: pd.DataFrame, table_path: Path, column_types: Dict[str, str]
+) -> Path:
+    """Append a DataFrame to a Parquet table as a new part file.
+
+    Args:
+        df (pd.DataFrame): The DataFrame to append.
+        table_path (Path): Directory of the Parquet table.
+        column_types (Dict[str, str]): Arrow type aliases keyed by snake_case name.
+
+    Returns:
+        Path: The written part file.
+    """
+    return append_arrow_part(build_arrow_table(df, column_types), table_path)
+
+
+def append_arrow_part(table: Any, table_path: Path) -> Path:
+    """Append an Arrow table to a Parquet table as a new part file.
+
+    Args:
+        table (pyarrow.Table): The Arrow table to append.
+        table_path (Path): Directory of the Parquet table.
+
+    Returns:
+        Path: The written part file.
+    """
+    pa = _import_pyarrow()
+    table_path.mkdir(parents=True, exist_ok=True)
+    part_file = table_path / PART_FILE_TEMPLATE.format(
+        index=len(list_part_files(table_path))
+    )
+    pa.parquet.write_table(table, part_file)
+    return part_file
+
+
+def write_parquet_file(
+    df: pd.DataFrame, file_path: Path, column_types: Dict[str, str]
+) -> None:
+    """Write a DataFrame to a single Parquet file, appending if the file exists.
+
+    Args:
+        df (pd.DataFrame): The DataFrame to write.
+        file_path (Path): Path to the Parquet file.
+        column_types (Dict[str, str]): Arrow type aliases keyed by snake_case name.
+    """
+    pa = _import_pyarrow()
+    table = build_arrow_table(df, column_types)
+    if file_path.exists():
+        existing = pa.parquet.read_table(file_path)
+        table = pa.concat_tables([existing, table], promote_options="default")
+    pa.parquet.write_table(table, file_path)
+
+
+def concat_arrow_tables(tables: List[Any]) -> Any:
+    """Concatenate Arrow tables, promoting column types where they differ.
+
+    Args:
+        tables (List[pyarrow.Table]): The tables to concatenate, in order.
+
+    Returns:
+        pyarrow.Table: The concatenated table.
+    """
+    pa = _import_pyarrow()
+    return pa.concat_tables(tables, promote_options="permissive")
+
+
+def move_parquet_parts(source_path: Path, table_path: Path) -> int:
+    """Move the part files of one Parquet table to the end of another.
+
+    Args:
+        source_path (Path): Directory of the table whose parts are moved.
+        table_path (Path): Directory of the table receiving the parts.
+
+    Returns:
+        int: Number of part files moved.
+    """
+    table_path.mkdir(parents=True, exist_ok=True)
+    next_index = len(list_part_files(table_path))
+    source_parts = list_part_files(source_path)
+    for offset, part_file in enumerate(source_parts):
+        part_file.replace(
+            table_path / PART_FILE_TEMPLATE.format(index=next_index + offset)
+        )
+    return len(source_parts)
+
+
+def move_parquet_file_to_parts(file_path: Path, table_path: Path) -> Path:
+    """Move a single-file Parquet table to the end of an appendable table.
+
+    Args:
+        file_path (Path): The Parquet file to move.
+        table_path (Path): Directory of the table receiving the file as a part.
+
+    Returns:
+        Path: The new part file.
+    """
+    table_path.mkdir(parents=True, exist_ok=True)
+    part_file = table_path / PART_FILE_TEMPLATE.format(
+        index=len(list_part_files(table_path))
+    )
+    file_path.replace(part_file)
+    return part_file
+
+
+def read_parquet_table(
+    table_path: Path,
+    columns: Optional[List[str]] = None,
+    dtype_plan: Optional[Dict[str, str]] = None,
+) -> pd.DataFrame:
+    """Read a Parquet table (a single file or a directory of parts).
+
+    Args:
+        table_path (Path): Parquet file or directory of part files.
+        columns (Optional[List[str]]): Columns to read; all columns if None.
+        dtype_plan (Optional[Dict[str, str]]): pandas dtype keyed by snake_case
+            column name; categorical columns are decoded straight from Arrow.
+
+    Returns:
+        pd.DataFrame: The table, with dates as datetime64 columns.
+    """
+    pa = _import_pyarrow()
+    part_files = list_part_files(table_path) if table_path.is_dir() else [table_path]
+    if not part_files:
+        return pd.DataFrame(columns=columns or [])
+
+    tables = []
+    for part_file in part_files:
+        part_columns = columns
+        if columns is not None:
+            available = set(pa.parquet.read_schema(part_file).names)
+            part_columns = [column for column in columns if column in available]
+        tables.append(pa.parquet.read_table(part_file, columns=part_columns))
+    table = pa.concat_tables(tables, promote_options="default")
+    categories = get_categorical_columns(table.column_names, dtype_plan or {})
+    df = table.to_pandas(date_as_object=False, categories=categories or None)
+    return apply_dtype_plan(df, dtype_plan) if dtype_plan else df
+
+
+def iter_parquet_batches(
+    table_path: Path, batch_size: int, dtype_plan: Optional[Dict[str, str]] = None
+) -> Iterator[pd.DataFrame]:
+    """Read a Parquet table (a single file or a directory of parts) in batches.
+
+    Args:
+        table_path (Path): Parquet file or directory of part files.
+        batch_size (int): Largest number of rows per batch.
+        dtype_plan (Optional[Dict[str, str]]): pandas dtype keyed by snake_case
+            column name; categorical columns are decoded straight from Arrow.
+
+    Yields:
+        pd.DataFrame: The batches in table order, with dates as datetime64 columns.
+    """
+    pa = _import_pyarrow()
+    part_files = list_part_files(table_path) if table_path.is_dir() else [table_path]
+    for part_file in part_files:
+        parquet_file = pa.parquet.ParquetFile(part_file)
+        categories = get_categorical_columns(
+            parquet_file.schema_arrow.names, dtype_plan or {}
+        )
+        for batch in parquet_file.iter_batches(batch_size=batch_size):
+            df = pa.Table.from_batches([batch]).to_pandas(
+                date_as_object=False, categories=categories or None
+            )
+            yield apply_dtype_plan(df, dtype_plan) if dtype_plan else df
+
+
+def merge_parquet_parts(table_path: Path, file_path: Path) -> int:
+    """Combine the part files of a Parquet table into a single Parquet file.
+
+    Parts are read one at a time, so memory is bounded by the largest part. Column
+    types are promoted where the parts differ, e.g. from all-null to strings.
+
+    Args:
+        table_path (Path): Directory of the Parquet table.
+        file_path (Path): Path of the combined file, replaced if it exists.
+
+    Returns:
+        int: Number of rows written.
+    """
+    pa = _import_pyarrow()
+    part_files = list_part_files(table_path)
+    schema = pa.unify_schemas([pa.parquet.read_schema(p) for p in part_files])
+    rows = 0
+    with pa.parquet.ParquetWriter(file_path, schema) as writer:
+        for part_file in part_files:
+            table = pa.parquet.read_table(part_file).select(schema.names)
+            writer.write_table(table.cast(schema))
+            rows += table.num_rows
+    return rows
@@ -0,0 +1,142 @@
+"""Date Normalization Utilities.
+
+This module provides the `DateNormalizer` class, which converts raw date strings
+from PRH records into ISO `YYYY-MM-DD` format. PRH dates are almost always ISO
+dates or timestamps, so those are validated with a strict fast path. Anything
+else falls back to the fuzzy `dateutil` parser.
+
+Key Features:
+- Strict ISO fast path for `YYYY-MM-DD` dates and timestamps.
+- Bounded memo cache keyed on the raw string.
+- Counters for fast-path, fallback, and failed parses.
+"""
+
+import logging
+from dataclasses import asdict, dataclass
+from datetime import date
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+from dateutil.parser import ParserError, parse
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of distinct raw date strings kept in the memo cache
+DEFAULT_DATE_CACHE_SIZE = 65536
+# Characters allowed directly after the date part of an ISO timestamp
+ISO_TIME_SEPARATORS = ("T", " ")
+
+
+@dataclass
+class DateParseStats:
+    """Counters describing how date strings were parsed."""
+
+    fast_path: int = 0
+    fallback: int = 0
+    failures: int = 0
+
+
+class DateNormalizer:
+    """Normalize raw date strings to ISO format with a cached fast path."""
+
+    def __init__(self, cache_size: int = DEFAULT_DATE_CACHE_SIZE) -> None:
+        """Initialize the DateNormalizer.
+
+        Args:
+            cache_size (int): Maximum number of raw strings kept in the memo cache.
+        """
+        self.stats = DateParseStats()
+        self._parse_cached = lru_cache(maxsize=cache_size)(self._parse_uncached)
+
+    def normalize(self, value: Any) -> Optional[str]:
+        """Normalize a single raw date value.
+
+        Args:
+            value (Any): The raw date value, usually a string.
+
+        Returns:
+            Optional[str]: The date in ISO format (YYYY-MM-DD), or None if parsing fails.
+        """
+        if not value:
+            return None
+        if not isinstance(value, str):
+            self.stats.failures += 1
+            logger.warning(f"Invalid date value '{value}': expected a string")
+            return None
+        return self._parse_cached(value)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Return parse counters together with memo cache statistics.
+
+        Returns:
+            Dict[str, int]: Fast-path, fallback, failure, and cache hit/miss counts.
+        """
+        cache_info = self._parse_cached.cache_info()
+        return {
+            **asdict(self.stats),
+            "cache_hits": cache_info.hits,
+            "cache_misses": cache_info.misses,
+            "cache_size": cache_info.currsize,
+        }
+
+    def log_stats(self) -> None:
+        """Log the parse counters and memo cache statistics."""
+        stats = self.get_stats()
+        logger.info(
+            f"Date parsing: {stats['fast_path']} fast-path, {stats['fallback']} fallback, "
+            f"{stats['failures']} failed, {stats['cache_hits']} cache hits, "
+            f"{stats['cache_misses']} cache misses."
+        )
+
+    def clear_cache(self) -> None:
+        """Clear the memo cache and reset the counters."""
+        self._parse_cached.cache_clear()
+        self.stats = DateParseStats()
+
+    def _parse_uncached(self, date_str: str) -> Optional[str]:
+        """Parse a raw date string that is not in the memo cache.
+
+        Args:
+            date_str (str): The raw date string.
+
+        Returns:
+            Optional[str]: The date in ISO format (YYYY-MM-DD), or None if parsing fails.
+        """
+        iso_date = parse_iso_date(date_str)
+        if iso_date is not None:
+            self.stats.fast_path += 1
+            return iso_date
+
+        self.stats.fallback += 1
+        try:
+            return parse(date_str, fuzzy=True).date().isoformat()
+        except (ValueError, TypeError, OverflowError, ParserError) as e:
+            self.stats.failures += 1
+            logger.warning(f"Invalid date string '{date_str}': {e}")
+            return None
+
+
+def parse_iso_date(date_str: str) -> Optional[str]:
+    """Strictly parse an ISO `YYYY-MM-DD` date or timestamp.
+
+    Args:
+        date_str (str): The raw date string.
+
+    Returns:
+        Optional[str]: The validated date part, or None if the string is not ISO formatted.
+    """
+    if len(date_str) < 10 or date_str[4] != "-" or date_str[7] != "-":
+        return None
+    if len(date_str) > 10 and date_str[10] not in ISO_TIME_SEPARATORS:
+        return None
+
+    date_part = date_str[:10]
+    try:
+        date.fromisoformat(date_part)
+    except ValueError:
+        return None
+    return date_part
+
+
+# Shared process-wide normalizer used by the extractors
+DATE_NORMALIZER = DateNormalizer()
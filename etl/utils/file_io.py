@@ -1,14 +1,46 @@
+import json
 import logging
 import os
+import shutil
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List
+from typing import Any, Callable, Dict, Iterator, List, Optional
 
 import pandas as pd
+from etl.utils.columnar_io import (
+    STORAGE_FORMAT_CSV,
+    STORAGE_FORMAT_PARQUET,
+    append_parquet_part,
+    apply_dtype_plan,
+    get_column_types,
+    get_parser_dtypes,
+    is_parquet_path,
+    iter_parquet_batches,
+    merge_parquet_parts,
+    move_parquet_file_to_parts,
+    read_parquet_table,
+    validate_storage_format,
+    with_storage_suffix,
+    write_parquet_file,
+)
+from etl.utils.run_profiler import PROFILER
 from etl.utils.s3_utils import upload_file_to_s3
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Files written by `save_to_csv_and_upload` while `record_written_files` is active
+_written_files: Optional[List[str]] = None
+# Part directories of the Parquet outputs deferred by `defer_parquet_outputs`
+_deferred_parquet_outputs: Optional[Dict[str, Path]] = None
+# Suffix of the part directory of a deferred Parquet output
+PARTS_DIR_SUFFIX = ".parts"
+
+# Receives (rows, output file, entity name) of `save_to_csv_and_upload` instead of
+# the output files while `redirect_outputs` is active
+OutputHandler = Callable[[pd.DataFrame, str, str], None]
+_output_handler: Optional[OutputHandler] = None
+
 
 def read_csv(file_path: str) -> pd.DataFrame:
     """Read a CSV file into a DataFrame.
@@ -24,6 +56,142 @@ def read_csv(file_path: str) -> pd.DataFrame:
     return df
 
 
+def read_table(
+    file_path: str,
+    columns: Optional[List[str]] = None,
+    dtype_plan: Optional[Dict[str, str]] = None,
+) -> pd.DataFrame:
+    """Read a CSV or Parquet table into a DataFrame, based on the file suffix.
+
+    Args:
+        file_path (str): Path to the CSV file, or the Parquet file or directory.
+        columns (Optional[List[str]]): Columns to read, in this order; all columns if None.
+        dtype_plan (Optional[Dict[str, str]]): pandas dtype keyed by snake_case
+            column name (see `get_dtype_plan`); types are inferred if None.
+
+    Returns:
+        pd.DataFrame: DataFrame containing the table data.
+    """
+    if is_parquet_path(file_path):
+        df = read_parquet_table(Path(file_path), columns, dtype_plan)
+    else:
+        df = pd.read_csv(
+            file_path,
+            usecols=columns,
+            dtype=_get_csv_dtypes(file_path, dtype_plan),
+            low_memory=False,
+        )
+        if columns is not None:
+            df = df[columns]
+        if dtype_plan:
+            df = apply_dtype_plan(df, dtype_plan)
+    logger.info(f"Read {len(df)} rows from {file_path}")
+    return df
+
+
+def _get_csv_dtypes(
+    file_path: str, dtype_plan: Optional[Dict[str, str]]
+) -> Optional[Dict[str, str]]:
+    if not dtype_plan:
+        return None
+    header = pd.read_csv(file_path, nrows=0).columns
+    return get_parser_dtypes(header, dtype_plan)
+
+
+def iter_table_chunks(
+    file_path: str, chunk_size: int, dtype_plan: Optional[Dict[str, str]] = None
+) -> Iterator[pd.DataFrame]:
+    """Read a CSV or Parquet table in chunks, based on the file suffix.
+
+    Args:
+        file_path (str): Path to the CSV file, or the Parquet file or directory.
+        chunk_size (int): Largest number of rows per chunk.
+        dtype_plan (Optional[Dict[str, str]]): pandas dtype keyed by snake_case
+            column name (see `get_dtype_plan`); types are inferred if None.
+
+    Yields:
+        pd.DataFrame: The chunks in table order.
+    """
+    if is_parquet_path(file_path):
+        chunks = iter_parquet_batches(Path(file_path), chunk_size, dtype_plan)
+    else:
+        chunks = pd.read_csv(
+            file_path,
+            dtype=_get_csv_dtypes(file_path, dtype_plan),
+            chunksize=chunk_size,
+        )
+    rows = 0
+    for chunk in chunks:
+        rows += len(chunk)
+        if dtype_plan and not is_parquet_path(file_path):
+            chunk = apply_dtype_plan(chunk, dtype_plan)
+        yield chunk
+    logger.info(f"Read {rows} rows from {file_path} in chunks of {chunk_size}")
+
+
+def save_table(
+    df: pd.DataFrame,
+    output_file: str,
+    storage_format: str = STORAGE_FORMAT_CSV,
+    column_types: Optional[Dict[str, str]] = None,
+) -> None:
+    """Append a DataFrame to a table in the given storage format.
+
+    CSV tables are appended in place; Parquet tables are directories to which each
+    call adds a new part file.
+
+    Args:
+        df (pd.DataFrame): The DataFrame to save.
+        output_file (str): Path to the output table.
+        storage_format (str): Storage format, "csv" or "parquet".
+        column_types (Optional[Dict[str, str]]): Arrow type aliases keyed by
+            snake_case column name, used for Parquet.
+    """
+    if validate_storage_format(storage_format) == STORAGE_FORMAT_CSV:
+        save_to_csv(df, output_file)
+    elif not df.empty:
+        append_parquet_part(df, Path(output_file), column_types or {})
+        logger.info(f"Saved {len(df)} rows to {output_file}")
+
+
+def load_json_records(json_file: Path) -> List[Dict[str, Any]]:
+    """Load raw records from a JSON file (list or line-delimited) as plain dicts.
+
+    Args:
+        json_file (Path): Path to the JSON file.
+
+    Returns:
+        List[Dict[str, Any]]: The records parsed from the file.
+    """
+    all_rows: List[Dict[str, Any]] = []
+    try:
+        with json_file.open("r", encoding="utf-8") as file:
+
+            data = json.load(file)
+            if isinstance(data, list):
+                all_rows.extend(data)
+            else:
+                logger.warning(
+                    f"Unexpected JSON format in {json_file}. Expected a list."
+                )
+    except json.JSONDecodeError:
+        logger.info(f"Falling back to line-by-line parsing for {json_file}.")
+
+        with json_file.open("r", encoding="utf-8") as file:
+            for line in file:
+                try:
+                    record = json.loads(line)
+                    if isinstance(record, dict):
+                        all_rows.append(record)
+                except json.JSONDecodeError as e:
+                    logger.error(f"Skipping invalid JSON line: {e}")
+
+    if not all_rows:
+        logger.warning(f"No valid data found in {json_file}")
+
+    return all_rows
+
+
 def save_to_csv(df: pd.DataFrame, output_file: str) -> None:
     """Save a DataFrame to a CSV file, appending if the file already exists.
 
@@ -58,31 +226,144 @@ def read_and_concatenate_csv_files(file_paths: List[str]) -> pd.DataFrame:
     return concatenated_df
 
 
+@contextmanager
+def defer_parquet_outputs(config: dict) -> Iterator[None]:
+    """Write the Parquet outputs of `save_to_csv_and_upload` as parts within the block.
+
+    Appending to a single-file Parquet output rewrites the whole file, so outputs
+    saved chunk by chunk are written as part files next to the output instead and
+    combined into the output file when the block exits, one part at a time. The
+    combined files are then uploaded to S3 if enabled.
+
+    Args:
+        config (dict): Config dictionary with snapshot_date, language, etc.
+
+    Yields:
+        None
+    """
+    global _deferred_parquet_outputs
+    previous = _deferred_parquet_outputs
+    deferred: Dict[str, Path] = {}
+    _deferred_parquet_outputs = deferred
+    try:
+        yield
+        for output_file, parts_dir in deferred.items():
+            rows = merge_parquet_parts(parts_dir, Path(output_file))
+            logger.info(f"Combined {rows} rows into {output_file}")
+            upload_cleaned_file(output_file, config)
+    finally:
+        _deferred_parquet_outputs = previous
+        for parts_dir in deferred.values():
+            shutil.rmtree(parts_dir, ignore_errors=True)
+
+
+def _get_deferred_parts_dir(deferred: Dict[str, Path], output_file: str) -> Path:
+    parts_dir = deferred.get(output_file)
+    if parts_dir is None:
+        parts_dir = Path(f"{output_file}{PARTS_DIR_SUFFIX}")
+        shutil.rmtree(parts_dir, ignore_errors=True)
+        if Path(output_file).exists():
+            # Rows saved before the block come first, as with a direct append
+            move_parquet_file_to_parts(Path(output_file), parts_dir)
+        deferred[output_file] = parts_dir
+    return parts_dir
+
+
+@contextmanager
+def redirect_outputs(handler: OutputHandler) -> Iterator[None]:
+    """Pass the outputs of `save_to_csv_and_upload` to a handler within the block.
+
+    Nothing is written or uploaded; the handler decides what happens to the rows,
+    e.g. spilling them to be reordered and saved later.
+
+    Args:
+        handler (OutputHandler): Called with the rows, the output file and the
+            entity name of every non-empty output.
+
+    Yields:
+        None
+    """
+    global _output_handler
+    previous = _output_handler
+    _output_handler = handler
+    try:
+        yield
+    finally:
+        _output_handler = previous
+
+
+@contextmanager
+def record_written_files() -> Iterator[List[str]]:
+    """Record the files written by `save_to_csv_and_upload` within the block.
+
+    Used to report the outputs of a cleaning job precisely, even when other jobs
+    write to the same directories at the same time in other processes.
+
+    Yields:
+        List[str]: The paths of the files written so far, without duplicates.
+    """
+    global _written_files
+    previous = _written_files
+    _written_files = []
+    try:
+        yield _written_files
+    finally:
+        _written_files = previous
+
+
 def save_to_csv_and_upload(
     df: pd.DataFrame, output_file: str, entity_name: str, config: dict
 ) -> None:
     """Save a DataFrame to a CSV file and upload to S3 if enabled.
 
+    With `storage_format: parquet` in the config, the table is written to a Parquet
+    file next to the given CSV path instead.
+
     Args:
         df (pd.DataFrame): The DataFrame to save.
         output_file (str): Path to the output CSV file.
         entity_name (str): Name of the entity (for S3 key).
         config (dict): Config dictionary with snapshot_date, language, etc.
     """
-    if not df.empty:
-        if Path(output_file).exists():
+    if not df.empty and _output_handler is not None:
+        _output_handler(df, output_file, entity_name)
+    elif not df.empty:
+        storage_format = config.get("storage_format", STORAGE_FORMAT_CSV)
+        if validate_storage_format(storage_format) == STORAGE_FORMAT_PARQUET:
+            output_file = str(with_storage_suffix(output_file, storage_format))
+            column_types = get_column_types(config.get("entities", []))
+            if _deferred_parquet_outputs is not None:
+                parts_dir = _get_deferred_parts_dir(
+                    _deferred_parquet_outputs, output_file
+                )
+                append_parquet_part(df, parts_dir, column_types)
+            else:
+                write_parquet_file(df, Path(output_file), column_types)
+        elif Path(output_file).exists():
             df.to_csv(
                 output_file, mode="a", header=False, index=False, encoding="utf-8"
             )
         else:
             df.to_csv(output_file, index=False, encoding="utf-8")
         logger.info(f"Saved {len(df)} rows to {output_file}")
+        PROFILER.add_rows_out(len(df))
+        if _written_files is not None and output_file not in _written_files:
+            _written_files.append(output_file)
+        if output_file not in (_deferred_parquet_outputs or {}):
+            upload_cleaned_file(output_file, config)
+
 
-        # Upload to S3 if enabled
-        if os.getenv("USE_S3", "false").lower() == "true":
-            bucket = os.getenv("S3_BUCKET")
-            snapshot_date = config.get("snapshot_date", "unknown-date")
-            language = config.get("language", "unknown-lang")
-            s3_key = f"etl/cleaned/{snapshot_date}/{language}/{Path(output_file).name}"
-            upload_file_to_s3(output_file, bucket, s3_key)
-            logger.info(f"Uploaded {output_file} to s3://{bucket}/{s3_key}")
+def upload_cleaned_file(output_file: str, config: dict) -> None:
+    """Upload a cleaned output file to S3 if enabled.
+
+    Args:
+        output_file (str): Path to the cleaned output file.
+        config (dict): Config dictionary with snapshot_date, language, etc.
+    """
+    if os.getenv("USE_S3", "false").lower() == "true":
+        bucket = os.getenv("S3_BUCKET")
+        snapshot_date = config.get("snapshot_date", "unknown-date")
+        language = config.get("language", "unknown-lang")
+        s3_key = f"etl/cleaned/{snapshot_date}/{language}/{Path(output_file).name}"
+        upload_file_to_s3(output_file, bucket, s3_key)
+        logger.info(f"Uploaded {output_file} to s3://{bucket}/{s3_key}")
@@ -0,0 +1,522 @@
+"""Resumable, Verified HTTP Downloads.
+
+This module defines the `ResumableDownloader` class, which downloads large files
+such as the PRH `all_companies` archive. Partial downloads are kept next to the
+destination and resumed with HTTP Range requests, large files can be fetched over
+several parallel ranged connections, and the result is verified before it replaces
+the destination file.
+
+Key Features:
+- Conditional requests (ETag / If-Modified-Since) skip unchanged upstream files.
+- Resume of interrupted downloads with `Range` and `If-Range` headers.
+- Parallel ranged connections for servers that accept byte ranges.
+- Size and SHA-256 verification, recorded in a `.meta.json` sidecar file.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+# Constants
+DEFAULT_CHUNK_SIZE = 1024 * 1024  # Bytes read from the response per iteration
+DEFAULT_CONNECTIONS = 4  # Parallel ranged connections for large files
+DEFAULT_MIN_PARALLEL_SIZE = 64 * 1024 * 1024  # Smaller files use one connection
+DEFAULT_TIMEOUT = 30  # Timeout for HTTP requests in seconds
+HASH_BLOCK_SIZE = 8 * 1024 * 1024  # Bytes read per iteration when hashing files
+METADATA_SUFFIX = ".meta.json"  # Sidecar file describing a completed download
+PART_SUFFIX = ".part"  # Suffix of partially downloaded files
+PART_METADATA_SUFFIX = ".part.meta.json"  # Validators of the partial files
+
+
+class DownloadChangedError(RuntimeError):
+    """Raised when the remote file changes while a download is being resumed."""
+
+
+class IncompleteDownloadError(RuntimeError):
+    """Raised when the server sends fewer bytes than expected; the part is kept."""
+
+
+@dataclass
+class DownloadMetadata:
+    """Validators and checksums of a completed download."""
+
+    url: str
+    size: Optional[int] = None
+    sha256: Optional[str] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+@dataclass
+class RemoteFileInfo:
+    """Properties of the remote file reported by the server."""
+
+    size: Optional[int] = None
+    accepts_ranges: bool = False
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    not_modified: bool = False
+
+
+def compute_sha256(file_path: Path) -> str:
+    """Compute the SHA-256 checksum of a file.
+
+    Args:
+        file_path (Path): Path to the file.
+
+    Returns:
+        str: Hexadecimal SHA-256 digest.
+    """
+    digest = hashlib.sha256()
+    with file_path.open("rb") as file:
+        while block := file.read(HASH_BLOCK_SIZE):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_download_metadata(destination_path: Path) -> Optional[DownloadMetadata]:
+    """Load the sidecar metadata of a completed download.
+
+    Args:
+        destination_path (Path): Path of the downloaded file.
+
+    Returns:
+        Optional[DownloadMetadata]: The metadata, or None if missing or unreadable.
+    """
+    metadata_path = destination_path.with_name(destination_path.name + METADATA_SUFFIX)
+    if not metadata_path.exists():
+        return None
+    try:
+        with metadata_path.open("r", encoding="utf-8") as file:
+            return DownloadMetadata(**json.load(file))
+    except (OSError, ValueError, TypeError) as e:
+        logger.warning(f"Ignoring invalid download metadata {metadata_path}: {e}")
+        return None
+
+
+def save_download_metadata(destination_path: Path, metadata: DownloadMetadata) -> None:
+    """Write the sidecar metadata of a completed download.
+
+    Args:
+        destination_path (Path): Path of the downloaded file.
+        metadata (DownloadMetadata): Metadata to store.
+    """
+    metadata_path = destination_path.with_name(destination_path.name + METADATA_SUFFIX)
+    with metadata_path.open("w", encoding="utf-8") as file:
+        json.dump(asdict(metadata), file, indent=2)
+
+
+class ResumableDownloader:
+    """Download files with resume, parallel ranges, and integrity checks."""
+
+    def __init__(
+        self,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        connections: int = DEFAULT_CONNECTIONS,
+        min_parallel_size: int = DEFAULT_MIN_PARALLEL_SIZE,
+        retries: int = 3,
+        delay: int = 5,
+        timeout: int = DEFAULT_TIMEOUT,
+        session: Optional[requests.Session] = None,
+    ) -> None:
+        """Initialize the ResumableDownloader.
+
+        Args:
+            chunk_size (int): Bytes read from the response per iteration.
+            connections (int): Maximum number of parallel ranged connections.
+            min_parallel_size (int): Minimum file size for parallel downloads.
+            retries (int): Number of attempts before giving up.
+            delay (int): Delay between attempts in seconds.
+            timeout (int): Timeout for HTTP requests in seconds.
+            session (Optional[requests.Session]): Session used for all requests.
+                Defaults to a new session.
+        """
+        self.chunk_size = chunk_size
+        self.connections = max(1, connections)
+        self.min_parallel_size = min_parallel_size
+        self.retries = retries
+        self.delay = delay
+        self.timeout = timeout
+        self.session = session or requests.Session()
+
+    def download(
+        self,
+        url: str,
+        destination_path: Path,
+        expected_size: Optional[int] = None,
+        expected_sha256: Optional[str] = None,
+    ) -> bool:
+        """Download a file unless the local copy is still current.
+
+        Args:
+            url (str): URL of the file to download.
+            destination_path (Path): Path to save the downloaded file.
+            expected_size (Optional[int]): Expected size in bytes, if known.
+            expected_sha256 (Optional[str]): Expected SHA-256 checksum, if known.
+
+        Returns:
+            bool: True if the file was downloaded, False if the local copy was reused.
+
+        Raises:
+            RuntimeError: If the download fails after all retries or verification fails.
+        """
+        destination_path.parent.mkdir(parents=True, exist_ok=True)
+        metadata = self._get_valid_metadata(url, destination_path)
+
+        for attempt in range(self.retries):
+            try:
+                logger.info(
+                    f"Downloading file from {url} (Attempt {attempt + 1}/{self.retries})"
+                )
+                remote = self._probe(url, metadata)
+                if remote.not_modified:
+                    logger.info(f"Remote file not modified, reusing {destination_path}")
+                    return False
+
+                self._check_partial_files(destination_path, remote)
+                if (
+                    self.connections > 1
+                    and remote.accepts_ranges
+                    and remote.size is not None
+                    and remote.size >= self.min_parallel_size
+                ):
+                    self._download_parallel(url, destination_path, remote)
+                else:
+                    self._download_single(url, destination_path, remote)
+
+                self._finalize(
+                    url, destination_path, remote, expected_size, expected_sha256
+                )
+                logger.info(f"File downloaded successfully to {destination_path}")
+                return True
+            except DownloadChangedError as e:
+                logger.warning(f"{e}; restarting download from scratch.")
+                self._remove_partial_files(destination_path)
+                metadata = None
+            except IncompleteDownloadError as e:
+                logger.warning(
+                    f"{e} (Attempt {attempt + 1}/{self.retries}); resuming download."
+                )
+            except requests.RequestException as e:
+                logger.warning(
+                    f"Download failed (Attempt {attempt + 1}/{self.retries}): {e}"
+                )
+            if attempt < self.retries - 1:
+                time.sleep(self.delay)
+
+        logger.error(f"Failed to download file after {self.retries} attempts: {url}")
+        raise RuntimeError(f"Download failed for {url}")
+
+    def _get_valid_metadata(
+        self, url: str, destination_path: Path
+    ) -> Optional[DownloadMetadata]:
+        """Return the metadata of the local copy if it still matches the file on disk.
+
+        Args:
+            url (str): URL of the file to download.
+            destination_path (Path): Path of the local copy.
+
+        Returns:
+            Optional[DownloadMetadata]: Metadata usable for conditional requests, or None.
+        """
+        if not destination_path.exists():
+            return None
+        metadata = load_download_metadata(destination_path)
+        if metadata is None or metadata.url != url:
+            return None
+        if (
+            metadata.size is not None
+            and destination_path.stat().st_size != metadata.size
+        ):
+            logger.warning(f"Size of {destination_path} does not match its metadata.")
+            return None
+        if metadata.sha256 and compute_sha256(destination_path) != metadata.sha256:
+            logger.warning(
+                f"Checksum of {destination_path} does not match its metadata."
+            )
+            return None
+        return metadata
+
+    def _probe(self, url: str, metadata: Optional[DownloadMetadata]) -> RemoteFileInfo:
+        """Ask the server for the file properties with a conditional HEAD request.
+
+        Args:
+            url (str): URL of the file to download.
+            metadata (Optional[DownloadMetadata]): Metadata of a valid local copy.
+
+        Returns:
+            RemoteFileInfo: Size, range support, validators, and not-modified flag.
+        """
+        headers: Dict[str, str] = {}
+        if metadata is not None:
+            if metadata.etag:
+                headers["If-None-Match"] = metadata.etag
+            if metadata.last_modified:
+                headers["If-Modified-Since"] = metadata.last_modified
+
+        response = self.session.head(
+            url, headers=headers, timeout=self.timeout, allow_redirects=True
+        )
+        if response.status_code == 304:
+            return RemoteFileInfo(not_modified=True)
+        if not response.ok:
+            # Servers without HEAD support: fall back to a plain single-stream GET
+            logger.debug(f"HEAD request returned {response.status_code} for {url}")
+            return RemoteFileInfo()
+
+        content_length = response.headers.get("Content-Length")
+        return RemoteFileInfo(
+            size=int(content_length) if content_length else None,
+            accepts_ranges=response.headers.get("Accept-Ranges", "").lower() == "bytes",
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+
+    def _download_single(
+        self, url: str, destination_path: Path, remote: RemoteFileInfo
+    ) -> None:
+        """Download the file over one connection, resuming a partial file if possible.
+
+        Args:
+            url (str): URL of the file to download.
+            destination_path (Path): Path of the final file.
+            remote (RemoteFileInfo): Properties of the remote file.
+        """
+        part_path = destination_path.with_name(destination_path.name + PART_SUFFIX)
+        start = part_path.stat().st_size if part_path.exists() else 0
+        if remote.size is not None and start == remote.size:
+            return
+        if not remote.accepts_ranges or (
+            remote.size is not None and start > remote.size
+        ):
+            start = 0
+
+        self._fetch_range(url, part_path, start, None, remote)
+
+    def _download_parallel(
+        self, url: str, destination_path: Path, remote: RemoteFileInfo
+    ) -> None:
+        """Download the file over several ranged connections and join the segments.
+
+        Each segment is written to a file of its own, so an interrupted download
+        resumes every segment from where it stopped.
+
+        Args:
+            url (str): URL of the file to download.
+            destination_path (Path): Path of the final file.
+            remote (RemoteFileInfo): Properties of the remote file (size is required).
+        """
+        assert remote.size is not None
+        segments = self._plan_segments(remote.size)
+        logger.info(
+            f"Downloading {remote.size} bytes over {len(segments)} ranged connections."
+        )
+
+        segment_paths = [
+            destination_path.with_name(f"{destination_path.name}{PART_SUFFIX}{index}")
+            for index in range(len(segments))
+        ]
+
+        def fetch_segment(index: int) -> None:
+            start, end = segments[index]
+            segment_path = segment_paths[index]
+            done = segment_path.stat().st_size if segment_path.exists() else 0
+            if done > end - start + 1:
+                segment_path.unlink()
+                done = 0
+            if done < end - start + 1:
+                self._fetch_range(url, segment_path, start + done, end, remote, start)
+            # Join only complete segments, so a retry resumes the short ones
+            size = segment_path.stat().st_size
+            if size < end - start + 1:
+                raise IncompleteDownloadError(
+                    f"Incomplete segment {index} of {url}: expected "
+                    f"{end - start + 1} bytes, got {size}"
+                )
+
+        with ThreadPoolExecutor(max_workers=len(segments)) as executor:
+            list(executor.map(fetch_segment, range(len(segments))))
+
+        part_path = destination_path.with_name(destination_path.name + PART_SUFFIX)
+        with part_path.open("wb") as output:
+            for segment_path in segment_paths:
+                with segment_path.open("rb") as segment:
+                    while block := segment.read(HASH_BLOCK_SIZE):
+                        output.write(block)
+        for segment_path in segment_paths:
+            segment_path.unlink()
+
+    def _plan_segments(self, size: int) -> List[Tuple[int, int]]:
+        """Split a file into contiguous byte ranges, one per connection.
+
+        Args:
+            size (int): Size of the file in bytes.
+
+        Returns:
+            List[Tuple[int, int]]: Inclusive (start, end) byte ranges.
+        """
+        segment_size = -(-size // self.connections)
+        return [
+            (start, min(start + segment_size, size) - 1)
+            for start in range(0, size, segment_size)
+        ]
+
+    def _fetch_range(
+        self,
+        url: str,
+        file_path: Path,
+        start: int,
+        end: Optional[int],
+        remote: RemoteFileInfo,
+        file_offset: int = 0,
+    ) -> None:
+        """Fetch a byte range and write it to a file at the matching position.
+
+        Args:
+            url (str): URL of the file to download.
+            file_path (Path): File receiving the bytes.
+            start (int): First byte to fetch.
+            end (Optional[int]): Last byte to fetch (inclusive), or None for the rest.
+            remote (RemoteFileInfo): Properties of the remote file.
+            file_offset (int): Byte position in the remote file of the first byte of
+                `file_path`.
+
+        Raises:
+            DownloadChangedError: If the server ignores a resumed range because the
+                remote file changed.
+            requests.HTTPError: If the server responds with an error status.
+        """
+        headers: Dict[str, str] = {}
+        ranged = start > 0 or end is not None
+        if ranged:
+            headers["Range"] = f"bytes={start}-{'' if end is None else end}"
+            validator = remote.etag or remote.last_modified
+            if validator:
+                headers["If-Range"] = validator
+
+        response = self.session.get(
+            url, headers=headers, stream=True, timeout=self.timeout
+        )
+        with response:
+            response.raise_for_status()
+            if ranged and response.status_code != 206:
+                if file_offset != 0 or end is not None:
+                    raise DownloadChangedError(f"Remote file changed: {url}")
+                # The server sent the full body instead of the range: start over
+                start = 0
+
+            mode = "r+b" if start > file_offset and file_path.exists() else "wb"
+            with file_path.open(mode) as file:
+                file.seek(start - file_offset)
+                file.truncate()
+                for chunk in response.iter_content(chunk_size=self.chunk_size):
+                    file.write(chunk)
+
+    def _finalize(
+        self,
+        url: str,
+        destination_path: Path,
+        remote: RemoteFileInfo,
+        expected_size: Optional[int],
+        expected_sha256: Optional[str],
+    ) -> None:
+        """Verify the downloaded file and move it into place with its metadata.
+
+        Args:
+            url (str): URL of the downloaded file.
+            destination_path (Path): Path of the final file.
+            remote (RemoteFileInfo): Properties of the remote file.
+            expected_size (Optional[int]): Expected size in bytes, if known.
+            expected_sha256 (Optional[str]): Expected SHA-256 checksum, if known.
+
+        Raises:
+            IncompleteDownloadError: If the file is shorter than expected; the
+                partial file is kept to be resumed.
+            RuntimeError: If the file is longer than expected or the checksum does
+                not match; the partial file is removed.
+        """
+        part_path = destination_path.with_name(destination_path.name + PART_SUFFIX)
+        size = part_path.stat().st_size
+        for expected in (remote.size, expected_size):
+            if expected is not None and size < expected:
+                raise IncompleteDownloadError(
+                    f"Incomplete download of {url}: expected {expected} bytes, "
+                    f"got {size}"
+                )
+            if expected is not None and size > expected:
+                part_path.unlink()
+                raise RuntimeError(
+                    f"Size mismatch for {url}: expected {expected} bytes, got {size}"
+                )
+
+        sha256 = compute_sha256(part_path)
+        if expected_sha256 and sha256.lower() != expected_sha256.lower():
+            part_path.unlink()
+            raise RuntimeError(
+                f"Checksum mismatch for {url}: expected {expected_sha256}, got {sha256}"
+            )
+
+        os.replace(part_path, destination_path)
+        self._remove_partial_files(destination_path)
+        save_download_metadata(
+            destination_path,
+            DownloadMetadata(
+                url=url,
+                size=size,
+                sha256=sha256,
+                etag=remote.etag,
+                last_modified=remote.last_modified,
+            ),
+        )
+        logger.info(f"Verified {destination_path} ({size} bytes, sha256 {sha256})")
+
+    def _check_partial_files(
+        self, destination_path: Path, remote: RemoteFileInfo
+    ) -> None:
+        """Discard partial files that belong to a different version of the remote file.
+
+        Args:
+            destination_path (Path): Path of the final file.
+            remote (RemoteFileInfo): Properties of the remote file.
+        """
+        part_metadata_path = destination_path.with_name(
+            destination_path.name + PART_METADATA_SUFFIX
+        )
+        current = {
+            "size": remote.size,
+            "etag": remote.etag,
+            "last_modified": remote.last_modified,
+        }
+        previous = None
+        if part_metadata_path.exists():
+            try:
+                with part_metadata_path.open("r", encoding="utf-8") as file:
+                    previous = json.load(file)
+            except (OSError, ValueError):
+                previous = None
+        if previous != current:
+            self._remove_partial_files(destination_path)
+            with part_metadata_path.open("w", encoding="utf-8") as file:
+                json.dump(current, file)
+
+    @staticmethod
+    def _remove_partial_files(destination_path: Path) -> None:
+        """Remove all partial files of a download.
+
+        Args:
+            destination_path (Path): Path of the final file.
+        """
+        for part_path in destination_path.parent.glob(
+            f"{destination_path.name}{PART_SUFFIX}*"
+        ):
+            part_path.unlink()
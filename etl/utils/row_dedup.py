@@ -0,0 +1,148 @@
+"""Streaming Row Deduplication.
+
+Drops repeated rows while a table is being written, instead of running
+`drop_duplicates()` once the whole table is in memory. Every row (or its key
+columns) is fingerprinted with a 64-bit hash, and only the hashes of the rows
+seen so far are kept, as sorted NumPy arrays of 8 bytes per distinct row.
+
+The first occurrence of a row is kept, like `drop_duplicates(keep="first")`.
+Two different rows are only mistaken for duplicates if their 64-bit hashes
+collide, which is negligible at the table sizes of the pipeline.
+"""
+
+import logging
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+def hash_rows(df: pd.DataFrame, columns: Optional[List[str]] = None) -> np.ndarray:
+    """Return a 64-bit hash of every row.
+
+    Args:
+        df (pd.DataFrame): The rows to hash.
+        columns (Optional[List[str]]): Columns to hash; all columns if None.
+
+    Returns:
+        np.ndarray: One `uint64` hash per row.
+
+    Raises:
+        ValueError: If a key column is missing.
+    """
+    if columns is not None:
+        missing = [column for column in columns if column not in df.columns]
+        if missing:
+            raise ValueError(f"Deduplication key columns not found: {missing}")
+        df = df[columns]
+    return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+
+class RowHashSet:
+    """Compact set of 64-bit row hashes.
+
+    Hashes are stored in sorted runs whose sizes at least double from the newest
+    to the oldest run. A new run is merged with the runs that are not larger than
+    it, so there are at most log2(n) runs and each hash is merged O(log n) times.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty set."""
+        self._runs: List[np.ndarray] = []
+
+    def __len__(self) -> int:
+        """Return the number of hashes in the set."""
+        return sum(len(run) for run in self._runs)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the stored hashes."""
+        return sum(run.nbytes for run in self._runs)
+
+    def contains(self, hashes: np.ndarray) -> np.ndarray:
+        """Return whether each hash is in the set.
+
+        Args:
+            hashes (np.ndarray): The `uint64` hashes to look up.
+
+        Returns:
+            np.ndarray: Boolean mask of the hashes found.
+        """
+        found = np.zeros(len(hashes), dtype=bool)
+        for run in self._runs:
+            positions = np.minimum(np.searchsorted(run, hashes), len(run) - 1)
+            found |= run[positions] == hashes
+        return found
+
+    def add(self, hashes: np.ndarray) -> None:
+        """Add hashes that are not in the set yet.
+
+        Args:
+            hashes (np.ndarray): Distinct `uint64` hashes not contained in the set.
+        """
+        if not len(hashes):
+            return
+        run = np.sort(hashes)
+        while self._runs and len(self._runs[-1]) <= len(run):
+            run = np.concatenate([self._runs.pop(), run])
+            # Both halves are sorted, which the stable sort merges in linear time
+            run.sort(kind="stable")
+        self._runs.append(run)
+
+
+class RowDeduplicator:
+    """Drops rows already seen by earlier calls, keeping first occurrences."""
+
+    def __init__(self, name: str, key_columns: Optional[List[str]] = None) -> None:
+        """Initialize the deduplicator.
+
+        Args:
+            name (str): Name of the deduplicated table, used in logs.
+            key_columns (Optional[List[str]]): Columns identifying a row; rows
+                are compared on all columns if None.
+        """
+        self.name = name
+        self.key_columns = key_columns
+        self.seen = RowHashSet()
+        self.rows_seen = 0
+        self.duplicate_rows = 0
+
+    @property
+    def duplicate_rate(self) -> float:
+        """Share of the rows seen that were dropped as duplicates."""
+        return self.duplicate_rows / self.rows_seen if self.rows_seen else 0.0
+
+    def filter(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Drop rows of a batch repeated within the batch or seen in earlier batches.
+
+        Args:
+            df (pd.DataFrame): The batch of rows.
+
+        Returns:
+            pd.DataFrame: The rows not seen before, in their original order.
+        """
+        if df.empty:
+            return df
+        hashes = hash_rows(df, self.key_columns)
+        unique_hashes, first_positions = np.unique(hashes, return_index=True)
+        is_new = ~self.seen.contains(unique_hashes)
+        self.seen.add(unique_hashes[is_new])
+
+        self.rows_seen += len(df)
+        keep = np.sort(first_positions[is_new])
+        if len(keep) == len(df):
+            return df
+        self.duplicate_rows += len(df) - len(keep)
+        return df.iloc[keep]
+
+    def log_stats(self) -> None:
+        """Log the duplicate rate and the memory of the hash set."""
+        if not self.rows_seen:
+            return
+        logger.info(
+            f"Dropped {self.duplicate_rows} duplicate rows of '{self.name}' "
+            f"({self.duplicate_rate:.2%} of {self.rows_seen} rows, "
+            f"{self.seen.nbytes / 1024 / 1024:.1f} MB of row hashes)"
+        )
@@ -0,0 +1,504 @@
+"""Per-Stage Timing and Memory Profiling of ETL Runs.
+
+This module defines `RunProfiler`, a process-wide recorder of the wall time, CPU
+time, peak resident memory and row counts of pipeline steps: the pipeline stages,
+every extractor, every cleaning function and the passes of the address validation.
+Steps with the same name and entity are aggregated over all their calls (e.g. an
+extractor over all chunks). Steps measured in worker processes are collected there
+and merged into the profiler of the main process. At the end of a run the profile is
+written to a JSON run report, optionally with the top memory allocations traced by
+`tracemalloc`.
+
+Key Features:
+- `measure` context manager and `profile_step` decorator for instrumenting steps.
+- Peak RSS per step, sampled in a background thread while steps are running.
+- Row counts in and out, inferred from DataFrame arguments and results or set
+  explicitly; rows written by `save_to_csv_and_upload` count as rows out.
+- Machine-readable JSON run report with host information and process peaks.
+- Disabled profiling (`profiling: false`) adds no measurable overhead.
+"""
+
+import functools
+import json
+import logging
+import os
+import platform
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+# Interval in seconds between RSS samples of running steps
+RSS_SAMPLE_INTERVAL = 0.05
+# Number of steps listed in the summary log
+SUMMARY_STEPS = 15
+# Configuration keys copied into the run report
+REPORT_SETTINGS = (
+    "snapshot_date",
+    "language",
+    "ingestion_mode",
+    "extraction_mode",
+    "extraction_workers",
+    "cleaning_workers",
+    "storage_format",
+    "chunk_size",
+    "chunk_memory_budget_mb",
+    "streaming_dedup",
+    "enforce_dtypes",
+    "cleaning_chunk_size",
+    "address_index",
+    "fuzzy_match_cache",
+    "address_validation_workers",
+    "incremental",
+)
+
+BYTES_PER_MB = 1024 * 1024
+
+
+def get_rss_bytes() -> int:
+    """Return the current resident set size of the process.
+
+    Returns:
+        int: RSS in bytes, or the peak RSS if the current RSS cannot be read.
+    """
+    try:
+        with open("/proc/self/statm", "rb") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return get_peak_rss_bytes()
+
+
+def get_peak_rss_bytes(children: bool = False) -> int:
+    """Return the peak resident set size of the process or of its children.
+
+    Args:
+        children (bool): Return the largest peak of the terminated child processes.
+
+    Returns:
+        int: Peak RSS in bytes, or 0 if it cannot be determined.
+    """
+    if resource is None:
+        return 0
+    who = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+    max_rss = resource.getrusage(who).ru_maxrss
+    # ru_maxrss is reported in kilobytes on Linux and in bytes on macOS
+    return max_rss if platform.system() == "Darwin" else max_rss * 1024
+
+
+@dataclass
+class StepMeasurement:
+    """A running measurement of a step."""
+
+    step: str
+    entity: str = ""
+    rows_in: Optional[int] = None
+    rows_out: Optional[int] = None
+    peak_rss: int = 0
+    start_time: float = field(default_factory=time.perf_counter)
+    start_cpu: float = field(default_factory=time.process_time)
+
+    def add_rows_out(self, rows: int) -> None:
+        """Add rows to the output row count of the step.
+
+        Args:
+            rows (int): Number of output rows.
+        """
+        self.rows_out = (self.rows_out or 0) + rows
+
+
+@dataclass
+class StepProfile:
+    """Aggregated measurements of a step over all its calls."""
+
+    step: str
+    entity: str = ""
+    calls: int = 0
+    wall_time: float = 0.0
+    cpu_time: float = 0.0
+    peak_rss_mb: float = 0.0
+    rows_in: Optional[int] = None
+    rows_out: Optional[int] = None
+
+    def add(
+        self,
+        calls: int,
+        wall_time: float,
+        cpu_time: float,
+        peak_rss_mb: float,
+        rows_in: Optional[int],
+        rows_out: Optional[int],
+    ) -> None:
+        """Add measurements to the profile.
+
+        Args:
+            calls (int): Number of calls measured.
+            wall_time (float): Wall time in seconds.
+            cpu_time (float): CPU time of the measuring process in seconds.
+            peak_rss_mb (float): Peak RSS in MB during the calls.
+            rows_in (Optional[int]): Input rows, if known.
+            rows_out (Optional[int]): Output rows, if known.
+        """
+        self.calls += calls
+        self.wall_time += wall_time
+        self.cpu_time += cpu_time
+        self.peak_rss_mb = max(self.peak_rss_mb, peak_rss_mb)
+        if rows_in is not None:
+            self.rows_in = (self.rows_in or 0) + rows_in
+        if rows_out is not None:
+            self.rows_out = (self.rows_out or 0) + rows_out
+
+
+class RunProfiler:
+    """Process-wide recorder of step timings, memory peaks and row counts."""
+
+    def __init__(self) -> None:
+        """Initialize a disabled profiler."""
+        self.enabled = False
+        self.tracemalloc_top = 0
+        self._profiles: Dict[Tuple[str, str], StepProfile] = {}
+        self._active: List[StepMeasurement] = []
+        self._lock = threading.RLock()
+        self._sampler: Optional[threading.Thread] = None
+        self._sampler_pid = 0
+
+    def configure(self, config: Dict[str, Any], trace_allocations: bool = True) -> None:
+        """Enable or disable profiling from the configuration.
+
+        Args:
+            config (Dict[str, Any]): Configuration with `profiling` and
+                `tracemalloc_top`.
+            trace_allocations (bool): Start tracemalloc if `tracemalloc_top` is set.
+                Worker processes only measure steps and do not trace allocations.
+        """
+        self.enabled = bool(config.get("profiling", False))
+        self.tracemalloc_top = int(config.get("tracemalloc_top", 0))
+        if (
+            self.enabled
+            and trace_allocations
+            and self.tracemalloc_top > 0
+            and not tracemalloc.is_tracing()
+        ):
+            tracemalloc.start()
+
+    @contextmanager
+    def measure(
+        self, step: str, entity: Optional[str] = None, rows_in: Optional[int] = None
+    ) -> Iterator[StepMeasurement]:
+        """Measure a step.
+
+        Args:
+            step (str): Name of the step.
+            entity (Optional[str]): Entity the step works on. Defaults to the entity
+                of the enclosing step.
+            rows_in (Optional[int]): Number of input rows, if known.
+
+        Yields:
+            StepMeasurement: The running measurement; `rows_in` and `rows_out` may be
+                set on it.
+        """
+        if entity is None:
+            entity = self._active[-1].entity if self._active else ""
+        measurement = StepMeasurement(step, entity, rows_in)
+        if not self.enabled:
+            yield measurement
+            return
+
+        measurement.peak_rss = get_rss_bytes()
+        with self._lock:
+            self._active.append(measurement)
+            self._ensure_sampler()
+        try:
+            yield measurement
+        finally:
+            with self._lock:
+                self._active.remove(measurement)
+            self._record(measurement)
+
+    def add_rows_out(self, rows: int) -> None:
+        """Count rows written by the running steps as output rows.
+
+        Args:
+            rows (int): Number of rows written.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            for measurement in self._active:
+                measurement.add_rows_out(rows)
+
+    def _record(self, measurement: StepMeasurement) -> None:
+        """Add a finished measurement to the profile of its step.
+
+        Args:
+            measurement (StepMeasurement): The finished measurement.
+        """
+        peak_rss = max(measurement.peak_rss, get_rss_bytes())
+        self.add_profile(
+            measurement.step,
+            measurement.entity,
+            calls=1,
+            wall_time=time.perf_counter() - measurement.start_time,
+            cpu_time=time.process_time() - measurement.start_cpu,
+            peak_rss_mb=peak_rss / BYTES_PER_MB,
+            rows_in=measurement.rows_in,
+            rows_out=measurement.rows_out,
+        )
+
+    def add_profile(self, step: str, entity: str = "", **measurements: Any) -> None:
+        """Add measurements to the profile of a step.
+
+        Args:
+            step (str): Name of the step.
+            entity (str): Entity the step works on.
+            **measurements (Any): Keyword arguments of `StepProfile.add`.
+        """
+        with self._lock:
+            profile = self._profiles.get((step, entity))
+            if profile is None:
+                profile = self._profiles[(step, entity)] = StepProfile(step, entity)
+            profile.add(**measurements)
+
+    def get_profiles(self) -> List[Dict[str, Any]]:
+        """Return the step profiles in the order the steps first finished.
+
+        Returns:
+            List[Dict[str, Any]]: The step profiles as dictionaries.
+        """
+        with self._lock:
+            return [asdict(profile) for profile in self._profiles.values()]
+
+    def merge(self, profiles: List[Dict[str, Any]]) -> None:
+        """Merge step profiles collected in another process.
+
+        Args:
+            profiles (List[Dict[str, Any]]): Profiles returned by `get_profiles`.
+        """
+        for profile in profiles:
+            self.add_profile(
+                profile["step"],
+                profile["entity"],
+                calls=profile["calls"],
+                wall_time=profile["wall_time"],
+                cpu_time=profile["cpu_time"],
+                peak_rss_mb=profile["peak_rss_mb"],
+                rows_in=profile["rows_in"],
+                rows_out=profile["rows_out"],
+            )
+
+    @contextmanager
+    def collect(self) -> Iterator[List[Dict[str, Any]]]:
+        """Collect the profiles of the steps measured within the block.
+
+        Used in worker processes, which return the collected profiles to the main
+        process to be merged. Profiles recorded before the block are set aside.
+
+        Yields:
+            List[Dict[str, Any]]: Filled with the collected profiles on exit.
+        """
+        collected: List[Dict[str, Any]] = []
+        with self._lock:
+            previous = self._profiles
+            self._profiles = {}
+        try:
+            yield collected
+        finally:
+            collected.extend(self.get_profiles())
+            with self._lock:
+                self._profiles = previous
+
+    def reset(self) -> None:
+        """Drop all recorded profiles."""
+        with self._lock:
+            self._profiles = {}
+
+    def _ensure_sampler(self) -> None:
+        """Start the RSS sampler thread of this process if it is not running."""
+        sampler = self._sampler
+        if (
+            sampler is not None
+            and sampler.is_alive()
+            and self._sampler_pid == os.getpid()
+        ):
+            return
+        self._sampler = threading.Thread(
+            target=self._sample_rss, name="rss-sampler", daemon=True
+        )
+        self._sampler_pid = os.getpid()
+        self._sampler.start()
+
+    def _sample_rss(self) -> None:
+        """Update the peak RSS of the running steps until no step is running."""
+        while True:
+            time.sleep(RSS_SAMPLE_INTERVAL)
+            rss = get_rss_bytes()
+            with self._lock:
+                if not self._active:
+                    self._sampler = None
+                    return
+                for measurement in self._active:
+                    measurement.peak_rss = max(measurement.peak_rss, rss)
+
+    def get_top_allocations(self) -> List[Dict[str, Any]]:
+        """Return the largest memory allocations traced by tracemalloc.
+
+        Returns:
+            List[Dict[str, Any]]: Allocation sites with their size and block count.
+        """
+        if self.tracemalloc_top <= 0 or not tracemalloc.is_tracing():
+            return []
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, tracemalloc.__file__)]
+        )
+        return [
+            {
+                "location": str(stat.traceback),
+                "size_mb": round(stat.size / BYTES_PER_MB, 3),
+                "count": stat.count,
+            }
+            for stat in snapshot.statistics("lineno")[: self.tracemalloc_top]
+        ]
+
+    def build_report(
+        self,
+        config: Dict[str, Any],
+        started_at: datetime,
+        status: str,
+        error: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Build the run report.
+
+        Args:
+            config (Dict[str, Any]): Configuration dictionary.
+            started_at (datetime): Start time of the run.
+            status (str): Final status of the run, e.g. "completed" or "failed".
+            error (Optional[str]): The error of a failed run.
+
+        Returns:
+            Dict[str, Any]: The report.
+        """
+        finished_at = datetime.now(timezone.utc)
+        return {
+            "started_at": started_at.isoformat(),
+            "finished_at": finished_at.isoformat(),
+            "elapsed_time": (finished_at - started_at).total_seconds(),
+            "status": status,
+            "error": error,
+            "settings": {key: config.get(key) for key in REPORT_SETTINGS},
+            "host": {
+                "hostname": platform.node(),
+                "platform": platform.platform(),
+                "python": platform.python_version(),
+                "cpu_count": os.cpu_count(),
+            },
+            "peak_rss_mb": {
+                "main": round(get_peak_rss_bytes() / BYTES_PER_MB, 1),
+                "workers": round(get_peak_rss_bytes(children=True) / BYTES_PER_MB, 1),
+            },
+            "steps": self.get_profiles(),
+            "top_allocations": self.get_top_allocations(),
+        }
+
+    def write_report(
+        self,
+        output_file: Path,
+        config: Dict[str, Any],
+        started_at: datetime,
+        status: str,
+        error: Optional[str] = None,
+    ) -> None:
+        """Write the run report to a JSON file.
+
+        Args:
+            output_file (Path): Path of the report file.
+            config (Dict[str, Any]): Configuration dictionary.
+            started_at (datetime): Start time of the run.
+            status (str): Final status of the run.
+            error (Optional[str]): The error of a failed run.
+        """
+        report = self.build_report(config, started_at, status, error)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        with output_file.open("w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        logger.info(f"Run report written to {output_file}")
+
+    def log_stats(self) -> None:
+        """Log the steps with the longest wall time."""
+        profiles = sorted(
+            self.get_profiles(), key=lambda p: p["wall_time"], reverse=True
+        )
+        for profile in profiles[:SUMMARY_STEPS]:
+            name = profile["step"]
+            if profile["entity"]:
+                name = f"{name} [{profile['entity']}]"
+            logger.info(
+                f"Profile {name}: {profile['wall_time']:.2f}s wall, "
+                f"{profile['cpu_time']:.2f}s CPU, {profile['peak_rss_mb']:.0f} MB "
+                f"peak RSS, rows {profile['rows_in']} -> {profile['rows_out']} "
+                f"({profile['calls']} calls)"
+            )
+
+
+# Shared process-wide profiler
+PROFILER = RunProfiler()
+
+
+def count_rows(value: Any) -> Optional[int]:
+    """Return the number of rows of a DataFrame, or of the first one in a tuple.
+
+    Args:
+        value (Any): A DataFrame, a tuple possibly containing DataFrames, or any value.
+
+    Returns:
+        Optional[int]: The number of rows, or None if there is no DataFrame.
+    """
+    if isinstance(value, pd.DataFrame):
+        return len(value)
+    if isinstance(value, tuple):
+        return next((len(v) for v in value if isinstance(v, pd.DataFrame)), None)
+    return None
+
+
+def profile_step(step: Optional[str] = None) -> Callable[[Callable], Callable]:
+    """Decorate a function to be measured as a step of the shared profiler.
+
+    Input rows are taken from the first DataFrame argument and output rows from a
+    returned DataFrame.
+
+    Args:
+        step (Optional[str]): Name of the step; defaults to the function name.
+
+    Returns:
+        Callable[[Callable], Callable]: The decorator.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        step_name = step or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not PROFILER.enabled:
+                return func(*args, **kwargs)
+            rows_in = next((len(a) for a in args if isinstance(a, pd.DataFrame)), None)
+            with PROFILER.measure(step_name, rows_in=rows_in) as measurement:
+                result = func(*args, **kwargs)
+                rows_out = count_rows(result)
+                if rows_out is not None:
+                    measurement.rows_out = rows_out
+                return result
+
+        return wrapper
+
+    return decorator
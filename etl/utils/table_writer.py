@@ -0,0 +1,387 @@
+"""Buffered Writers for Entity Output Tables.
+
+This module defines `TableWriter`, a long-lived writer for a single output table,
+and `EntityWriters`, which keeps one writer per entity for the duration of a
+pipeline stage. Instead of opening, appending to and closing every entity file once
+per chunk, rows are buffered in memory and flushed in large sequential writes once a
+byte or row threshold is reached. Writers must be closed explicitly at the end of the
+stage, which flushes the remaining rows.
+
+Key Features:
+- CSV rows are encoded once and buffered as bytes; the file is opened once.
+- Parquet rows are buffered as Arrow tables and flushed as one part file per flush.
+- Byte and row thresholds bound the memory held by every writer.
+- Optionally drops repeated rows of an entity before they are buffered.
+- Reports rows written, bytes written, flush counts and duplicates per table.
+"""
+
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from etl.utils.columnar_io import (
+    STORAGE_FORMAT_CSV,
+    append_arrow_part,
+    build_arrow_table,
+    concat_arrow_tables,
+    validate_storage_format,
+    with_storage_suffix,
+)
+from etl.utils.row_dedup import RowDeduplicator
+from etl.utils.run_profiler import PROFILER
+
+logger = logging.getLogger(__name__)
+
+# Default flush thresholds (configured via `output_buffer_bytes`/`output_buffer_rows`)
+DEFAULT_BUFFER_BYTES = 16 * 1024 * 1024
+DEFAULT_BUFFER_ROWS = 200_000
+
+
+class TableWriter:
+    """Buffered, append-only writer for a single CSV or Parquet table."""
+
+    def __init__(
+        self,
+        output_file: Path,
+        storage_format: str = STORAGE_FORMAT_CSV,
+        column_types: Optional[Dict[str, str]] = None,
+        max_buffer_bytes: int = DEFAULT_BUFFER_BYTES,
+        max_buffer_rows: int = DEFAULT_BUFFER_ROWS,
+    ) -> None:
+        """Initialize the TableWriter.
+
+        Args:
+            output_file (Path): Path to the output table. Existing tables are appended to.
+            storage_format (str): Storage format, "csv" or "parquet".
+            column_types (Optional[Dict[str, str]]): Arrow type aliases keyed by
+                snake_case column name, used for Parquet.
+            max_buffer_bytes (int): Buffered bytes that trigger a flush.
+            max_buffer_rows (int): Buffered rows that trigger a flush.
+        """
+        self.output_file = Path(output_file)
+        self.storage_format = validate_storage_format(storage_format)
+        self.column_types = column_types or {}
+        self.max_buffer_bytes = max_buffer_bytes
+        self.max_buffer_rows = max_buffer_rows
+
+        self.rows_written = 0
+        self.bytes_written = 0
+        self.flush_count = 0
+        self.closed = False
+
+        self._buffer: List[Any] = []
+        self._buffered_bytes = 0
+        self._buffered_rows = 0
+        self._columns: Optional[List[str]] = None
+        self._file: Optional[Any] = None
+
+    def __enter__(self) -> "TableWriter":
+        """Return the writer for use as a context manager."""
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        """Close the writer, flushing any buffered rows."""
+        self.close()
+
+    def write(self, df: pd.DataFrame) -> None:
+        """Buffer the rows of a DataFrame, flushing if a threshold is reached.
+
+        Args:
+            df (pd.DataFrame): The rows to write.
+
+        Raises:
+            ValueError: If the writer is already closed.
+        """
+        if self.closed:
+            raise ValueError(f"Writer for {self.output_file} is closed")
+        if df.empty:
+            return
+
+        if self.storage_format == STORAGE_FORMAT_CSV:
+            data = self._encode_csv(df)
+            size = len(data)
+        else:
+            data = build_arrow_table(df, self.column_types)
+            size = data.nbytes
+        self._buffer.append(data)
+        self._buffered_bytes += size
+        self._buffered_rows += len(df)
+
+        if (
+            self._buffered_bytes >= self.max_buffer_bytes
+            or self._buffered_rows >= self.max_buffer_rows
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        """Write all buffered rows to the output table in one sequential write."""
+        if not self._buffer:
+            return
+
+        if self.storage_format == STORAGE_FORMAT_CSV:
+            output = self._open_csv()
+            for data in self._buffer:
+                output.write(data)
+            output.flush()
+            self.bytes_written += self._buffered_bytes
+        else:
+            part_file = append_arrow_part(
+                concat_arrow_tables(self._buffer), self.output_file
+            )
+            self.bytes_written += part_file.stat().st_size
+
+        self.rows_written += self._buffered_rows
+        self.flush_count += 1
+        self._buffer = []
+        self._buffered_bytes = 0
+        self._buffered_rows = 0
+
+    def close(self) -> None:
+        """Flush the remaining rows and release the output file."""
+        if self.closed:
+            return
+        try:
+            self.flush()
+        finally:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            self.closed = True
+        if self.rows_written:
+            logger.info(
+                f"Saved {self.rows_written} rows to {self.output_file} "
+                f"({self.bytes_written} bytes in {self.flush_count} flushes)"
+            )
+
+    def stats(self) -> Dict[str, int]:
+        """Return the write statistics of the table.
+
+        Returns:
+            Dict[str, int]: Rows written, bytes written and number of flushes.
+        """
+        return {
+            "rows_written": self.rows_written,
+            "bytes_written": self.bytes_written,
+            "flush_count": self.flush_count,
+        }
+
+    def _encode_csv(self, df: pd.DataFrame) -> bytes:
+        """Encode rows as CSV without a header, in the column order of the table.
+
+        Args:
+            df (pd.DataFrame): The rows to encode.
+
+        Returns:
+            bytes: The UTF-8 encoded CSV rows.
+        """
+        if self._columns is None:
+            self._columns = self._read_existing_header() or [str(c) for c in df.columns]
+        if list(df.columns) != self._columns:
+            logger.warning(f"Aligning columns of appended rows to {self.output_file}")
+            df = df.reindex(columns=self._columns)
+        return df.to_csv(header=False, index=False).encode("utf-8")
+
+    def _read_existing_header(self) -> Optional[List[str]]:
+        """Read the header of an existing, non-empty output CSV file.
+
+        Returns:
+            Optional[List[str]]: The existing column names, or None for a new file.
+        """
+        if not self.output_file.exists() or self.output_file.stat().st_size == 0:
+            return None
+        return list(pd.read_csv(self.output_file, nrows=0).columns)
+
+    def _open_csv(self) -> Any:
+        """Open the output CSV file for appending, writing the header if it is new.
+
+        Returns:
+            BinaryIO: The open output file.
+        """
+        if self._file is None:
+            is_new = (
+                not self.output_file.exists() or self.output_file.stat().st_size == 0
+            )
+            self._file = self.output_file.open("ab")
+            if is_new:
+                header = pd.DataFrame(columns=self._columns).to_csv(index=False)
+                encoded_header = header.encode("utf-8")
+                self._file.write(encoded_header)
+                self.bytes_written += len(encoded_header)
+        return self._file
+
+
+class EntityWriters:
+    """Set of long-lived table writers, one per entity, for a pipeline stage."""
+
+    def __init__(
+        self,
+        output_dir: Path,
+        storage_format: str = STORAGE_FORMAT_CSV,
+        max_buffer_bytes: int = DEFAULT_BUFFER_BYTES,
+        max_buffer_rows: int = DEFAULT_BUFFER_ROWS,
+        measure_frames: bool = False,
+        deduplicate: bool = False,
+        dedup_columns: Optional[Dict[str, List[str]]] = None,
+    ) -> None:
+        """Initialize the EntityWriters.
+
+        Args:
+            output_dir (Path): Directory of the `<entity>.csv`/`.parquet` tables.
+            storage_format (str): Storage format, "csv" or "parquet".
+            max_buffer_bytes (int): Buffered bytes per entity that trigger a flush.
+            max_buffer_rows (int): Buffered rows per entity that trigger a flush.
+            measure_frames (bool): Sum the in-memory size of the written DataFrames
+                in `frame_bytes`, e.g. for adaptive batch sizing.
+            deduplicate (bool): Drop rows already written to an entity by this
+                writer set, keeping only a hash per distinct row in memory.
+            dedup_columns (Optional[Dict[str, List[str]]]): Key columns per entity
+                compared when deduplicating; all columns for other entities.
+        """
+        self.output_dir = Path(output_dir)
+        self.storage_format = validate_storage_format(storage_format)
+        self.max_buffer_bytes = max_buffer_bytes
+        self.max_buffer_rows = max_buffer_rows
+        self.measure_frames = measure_frames
+        self.frame_bytes = 0
+        self.deduplicate = deduplicate
+        self.dedup_columns = dedup_columns or {}
+        self._writers: Dict[str, TableWriter] = {}
+        self._deduplicators: Dict[str, RowDeduplicator] = {}
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], output_dir: Path) -> "EntityWriters":
+        """Create entity writers using the storage and buffer settings of the config.
+
+        Args:
+            config (Dict[str, Any]): Configuration dictionary.
+            output_dir (Path): Directory of the entity tables.
+
+        Returns:
+            EntityWriters: The writer set.
+        """
+        return cls(
+            output_dir,
+            config.get("storage_format", STORAGE_FORMAT_CSV),
+            int(config.get("output_buffer_bytes", DEFAULT_BUFFER_BYTES)),
+            int(config.get("output_buffer_rows", DEFAULT_BUFFER_ROWS)),
+            bool(config.get("chunk_memory_budget_mb")),
+            bool(config.get("streaming_dedup", False)),
+            {
+                entity["name"]: entity["dedup_columns"]
+                for entity in config.get("entities", [])
+                if entity.get("dedup_columns")
+            },
+        )
+
+    def __enter__(self) -> "EntityWriters":
+        """Return the writer set for use as a context manager."""
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        """Close all writers, flushing any buffered rows."""
+        self.close()
+
+    def get_writer(
+        self, entity_name: str, column_types: Optional[Dict[str, str]] = None
+    ) -> TableWriter:
+        """Return the writer of an entity, creating it on first use.
+
+        Args:
+            entity_name (str): Name of the entity.
+            column_types (Optional[Dict[str, str]]): Arrow type aliases for Parquet.
+
+        Returns:
+            TableWriter: The entity's writer.
+        """
+        writer = self._writers.get(entity_name)
+        if writer is None:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            writer = TableWriter(
+                with_storage_suffix(
+                    self.output_dir / f"{entity_name}.csv", self.storage_format
+                ),
+                self.storage_format,
+                column_types,
+                self.max_buffer_bytes,
+                self.max_buffer_rows,
+            )
+            self._writers[entity_name] = writer
+        return writer
+
+    def write(
+        self,
+        entity_name: str,
+        df: pd.DataFrame,
+        column_types: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """Buffer rows for an entity.
+
+        Args:
+            entity_name (str): Name of the entity.
+            df (pd.DataFrame): The rows to write.
+            column_types (Optional[Dict[str, str]]): Arrow type aliases for Parquet.
+        """
+        if self.deduplicate:
+            deduplicator = self._deduplicators.get(entity_name)
+            if deduplicator is None:
+                deduplicator = self._deduplicators[entity_name] = RowDeduplicator(
+                    entity_name, self.dedup_columns.get(entity_name)
+                )
+            with PROFILER.measure("dedup", entity_name, rows_in=len(df)) as step:
+                df = deduplicator.filter(df)
+                step.rows_out = len(df)
+        if self.measure_frames:
+            self.frame_bytes += int(df.memory_usage(index=True, deep=True).sum())
+        self.get_writer(entity_name, column_types).write(df)
+
+    def close(self) -> Dict[str, Dict[str, int]]:
+        """Close every writer and log the totals.
+
+        Returns:
+            Dict[str, Dict[str, int]]: Write statistics keyed by entity name.
+
+        Raises:
+            RuntimeError: If any writer fails to flush.
+        """
+        errors = []
+        for entity_name, writer in self._writers.items():
+            try:
+                writer.close()
+            except Exception as e:
+                logger.error(f"Error closing writer for entity '{entity_name}': {e}")
+                errors.append(f"{entity_name}: {e}")
+        for deduplicator in self._deduplicators.values():
+            deduplicator.log_stats()
+        stats = self.stats()
+        if stats:
+            logger.info(
+                f"Entity writers closed: "
+                f"{sum(s['rows_written'] for s in stats.values())} rows, "
+                f"{sum(s['duplicate_rows'] for s in stats.values())} duplicates "
+                f"dropped, "
+                f"{sum(s['bytes_written'] for s in stats.values())} bytes, "
+                f"{sum(s['flush_count'] for s in stats.values())} flushes"
+            )
+        if errors:
+            raise RuntimeError(f"Error closing entity writers: {'; '.join(errors)}")
+        return stats
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Return the write statistics of all entities.
+
+        Returns:
+            Dict[str, Dict[str, int]]: Write statistics keyed by entity name.
+        """
+        return {
+            name: {
+                **writer.stats(),
+                "duplicate_rows": (
+                    self._deduplicators[name].duplicate_rows
+                    if name in self._deduplicators
+                    else 0
+                ),
+            }
+            for name, writer in self._writers.items()
+        }
@@ -0,0 +1,174 @@
+"""Tests of ResumableDownloader against a local HTTP server."""
+
+import hashlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+import pytest
+
+from etl.utils.resumable_download import (
+    METADATA_SUFFIX,
+    PART_METADATA_SUFFIX,
+    PART_SUFFIX,
+    ResumableDownloader,
+)
+
+CONTENT = bytes(range(256)) * 4096  # 1 MiB
+ETAG = '"v1"'
+
+
+class RangeRequestHandler(BaseHTTPRequestHandler):
+    """Serve CONTENT with ETag, If-None-Match, and Range support."""
+
+    server: "FileServer"
+
+    def log_message(self, format: str, *args: object) -> None:
+        """Keep the test output free of request logs."""
+        pass
+
+    def do_HEAD(self) -> None:
+        """Answer a HEAD request with the headers of a GET request."""
+        self._respond(send_body=False)
+
+    def do_GET(self) -> None:
+        """Record the Range header and send the requested bytes."""
+        self.server.requests.append(self.headers.get("Range"))
+        self._respond(send_body=True)
+
+    def _respond(self, send_body: bool) -> None:
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.send_header("ETag", ETAG)
+            self.end_headers()
+            return
+
+        start, end, status = 0, len(CONTENT) - 1, 200
+        range_header = self.headers.get("Range")
+        if_range = self.headers.get("If-Range")
+        if range_header and (if_range is None or if_range == ETAG):
+            first, last = range_header.removeprefix("bytes=").split("-")
+            start, end, status = int(first), int(last) if last else end, 206
+        body = CONTENT[start : end + 1]
+        if send_body and self.server.truncate_next:
+            # Cut the body short, with a consistent Content-Length
+            self.server.truncate_next = False
+            body = body[: len(body) // 2]
+
+        self.send_response(status)
+        self.send_header("ETag", ETAG)
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Length", str(len(body)))
+        if status == 206:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(CONTENT)}")
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+
+class FileServer(ThreadingHTTPServer):
+    """HTTP server recording the Range header of every GET request."""
+
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        """Listen on a free local port."""
+        super().__init__(("127.0.0.1", 0), RangeRequestHandler)
+        self.requests: List[Optional[str]] = []
+        self.truncate_next = False
+
+
+@pytest.fixture
+def server() -> Iterator[FileServer]:
+    file_server = FileServer()
+    thread = threading.Thread(target=file_server.serve_forever, daemon=True)
+    thread.start()
+    yield file_server
+    file_server.shutdown()
+    file_server.server_close()
+
+
+@pytest.fixture
+def url(server: FileServer) -> str:
+    return f"http://127.0.0.1:{server.server_port}/all_companies.zip"
+
+
+def make_downloader(**kwargs: int) -> ResumableDownloader:
+    options = {"chunk_size": 64 * 1024, "connections": 1, "delay": 0, "timeout": 5}
+    return ResumableDownloader(**(options | kwargs))
+
+
+def test_full_download(tmp_path: Path, server: FileServer, url: str) -> None:
+    destination = tmp_path / "all_companies.zip"
+
+    assert make_downloader().download(url, destination)
+
+    assert destination.read_bytes() == CONTENT
+    assert server.requests == [None]
+    metadata = json.loads(
+        destination.with_name(destination.name + METADATA_SUFFIX).read_text()
+    )
+    assert metadata["sha256"] == hashlib.sha256(CONTENT).hexdigest()
+    assert metadata["etag"] == ETAG
+    assert not list(tmp_path.glob(f"*{PART_SUFFIX}"))
+
+
+def test_unchanged_file_is_reused(tmp_path: Path, server: FileServer, url: str) -> None:
+    destination = tmp_path / "all_companies.zip"
+    make_downloader().download(url, destination)
+
+    assert not make_downloader().download(url, destination)
+
+    assert server.requests == [None]
+    assert destination.read_bytes() == CONTENT
+
+
+def test_resume_from_part_file(tmp_path: Path, server: FileServer, url: str) -> None:
+    destination = tmp_path / "all_companies.zip"
+    done = 300_000
+    destination.with_name(destination.name + PART_SUFFIX).write_bytes(CONTENT[:done])
+    destination.with_name(destination.name + PART_METADATA_SUFFIX).write_text(
+        json.dumps({"size": len(CONTENT), "etag": ETAG, "last_modified": None})
+    )
+
+    assert make_downloader().download(url, destination)
+
+    assert server.requests == [f"bytes={done}-"]
+    assert destination.read_bytes() == CONTENT
+
+
+def test_short_body_is_resumed(tmp_path: Path, server: FileServer, url: str) -> None:
+    destination = tmp_path / "all_companies.zip"
+    server.truncate_next = True
+
+    assert make_downloader().download(url, destination)
+
+    assert server.requests == [None, f"bytes={len(CONTENT) // 2}-"]
+    assert destination.read_bytes() == CONTENT
+
+
+def test_parallel_download(tmp_path: Path, server: FileServer, url: str) -> None:
+    destination = tmp_path / "all_companies.zip"
+
+    downloader = make_downloader(connections=4, min_parallel_size=0)
+    assert downloader.download(url, destination)
+
+    segment_size = len(CONTENT) // 4
+    assert sorted(server.requests) == [
+        f"bytes={start}-{start + segment_size - 1}"
+        for start in range(0, len(CONTENT), segment_size)
+    ]
+    assert destination.read_bytes() == CONTENT
+    assert not list(tmp_path.glob(f"*{PART_SUFFIX}*"))
+
+
+def test_checksum_mismatch(tmp_path: Path, server: FileServer, url: str) -> None:
+    destination = tmp_path / "all_companies.zip"
+
+    with pytest.raises(RuntimeError, match="Checksum mismatch"):
+        make_downloader().download(url, destination, expected_sha256="0" * 64)
+
+    assert not destination.exists()
+    assert not list(tmp_path.glob(f"*{PART_SUFFIX}"))
@@ -0,0 +1,92 @@
+"""Streaming deduplication must keep the rows of `drop_duplicates(keep="first")`."""
+
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from etl.utils.row_dedup import RowDeduplicator, RowHashSet, hash_rows
+from etl.utils.table_writer import EntityWriters
+
+KEY_COLUMNS = ["businessId", "type"]
+
+
+def make_rows(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Return rows with many repeated values, including missing ones."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "businessId": [f"{value:07d}-1" for value in rng.integers(0, 50, rows)],
+            "type": rng.integers(0, 3, rows),
+            "name": pd.Series(rng.choice(["Oy", "Ab", None], rows), dtype=object),
+        }
+    )
+
+
+def split_batches(df: pd.DataFrame, sizes: List[int]) -> List[pd.DataFrame]:
+    bounds = np.cumsum([0] + sizes)
+    return [df.iloc[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+
+
+@pytest.mark.parametrize("key_columns", [None, KEY_COLUMNS])
+def test_batches_keep_first_occurrences_in_order(key_columns: List[str]) -> None:
+    df = make_rows(1000)
+    # Uneven batches, including an empty one, with duplicates within and across them
+    batches = split_batches(df, [1, 0, 7, 150, 42, 300, 500])
+    deduplicator = RowDeduplicator("rows", key_columns)
+
+    result = pd.concat([deduplicator.filter(batch) for batch in batches])
+
+    expected = df.drop_duplicates(subset=key_columns, keep="first")
+    pd.testing.assert_frame_equal(result, expected)
+    assert deduplicator.rows_seen == len(df)
+    assert deduplicator.duplicate_rows == len(df) - len(expected)
+    assert deduplicator.duplicate_rate == pytest.approx(
+        (len(df) - len(expected)) / len(df)
+    )
+
+
+def test_batch_without_duplicates_is_returned_unchanged() -> None:
+    deduplicator = RowDeduplicator("rows")
+    batch = pd.DataFrame({"businessId": ["1", "2", "3"]})
+
+    assert deduplicator.filter(batch) is batch
+    assert deduplicator.filter(batch).empty
+    assert deduplicator.duplicate_rows == 3
+
+
+def test_hash_set_matches_a_python_set() -> None:
+    rng = np.random.default_rng(0)
+    hash_set = RowHashSet()
+    expected = set()
+    for _ in range(200):
+        hashes = np.unique(rng.integers(0, 5000, rng.integers(0, 40), dtype=np.uint64))
+        is_new = ~hash_set.contains(hashes)
+        assert list(is_new) == [value not in expected for value in hashes.tolist()]
+        hash_set.add(hashes[is_new])
+        expected.update(hashes.tolist())
+
+    assert len(hash_set) == len(expected)
+    assert hash_set.nbytes == 8 * len(expected)
+    # Run sizes at least double, so the number of runs stays logarithmic
+    assert len(hash_set._runs) <= np.log2(len(expected)) + 1
+
+
+def test_missing_key_column_raises() -> None:
+    with pytest.raises(ValueError, match="missing_column"):
+        hash_rows(make_rows(10), ["businessId", "missing_column"])
+
+
+def test_written_table_equals_drop_duplicates(tmp_path: Path) -> None:
+    df = make_rows(1000)
+    with EntityWriters(tmp_path, max_buffer_rows=64, deduplicate=True) as writers:
+        for batch in split_batches(df, [100] * 10):
+            writers.write("names", batch)
+        stats = writers.stats()
+
+    written = pd.read_csv(tmp_path / "names.csv", dtype={"businessId": str})
+    expected = df.drop_duplicates(keep="first").reset_index(drop=True)
+    pd.testing.assert_frame_equal(written, expected)
+    assert stats["names"]["duplicate_rows"] == len(df) - len(expected)